@@ -14,15 +14,21 @@ Usage:
     python cli/pull_tracked_scripts.py --unit unit1
     python cli/pull_tracked_scripts.py --module 12
     python cli/pull_tracked_scripts.py --type lesson
+    python cli/pull_tracked_scripts.py --jobs 8
+    python cli/pull_tracked_scripts.py --incremental-comments
+
+Pages are pulled concurrently (--jobs, default 4) under the shared Notion rate limit;
+each line of output is prefixed with the page it belongs to.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
@@ -44,6 +50,7 @@ from utils.notion import (  # noqa: E402
     pull_lesson,
     pull_out_path,
 )
+from utils.notion_jobs import DEFAULT_PAGE_WORKERS, print_job_summary, run_page_jobs  # noqa: E402
 
 TRACKED_DIR = project_root / "tracked_scripts"
 
@@ -56,7 +63,11 @@ _SCRIPT_TYPE_LABELS = {
     "exitcheck": "exitcheck",
     "synthesis": "synthesis",
 }
-_SKIP_FILES = {"notion_blocks.json", "notion_push_log.json"}
+# Per-block comment cache for incremental sweeps, written next to notion_blocks.json
+_COMMENT_STATE_FILE = "notion_comment_state.json"
+_SKIP_FILES = {"notion_blocks.json", "notion_push_log.json", _COMMENT_STATE_FILE}
+# Max comment analyses in flight at once during a sweep
+_COMMENT_ANALYSIS_CONCURRENCY = 8
 _STEP_PROMPT_FILES = {
     "section_structurer": "steps/prompts/section_structurer.py",
     "dialogue_rewriter": "steps/prompts/dialogue_rewriter.py",
@@ -225,7 +236,7 @@ def _trace_beat_backwards(tracked_dir: Path, section_id: str, beat_description:
     return history
 
 
-def _analyze_comment(comment: dict, sections: list, tracked_dir: Path | None = None) -> dict:
+async def _analyze_comment(comment: dict, sections: list, tracked_dir: Path | None = None) -> dict:
     """Call Claude to identify which pipeline step introduced the issue in a comment thread."""
     section_by_id = {s["id"]: s for s in sections if isinstance(s, dict) and "id" in s}
     surrounding = section_by_id.get(comment.get("section_id") or "", {})
@@ -258,8 +269,9 @@ def _analyze_comment(comment: dict, sections: list, tracked_dir: Path | None = N
     logs_dir.mkdir(exist_ok=True)
     client = ClaudeClient(log_file=str(logs_dir / "claude_usage.jsonl"))
 
+    raw = ""
     try:
-        raw = client.generate(
+        raw = await client.agenerate(
             system=system_text,
             user_message=user_message,
             max_tokens=COMMENT_ANALYZER_PROMPT.max_tokens or 600,
@@ -275,13 +287,13 @@ def _analyze_comment(comment: dict, sections: list, tracked_dir: Path | None = N
     except Exception as e:
         return {
             "error": str(e),
-            "raw": raw if "raw" in dir() else "",
+            "raw": raw,
             "pipeline_history": pipeline_history,
         }
 
 
-def _find_notion_blocks(tracked_dir: Path) -> list[dict] | None:
-    """Find the most recent notion_blocks.json anywhere in the tracked dir."""
+def _find_notion_blocks_file(tracked_dir: Path) -> Path | None:
+    """Find the most recent readable notion_blocks.json anywhere in the tracked dir."""
     step_dirs = sorted(
         [d for d in tracked_dir.iterdir() if d.is_dir() and re.match(r"^step_\d+_", d.name)],
         key=lambda d: int(re.match(r"^step_(\d+)_", d.name).group(1)),
@@ -290,16 +302,28 @@ def _find_notion_blocks(tracked_dir: Path) -> list[dict] | None:
         blocks_file = step_dir / "notion_blocks.json"
         if blocks_file.exists():
             try:
-                return json.loads(blocks_file.read_text(encoding="utf-8"))
+                json.loads(blocks_file.read_text(encoding="utf-8"))
+                return blocks_file
             except Exception:
                 pass
     return None
 
 
 def _sweep_comments(
-    tracked_dir: Path, page_id: str, all_comments: bool = False, out_dir: Path | None = None
+    tracked_dir: Path,
+    page_id: str,
+    all_comments: bool = False,
+    out_dir: Path | None = None,
+    incremental: bool = False,
 ) -> str:
-    """Fetch comments from Notion, analyze each, write notion_comments.json."""
+    """Fetch comments from Notion, analyze each, write notion_comments.json.
+
+    Every block's comments are listed by default. With incremental=True,
+    notion_comment_state.json next to notion_blocks.json remembers each block's
+    last_edited_time and comments, and only edited blocks and blocks that already had
+    comments are re-queried: a new thread on an unedited block without comments is
+    missed (adding a comment does not change last_edited_time).
+    """
     source_file = _find_source_json(tracked_dir)
     if not source_file:
         return "no source JSON found"
@@ -310,11 +334,13 @@ def _sweep_comments(
         return "source JSON has no sections list"
 
     # Load pre-fetched blocks for full-tree comment sweep (catches untagged blocks)
-    blocks = _find_notion_blocks(tracked_dir)
+    blocks_file = _find_notion_blocks_file(tracked_dir)
+    blocks = json.loads(blocks_file.read_text(encoding="utf-8")) if blocks_file else None
+    state_path = blocks_file.with_name(_COMMENT_STATE_FILE) if blocks_file and incremental else None
 
     try:
         comments = fetch_lesson_comments(
-            page_id, sections, blocks=blocks, all_comments=all_comments
+            page_id, sections, blocks=blocks, all_comments=all_comments, state_path=state_path
         )
     except Exception as e:
         return f"comment fetch error: {e}"
@@ -328,8 +354,9 @@ def _sweep_comments(
             out_path.unlink()
         return "no comments"
 
-    def _build_entry(comment: dict) -> dict:
-        analysis = _analyze_comment(comment, sections, tracked_dir=tracked_dir)
+    async def _build_entry(comment: dict, limit: asyncio.Semaphore) -> dict:
+        async with limit:
+            analysis = await _analyze_comment(comment, sections, tracked_dir=tracked_dir)
         entry = {
             "discussion_id": comment["discussion_id"],
             "block_id": comment["block_id"],
@@ -342,14 +369,12 @@ def _sweep_comments(
         entry.update(analysis)
         return entry
 
-    order = {c["discussion_id"]: i for i, c in enumerate(comments)}
-    with ThreadPoolExecutor(max_workers=8) as pool:
-        futures = {pool.submit(_build_entry, c): c["discussion_id"] for c in comments}
-        results: dict[int, dict] = {}
-        for fut in as_completed(futures):
-            did = futures[fut]
-            results[order[did]] = fut.result()
-    analyzed = [results[i] for i in range(len(comments))]
+    async def _analyze_all() -> list[dict]:
+        # gather() keeps input order; the semaphore caps in-flight requests
+        limit = asyncio.Semaphore(_COMMENT_ANALYSIS_CONCURRENCY)
+        return await asyncio.gather(*(_build_entry(c, limit) for c in comments))
+
+    analyzed = asyncio.run(_analyze_all())
 
     out_path.write_text(json.dumps(analyzed, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
@@ -421,7 +446,9 @@ def _sweep_comments(
     return f"{len(analyzed)} comment(s) -> {rel}"
 
 
-def _pull_entry(key: str, entry: dict, all_comments: bool = False) -> str:
+def _pull_entry(
+    key: str, entry: dict, all_comments: bool = False, incremental_comments: bool = False
+) -> str:
     """Pull one registry entry. Returns a status string."""
     parsed = _parse_registry_key(key)
     if not parsed:
@@ -439,7 +466,11 @@ def _pull_entry(key: str, entry: dict, all_comments: bool = False) -> str:
         return f"PULL ERROR  {key}: {pull_result}"
 
     comment_status = _sweep_comments(
-        dest, entry["page_id"], all_comments=all_comments, out_dir=pull_result.parent
+        dest,
+        entry["page_id"],
+        all_comments=all_comments,
+        out_dir=pull_result.parent,
+        incremental=incremental_comments,
     )
     rel = dest.relative_to(project_root)
     return f"OK    {rel}  [{comment_status}]"
@@ -460,6 +491,20 @@ def main() -> None:
         default=False,
         help="Analyze all comment threads, not just those tagged @claude",
     )
+    parser.add_argument(
+        "--incremental-comments",
+        action="store_true",
+        default=False,
+        help="Only re-query comments on blocks edited or commented on since the last pull "
+        "(misses new threads on other unedited blocks)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_PAGE_WORKERS,
+        help=f"Pages to pull concurrently (default: {DEFAULT_PAGE_WORKERS})",
+    )
     args = parser.parse_args()
 
     if not is_configured():
@@ -510,8 +555,28 @@ def main() -> None:
 
     for key, entry in skipped_keys:
         print(f"SKIP  {key} (not a unit/module pipeline)")
-    for key, entry in deduped:
-        print(_pull_entry(key, entry, all_comments=args.all_comments))
+
+    def _job(key: str, entry: dict):
+        def run() -> str:
+            status = _pull_entry(
+                key,
+                entry,
+                all_comments=args.all_comments,
+                incremental_comments=args.incremental_comments,
+            )
+            if status.startswith("PULL ERROR"):
+                raise RuntimeError(status.split(": ", 1)[-1])
+            return status
+
+        unit, script_type, module_num = _parse_registry_key(key)
+        unit_short = re.sub(r"^unit(\d+)$", r"u\1", unit)
+        return f"{unit_short}/m{module_num}/{script_type}", run
+
+    start = time.monotonic()
+    results = run_page_jobs([_job(key, entry) for key, entry in deduped], max_workers=args.jobs)
+    print_job_summary(results, time.monotonic() - start)
+    if any(not result.ok for result in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
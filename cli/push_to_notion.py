@@ -3,20 +3,27 @@
 Usage:
     python cli/push_to_notion.py <path/to/output.json> [--title "Custom Title"]
     python cli/push_to_notion.py <path/to/output.json> --pull
+    python cli/push_to_notion.py <a.json> <b.json> ... [--pull] [--jobs 8]
 
 Push: renders the lesson with emoji callouts and updates the Notion page.
 Pull: fetches edits from Notion, patches dialogue/prompt text back into the
       file, and saves a notion_flags.json sidecar listing any scene
       descriptions that changed (those need manual config updates).
+
+Several files are pushed or pulled concurrently (--jobs, default 4), one page per
+file, under the shared Notion rate limit; their output is prefixed with the file's
+version directory and a summary lists any failures.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import shutil
 import sys
+import time
 from pathlib import Path
 from typing import Any
 
@@ -39,8 +46,10 @@ from utils.notion import (  # noqa: E402
     pull_lesson,
     pull_out_path,
     push_lesson,
+    registry_batch,
     set_registry_entry,
 )
+from utils.notion_jobs import DEFAULT_PAGE_WORKERS, print_job_summary, run_page_jobs  # noqa: E402
 
 TRACKED_DIR = project_root / "tracked_scripts"
 _PIPELINE_RE = re.compile(
@@ -84,7 +93,7 @@ def _auto_stitch(file_path: Path) -> str | None:
 
 def main():
     parser = argparse.ArgumentParser(description="Push or pull a lesson JSON file with Notion")
-    parser.add_argument("file", help="Path to the JSON file")
+    parser.add_argument("files", nargs="+", metavar="file", help="Path(s) to the JSON file(s)")
     parser.add_argument("--title", help="Notion page title (push only, auto-generated if omitted)")
     parser.add_argument(
         "--pull", action="store_true", help="Pull edits from Notion back into the file"
@@ -109,17 +118,34 @@ def main():
         "--page-id",
         help="Notion page ID to pull from (overrides registry lookup, useful for tracked_scripts)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_PAGE_WORKERS,
+        help=f"Files to push/pull concurrently (default: {DEFAULT_PAGE_WORKERS})",
+    )
     args = parser.parse_args()
 
     if not is_configured():
         print("[ERROR] NOTION_API_KEY or NOTION_PARENT_PAGE_ID not set in .env")
         sys.exit(1)
 
-    file_path = Path(args.file).resolve()
-    if not file_path.exists():
-        print(f"[ERROR] File not found: {file_path}")
+    file_paths = [Path(f).resolve() for f in args.files]
+    missing = [f for f in file_paths if not f.exists()]
+    if missing:
+        for f in missing:
+            print(f"[ERROR] File not found: {f}")
         sys.exit(1)
 
+    if len(file_paths) > 1:
+        if args.title or args.sections or args.page_id:
+            parser.error("--title, --sections and --page-id apply to a single file")
+        _run_many(file_paths, args)
+        return
+
+    file_path = file_paths[0]
+
     if args.pull:
         _pull(file_path, new_version=args.new_version, page_id_override=args.page_id)
     else:
@@ -132,6 +158,39 @@ def main():
         )
 
 
+def _run_many(file_paths: list[Path], args: argparse.Namespace) -> None:
+    """Push or pull several files concurrently, one Notion page each."""
+    if not args.pull and not os.getenv("NOTION_YES"):
+        confirm = input(f"Push {len(file_paths)} files to Notion? [y/N] ").strip().lower()
+        if confirm != "y":
+            print("Aborted.")
+            return
+        # Confirmed once for all pages; workers must not prompt
+        os.environ["NOTION_YES"] = "1"
+
+    def _job(file_path: Path):
+        try:
+            label = file_path.parent.parent.relative_to(project_root).as_posix()
+        except ValueError:
+            label = file_path.stem
+
+        def run():
+            # The page's registry writes are saved in one locked write as soon as it is
+            # done, so an interrupted run keeps the entries of the pages already pushed
+            with registry_batch():
+                if args.pull:
+                    return _pull(file_path, new_version=args.new_version)
+                return _push(file_path, None, test_push=args.test_push)
+
+        return label, run
+
+    start = time.monotonic()
+    results = run_page_jobs([_job(f) for f in file_paths], max_workers=args.jobs)
+    print_job_summary(results, time.monotonic() - start)
+    if any(not result.ok for result in results):
+        sys.exit(1)
+
+
 def _push(
     file_path: Path,
     title: str | None,
@@ -0,0 +1,277 @@
+"""
+Report CLI - Where a pipeline version spent its time and tokens
+
+Reads the telemetry run_pipeline saves in metadata.json (see core/telemetry.py) and
+prints it per step: wall time, time in each phase, requests, tokens, retries and bytes
+written, followed by the slowest items. With --compare, each step is shown next to the
+same step of another version, and steps that got slower or more expensive are flagged.
+
+With --gc, objects of the artifact store (outputs/.objects, see core/artifact_store.py)
+that no version refers to any more are removed first, e.g. after deleting old versions.
+
+Usage:
+    python report.py <pipeline_name> [version] [--compare VERSION]
+    python report.py --gc
+
+Examples:
+    python report.py lesson_generator_dialogue_pass                # latest version
+    python report.py lesson_generator_dialogue_pass v12 --items 10
+    python report.py lesson_generator_dialogue_pass v12 --compare v11
+    python report.py --gc                                         # clean up outputs/.objects
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Columns of the step table: (telemetry key, header, kind)
+COLUMNS = [
+    ("seconds", "wall", "time"),
+    ("api", "api", "phase"),
+    ("rate_limit_wait", "rl wait", "phase"),
+    ("prompt_build", "build", "phase"),
+    ("json_parse", "parse", "phase"),
+    ("validation", "valid", "phase"),
+    ("write", "write", "phase"),
+    ("requests", "reqs", "count"),
+    ("input_tokens", "in tok", "count"),
+    ("output_tokens", "out tok", "count"),
+    ("cache_read_tokens", "cache rd", "count"),
+    ("retries", "retries", "count"),
+    ("bytes_written", "written", "bytes"),
+]
+
+# Compared to the other version, a step is flagged when it grew by more than this
+DEFAULT_THRESHOLD = 0.2
+
+
+def format_duration(seconds):
+    """Format duration in human-readable format"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    elif seconds < 3600:
+        minutes = seconds / 60
+        return f"{minutes:.1f}m"
+    else:
+        hours = seconds / 3600
+        return f"{hours:.1f}h"
+
+
+def format_count(value, kind="count"):
+    """Format a token/byte count compactly (12.3k, 4.1M)"""
+    if kind == "bytes":
+        for unit in ("B", "KB", "MB"):
+            if value < 1024:
+                return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+            value /= 1024
+        return f"{value:.1f}GB"
+    if value < 1000:
+        return f"{value:.0f}"
+    if value < 1_000_000:
+        return f"{value / 1000:.1f}k"
+    return f"{value / 1_000_000:.1f}M"
+
+
+def metric(entry: dict, key: str, kind: str) -> float:
+    """Value of one column for a run, step or item telemetry entry"""
+    if kind == "phase":
+        return entry.get("phases", {}).get(key, 0.0)
+    return entry.get(key, 0)
+
+
+def format_metric(value, kind: str) -> str:
+    """Format one column's value ("-" for zero)"""
+    if kind in ("time", "phase"):
+        return format_duration(value) if value else "-"
+    return format_count(value, kind) if value else "-"
+
+
+def load_telemetry(version_dir: Path) -> dict:
+    """metadata["telemetry"] of a version directory ({} for runs saved without it)"""
+    metadata_path = version_dir / "metadata.json"
+    if not metadata_path.exists():
+        return {}
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("telemetry", {})
+
+
+def step_label(step_dir_name: str) -> str:
+    """step_05_section_structurer -> 5 section_structurer"""
+    parts = step_dir_name.split("_", 2)
+    if len(parts) == 3 and parts[0] == "step" and parts[1].isdigit():
+        return f"{int(parts[1])} {parts[2]}"
+    return step_dir_name
+
+
+def regressions(base: dict, new: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Columns of a step (or run) that grew by more than threshold from base to new
+
+    Returns:
+        List of (header, base value, new value)
+    """
+    grown = []
+    for key, header, kind in COLUMNS:
+        before, after = metric(base, key, kind), metric(new, key, kind)
+        # Ignore sub-second phases and tiny counts: they are noise, not regressions
+        floor = 1.0 if kind in ("time", "phase") else 1
+        if after > floor and after > before * (1 + threshold):
+            grown.append((header, before, after))
+    return grown
+
+
+def print_table(rows: list) -> None:
+    """Print rows of strings as left-aligned first column, right-aligned others"""
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    for row in rows:
+        cells = [row[0].ljust(widths[0])]
+        cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        print("  " + "  ".join(cells))
+
+
+def step_rows(telemetry: dict, compare: dict = None) -> list:
+    """Table rows (header first) for the run's steps and its total"""
+    rows = [["step"] + [header for _, header, _ in COLUMNS]]
+    other_steps = (compare or {}).get("steps", {})
+    entries = list(telemetry.get("steps", {}).items()) + [("total", telemetry)]
+    for name, entry in entries:
+        rows.append(
+            [step_label(name)]
+            + [format_metric(metric(entry, k, kind), kind) for k, _, kind in COLUMNS]
+        )
+        if compare is None:
+            continue
+        base = compare if name == "total" else other_steps.get(name)
+        if base is None:
+            rows.append(["  (new step)"] + [""] * len(COLUMNS))
+            continue
+        rows.append(
+            ["  was"] + [format_metric(metric(base, k, kind), kind) for k, _, kind in COLUMNS]
+        )
+    return rows
+
+
+def slowest_items(telemetry: dict, count: int) -> list:
+    """(seconds, step dir name, item ID, item entry) of the slowest items in the run"""
+    items = [
+        (entry.get("seconds", 0.0), step_name, item_id, entry)
+        for step_name, step in telemetry.get("steps", {}).items()
+        for item_id, entry in step.get("items", {}).items()
+    ]
+    items.sort(key=lambda item: item[0], reverse=True)
+    return items[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report where a pipeline version spent its time and tokens",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("pipeline_name", nargs="?", help="Pipeline name (as listed by list.py)")
+    parser.add_argument("version", nargs="?", help="Version to report (default: latest)")
+    parser.add_argument("--compare", metavar="VERSION", help="Compare with another version")
+    parser.add_argument(
+        "--items", type=int, default=5, help="Number of slowest items to show (default: 5)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Flag steps that grew by more than this fraction (default: 0.2)",
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Remove artifact store objects no version refers to any more",
+    )
+
+    args = parser.parse_args()
+    if args.pipeline_name is None and not args.gc:
+        parser.error("pipeline_name is required (unless --gc is given)")
+
+    # Add project root to path
+    project_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(project_root))
+    sys.path.insert(0, str(project_root / "core"))
+
+    from artifact_store import get_artifact_store
+    from path_manager import get_project_paths
+    from version_manager import get_latest_version
+
+    if args.gc:
+        removed = get_artifact_store().gc()
+        print(f"[GC] Removed {removed} unreferenced object(s) from outputs/.objects")
+        if args.pipeline_name is None:
+            return
+
+    pipeline_dir = get_project_paths()["outputs"] / args.pipeline_name
+    version = args.version or get_latest_version(pipeline_dir)
+    if version is None or not (pipeline_dir / version).exists():
+        print(f"Error: Version '{version}' of pipeline '{args.pipeline_name}' not found")
+        sys.exit(1)
+
+    telemetry = load_telemetry(pipeline_dir / version)
+    if not telemetry:
+        print(
+            f"Error: {args.pipeline_name}/{version} has no telemetry (run before it was recorded)"
+        )
+        sys.exit(1)
+
+    compare = None
+    if args.compare:
+        compare = load_telemetry(pipeline_dir / args.compare)
+        if not compare:
+            print(f"Error: {args.pipeline_name}/{args.compare} has no telemetry")
+            sys.exit(1)
+
+    print(f"\n{'=' * 70}")
+    print(f"PIPELINE: {args.pipeline_name} {version}")
+    if compare is not None:
+        print(f"Compared with: {args.compare}")
+    print(f"Duration: {format_duration(telemetry.get('seconds', 0.0))}")
+    print("Phase times are summed over concurrent items and can exceed wall time")
+    print(f"{'=' * 70}\n")
+
+    print_table(step_rows(telemetry, compare))
+
+    if compare is not None:
+        print("\nRegressions:")
+        flagged = False
+        other_steps = compare.get("steps", {})
+        for name, entry in list(telemetry.get("steps", {}).items()) + [("total", telemetry)]:
+            base = compare if name == "total" else other_steps.get(name)
+            if base is None:
+                continue
+            for header, before, after in regressions(base, entry, args.threshold):
+                kind = next(kind for _, h, kind in COLUMNS if h == header)
+                print(
+                    f"  [SLOWER] {step_label(name)}: {header} "
+                    f"{format_metric(before, kind)} -> {format_metric(after, kind)}"
+                )
+                flagged = True
+        if not flagged:
+            print(f"  None (no step grew by more than {args.threshold:.0%})")
+
+    items = slowest_items(telemetry, args.items)
+    if items:
+        print("\nSlowest items:")
+        for seconds, step_name, item_id, entry in items:
+            phases = ", ".join(
+                f"{name} {format_duration(value)}"
+                for name, value in sorted(
+                    entry.get("phases", {}).items(), key=lambda phase: phase[1], reverse=True
+                )
+                if value >= 0.05
+            )
+            print(
+                f"  {format_duration(seconds):>7}  {step_label(step_name)} / {item_id}"
+                f"  ({entry.get('requests', 0)} requests"
+                + (f", {entry['retries']} retries" if entry.get("retries") else "")
+                + (f"; {phases}" if phases else "")
+                + ")"
+            )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -37,9 +37,11 @@ load_dotenv()
 import json  # noqa: E402
 import re  # noqa: E402
 
+from core.artifact_store import get_artifact_store  # noqa: E402
 from core.path_manager import get_project_paths, get_step_directory  # noqa: E402
 from core.pipeline import (  # noqa: E402
     add_common_pipeline_args,
+    apply_no_cache_flag,
     apply_yes_flag,
     parse_batch_filter_arg,
     parse_step_ref_arg,
@@ -698,6 +700,7 @@ Examples:
     print(f"{'=' * 70}\n")
 
     apply_yes_flag(args)
+    apply_no_cache_flag(args)
 
     if not args.yes:
         response = input("Proceed with rerun? (y/n): ").strip().lower()
@@ -1162,8 +1165,8 @@ def run_template_rerun_pipeline(
         # Pre-seed steps 2+ from original base into the version dir so _load_from_base
         # can find unchanged items for those steps. Without this the batch_processor
         # has no collated file to read from and silently drops all unchanged items.
-        import shutil as _shutil
-
+        # Linked through the artifact store: cloned where the filesystem supports it.
+        _store = get_artifact_store()
         for _step_idx, _step in enumerate(steps, 1):
             if _step_idx == 1:
                 continue  # step 1 is already in p1_version (re-collated)
@@ -1171,9 +1174,9 @@ def run_template_rerun_pipeline(
             _base_src = get_step_directory(base_version_dir, _step_idx, _sname)
             _p1_dst = get_step_directory(p1_version_dir, _step_idx, _sname)
             if _base_src.exists() and not _p1_dst.exists():
-                _shutil.copytree(str(_base_src), str(_p1_dst), dirs_exist_ok=True)
+                _store.link_tree(_base_src, _p1_dst)
         if verbose:
-            print(f"  [STEP 1] Copied base steps 2+ into {p1_version} for steps 2+ reference")
+            print(f"  [STEP 1] Linked base steps 2+ into {p1_version} for steps 2+ reference")
 
         # Early exit if only step 1 was requested
         if end_at and end_at <= 1:
@@ -1,109 +1,99 @@
 """
 Module Runner - Runs warmup, lesson, exitcheck, and synthesis pipelines
-for a given module in parallel.
+for a given module in parallel, in one process.
+
+The pipelines share one process (doc cache, response cache, Claude rate limiter) and
+each step starts once the steps it reads have finished, including steps of another
+pipeline (see core/scheduler.py). Progress of all four is shown together; each
+pipeline's full log is in its version directory's console.txt.
 
 Usage:
     python cli/run_module.py --module 4 --unit 1
     python cli/run_module.py -m 4 -u 1
+    python cli/run_module.py -m 4 -u 1 --no-cache
+    python cli/run_module.py -m 4 -u 1 --stream
 """
 
 import argparse
 import subprocess
 import sys
-import threading
+import time
 from pathlib import Path
 
+from dotenv import load_dotenv
+
+load_dotenv()
+
 project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "core"))
+
+from core.pipeline import apply_no_cache_flag, apply_yes_flag  # noqa: E402
+from core.pipelines import PIPELINES  # noqa: E402
+from core.scheduler import DependencyError, PipelineRun, run_pipelines  # noqa: E402
 
-PIPELINES = [
+PIPELINES_TO_RUN = [
     ("warmup", "warmup_generator_dialogue_pass"),
     ("lesson", "lesson_generator_dialogue_pass"),
     ("exitcheck", "exitcheck_generator_dialogue_pass"),
     ("synthesis", "synthesis_generator_dialogue_pass"),
 ]
 
-_print_lock = threading.Lock()
-
-
-def prefixed_print(label, line):
-    with _print_lock:
-        print(f"[{label}] {line}", end="", flush=True)
-
-
-def run_one(label, pipeline_name, module, unit, results):
-    cmd = [
-        sys.executable,
-        str(project_root / "cli" / "run_pipeline.py"),
-        "-p",
-        pipeline_name,
-        "-m",
-        str(module),
-        "-u",
-        str(unit),
-        "-y",
-    ]
-
-    prefixed_print(label, f"Starting {pipeline_name}\n")
-
-    try:
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            cwd=str(project_root),
-        )
-
-        for line in proc.stdout:
-            prefixed_print(label, line)
-
-        proc.wait()
-        results[label] = proc.returncode == 0
-
-        status = "DONE" if proc.returncode == 0 else f"FAILED (exit {proc.returncode})"
-        prefixed_print(label, f"{status}\n")
-
-    except Exception as e:
-        prefixed_print(label, f"ERROR: {e}\n")
-        results[label] = False
-
 
 def main():
     parser = argparse.ArgumentParser(description="Run all pipeline types for a module in parallel")
     parser.add_argument("-m", "--module", type=int, required=True, help="Module number")
     parser.add_argument("-u", "--unit", type=int, default=1, help="Unit number (default: 1)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Claude; ignore cached responses for byte-identical prompts",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pass each section on to the next per-item step as soon as it is done",
+    )
     args = parser.parse_args()
 
-    labels = [label for label, _ in PIPELINES]
+    # Pipelines run unattended (same as run_pipeline.py -y)
+    args.yes = True
+    apply_yes_flag(args)
+    apply_no_cache_flag(args)
+
+    labels = [label for label, _ in PIPELINES_TO_RUN]
     print(f"\nModule Runner: unit {args.unit}, module {args.module}")
     print(f"Running in parallel: {', '.join(labels)}")
     print("=" * 60 + "\n")
 
-    results = {}
-    threads = [
-        threading.Thread(
-            target=run_one,
-            args=(label, pipeline_name, args.module, args.unit, results),
-            daemon=True,
-        )
-        for label, pipeline_name in PIPELINES
+    runs = [
+        PipelineRun(label, pipeline_name, list(PIPELINES[pipeline_name]))
+        for label, pipeline_name in PIPELINES_TO_RUN
     ]
-
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    start = time.monotonic()
+    try:
+        results = run_pipelines(
+            runs,
+            module_number=args.module,
+            unit_number=args.unit,
+            stream=args.stream,
+        )
+    except DependencyError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
 
     print("\n" + "=" * 60)
-    print(f"MODULE {args.module} COMPLETE")
+    print(f"MODULE {args.module} COMPLETE in {time.monotonic() - start:.1f}s")
     print("=" * 60)
-    for label in labels:
-        ok = results.get(label, False)
-        print(f"  {label:12s}  {'OK' if ok else 'FAILED'}")
-
-    all_ok = all(results.get(label, False) for label in labels)
+    for result in results:
+        status = "OK" if result.ok else "FAILED"
+        print(
+            f"  {result.label:12s}  {status:6s}  {result.seconds:7.1f}s  {result.output_dir or ''}"
+        )
+        if not result.ok:
+            print(f"  {'':12s}  {result.error}")
 
-    if all_ok:
+    if all(result.ok for result in results):
         print("\n" + "=" * 60)
         print("STITCHING TRACKED SCRIPTS (replace)")
         print("=" * 60)
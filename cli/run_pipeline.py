@@ -14,16 +14,22 @@ Options:
     --end-at <step>               Stop after this step (number or name)
     --batch-ids <ids>             Only run these batch IDs (comma-separated)
     --skip-batch-ids <ids>        Skip these batch IDs (comma-separated)
+    --incremental                 Reuse the latest version's outputs for unchanged steps/items
+    --stream                      Pass each item to the next per-item step as soon as it is done
+    --debug                       Also log per-item diagnostics (variable previews, tracebacks)
     -y, --yes                     Skip all confirmation prompts
     --note <text>                 Note about this run
     --status <label>              Pipeline status (alpha/beta/rc/final)
     --test-push                   Push to a temporary Notion page (registry not updated)
+    --no-cache                    Ignore cached Claude responses for identical prompts
     -h, --help                    Show this help message
 
 Examples:
     python cli/run_pipeline.py -p 1 -m 5 --path a -i
     python cli/run_pipeline.py --pipeline "GODOT Formatter" --module 3
     python cli/run_pipeline.py -p 2
+    python cli/run_pipeline.py -p 1 -m 5 --incremental
+    python cli/run_pipeline.py -p lesson_generator_dialogue_pass -u 1 -m 4 -y --stream
 
 Note: Pipelines are centralized in ui/saved_pipelines.json.
       Edit pipelines through the UI or directly in the JSON file.
@@ -44,6 +50,7 @@ sys.path.insert(0, str(project_root / "core"))
 
 from core.pipeline import (  # noqa: E402
     add_common_pipeline_args,
+    apply_no_cache_flag,
     apply_yes_flag,
     parse_batch_filter_arg,
     parse_step_ref_arg,
@@ -52,6 +59,7 @@ from core.pipeline import (  # noqa: E402
     resolve_pipeline_name,
 )
 from core.pipelines import PIPELINES, run_pipeline_from_config  # noqa: E402
+from core.run_log import DEBUG  # noqa: E402
 
 # =============================================================================
 # MAIN
@@ -66,6 +74,8 @@ Examples:
   python cli/run_pipeline.py -p 1 -m 5 --path a -i
   python cli/run_pipeline.py --pipeline "GODOT Formatter" --module 3
   python cli/run_pipeline.py -p 2
+  python cli/run_pipeline.py -p 1 -m 5 --incremental
+  python cli/run_pipeline.py -p lesson_generator_dialogue_pass -u 1 -m 4 -y --stream
         """,
     )
 
@@ -80,6 +90,22 @@ Examples:
         type=str,
         help='Skip these batch IDs (comma-separated, e.g. "2,4")',
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rerun steps and batch items whose inputs changed since the latest version",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pass each section on to the next per-item step as soon as it is done, "
+        "instead of after the whole step",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Also log per-item diagnostics (variable previews, tracebacks)",
+    )
     parser.add_argument(
         "--test-push",
         action="store_true",
@@ -89,6 +115,7 @@ Examples:
     args = parser.parse_args()
 
     apply_yes_flag(args)
+    apply_no_cache_flag(args)
 
     print("Pipeline Runner")
     print("=" * 70)
@@ -125,6 +152,10 @@ Examples:
         if batch_skip_items:
             print(f"Batch filter (skip): {', '.join(batch_skip_items)}")
         print(f"Interactive mode: {'enabled' if args.interactive else 'disabled'}")
+        if args.incremental:
+            print("Incremental: reusing unchanged steps and items from the latest version")
+        if args.stream:
+            print("Streaming: items move on to the next per-item step as they complete")
 
         start_at = parse_step_ref_arg(args.start_from)
         end_at = parse_step_ref_arg(args.end_at)
@@ -146,11 +177,13 @@ Examples:
             unit_number=args.unit,
             module_number=args.module,
             path_letter=args.path,
-            verbose=True,
+            verbose=DEBUG if args.debug else True,
             interactive=args.interactive,
             rerun_items=batch_only_items,
             start_from_step=start_at,
             end_at_step=end_at,
+            incremental=args.incremental,
+            stream=args.stream,
         )
 
         print("\n" + "=" * 70)
@@ -0,0 +1,265 @@
+"""Content-addressed store for pipeline version outputs
+
+Partial reruns (start_from_step, template reruns) used to copytree every skipped step
+directory from the base version, so each version held a full copy of outputs that were
+mostly identical to the version before it. The store keeps each distinct file once, under
+the SHA-256 of its contents:
+
+    outputs/.objects/{digest[:2]}/{digest}
+
+and a version's inherited step directories are copy-on-write clones of those objects
+(reflinks: the clone shares the object's blocks until either is written). Clones are
+ordinary, private files, so every existing reader and writer (pipeline steps, rerun,
+push_to_notion, notion pulls, fixes/ scripts) can read them and rewrite them in place
+without reaching another version. Each version directory records what it linked in
+manifest.json:
+
+    {"step_01_problem_generator": {"problem_generator.json": "<digest>", "items/3001.json": ...}}
+
+A clone keeps its object's size and modification time, which lets the next link skip
+re-hashing a file that was not rewritten since. gc() removes objects no manifest refers
+to any more (python cli/report.py --gc).
+
+Whether the filesystem can clone is checked once per store. Where it cannot (ext4,
+NTFS, and APFS, which has no FICLONE), objects would only add a copy to every version's
+own, so link_tree() falls back to a plain copytree and writes no objects or manifests.
+
+    store = get_artifact_store()
+    store.link_tree(base_step_dir, new_step_dir)
+    unshare_tree(step_dir)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MANIFEST_FILENAME = "manifest.json"
+
+# ioctl that makes a file a copy-on-write clone of another (Linux btrfs/XFS)
+FICLONE = 0x40049409
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> "ArtifactStore":
+    """Return the store under the project's outputs directory"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            from path_manager import get_project_paths
+
+            _default_store = ArtifactStore(get_project_paths()["outputs"] / ".objects")
+        return _default_store
+
+
+def _file_digest(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _clone(src: Path, dst: Path) -> None:
+    """Atomically make dst a private copy of src (a reflink where the filesystem can)
+
+    dst gets src's modification time, but not its permissions.
+    """
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.clone")
+    try:
+        with open(src, "rb") as fsrc, open(tmp_path, "wb") as fdst:
+            try:
+                if fcntl is None:
+                    raise OSError("reflinks need fcntl")
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except OSError:
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+        stat = os.stat(src)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, dst)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _probe_reflinks(directory: Path) -> bool:
+    """Whether files in directory can be cloned with FICLONE"""
+    if fcntl is None:
+        return False
+    src = directory / f".reflink.{os.getpid()}.{threading.get_ident()}"
+    dst = src.with_name(src.name + ".clone")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        src.write_bytes(b"reflink probe")
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
+    finally:
+        src.unlink(missing_ok=True)
+        dst.unlink(missing_ok=True)
+
+
+def _load_manifest(version_dir: Path) -> Dict[str, Dict[str, str]]:
+    manifest_path = version_dir / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def _save_manifest(version_dir: Path, manifest: Dict[str, Dict[str, str]]) -> None:
+    manifest_path = version_dir / MANIFEST_FILENAME
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+class ArtifactStore:
+    """Copy-on-write object store keyed on file content"""
+
+    def __init__(self, objects_dir, reflinks: Optional[bool] = None):
+        """
+        Args:
+            objects_dir: Directory holding the objects (outputs/.objects)
+            reflinks: Whether files can be cloned (default: probed on first link)
+        """
+        self.objects_dir = Path(objects_dir)
+        self._reflinks = reflinks
+        self._lock = threading.Lock()
+
+    def supports_reflinks(self) -> bool:
+        """Whether the filesystem holding the store can clone files (checked once)"""
+        with self._lock:
+            if self._reflinks is None:
+                self._reflinks = _probe_reflinks(self.objects_dir.parent)
+            return self._reflinks
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def put(self, path: Path, digest: Optional[str] = None) -> str:
+        """Store path's contents (path itself is left as it is)
+
+        Args:
+            path: File to store
+            digest: Digest recorded for path earlier; trusted only while path still has
+                    the stored object's size and modification time
+
+        Returns:
+            The content digest
+        """
+        path = Path(path)
+        if digest is not None and self._is_clone(path, digest):
+            return digest
+        digest = _file_digest(path)
+        obj = self.object_path(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            _clone(path, obj)
+        return digest
+
+    def _is_clone(self, path: Path, digest: str) -> bool:
+        """Whether path is an unmodified clone of the object (same size and mtime)"""
+        try:
+            stat, obj_stat = os.stat(path), os.stat(self.object_path(digest))
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (obj_stat.st_size, obj_stat.st_mtime_ns)
+
+    def link_tree(self, src_dir: Path, dst_dir: Path) -> Dict[str, str]:
+        """Populate dst_dir with clones of the contents of step directory src_dir
+
+        Replaces shutil.copytree(src_dir, dst_dir, dirs_exist_ok=True). Both directories'
+        version manifests are updated. Without reflinks this is that copytree.
+
+        Returns:
+            {relative path: digest} of the linked files ({} when copied)
+        """
+        src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+        if not self.supports_reflinks():
+            shutil.copytree(src_dir, dst_dir, dirs_exist_ok=True)
+            return {}
+        src_manifest = _load_manifest(src_dir.parent)
+        known = src_manifest.get(src_dir.name, {})
+        linked = {}
+        for src in sorted(src_dir.rglob("*")):
+            if not src.is_file():
+                continue
+            rel = src.relative_to(src_dir).as_posix()
+            dst = dst_dir / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                digest = self.put(src, known.get(rel))
+                _clone(self.object_path(digest), dst)
+            except OSError:
+                # Store not writable here: fall back to a plain copy
+                shutil.copy2(src, dst)
+                continue
+            linked[rel] = digest
+        dst_dir.mkdir(parents=True, exist_ok=True)
+
+        if linked:
+            src_manifest[src_dir.name] = {**known, **linked}
+            _save_manifest(src_dir.parent, src_manifest)
+            dst_manifest = _load_manifest(dst_dir.parent)
+            dst_manifest[dst_dir.name] = {**dst_manifest.get(dst_dir.name, {}), **linked}
+            _save_manifest(dst_dir.parent, dst_manifest)
+        return linked
+
+    def gc(self) -> int:
+        """Remove objects no version manifest under the outputs directory refers to
+
+        Returns:
+            Number of objects removed
+        """
+        removed = 0
+        if not self.objects_dir.exists():
+            return removed
+        referenced = set()
+        for manifest_path in self.objects_dir.parent.rglob(MANIFEST_FILENAME):
+            for files in _load_manifest(manifest_path.parent).values():
+                referenced.update(files.values())
+        for obj in self.objects_dir.glob("*/*"):
+            if obj.is_file() and obj.name not in referenced:
+                obj.unlink()
+                removed += 1
+        return removed
+
+
+def unshare_tree(directory: Path) -> int:
+    """Prepare step directory for rewriting: drop its manifest entry
+
+    Also gives files hardlinked by an older store (which shared one inode across
+    versions) their own copies.
+
+    Returns:
+        Number of files unshared
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return 0
+    unshared = 0
+    for path in directory.rglob("*"):
+        if path.is_file() and path.stat().st_nlink > 1:
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.copy")
+            shutil.copy2(path, tmp_path)
+            os.replace(tmp_path, path)
+            unshared += 1
+    manifest = _load_manifest(directory.parent)
+    if manifest.pop(directory.name, None) is not None:
+        _save_manifest(directory.parent, manifest)
+    return unshared
@@ -79,6 +79,10 @@ class BatchProcessor:
         self.processed_count = 0
         self.skipped_count = 0
 
+        # Per-item validation failures (filled in by run_pipeline, sorted by item_index)
+        self._validation_errors = []
+        self._content_validation_errors = []
+
         # Cache for base collated items (avoid reloading file multiple times)
         self._base_collated_cache = None
 
@@ -92,61 +96,113 @@ class BatchProcessor:
         Returns:
             Tuple of (should_skip, skip_reason)
         """
-        # Get item ID (handles nested IDs like metadata.problem_id)
-        if self.batch_id_field:
-            base_id = self._get_item_id(item, self.batch_id_field)
-            if not base_id:  # If no ID found, fall back to index
-                base_id = str(item_idx)
-                item_id = base_id
-            else:
-                # For multi-step items, append step_id to create unique file names
-                if isinstance(item, dict) and "step_id" in item:
-                    item_id = f"{base_id}_{item['step_id']}"
-                else:
-                    item_id = base_id
-        else:
-            base_id = str(item_idx)
-            item_id = base_id
+        skip_reason = self.get_skip_reason(item, item_idx)
+        if not skip_reason:
+            return False, ""
+        return True, self.apply_skip(item, item_idx, skip_reason)
+
+    def get_skip_reason(self, item: Dict, item_idx: int) -> str:
+        """Decide whether an item should be skipped, without touching collated results
+
+        Used by concurrent batch execution to pick the items to dispatch up front;
+        the side effects are applied later, in input order, via apply_skip().
+
+        Args:
+            item: Item data
+            item_idx: Item index (1-indexed)
+
+        Returns:
+            Skip reason, or empty string if the item should be processed
+        """
+        base_id, item_id = self._get_item_ids(item, item_idx)
 
         # Check only_items filter
         # Support both exact matches (e.g., "75_1") and base ID matches (e.g., "75" matches "75_1" and "75_2")
         if self.batch_only_items:
             is_included = item_id in self.batch_only_items or base_id in self.batch_only_items
             if not is_included:
-                # If base_version_dir provided, copy from base instead of skipping
-                if self.base_version_dir:
-                    copied_item = self._load_from_base(item, item_id, base_id)
-                    if copied_item:
-                        self.add_result(copied_item, preserve_id=True)
-                        return True, "copied from base"
-                    else:
-                        # Base item not found (e.g. it was excluded from the base version).
-                        # Advance sequential counter so fresh items downstream get correct IDs.
-                        if self.batch_output_id_field:
-                            self.sequential_id += 1
-                return True, "not in only_items"
+                return "not in only_items"
 
         # Check skip_items filter
         # Support both exact matches and base ID matches
         if self.batch_skip_items:
             is_skipped = item_id in self.batch_skip_items or base_id in self.batch_skip_items
             if is_skipped:
-                return True, "in skip_items"
+                return "in skip_items"
 
         # Check if already exists
         if self.batch_skip_existing and self.items_dir:
             item_output_file = self.items_dir / f"{item_id}.json"
             if item_output_file.exists():
-                # Load existing result for collation
-                try:
-                    with open(item_output_file, "r", encoding="utf-8") as f:
-                        existing_result = json.load(f)
-                        self.collated_results.append(existing_result)
-                except Exception:
-                    pass  # Ignore load errors for existing files
-                return True, "already exists"
+                return "already exists"
+
+        return ""
+
+    def apply_skip(self, item: Dict, item_idx: int, skip_reason: str) -> str:
+        """Apply the collation side effects of skipping an item
+
+        Args:
+            item: Item data
+            item_idx: Item index (1-indexed)
+            skip_reason: Reason returned by get_skip_reason()
+
+        Returns:
+            Final skip reason ("copied from base" when the item was restored from the base version)
+        """
+        base_id, item_id = self._get_item_ids(item, item_idx)
+
+        if skip_reason == "not in only_items":
+            # If base_version_dir provided, copy from base instead of skipping
+            if self.base_version_dir:
+                copied_item = self._load_from_base(item, item_id, base_id)
+                if copied_item:
+                    self.add_result(copied_item, preserve_id=True)
+                    return "copied from base"
+                else:
+                    # Base item not found (e.g. it was excluded from the base version).
+                    # Advance sequential counter so fresh items downstream get correct IDs.
+                    if self.batch_output_id_field:
+                        self.sequential_id += 1
+
+        elif skip_reason == "already exists":
+            # Load existing result for collation
+            item_output_file = self.items_dir / f"{item_id}.json"
+            try:
+                with open(item_output_file, "r", encoding="utf-8") as f:
+                    existing_result = json.load(f)
+                    self.collated_results.append(existing_result)
+            except Exception:
+                pass  # Ignore load errors for existing files
+
+        return skip_reason
+
+    def _get_item_ids(self, item: Dict, item_idx: int) -> tuple[str, str]:
+        """Get (base_id, item_id) for an item, falling back to its index
+
+        Args:
+            item: Item data
+            item_idx: Item index (1-indexed)
+
+        Returns:
+            Tuple of (base_id, item_id); item_id carries a step_id suffix for multi-step items
+        """
+        # Get item ID (handles nested IDs like metadata.problem_id)
+        if self.batch_id_field:
+            base_id = self._get_item_id(item, self.batch_id_field)
+            if not base_id:  # If no ID found, fall back to index
+                base_id = str(item_idx)
+                item_id = base_id
+            else:
+                # For multi-step items, append step_id to create unique file names
+                if isinstance(item, dict) and "step_id" in item:
+                    item_id = f"{base_id}_{item['step_id']}"
+                else:
+                    item_id = base_id
+        else:
+            base_id = str(item_idx)
+            item_id = base_id
 
-        return False, ""
+        return base_id, item_id
 
     def add_result(self, result: Any, preserve_id: bool = False):
         """Add a result to collated results with sequential ID assignment
@@ -1,26 +1,121 @@
-"""Simple Claude API wrapper with prompt caching support and logging"""
+"""Simple Claude API wrapper with prompt caching support and logging
 
+Provides both a synchronous API (generate, generate_with_tools) and a native asyncio
+API (agenerate, agenerate_with_tools). All ClaudeClient instances in a process share
+one underlying Anthropic client per API key, so constructing a ClaudeClient per call
+is cheap and HTTP connections are reused across calls.
+"""
+
+import asyncio
+import inspect
+import itertools
 import json
 import os
+import sys
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 
 import anthropic
 from dotenv import load_dotenv
 
+# Sibling core modules are imported flat (also when loaded as core.claude_client)
+core_dir = Path(__file__).parent
+if str(core_dir) not in sys.path:
+    sys.path.insert(0, str(core_dir))
+
+from rate_limiter import (  # noqa: E402
+    MAX_ATTEMPTS,
+    estimate_input_tokens,
+    get_rate_limiter,
+    is_rate_limit_error,
+    retry_delay,
+)
+from response_cache import ResponseCache, get_response_cache, response_cache_enabled  # noqa: E402
+from telemetry import phase, record, record_usage  # noqa: E402
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Process-wide Anthropic clients, keyed by API key (see _get_shared_client)
+_client_lock = threading.Lock()
+_shared_clients = {}
+# Async clients per event loop: {loop: {api_key: client}}
+_shared_async_clients = weakref.WeakKeyDictionary()
+
+
+def _get_shared_client(api_key: str) -> anthropic.Anthropic:
+    """Return the process-wide sync Anthropic client for api_key (reuses its connection pool)."""
+    with _client_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            # Retries are owned by the shared rate limiter (see _create / _stream)
+            client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+            _shared_clients[api_key] = client
+        return client
+
+
+def _get_shared_async_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """Return the shared AsyncAnthropic client for api_key on the running event loop.
+
+    httpx connection pools are bound to the loop that created them, so each loop gets
+    its own client; loops running at the same time on different threads (run_page_jobs
+    workers each calling asyncio.run()) keep reusing theirs instead of replacing each
+    other's. Clients of loops that have since closed are dropped.
+    """
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        # A client's connections refer to its loop: drop it, or the loop is never freed
+        for closed_loop in [other for other in _shared_async_clients if other.is_closed()]:
+            del _shared_async_clients[closed_loop]
+        clients = _shared_async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+            clients[api_key] = client
+        return client
+
+
+# Token usage summed over every ClaudeClient in the process (see get_usage_totals)
+_usage_lock = threading.Lock()
+_usage_totals = {
+    "requests": 0,
+    "input_tokens": 0,
+    "output_tokens": 0,
+    "cache_creation_tokens": 0,
+    "cache_read_tokens": 0,
+}
+
+
+def get_usage_totals() -> dict:
+    """Snapshot of the process-wide token usage across all ClaudeClient instances.
+
+    Pipelines create a client per item, so per-step prompt cache ratios are the
+    difference between snapshots taken before and after the step.
+    """
+    with _usage_lock:
+        return dict(_usage_totals)
+
 
 class ClaudeClient:
     """Basic wrapper around Anthropic API with caching support"""
 
-    def __init__(self, api_key=None, log_file=None):
+    def __init__(self, api_key=None, log_file=None, cache=False):
+        """
+        Args:
+            api_key: Anthropic API key (default: ANTHROPIC_API_KEY)
+            log_file: JSONL usage log path (default: logs/claude_usage.jsonl)
+            cache: Serve repeated identical requests from the on-disk response cache.
+                   True uses the shared cache, or pass a ResponseCache. Ignored when
+                   caching is disabled for the run (--no-cache).
+        """
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("API key required!")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = _get_shared_client(self.api_key)
         self.model = "claude-sonnet-4-5-20250929"
 
         # Track usage
@@ -42,6 +137,20 @@ class ClaudeClient:
 
         self.request_count = 0
 
+        # Response cache (generate/agenerate only; tool calls have side effects)
+        if not response_cache_enabled() or not cache:
+            self.cache = None
+        elif cache is True:
+            self.cache = get_response_cache()
+        else:
+            self.cache = cache
+        self.response_cache_hits = 0
+
+    @property
+    def async_client(self) -> anthropic.AsyncAnthropic:
+        """Shared AsyncAnthropic client for the running event loop (async methods only)"""
+        return _get_shared_async_client(self.api_key)
+
     def generate_with_tools(
         self,
         system=None,
@@ -75,30 +184,14 @@ class ClaudeClient:
             Generated text response (with prefill prepended if used)
         """
         final_model = model if model else self.model
-
-        # Build base API params (no prefill for tool turn)
-        def _base_params(messages):
-            params = {
-                "model": final_model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": messages,
-            }
-            if system:
-                params["system"] = (
-                    self._strip_metadata(system) if isinstance(system, list) else system
-                )
-            if stop_sequences:
-                params["stop_sequences"] = stop_sequences
-            if tools:
-                params["tools"] = tools
-            return params
-
         messages = [{"role": "user", "content": user_message}]
 
         # Tool loop: keep going until Claude stops making tool calls
         while True:
-            response = self.client.messages.create(**_base_params(messages))
+            params = self._build_params(
+                system, messages, max_tokens, temperature, stop_sequences, final_model, tools
+            )
+            response = self._create(params)
             self._track_usage(response.usage)
             self._log_request(response.usage, max_tokens, temperature, final_model)
 
@@ -128,20 +221,17 @@ class ClaudeClient:
         if prefill:
             messages.append({"role": "assistant", "content": prefill})
 
-        final_params = _base_params(messages)
-        final_params.pop("tools", None)
+        final_params = self._build_params(
+            system, messages, max_tokens, temperature, stop_sequences, final_model
+        )
 
         if max_tokens > 10000:
-            full_response = ""
-            with self.client.messages.stream(**final_params) as stream:
-                for text in stream.text_stream:
-                    full_response += text
-                final_message = stream.get_final_message()
-                self._track_usage(final_message.usage)
-                self._log_request(final_message.usage, max_tokens, temperature, final_model)
+            full_response, final_message = self._stream(final_params)
+            self._track_usage(final_message.usage)
+            self._log_request(final_message.usage, max_tokens, temperature, final_model)
             return (prefill or "") + full_response
         else:
-            final_message = self.client.messages.create(**final_params)
+            final_message = self._create(final_params)
             self._track_usage(final_message.usage)
             self._log_request(final_message.usage, max_tokens, temperature, final_model)
             return (prefill or "") + final_message.content[0].text
@@ -178,18 +268,338 @@ class ClaudeClient:
             system = None
             user_message = prompt
 
-        # Build messages
+        # Use provided model, fallback to instance default, ensure it's not empty
+        final_model = model if model else self.model
+        api_params = self._build_params(
+            system,
+            self._build_messages(user_message, prefill),
+            max_tokens,
+            temperature,
+            stop_sequences,
+            final_model,
+        )
+
+        cache_key, cached = self._cache_lookup(api_params)
+        if cached is not None:
+            return (prefill or "") + cached
+
+        # Use streaming for large outputs (>10K tokens) to avoid timeouts
+        try:
+            if max_tokens > 10000:
+                response_text, final_message = self._stream(api_params)
+
+                # Final message carries the usage stats
+                self._track_usage(final_message.usage)
+                self._log_request(final_message.usage, max_tokens, temperature, final_model)
+            else:
+                # Standard non-streaming for smaller outputs
+                message = self._create(api_params)
+
+                # Track tokens
+                self._track_usage(message.usage)
+                self._log_request(message.usage, max_tokens, temperature, final_model)
+
+                response_text = self._message_text(message)
+        except anthropic.BadRequestError as e:
+            self._reraise_bad_request(e)
+
+        self._cache_store(cache_key, response_text, final_model)
+
+        # Prepend prefill to response if it was used
+        return (prefill or "") + response_text
+
+    def generate_conversation(
+        self,
+        messages: list,
+        system=None,
+        max_tokens: int = 1000,
+        temperature: float = 1.0,
+        model: str = None,
+    ) -> str:
+        """Generate the next assistant turn for an existing multi-turn conversation
+
+        Used for validation retries, where the error feedback is appended to the
+        original exchange. Goes through the same rate limiting and retries as generate().
+
+        Args:
+            messages: Full message list, ending with a user turn
+            system: Optional system blocks or string
+            max_tokens: Maximum tokens to generate
+            temperature: Temperature for generation
+            model: Claude model to use. If None, uses self.model
+
+        Returns:
+            Generated text response
+        """
+        final_model = model if model else self.model
+        api_params = self._build_params(
+            system, messages, max_tokens, temperature, None, final_model
+        )
+
+        if max_tokens > 10000:
+            response_text, message = self._stream(api_params)
+        else:
+            message = self._create(api_params)
+            response_text = self._message_text(message)
+
+        self._track_usage(message.usage)
+        self._log_request(message.usage, max_tokens, temperature, final_model)
+        return response_text
+
+    async def agenerate_with_tools(
+        self,
+        system=None,
+        user_message: str = "",
+        tools: list = None,
+        tool_executor=None,
+        max_tokens: int = 1000,
+        temperature: float = 1.0,
+        prefill: str = None,
+        stop_sequences=None,
+        model: str = None,
+    ) -> str:
+        """Async version of generate_with_tools().
+
+        tool_executor may be a plain callable or a coroutine function.
+        """
+        final_model = model if model else self.model
         messages = [{"role": "user", "content": user_message}]
 
-        # Add prefill if provided
+        while True:
+            params = self._build_params(
+                system, messages, max_tokens, temperature, stop_sequences, final_model, tools
+            )
+            response = await self._acreate(params)
+            self._track_usage(response.usage)
+            self._log_request(response.usage, max_tokens, temperature, final_model)
+
+            tool_results = []
+            for block in response.content:
+                if block.type == "tool_use" and tool_executor:
+                    result = tool_executor(block.name, block.input)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    tool_results.append(
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": block.id,
+                            "content": result,
+                        }
+                    )
+
+            if not tool_results:
+                break
+
+            messages.append({"role": "assistant", "content": response.content})
+            messages.append({"role": "user", "content": tool_results})
+
+        messages.append({"role": "assistant", "content": response.content})
         if prefill:
             messages.append({"role": "assistant", "content": prefill})
 
-        # Build API parameters
-        # Use provided model, fallback to instance default, ensure it's not empty
+        final_params = self._build_params(
+            system, messages, max_tokens, temperature, stop_sequences, final_model
+        )
+        if max_tokens > 10000:
+            text, final_message = await self._astream(final_params)
+            self._track_usage(final_message.usage)
+            self._log_request(final_message.usage, max_tokens, temperature, final_model)
+            return (prefill or "") + text
+        final_message = await self._acreate(final_params)
+        self._track_usage(final_message.usage)
+        self._log_request(final_message.usage, max_tokens, temperature, final_model)
+        return (prefill or "") + final_message.content[0].text
+
+    async def agenerate(
+        self,
+        system=None,
+        user_message: str = "",
+        max_tokens: int = 1000,
+        temperature: float = 1.0,
+        prefill: str = None,
+        stop_sequences=None,
+        model: str = None,
+    ) -> str:
+        """Async version of generate().
+
+        Uses the shared AsyncAnthropic client, so many calls can be awaited concurrently
+        from one event loop (e.g. with asyncio.gather) over a single connection pool.
+        """
         final_model = model if model else self.model
+        api_params = self._build_params(
+            system,
+            self._build_messages(user_message, prefill),
+            max_tokens,
+            temperature,
+            stop_sequences,
+            final_model,
+        )
+
+        cache_key, cached = self._cache_lookup(api_params)
+        if cached is not None:
+            return (prefill or "") + cached
+
+        try:
+            if max_tokens > 10000:
+                response_text, final_message = await self._astream(api_params)
+                self._track_usage(final_message.usage)
+                self._log_request(final_message.usage, max_tokens, temperature, final_model)
+            else:
+                message = await self._acreate(api_params)
+                self._track_usage(message.usage)
+                self._log_request(message.usage, max_tokens, temperature, final_model)
+                response_text = self._message_text(message)
+        except anthropic.BadRequestError as e:
+            self._reraise_bad_request(e)
+
+        self._cache_store(cache_key, response_text, final_model)
+        return (prefill or "") + response_text
+
+    def _cache_lookup(self, api_params: dict):
+        """Return (cache_key, cached_text); both None when caching is off for this client"""
+        if self.cache is None:
+            return None, None
+        cache_key = ResponseCache.make_key(api_params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.response_cache_hits += 1
+            record(response_cache_hits=1)
+        return cache_key, cached
+
+    def _cache_store(self, cache_key, response_text: str, model: str) -> None:
+        if cache_key is not None:
+            try:
+                self.cache.put(cache_key, response_text, model=model)
+            except OSError as e:
+                print(f"  [CACHE] Could not store response: {e}")
+
+    def _create(self, api_params: dict):
+        """messages.create() through the shared rate limiter, retrying transient failures"""
+        limiter = get_rate_limiter(api_params["model"])
+        estimate = estimate_input_tokens(api_params)
+        for attempt in itertools.count():
+            with phase("rate_limit_wait"):
+                limiter.acquire(estimate)
+            try:
+                with phase("api"):
+                    raw = self.client.messages.with_raw_response.create(**api_params)
+                    message = raw.parse()
+            except Exception as e:
+                delay = self._retry_delay(limiter, estimate, e, attempt)
+                if delay is None:
+                    raise
+                with phase("retry_wait"):
+                    time.sleep(delay)
+                continue
+            limiter.record(message.usage, estimate, raw.headers)
+            return message
+
+    def _stream(self, api_params: dict):
+        """Streamed request through the shared rate limiter; returns (text, final_message)"""
+        limiter = get_rate_limiter(api_params["model"])
+        estimate = estimate_input_tokens(api_params)
+        for attempt in itertools.count():
+            with phase("rate_limit_wait"):
+                limiter.acquire(estimate)
+            try:
+                full_response = ""
+                with phase("api"), self.client.messages.stream(**api_params) as stream:
+                    for text in stream.text_stream:
+                        full_response += text
+                    final_message = stream.get_final_message()
+                    headers = stream.response.headers
+            except Exception as e:
+                delay = self._retry_delay(limiter, estimate, e, attempt)
+                if delay is None:
+                    raise
+                with phase("retry_wait"):
+                    time.sleep(delay)
+                continue
+            limiter.record(final_message.usage, estimate, headers)
+            return full_response, final_message
+
+    async def _acreate(self, api_params: dict):
+        """Async version of _create()"""
+        limiter = get_rate_limiter(api_params["model"])
+        estimate = estimate_input_tokens(api_params)
+        for attempt in itertools.count():
+            with phase("rate_limit_wait"):
+                await limiter.aacquire(estimate)
+            try:
+                with phase("api"):
+                    raw = await self.async_client.messages.with_raw_response.create(**api_params)
+                    message = raw.parse()
+            except Exception as e:
+                delay = self._retry_delay(limiter, estimate, e, attempt)
+                if delay is None:
+                    raise
+                with phase("retry_wait"):
+                    await asyncio.sleep(delay)
+                continue
+            limiter.record(message.usage, estimate, raw.headers)
+            return message
+
+    async def _astream(self, api_params: dict):
+        """Async version of _stream()"""
+        limiter = get_rate_limiter(api_params["model"])
+        estimate = estimate_input_tokens(api_params)
+        for attempt in itertools.count():
+            with phase("rate_limit_wait"):
+                await limiter.aacquire(estimate)
+            try:
+                full_response = ""
+                with phase("api"):
+                    async with self.async_client.messages.stream(**api_params) as stream:
+                        async for text in stream.text_stream:
+                            full_response += text
+                        final_message = await stream.get_final_message()
+                        headers = stream.response.headers
+            except Exception as e:
+                delay = self._retry_delay(limiter, estimate, e, attempt)
+                if delay is None:
+                    raise
+                with phase("retry_wait"):
+                    await asyncio.sleep(delay)
+                continue
+            limiter.record(final_message.usage, estimate, headers)
+            return full_response, final_message
+
+    def _retry_delay(self, limiter, estimate: int, error: Exception, attempt: int):
+        """Release a failed request's reservation and decide whether/when to retry it"""
+        response = getattr(error, "response", None)
+        limiter.record(None, estimate, getattr(response, "headers", None))
+        delay = retry_delay(error, attempt)
+        if delay is None:
+            return None
+        if is_rate_limit_error(error):
+            limiter.backoff(delay)
+        record(retries=1)
+        print(
+            f"  [RETRY] {type(error).__name__} from {limiter.model}; "
+            f"retrying in {delay:.1f}s (attempt {attempt + 2}/{MAX_ATTEMPTS})"
+        )
+        return delay
+
+    def _build_messages(self, user_message: str, prefill: str = None) -> list:
+        """Build the messages list for a single-turn request (with optional prefill)"""
+        messages = [{"role": "user", "content": user_message}]
+        if prefill:
+            messages.append({"role": "assistant", "content": prefill})
+        return messages
+
+    def _build_params(
+        self,
+        system,
+        messages,
+        max_tokens,
+        temperature,
+        stop_sequences,
+        model,
+        tools=None,
+    ) -> dict:
+        """Build messages.create() keyword arguments shared by the sync and async paths"""
         api_params = {
-            "model": final_model,
+            "model": model,
             "max_tokens": max_tokens,
             "temperature": temperature,
             "messages": messages,
@@ -204,63 +614,44 @@ class ClaudeClient:
             else:
                 api_params["system"] = system
 
-        # Add stop_sequences if provided
         if stop_sequences:
             api_params["stop_sequences"] = stop_sequences
-
-        # Use streaming for large outputs (>10K tokens) to avoid timeouts
-        try:
-            if max_tokens > 10000:
-                full_response = ""
-                with self.client.messages.stream(**api_params) as stream:
-                    for text in stream.text_stream:
-                        full_response += text
-
-                    # Get final message for usage stats
-                    final_message = stream.get_final_message()
-                    self._track_usage(final_message.usage)
-                    self._log_request(final_message.usage, max_tokens, temperature, final_model)
-
-                # Prepend prefill to response if it was used
-                if prefill:
-                    return prefill + full_response
-                return full_response
-            else:
-                # Standard non-streaming for smaller outputs
-                message = self.client.messages.create(**api_params)
-
-                # Track tokens
-                self._track_usage(message.usage)
-                self._log_request(message.usage, max_tokens, temperature, final_model)
-
-                if not message.content:
-                    raise ValueError(
-                        f"API returned empty content (stop_reason={message.stop_reason!r}). "
-                        "This may indicate a filtered or truncated response."
-                    )
-                response_text = message.content[0].text
-
-                # Prepend prefill to response if it was used
-                if prefill:
-                    return prefill + response_text
-                return response_text
-        except anthropic.BadRequestError as e:
-            # Check if this is a low credit balance error
-            error_message = str(e)
-            if "credit balance is too low" in error_message.lower():
-                raise anthropic.BadRequestError(
-                    f"\n{'=' * 70}\n"
-                    f"❌ INSUFFICIENT CREDITS\n"
-                    f"{'=' * 70}\n"
-                    f"Your Anthropic API credit balance is too low.\n\n"
-                    f"Please visit the billing page to add credits:\n"
-                    f"👉 https://console.anthropic.com/settings/billing\n"
-                    f"{'=' * 70}\n",
-                    response=e.response,
-                    body=e.body,
-                )
-            # Re-raise other BadRequestErrors
-            raise
+        if tools:
+            api_params["tools"] = tools
+        return api_params
+
+    def _message_text(self, message, prefill: str = None) -> str:
+        """Return the text of a non-streamed message, with prefill prepended if used"""
+        if not message.content:
+            raise ValueError(
+                f"API returned empty content (stop_reason={message.stop_reason!r}). "
+                "This may indicate a filtered or truncated response."
+            )
+        response_text = message.content[0].text
+
+        # Prepend prefill to response if it was used
+        if prefill:
+            return prefill + response_text
+        return response_text
+
+    def _reraise_bad_request(self, e: anthropic.BadRequestError):
+        """Re-raise a BadRequestError, replacing low-credit errors with a readable message"""
+        # Check if this is a low credit balance error
+        error_message = str(e)
+        if "credit balance is too low" in error_message.lower():
+            raise anthropic.BadRequestError(
+                f"\n{'=' * 70}\n"
+                f"❌ INSUFFICIENT CREDITS\n"
+                f"{'=' * 70}\n"
+                f"Your Anthropic API credit balance is too low.\n\n"
+                f"Please visit the billing page to add credits:\n"
+                f"👉 https://console.anthropic.com/settings/billing\n"
+                f"{'=' * 70}\n",
+                response=e.response,
+                body=e.body,
+            ) from e
+        # Re-raise other BadRequestErrors
+        raise e
 
     def _strip_metadata(self, system_blocks):
         """Strip metadata field from system blocks before sending to API
@@ -287,15 +678,33 @@ class ClaudeClient:
 
         return cleaned_blocks
 
-    def _track_usage(self, usage):
-        """Track token usage including cache stats"""
+    def _track_usage(self, usage, telemetry: bool = True):
+        """Track token usage including cache stats
+
+        Args:
+            usage: Usage of one response
+            telemetry: Also record it in the current telemetry spans (off when the
+                       response is resolved for another thread, as Message Batches are)
+        """
         self.total_input_tokens += usage.input_tokens
         self.total_output_tokens += usage.output_tokens
 
         # Track cache stats if available
+        cache_creation = cache_read = 0
         if hasattr(usage, "cache_creation_input_tokens"):
-            self.total_cache_creation_tokens += usage.cache_creation_input_tokens
-            self.total_cache_read_tokens += usage.cache_read_input_tokens
+            cache_creation = usage.cache_creation_input_tokens or 0
+            cache_read = usage.cache_read_input_tokens or 0
+            self.total_cache_creation_tokens += cache_creation
+            self.total_cache_read_tokens += cache_read
+
+        with _usage_lock:
+            _usage_totals["requests"] += 1
+            _usage_totals["input_tokens"] += usage.input_tokens
+            _usage_totals["output_tokens"] += usage.output_tokens
+            _usage_totals["cache_creation_tokens"] += cache_creation
+            _usage_totals["cache_read_tokens"] += cache_read
+        if telemetry:
+            record_usage(usage)
 
     def _log_request(self, usage, max_tokens, temperature, model):
         """Log request details to file"""
@@ -336,6 +745,9 @@ class ClaudeClient:
             stats["cache_read_tokens"] = self.total_cache_read_tokens
             stats["cache_savings"] = self._calculate_cache_savings()
 
+        if self.response_cache_hits:
+            stats["response_cache_hits"] = self.response_cache_hits
+
         return stats
 
     def _calculate_cache_savings(self):
@@ -0,0 +1,142 @@
+"""Input fingerprints for incremental pipeline runs
+
+run_pipeline records, for every step it runs, a fingerprint of everything the step's
+output depends on, in metadata.json:
+
+    "fingerprints": {
+        "step_02_section_structurer": {"step": "<config fp>", "items": {"s1_2": "<item fp>", ...}},
+        "step_03_flatten_steps": {"step": "<config + input fp>"}
+    }
+
+- step config: prompt definition (and the source of its prompt module), the contents of
+  its doc_refs, module_ref data and problem templates, model, variables, context_files
+  contents, batch settings; for formatting steps the function, its function_args and the
+  source file it lives in
+- non-batch steps: config + the step's input text
+- batch items: config + the item's JSON (minus _generated_at); batch_continuous items also
+  chain the previous item's fingerprint, since each one reads the summaries before it
+
+Inputs are fingerprinted by content, so a step upstream that reruns but produces the same
+output does not invalidate the steps after it.
+
+With run_pipeline(incremental=True) (--incremental) a step or item whose fingerprint
+matches the base version's is reused from the base instead of being run again.
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump when what goes into a fingerprint changes, so old metadata never matches
+FINGERPRINT_VERSION = 2
+
+# Step attributes that change what a step produces (not how fast it runs)
+_STEP_FIELDS = (
+    "prompt_name",
+    "function",
+    "function_args",
+    "model",
+    "batch_mode",
+    "batch_id_field",
+    "batch_output_id_field",
+    "batch_id_start",
+    "batch_only_items",
+    "batch_skip_items",
+    "batch_continuous",
+    "batch_continuous_summary_prompt",
+)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash of JSON-serializable parts (dict key order does not matter)"""
+    payload = json.dumps(
+        [FINGERPRINT_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _file_hash(path) -> Optional[str]:
+    if not path:
+        return None
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def item_fingerprint(step_fp: str, item: Any, previous: Optional[str] = None) -> str:
+    """Fingerprint of one batch item under a step config fingerprint"""
+    if isinstance(item, dict):
+        item = {k: v for k, v in item.items() if k != "_generated_at"}
+    return fingerprint(step_fp, item, previous)
+
+
+def step_config_fingerprint(
+    step,
+    step_vars: dict,
+    builder,
+    project_root: Path,
+    module_number: int = None,
+    path_letter: str = None,
+    unit_number: int = None,
+    template_path: Path = None,
+    extra_context: str = "",
+    batch_config_overrides: dict = None,
+    rerun_items: list = None,
+) -> str:
+    """Fingerprint of a step's definition and the files it reads (not its input)
+
+    Args:
+        step: The Step
+        step_vars: Variables the step runs with (initial_variables + step.variables)
+        builder: A PromptBuilderV2 for this module (used to resolve prompts and docs)
+        project_root: Project root, for loading formatting functions
+        template_path: Problem templates file, if the pipeline has one
+        extra_context: Resolved context_files text
+        batch_config_overrides: Batch settings taken from the previous step's output
+                                (other than its item selection)
+        rerun_items: Item IDs passed to formatting functions that accept rerun_items
+    """
+    fields = {field: getattr(step, field, None) for field in _STEP_FIELDS}
+    if callable(fields["function"]):
+        fields["function"] = f"{step.function.__module__}.{step.function.__qualname__}"
+    parts = {
+        "step": fields,
+        "variables": step_vars,
+        "module": [unit_number, module_number, path_letter],
+        "context_files": extra_context,
+        # Which items a filter step selected is left out: streamed runs learn it item by
+        # item, after the step is fingerprinted, and skipped items pass through unchanged
+        "batch_overrides": {
+            key: value
+            for key, value in (batch_config_overrides or {}).items()
+            if key not in ("batch_only_items", "batch_skip_items")
+        },
+    }
+    if step.is_ai_step():
+        prompt = builder._load_prompt(step.prompt_name)
+        prompt_module = sys.modules.get(step.prompt_name)
+        parts["prompt"] = {
+            **prompt.to_dict(),
+            "template_ref": prompt.template_ref,
+            "tools": prompt.tools,
+        }
+        parts["prompt_source"] = _file_hash(getattr(prompt_module, "__file__", None))
+        parts["docs"] = {ref: _file_hash(builder._resolve_doc(ref)) for ref in prompt.doc_refs}
+        if prompt.module_ref and module_number is not None:
+            parts["module_data"] = builder._fetch_module_data(prompt.module_ref, {})
+        if prompt.template_ref and template_path:
+            parts["templates"] = _file_hash(template_path)
+    else:
+        from pipeline_executor import load_function
+
+        func = load_function(step.function, project_root)
+        try:
+            parts["function_source"] = _file_hash(inspect.getsourcefile(func))
+        except TypeError:
+            parts["function_source"] = None  # builtin / C function
+        parts["rerun_items"] = rerun_items
+    return fingerprint(parts)
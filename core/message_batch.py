@@ -0,0 +1,289 @@
+"""Message Batches API execution for batch steps (batch_api: true)
+
+Steps that do not need synchronous answers (overnight runs of remediation_generator,
+dialogue_rewriter, ...) can send the first generation of every item as one Anthropic
+Message Batch instead of one request per item: batched requests cost half as much and
+are not subject to the per-minute rate limits.
+
+run_pipeline hands the step's items to MessageBatchCollector.run_items(), which runs
+them on the step's bounded worker pool (batch_concurrency) in two passes:
+
+1. prepare: each item runs up to its first execute(), which records the built prompt
+   (unless the response cache already has it) and ends the pass for that item
+2. once every item is prepared, the pipeline thread submits the requests as one batch
+   and polls until it has ended; then each item runs again, from the start, and its
+   first execute() returns its batch result, so prompt building, JSON extraction,
+   validate_ai_output_structure and BatchProcessor collation are unchanged
+
+Prompts are therefore built twice, and verbose item headers print once per pass. Content
+validation and retries that follow the first generation are sent directly as regular
+(rate-limited) requests rather than waiting for a batch of their own.
+"""
+
+import contextvars
+import itertools
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Dict, Optional
+
+import anthropic
+from claude_client import ClaudeClient
+from rate_limiter import retry_delay
+from response_cache import ResponseCache
+from telemetry import phase, record_usage
+
+# Seconds between batch status checks; batches usually end within minutes to an hour
+DEFAULT_POLL_SECONDS = 30.0
+
+# API limit on requests per batch; larger steps are split across several batches
+MAX_BATCH_REQUESTS = 100_000
+
+
+class _Deferred(BaseException):
+    """Ends an item's prepare run at its first execute() (not caught by except Exception)"""
+
+
+class _PendingRequest:
+    """One item's request, waiting for its batch result"""
+
+    def __init__(self, custom_id: str, api_params: dict, prefill: Optional[str], cache_key):
+        self.custom_id = custom_id
+        self.api_params = api_params
+        self.prefill = prefill
+        self.cache_key = cache_key
+        self.done = False
+        self.text = None
+        self.usage = None
+        self.error = None
+
+
+class MessageBatchCollector:
+    """Gathers the first-generation requests of a batch step into Message Batches"""
+
+    def __init__(
+        self,
+        client: ClaudeClient = None,
+        poll_seconds: float = None,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            client: ClaudeClient used to build params, track usage and cache responses
+                    (default: a new ClaudeClient honouring the step's cache setting)
+            poll_seconds: Delay between batch status checks (default: DEFAULT_POLL_SECONDS)
+            verbose: Print batch progress
+        """
+        self.client = client
+        self.poll_seconds = DEFAULT_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.verbose = verbose
+        self._requests = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.batch_ids = []
+
+    def run_items(self, jobs: Dict, prepare, run, executor: Executor) -> Dict[object, Future]:
+        """Run every job's first generation as part of one Message Batch
+
+        Blocks until the batch has ended, then submits run(*args) for every job.
+
+        Args:
+            jobs: {key: args} of the items to run
+            prepare: Item function run up to its first execute() (builds the prompt)
+            run: Item function run to the end; its first execute() gets the batch result
+            executor: Bounded pool both passes run on
+
+        Returns:
+            {key: Future of run(*args)}
+        """
+        prepared = [
+            executor.submit(
+                contextvars.copy_context().run, self._call_item, key, True, prepare, args
+            )
+            for key, args in jobs.items()
+        ]
+        for future in prepared:
+            # Items that fail before execute() fail again (and are reported) in run
+            future.exception()
+
+        with self._lock:
+            pending = list(self._requests.values())
+        with phase("api"):
+            for start in range(0, len(pending), MAX_BATCH_REQUESTS):
+                chunk = pending[start : start + MAX_BATCH_REQUESTS]
+                try:
+                    self._run_batch(chunk)
+                except Exception as e:
+                    for req in chunk:
+                        if not req.done:
+                            req.error = e
+                            req.done = True
+
+        return {
+            key: executor.submit(
+                contextvars.copy_context().run, self._call_item, key, False, run, args
+            )
+            for key, args in jobs.items()
+        }
+
+    def _call_item(self, key, preparing: bool, fn, args):
+        """Run fn(*args) as item key of the prepare or run pass"""
+        self._local.key = key
+        self._local.preparing = preparing
+        self._local.first = True
+        try:
+            return fn(*args)
+        except _Deferred:
+            return None
+        finally:
+            self._local.key = None
+
+    def execute(self, built_prompt: Dict, model: str = None, cache: bool = False) -> str:
+        """Return an item's batch result, or send the prompt directly
+
+        Drop-in replacement for PromptBuilderV2.execute() inside a batch_api step. An
+        item's first call is its batched generation; later calls (validation retries)
+        and calls outside run_items() are regular requests.
+
+        Args:
+            built_prompt: Dict from build() ({system, user_message, prefill, api_params})
+            model: Claude model to use. If None, uses the client's default
+            cache: Reuse the stored response when an identical prompt was run before
+
+        Returns:
+            Claude's response text, with the prefill prepended
+        """
+        client = self._get_client(cache)
+        prefill = built_prompt.get("prefill")
+        extra = built_prompt["api_params"]
+        api_params = client._build_params(
+            built_prompt["system"],
+            client._build_messages(built_prompt["user_message"], prefill),
+            extra.get("max_tokens", 1000),
+            extra.get("temperature", 1.0),
+            extra.get("stop_sequences"),
+            model or client.model,
+            tools=extra.get("tools"),
+        )
+
+        key = getattr(self._local, "key", None)
+        first = key is not None and self._local.first
+        self._local.first = False
+        if first and self._local.preparing:
+            # Cached prompts are answered directly in run, without a batch request
+            cache_key = None if client.cache is None else ResponseCache.make_key(api_params)
+            if cache_key is None or client.cache.get(cache_key) is None:
+                # custom_id must match ^[a-zA-Z0-9_-]{1,64}$, so item ids are not used
+                custom_id = f"item-{next(self._ids)}"
+                request = _PendingRequest(custom_id, api_params, prefill, cache_key)
+                with self._lock:
+                    self._requests[key] = request
+            raise _Deferred()
+
+        with self._lock:
+            request = self._requests.pop(key, None) if first else None
+        if request is not None:
+            if request.usage is not None:
+                # Resolved on the thread that ran the batch: count it for this item
+                record_usage(request.usage)
+            if request.error is not None:
+                raise request.error
+            return (prefill or "") + request.text
+
+        cache_key, cached = client._cache_lookup(api_params)
+        if cached is not None:
+            return (prefill or "") + cached
+        message = client._create(api_params)
+        return (prefill or "") + self._finish(api_params, cache_key, message)
+
+    def _get_client(self, cache: bool) -> ClaudeClient:
+        with self._lock:
+            if self.client is None:
+                self.client = ClaudeClient(cache=cache)
+            return self.client
+
+    def _finish(self, api_params: dict, cache_key, message, telemetry: bool = True) -> str:
+        """Track, log and cache one response; returns its text"""
+        client = self.client
+        client._track_usage(message.usage, telemetry=telemetry)
+        client._log_request(
+            message.usage,
+            api_params["max_tokens"],
+            api_params["temperature"],
+            api_params["model"],
+        )
+        text = client._message_text(message)
+        client._cache_store(cache_key, text, api_params["model"])
+        return text
+
+    def _run_batch(self, requests: list) -> None:
+        """Submit one Message Batch, wait for it to end and resolve its requests"""
+        batches = self.client.client.messages.batches
+        by_id = {req.custom_id: req for req in requests}
+
+        batch = self._call(
+            batches.create,
+            requests=[{"custom_id": req.custom_id, "params": req.api_params} for req in requests],
+        )
+        self.batch_ids.append(batch.id)
+        if self.verbose:
+            print(f"  [BATCH API] Submitted {len(requests)} requests as {batch.id}")
+
+        while batch.processing_status != "ended":
+            time.sleep(self.poll_seconds)
+            batch = self._call(batches.retrieve, batch.id)
+            if self.verbose:
+                counts = batch.request_counts
+                print(
+                    f"  [BATCH API] {batch.id}: {batch.processing_status} "
+                    f"({counts.succeeded} succeeded, {counts.processing} processing)"
+                )
+
+        for entry in self._call(batches.results, batch.id):
+            req = by_id.get(entry.custom_id)
+            if req is not None:
+                self._resolve(req, entry.result)
+
+        for req in requests:
+            if not req.done:
+                req.error = RuntimeError(f"No result for {req.custom_id} in batch {batch.id}")
+                req.done = True
+
+    def _resolve(self, req: _PendingRequest, result) -> None:
+        """Turn one batch result into the request's text or error"""
+        client = self.client
+        try:
+            if result.type == "succeeded":
+                message = result.message
+            elif result.type in ("expired", "canceled"):
+                # Never processed: fall back to a regular request for this item
+                if self.verbose:
+                    print(f"  [BATCH API] {req.custom_id} {result.type}; sending directly")
+                message = client._create(req.api_params)
+            else:
+                error = getattr(result.error, "error", result.error)
+                raise RuntimeError(
+                    f"Batch request {req.custom_id} failed: "
+                    f"{getattr(error, 'type', 'error')}: {getattr(error, 'message', error)}"
+                )
+
+            req.usage = message.usage
+            req.text = self._finish(req.api_params, req.cache_key, message, telemetry=False)
+        except Exception as e:
+            req.error = e
+        finally:
+            req.done = True
+
+    @staticmethod
+    def _call(fn, *args, **kwargs):
+        """Call a batches endpoint, retrying transient failures like regular requests"""
+        for attempt in itertools.count():
+            try:
+                return fn(*args, **kwargs)
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                delay = retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                print(f"  [RETRY] {type(e).__name__} from batches API; retrying in {delay:.1f}s")
+                time.sleep(delay)
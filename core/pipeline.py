@@ -5,45 +5,90 @@ Provides Step class and run_pipeline function for chaining prompts together.
 Supports both AI steps (Claude API) and deterministic formatting steps (Python functions).
 """
 
+import contextvars
 import json
+import queue
 import re
-import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Callable, Dict, List, Union
 
+# Console target of the pipeline run the current thread belongs to (see _ConsoleTee)
+_console_target = contextvars.ContextVar("pipeline_console_target", default=None)
 
-class _TeeStream:
-    """Write to both the original stream and a log file simultaneously."""
 
-    def __init__(self, original, log_file):
+class _ConsoleTarget:
+    """Where one run's console output goes: its RunLog (console.txt), and the terminal if echo"""
+
+    def __init__(self, log_file, echo: bool = True):
+        self.log = log_file
+        self.echo = echo
+
+
+class _ConsoleTee:
+    """sys.stdout/sys.stderr wrapper that copies each write to the current run's console.txt.
+
+    The run is looked up in a context variable instead of swapping sys.stdout per run, so
+    pipelines running side by side in threads (see core/scheduler.py) each log only their
+    own output. Writes are handed to the run's RunLog, which appends them to console.txt
+    in the background (see core/run_log.py).
+    """
+
+    def __init__(self, original):
         self._original = original
-        self._log = log_file
 
     def write(self, data):
-        try:
-            self._original.write(data)
-        except UnicodeEncodeError:
-            enc = getattr(self._original, "encoding", "utf-8") or "utf-8"
-            self._original.write(data.encode(enc, errors="replace").decode(enc))
-        try:
-            self._log.write(data)
-            self._log.flush()
-        except Exception:
-            pass
+        target = _console_target.get()
+        if target is None or target.echo:
+            try:
+                self._original.write(data)
+            except UnicodeEncodeError:
+                enc = getattr(self._original, "encoding", "utf-8") or "utf-8"
+                self._original.write(data.encode(enc, errors="replace").decode(enc))
+        if target is not None:
+            target.log.write(data)
 
     def flush(self):
+        # console.txt is flushed by the run log's writer thread
         self._original.flush()
-        try:
-            self._log.flush()
-        except Exception:
-            pass
 
     def __getattr__(self, attr):
         return getattr(self._original, attr)
 
 
+_console_lock = threading.Lock()
+_console_users = 0
+_console_originals = None
+
+
+def _acquire_console_tee() -> None:
+    """Install _ConsoleTee on sys.stdout/sys.stderr while any pipeline run is active"""
+    global _console_users, _console_originals
+    with _console_lock:
+        # Also re-install if something replaced the streams (a run that raised never
+        # released its use)
+        if _console_users == 0 or not isinstance(sys.stdout, _ConsoleTee):
+            _console_originals = (sys.stdout, sys.stderr)
+            sys.stdout = _ConsoleTee(sys.stdout)
+            sys.stderr = _ConsoleTee(sys.stderr)
+        _console_users += 1
+
+
+def _release_console_tee() -> None:
+    """Restore the original streams once the last active run has finished"""
+    global _console_users
+    with _console_lock:
+        _console_users -= 1
+        if _console_users == 0:
+            if isinstance(sys.stdout, _ConsoleTee):
+                sys.stdout = _console_originals[0]
+            if isinstance(sys.stderr, _ConsoleTee):
+                sys.stderr = _console_originals[1]
+
+
 # Add core directory to path
 core_dir = Path(__file__).parent
 if str(core_dir) not in sys.path:
@@ -63,7 +108,10 @@ utils_dir = paths["utils"]
 if str(utils_dir) not in sys.path:
     sys.path.insert(0, str(utils_dir))
 
+import telemetry  # noqa: E402
+from artifact_store import get_artifact_store, unshare_tree  # noqa: E402
 from batch_processor import BatchProcessor  # noqa: E402
+from fingerprint import item_fingerprint, step_config_fingerprint  # noqa: E402
 from json_utils import extract_json, parse_json  # noqa: E402
 from output_validator import validate_ai_output_structure  # noqa: E402
 
@@ -75,6 +123,8 @@ from path_manager import (  # noqa: E402
     resolve_input_path,
 )
 from pipeline_executor import flatten_dict, run_formatting_step  # noqa: E402
+from run_log import DEBUG, RunLog  # noqa: E402
+from step_output import OutputWriter, StepOutput, StreamedOutput  # noqa: E402
 from template_utils import get_template_by_id  # noqa: E402
 from version_manager import (  # noqa: E402
     create_version_directory,
@@ -163,7 +213,11 @@ class Step:
         stop_on_validation_failure: bool = True,
         batch_continuous: bool = False,
         batch_continuous_summary_prompt: str = None,
+        batch_concurrency: int = 1,
         context_files: dict = None,
+        cache_responses: bool = False,
+        batch_api: bool = False,
+        streamable: bool = False,
     ):
         """
         Args:
@@ -189,9 +243,22 @@ class Step:
             batch_skip_items: Skip these item IDs (list of strings)
             batch_stop_on_error: Stop pipeline if any item fails (default: False, continue)
             stop_on_validation_failure: Stop pipeline if validation fails (default: True, stop)
+            batch_concurrency: Max items processed in parallel (default: 1, serial). Results are
+                          still collated in input order. Ignored for batch_continuous steps,
+                          where each item depends on the summaries of the ones before it.
             context_files: Dict mapping XML tag names to "{step_name}/{filename}" refs.
                           The referenced file is injected into the user message after </input>.
                           e.g. {"lesson_sections": "lesson_generator/lesson_sections.json"}
+            cache_responses: Serve AI calls from the on-disk response cache when the built
+                          prompt is byte-identical to an earlier run (default: False).
+                          Disabled for a whole run with --no-cache.
+            batch_api: Send the first generation of every batch item as one Anthropic
+                          Message Batch (half price, no per-request rate limits) and wait for
+                          it to finish (default: False). For large non-interactive AI batch
+                          steps; ignored for batch_continuous steps.
+            streamable: Formatting step whose function handles each section on its own,
+                          so with run_pipeline(stream=True) it runs on every item of the
+                          previous batch step as soon as that item is done (default: False)
 
         Note: Either prompt_name OR function must be specified, not both.
         """
@@ -215,7 +282,11 @@ class Step:
         self.stop_on_validation_failure = stop_on_validation_failure
         self.batch_continuous = batch_continuous
         self.batch_continuous_summary_prompt = batch_continuous_summary_prompt or ""
+        self.batch_concurrency = batch_concurrency or 1
         self.context_files = context_files or {}
+        self.cache_responses = cache_responses
+        self.batch_api = batch_api
+        self.streamable = streamable
 
         # Validation
         if prompt_name and function:
@@ -240,42 +311,51 @@ class Step:
 
 
 def _resolve_context_files(
-    step: "Step", output_dir_path: Path, module_number: int, verbose: bool
+    step: "Step",
+    output_dir_path: Path,
+    module_number: int,
+    verbose: bool,
+    sibling_dirs: Dict[str, Path] = None,
 ) -> str:
     """Resolve context_files for a step and return the extra_context string.
 
     Two ref formats:
       "step_name/filename"               — same pipeline run
-      "pipeline_name::step_name/filename" — latest version of a sibling pipeline run
+      "pipeline_name::step_name/filename" — latest version of a sibling pipeline run, or
+                                            the version it is writing when both run under
+                                            one scheduler (sibling_dirs)
     """
     extra_context = ""
     for tag_name, ref in step.context_files.items():
         if "::" in ref:
             pipeline_name, step_ref = ref.split("::", 1)
             cf_step_name, cf_filename = step_ref.split("/", 1)
-            unit_root = output_dir_path.parent.parent
-            pipeline_module_dir = unit_root / f"{pipeline_name}_module_{module_number}"
-            if not pipeline_module_dir.exists():
-                if verbose:
-                    print(f"  [WARN] context_files: {pipeline_module_dir} not found, skipping")
-                continue
-            latest_file = pipeline_module_dir / "latest.txt"
-            if latest_file.exists():
-                latest_version = latest_file.read_text(encoding="utf-8").strip()
-                search_dir = pipeline_module_dir / latest_version
+            if sibling_dirs and pipeline_name in sibling_dirs:
+                search_dir = sibling_dirs[pipeline_name]
             else:
-                version_dirs = sorted(
-                    d
-                    for d in pipeline_module_dir.iterdir()
-                    if d.is_dir() and d.name.startswith("v")
-                )
-                if not version_dirs:
+                unit_root = output_dir_path.parent.parent
+                pipeline_module_dir = unit_root / f"{pipeline_name}_module_{module_number}"
+                if not pipeline_module_dir.exists():
                     if verbose:
-                        print(
-                            f"  [WARN] context_files: no version dir in {pipeline_module_dir}, skipping"
-                        )
+                        print(f"  [WARN] context_files: {pipeline_module_dir} not found, skipping")
                     continue
-                search_dir = version_dirs[-1]
+                latest_file = pipeline_module_dir / "latest.txt"
+                if latest_file.exists():
+                    latest_version = latest_file.read_text(encoding="utf-8").strip()
+                    search_dir = pipeline_module_dir / latest_version
+                else:
+                    version_dirs = sorted(
+                        d
+                        for d in pipeline_module_dir.iterdir()
+                        if d.is_dir() and d.name.startswith("v")
+                    )
+                    if not version_dirs:
+                        if verbose:
+                            print(
+                                f"  [WARN] context_files: no version dir in {pipeline_module_dir}, skipping"
+                            )
+                        continue
+                    search_dir = version_dirs[-1]
         else:
             cf_step_name, cf_filename = ref.split("/", 1)
             search_dir = output_dir_path
@@ -372,6 +452,29 @@ def validate_base_version_outputs(base_dir: Path, steps: List[Step], start_idx:
         raise FileNotFoundError("Base version missing required outputs:\n  " + "\n  ".join(missing))
 
 
+def _print_prompt_cache_usage(counts: Dict) -> None:
+    """Print a step's prompt cache read/creation ratios from its telemetry counters"""
+    requests = counts.get("requests", 0)
+    if not requests:
+        return
+    read = counts.get("cache_read_tokens", 0)
+    created = counts.get("cache_creation_tokens", 0)
+    uncached = counts.get("input_tokens", 0)
+    total = read + created + uncached
+    if not total:
+        return
+    print(
+        f"  [PROMPT CACHE] {requests} requests: {read / total:.0%} read from cache, "
+        f"{created / total:.0%} written, {uncached / total:.0%} uncached "
+        f"({read:,} / {created:,} / {uncached:,} input tokens)"
+    )
+    if requests > 1 and created and not read:
+        print(
+            "  [WARN] Prompt cache written but never read - per-request content may be "
+            "landing ahead of the cache breakpoints"
+        )
+
+
 def run_pipeline(
     steps: List[Step],
     pipeline_name: str = None,
@@ -393,6 +496,11 @@ def run_pipeline(
     template_filename: str = "problem_templates.json",
     reuse_version_dir: Path = None,
     skip_base_validation: bool = False,
+    background_writes: bool = True,
+    incremental: bool = False,
+    console_echo: bool = True,
+    step_gate=None,
+    stream: bool = False,
 ) -> Dict:
     """Run a pipeline of steps with file I/O support
 
@@ -404,7 +512,8 @@ def run_pipeline(
         path_letter: Path letter for context (automatically passed to formatting steps)
         unit_number: Optional unit number. When set, paths use units/unit{N}/module{M}/
         output_dir: Directory for output files (overrides versioning if specified)
-        verbose: Enable verbose logging
+        verbose: Enable verbose logging (True), or a level from core/run_log.py: DEBUG also
+                 logs per-item diagnostics (variable previews, tracebacks)
         parse_json_output: Enable JSON extraction and formatting for AI steps (default: True)
         control: Optional PipelineControl object for pause/stop functionality
         interactive: Enable step-by-step confirmation before each step (default: False)
@@ -418,6 +527,25 @@ def run_pipeline(
                           Path will be constructed as: modules/module{module_number}/{template_filename}
         reuse_version_dir: If set, write into this existing directory instead of creating a new version.
                            Skips version creation and skipped-step copying. Console output is appended.
+        background_writes: Write each step's main output on a background thread while the
+                           next step runs (default: True). The next step always receives the
+                           output in memory (see core/step_output.py).
+        incremental: Reuse base version outputs of steps and batch items whose input
+                     fingerprint is unchanged (see core/fingerprint.py). Uses the latest
+                     version as base_version when none is given.
+        console_echo: Echo console output to the terminal as well as console.txt. The
+                      scheduler turns this off and shows combined progress instead.
+        step_gate: Set by core/scheduler.py when pipelines run side by side. Each step
+                   waits on step_gate.wait_for_inputs(i) before it runs and reports
+                   step_gate.step_finished(i, step_dir) once its outputs are on disk;
+                   step_gate.sibling_dirs maps the other pipelines to the versions they
+                   are writing, for "pipeline::step/file" context_files.
+        stream: Stream items between consecutive per-item steps (default: False). A batch
+                step followed by batch steps and streamable formatting steps runs as one
+                segment: each item moves on to the next step as soon as it is collated,
+                instead of after the whole step. Steps that need the whole output (other
+                formatting steps, non-batch AI steps) stay barriers. Ignored with
+                incremental, rerun_items and interactive.
 
     Returns:
         Dict with final_output and metadata
@@ -489,7 +617,7 @@ def run_pipeline(
             if path_letter is not None:
                 full_pipeline_name += f"_path_{path_letter.lower()}"
 
-            if base_version is None and rerun_items:
+            if base_version is None and (rerun_items or incremental):
                 # Auto-use latest version for reruns
                 pipeline_dir = _outputs_base / full_pipeline_name
                 base_version = get_latest_version(pipeline_dir)
@@ -550,11 +678,14 @@ def run_pipeline(
                     if not skip_base_validation:
                         validate_base_version_outputs(base_version_dir, steps, 1, start_idx - 1)
 
-                    # Copy skipped step outputs from base version to new version
+                    # Link skipped step outputs from base version into the new version
+                    # (content-addressed clones where the filesystem supports them, see
+                    # core/artifact_store.py)
                     if verbose:
                         print(f"\n{'=' * 70}")
-                        print("COPYING SKIPPED STEPS FROM BASE VERSION")
+                        print("LINKING SKIPPED STEPS FROM BASE VERSION")
                         print(f"{'=' * 70}")
+                    artifact_store = get_artifact_store()
 
                     for skip_step_num in range(1, start_idx):
                         skip_step = steps[skip_step_num - 1]
@@ -579,10 +710,10 @@ def run_pipeline(
                             output_dir_path, skip_step_num, skip_step_name
                         )
 
-                        # Copy entire step directory
+                        # Link entire step directory
                         if base_step_dir.exists():
                             if verbose:
-                                print(f"  [COPY] Step {skip_step_num} ({skip_step_name})")
+                                print(f"  [LINK] Step {skip_step_num} ({skip_step_name})")
                                 print(
                                     f"         From: {base_step_dir.relative_to(get_project_paths()['outputs'])}"
                                 )
@@ -590,8 +721,7 @@ def run_pipeline(
                                     f"         To:   {new_step_dir.relative_to(get_project_paths()['outputs'])}"
                                 )
 
-                            # Use copytree with dirs_exist_ok=True to copy directory
-                            shutil.copytree(base_step_dir, new_step_dir, dirs_exist_ok=True)
+                            artifact_store.link_tree(base_step_dir, new_step_dir)
                         else:
                             print(f"  [WARNING] Base step directory not found: {base_step_dir}")
 
@@ -621,15 +751,24 @@ def run_pipeline(
     else:
         output_dir_path = ensure_dir(Path(output_dir))
 
-    # Tee all console output to console.txt in the output directory.
-    # _TeeStream flushes after every write so output is preserved even on crash/early stop.
-    _console_log_file = open(
-        output_dir_path / "console.txt", "a" if reuse_version_dir else "w", encoding="utf-8"
+    # Tee all console output of this run (including its batch worker threads) to
+    # console.txt in the output directory, next to its structured run_log.jsonl
+    run_log = RunLog(output_dir_path, append=bool(reuse_version_dir))
+    _acquire_console_tee()
+    _console_token = _console_target.set(_ConsoleTarget(run_log, echo=console_echo))
+    run_log.event(
+        "run_start",
+        pipeline=pipeline_name,
+        version=metadata.get("version"),
+        steps=len(steps),
+        step_range=[start_idx, end_idx],
     )
-    _orig_stdout = sys.stdout
-    _orig_stderr = sys.stderr
-    sys.stdout = _TeeStream(sys.stdout, _console_log_file)
-    sys.stderr = _TeeStream(sys.stderr, _console_log_file)
+
+    def _end_console():
+        """Stop teeing this run's output and close its log"""
+        _console_target.reset(_console_token)
+        _release_console_tee()
+        run_log.close()
 
     builder = PromptBuilderV2(module_number, path_letter, verbose, unit_number=unit_number)
 
@@ -643,8 +782,50 @@ def run_pipeline(
         if verbose and template_path.exists():
             print(f"  [TEMPLATES] Using: {template_path.relative_to(project_root)}")
 
+    # Incremental mode: fingerprints recorded by the base version, matched per step/item
+    base_fingerprints = {}
+    if incremental:
+        if pipeline_name and base_version:
+            base_meta_file = (
+                _outputs_base / metadata["full_pipeline_name"] / base_version / "metadata.json"
+            )
+            if base_meta_file.exists():
+                with open(base_meta_file, "r", encoding="utf-8") as f:
+                    base_fingerprints = json.load(f).get("fingerprints", {})
+            metadata["incremental"] = {
+                "base_version": base_version,
+                "reused_steps": [],
+                "reused_items": {},
+            }
+        if verbose:
+            if base_fingerprints:
+                print(f"  [INCREMENTAL] Reusing unchanged steps and items from {base_version}")
+            else:
+                print("  [INCREMENTAL] No base version fingerprints, running every step")
+    fingerprints = metadata.setdefault("fingerprints", {})
+    # Quiet builder for fingerprinting (resolves prompts and docs without logging)
+    fingerprint_builder = PromptBuilderV2(
+        module_number, path_letter, False, unit_number=unit_number
+    )
+
+    sibling_dirs = step_gate.sibling_dirs if step_gate else None
+
     last_output = None
     last_output_file = None
+    # Previous step's main output, handed to the next step without re-reading its file
+    handoff = None
+    writer = OutputWriter(background=background_writes)
+
+    # Streaming segments: {first step: last step}; inside one, step n hands its items to
+    # step n + 1 through streams[n] while both run
+    segments, segment_waits = {}, {}
+    if stream:
+        if incremental or rerun_items or interactive:
+            if verbose:
+                print("  [STREAM] Disabled for incremental, rerun and interactive runs")
+        else:
+            segments, segment_waits = _stream_segments(steps, start_idx, end_idx)
+    streams: Dict[int, StreamedOutput] = {}
 
     if verbose:
         print(f"\n{'=' * 70}")
@@ -654,8 +835,13 @@ def run_pipeline(
         if interactive:
             print("Mode: INTERACTIVE (step-by-step confirmation)")
         print(f"{'=' * 70}")
+        for first, last in segments.items():
+            print(f"Streaming: steps {first}-{last}")
+
+    def _run_step(i, step):
+        """Run step i; returns the run's result dict if the user quit (interactive)"""
+        nonlocal handoff, last_output, last_output_file
 
-    for i, step in enumerate(steps, 1):
         step_type = "AI" if step.is_ai_step() else "FORMATTING"
         step_name = step.prompt_name if step.is_ai_step() else str(step.function).split(".")[-1]
 
@@ -664,7 +850,13 @@ def run_pipeline(
             if verbose:
                 print(f"\n[STEP {i}/{len(steps)}] [{step_type}] {step_name}")
                 print(f"  [SKIP] Outside execution range ({start_idx}-{end_idx})")
-            continue
+            if step_gate:
+                step_gate.step_finished(i, get_step_directory(output_dir_path, i, step_name))
+            return None
+
+        # Wait for steps of other pipelines this step reads (see core/scheduler.py)
+        if step_gate:
+            step_gate.wait_for_inputs(i)
 
         # Check for pause/stop
         if control:
@@ -675,8 +867,10 @@ def run_pipeline(
         step_dir = get_step_directory(output_dir_path, i, step_name)
         step_paths = get_step_output_paths(step_dir, step_name, step.batch_mode)
 
-        # Create directories
+        # Create directories. This step rewrites files linked in from a base version, so
+        # they no longer match the digests recorded for them.
         ensure_dir(step_dir)
+        unshare_tree(step_dir)
         if step_paths["items_dir"]:
             ensure_dir(step_paths["items_dir"])
         if step_paths["prompts_dir"]:
@@ -706,6 +900,9 @@ def run_pipeline(
                     continue
                 elif response == "q":
                     print("  [INTERACTIVE] Quitting pipeline")
+                    writer.close()
+                    run_log.event("run_end", status="stopped", stopped_at_step=i)
+                    _end_console()
                     return {
                         "final_output": last_output,
                         "output_dir": str(output_dir_path),
@@ -717,7 +914,11 @@ def run_pipeline(
                     print("  Invalid input. Please enter 'y' (yes), 'n' (no), or 'q' (quit)")
 
             if response == "n":
-                continue
+                return None
+
+        # Formatting steps and context_files may read earlier outputs from disk
+        if step.is_formatting_step() or step.context_files:
+            writer.flush()
 
         step_vars = initial_variables.copy()
         step_vars.update(step.variables)
@@ -733,6 +934,7 @@ def run_pipeline(
                 input_file = input_file.replace("{unit_number}", str(unit_number))
 
         # Auto-chaining logic
+        chained_output = None
         if (input_file is None or input_file == "") and i > 1:
             # Get previous step's output
             prev_step = steps[i - 2]  # i is 1-indexed
@@ -767,14 +969,26 @@ def run_pipeline(
                     prev_step_dir, prev_step_name, prev_step.batch_mode
                 )
                 input_file = str(prev_step_paths["main_output"].relative_to(output_dir_path))
+                if i - 1 in streams:
+                    chained_output = streams[i - 1]
+                elif handoff is not None and handoff.is_output_of(prev_step_paths["main_output"]):
+                    chained_output = handoff
 
                 if verbose:
                     print(f"  [AUTO-CHAIN] Using previous step output: {input_file}")
 
-        # Load input file if specified
-        input_content = None
-        input_data = None
-        if input_file:
+        # Load input: the previous step's output is taken from memory, anything else
+        # (cold start, start_from_step, explicit input_file) is read from disk once
+        step_input = None
+        if chained_output is not None:
+            step_input = chained_output
+            if verbose:
+                if isinstance(chained_output, StreamedOutput):
+                    print("  [STREAM] Taking items from the previous step as they complete")
+                else:
+                    print("  [HANDOFF] Previous step output passed in memory")
+        elif input_file:
+            writer.flush()
             # For partial reruns with explicit input, resolve from base version if first step
             if i == start_idx and start_idx > 1 and not Path(input_file).is_absolute():
                 pipeline_dir = _outputs_base / metadata["full_pipeline_name"]
@@ -796,36 +1010,33 @@ def run_pipeline(
                     unit_number=unit_number,
                 )
 
-            if verbose:
-                print(f"  [LOAD] Reading: {input_path}")
-            try:
-                # Debug: Check file size before reading
-                file_size = input_path.stat().st_size
+            if handoff is not None and handoff.is_output_of(input_path):
+                step_input = handoff
                 if verbose:
-                    print(f"  [DEBUG] File size: {file_size} bytes")
-
-                with open(input_path, "r", encoding="utf-8") as f:
-                    input_content = f.read()
-
+                    print(f"  [HANDOFF] {input_file} passed in memory")
+            else:
                 if verbose:
-                    print(f"  [DEBUG] Read {len(input_content)} chars from {file_size} bytes")
-
-                # For formatting steps, try to parse as JSON
-                if step.is_formatting_step():
-                    try:
-                        input_data = json.loads(input_content)
-                        if verbose:
-                            print("  [OK] Loaded and parsed JSON")
-                    except:  # noqa: E722
-                        input_data = input_content
-                        if verbose:
-                            print("  [OK] Loaded as text")
-                else:
+                    print(f"  [LOAD] Reading: {input_path}")
+                try:
+                    step_input = StepOutput.load(input_path)
                     if verbose:
-                        print(f"  [OK] Loaded {len(input_content)} chars")
-            except Exception as e:
-                print(f"  [ERROR] Failed to load input file: {e}")
-                raise
+                        print(f"  [OK] Loaded {len(step_input.text)} chars")
+                except Exception as e:
+                    print(f"  [ERROR] Failed to load input file: {e}")
+                    raise
+
+        # Streamed input is consumed item by item below (step_input.chunks())
+        streamed_input = isinstance(step_input, StreamedOutput)
+        input_content = None
+        input_data = None
+        if step_input is not None and not streamed_input:
+            input_content = step_input.text
+            # For formatting steps, pass parsed JSON when the input is JSON
+            if step.is_formatting_step():
+                try:
+                    input_data = step_input.data()
+                except ValueError:
+                    input_data = input_content
 
         # Batch config override: if a formatting step outputs a dict with recognized
         # batch config keys + optional "data", apply overrides and use "data" as input.
@@ -839,37 +1050,124 @@ def run_pipeline(
         batch_config_overrides = {}
         if step.batch_mode and input_content:
             try:
-                _parsed = json.loads(input_content)
-            except (json.JSONDecodeError, ValueError):
+                _parsed = step_input.data()
+            except ValueError:
                 _parsed = None
             if isinstance(_parsed, dict) and any(k in _parsed for k in _BATCH_OVERRIDE_KEYS):
                 for key in _BATCH_OVERRIDE_KEYS:
                     if key in _parsed:
                         batch_config_overrides[key] = _parsed[key]
                 if "data" in _parsed:
-                    input_content = json.dumps(_parsed["data"])
+                    step_input = StepOutput(step_input.path, value=_parsed["data"])
                     input_data = _parsed["data"]
                     if verbose:
                         print(
                             f"  [BATCH-OVERRIDE] Applied {list(batch_config_overrides.keys())} from prev step output"
                         )
 
+        # Fingerprint the step's inputs (see core/fingerprint.py)
+        step_fingerprint = step_config_fingerprint(
+            step,
+            step_vars,
+            fingerprint_builder,
+            project_root,
+            module_number=module_number,
+            path_letter=path_letter,
+            unit_number=unit_number,
+            template_path=template_path,
+            extra_context=(
+                _resolve_context_files(step, output_dir_path, module_number, False, sibling_dirs)
+                if step.context_files
+                else ""
+            ),
+            batch_config_overrides=batch_config_overrides,
+            rerun_items=rerun_items,
+        )
+        step_config_fp = step_fingerprint
+        if not step.batch_mode:
+            # Streamed input is fingerprinted once the step has seen all of it
+            step_fingerprint = item_fingerprint(step_fingerprint, input_content)
+        fingerprints[step_dir.name] = {"step": step_fingerprint}
+        base_fp_dir, base_fp = _find_base_fingerprints(base_fingerprints, step_dir.name, step_name)
+        if base_fp_dir:
+            base_fp_dir = (
+                _outputs_base / metadata["full_pipeline_name"] / base_version / base_fp_dir
+            )
+
+        # Incremental: an unchanged non-batch step is linked in from the base version
+        if (
+            not step.batch_mode
+            and base_fp.get("step") == step_fingerprint
+            and (base_fp_dir / step_paths["main_output"].name).exists()
+        ):
+            get_artifact_store().link_tree(base_fp_dir, step_dir)
+            handoff = StepOutput.load(step_paths["main_output"])
+            last_output = handoff.text
+            last_output_file = str(step_paths["main_output"].relative_to(output_dir_path))
+            metadata["incremental"]["reused_steps"].append(i)
+            if verbose:
+                print(f"  [INCREMENTAL] Unchanged since {base_version}, reused its output")
+            if step_gate:
+                step_gate.step_finished(i, step_dir)
+            return None
+
         # Execute the step (batch or non-batch mode)
         if step.batch_mode:
             # BATCH MODE: Process input array item-by-item
             if verbose:
                 print("  [BATCH] Processing items individually...")
 
-            # Parse input as JSON array
-            try:
-                items = json.loads(input_content) if input_content else []
-                if not isinstance(items, list):
-                    raise ValueError("Batch mode requires input to be a JSON array")
-                if verbose:
-                    print(f"  [DEBUG] Parsed {len(items)} items from JSON array")
-            except Exception as e:
-                print(f"  [ERROR] Failed to parse input as JSON array: {e}")
-                raise
+            # Input as a JSON array (already parsed when handed over from the previous step).
+            # Streamed input starts empty and grows as the previous step hands items on.
+            if streamed_input:
+                items = []
+            else:
+                try:
+                    items = step_input.data() if input_content else []
+                    if not isinstance(items, list):
+                        raise ValueError("Batch mode requires input to be a JSON array")
+                    if (verbose or 0) >= DEBUG:
+                        print(f"  [DEBUG] Parsed {len(items)} items from JSON array")
+                except Exception as e:
+                    print(f"  [ERROR] Failed to parse input as JSON array: {e}")
+                    raise
+
+            # Item fingerprints; batch_continuous items also depend on every item before them
+            item_fingerprints = {}
+            previous_fingerprint = None
+
+            def _fingerprint_item(item_idx, item):
+                nonlocal previous_fingerprint
+                item_fp = item_fingerprint(
+                    step_fingerprint,
+                    item,
+                    previous_fingerprint if step.batch_continuous else None,
+                )
+                item_fingerprints[_batch_item_id(step, item, item_idx)] = item_fp
+                previous_fingerprint = item_fp
+
+            for item_idx, item in enumerate(items, 1):
+                _fingerprint_item(item_idx, item)
+            fingerprints[step_dir.name]["items"] = item_fingerprints
+
+            # Incremental: results of unchanged items, from the base version's item files
+            reused_results = {}
+            if base_fp.get("step") == step_fingerprint:
+                base_item_fps = base_fp.get("items", {})
+                for item_idx, item in enumerate(items, 1):
+                    item_id = _batch_item_id(step, item, item_idx)
+                    if base_item_fps.get(item_id) != item_fingerprints[item_id]:
+                        continue
+                    base_item_file = base_fp_dir / "items" / f"{item_id}.json"
+                    if base_item_file.exists():
+                        with open(base_item_file, "r", encoding="utf-8") as f:
+                            reused_results[item_idx] = json.load(f)
+                if reused_results:
+                    metadata["incremental"]["reused_items"][step_dir.name] = len(reused_results)
+                    if verbose:
+                        print(
+                            f"  [INCREMENTAL] {len(reused_results)}/{len(items)} items unchanged since {base_version}"
+                        )
 
             # Calculate base version directory for rerun mode
             base_step_dir = None
@@ -917,7 +1215,7 @@ def run_pipeline(
                 elif rerun_items:
                     print(f"  [RERUN] Processing only: {batch_filter}")
 
-            total_items = len(items)
+            total_items = "?" if streamed_input else len(items)
 
             # batch_continuous: growing section-context document + dedicated summary client
             _batch_context_doc: list[str] = []
@@ -925,7 +1223,8 @@ def run_pipeline(
             if step.batch_continuous and step.batch_continuous_summary_prompt:
                 from claude_client import ClaudeClient as _CC
 
-                _batch_summary_client = _CC()
+                # Temperature-0 summaries of unchanged sections are served from the cache
+                _batch_summary_client = _CC(cache=True)
 
             # batch_continuous: pre-load prior context from the most recent version that has
             # a section_context.md, scanning backwards across all versions. This ensures
@@ -965,238 +1264,253 @@ def run_pipeline(
                             f"  [CONTEXT] Pre-loaded {len(_batch_context_doc)} prior section(s) from {_ctx_version}"
                         )
 
-            for item_idx, item in enumerate(items, 1):
-                # Get item ID (with composite key support for multi-step items)
-                if step.batch_id_field and isinstance(item, dict):
-                    base_id = str(item.get(step.batch_id_field, item_idx))
-                    # For multi-step items, append step_id to create unique file names
-                    if "step_id" in item:
-                        item_id = f"{base_id}_{item['step_id']}"
-                    else:
-                        item_id = base_id
-                else:
-                    item_id = str(item_idx)
-
-                # Check if should skip
-                should_skip, skip_reason = batch_proc.should_skip_item(item, item_idx)
-                if should_skip:
+            # batch_concurrency: dispatch independent items to a worker pool. batch_continuous
+            # steps stay serial because every item reads the summaries of the ones before it.
+            concurrency = 1 if step.batch_continuous else max(1, int(step.batch_concurrency))
+
+            # batch_api: items build their prompts on the worker pool, a shared collector
+            # sends their first generations as one Message Batch, then they finish on the pool
+            use_batch_api = step.batch_api and step.is_ai_step() and not step.batch_continuous
+            if step.batch_api and not use_batch_api and verbose:
+                print("  [WARN] batch_api ignored (needs a non-continuous AI batch step)")
+            batch_collector = None
+            dispatch_all = concurrency > 1 or use_batch_api
+
+            def _summarize_section(item_idx, item_result):
+                """batch_continuous: append this item's summary to the section-context document"""
+                if not (
+                    step.batch_continuous
+                    and _batch_summary_client
+                    and isinstance(item_result, dict)
+                ):
+                    return
+                try:
+                    section_summary = _batch_summary_client.generate(
+                        system=step.batch_continuous_summary_prompt,
+                        user_message=json.dumps(item_result, indent=2, ensure_ascii=False),
+                        model="claude-haiku-4-5-20251001",
+                        temperature=0.0,
+                        max_tokens=500,
+                    )
+                    section_id = item_result.get("id", f"section_{item_idx}")
+                    _batch_context_doc.append(f"## {section_id}\n{section_summary.strip()}")
+                    context_path = step_paths["items_dir"].parent / "section_context.md"
+                    context_path.write_text("\n\n".join(_batch_context_doc), encoding="utf-8")
                     if verbose:
-                        print(f"  [SKIP {item_idx}/{total_items}] {item_id} ({skip_reason})")
-                    if (
-                        "batch_only_items" in batch_config_overrides
-                        and skip_reason == "not in only_items"
-                    ):
-                        # Pass through unchanged — item has no work to do in this step
-                        batch_proc.add_result(item, preserve_id=True)
-                    else:
-                        batch_proc.increment_skipped()
-                    continue
+                        print(
+                            f"    [CONTEXT] section_context.md updated ({len(_batch_context_doc)} sections)"
+                        )
+                except Exception as _ce:
+                    if verbose:
+                        print(f"    [WARN] batch_continuous summary failed: {_ce}")
 
-                # Process this item
+            def _process_item(item_idx, item, item_id):
+                """Run one batch item through this step and return its (uncollated) result."""
                 if verbose:
                     print(f"\n  [BATCH {item_idx}/{total_items}] {item_id}")
 
-                try:
-                    # batch_continuous: inject the full section-context document into this item
-                    if step.batch_continuous and _batch_context_doc:
-                        item = {
-                            **item,
-                            "prior_section_summaries": "\n\n---\n\n".join(_batch_context_doc),
-                        }
-
-                    # Flatten item to variables
-                    item_vars = flatten_dict(item)
-                    # Keep both original and flattened versions for prefill compatibility
-                    merged_vars = {**step_vars, **item, **item_vars}
-
-                    # Legacy + rerun slug injection: ensure {slug} is available for prefill.
-                    # For legacy items (pre-slug spec_splitter): compute from header.
-                    # For reruns with base version: override with old slug to preserve section ids.
-                    if "header" in merged_vars and "slug" not in merged_vars:
-                        merged_vars["slug"] = _derive_section_slug(str(merged_vars["header"]))
-                    if (
-                        base_step_dir is not None
-                        and "major" in merged_vars
-                        and "minor" in merged_vars
-                    ):
-                        _old_slug = _lookup_base_section_slug(
-                            base_step_dir, step_name, merged_vars["major"], merged_vars["minor"]
-                        )
-                        if _old_slug:
-                            merged_vars["slug"] = _old_slug
+                # batch_continuous: inject the full section-context document into this item
+                if step.batch_continuous and _batch_context_doc:
+                    item = {
+                        **item,
+                        "prior_section_summaries": "\n\n---\n\n".join(_batch_context_doc),
+                    }
 
-                    if verbose:
-                        # Show some key variables
-                        var_preview = {k: v for k, v in list(item_vars.items())[:3]}
-                        print(f"    Variables: {var_preview}...")
-
-                    # Execute step for this item
-                    if step.is_ai_step():
-                        # AI step - call Claude
-                        prompt_save_path = step_paths["prompts_dir"] / f"{item_id}.md"
-
-                        # Load prompt to check for template_ref
-                        prompt = builder._load_prompt(step.prompt_name)
-
-                        # Always pass entire item as input JSON
-                        item_input = json.dumps(item, indent=2, ensure_ascii=False)
-
-                        # Add full input JSON as variable for prefill support
-                        merged_vars["__input__"] = item_input
-
-                        # Template lookup: If template_ref exists, fetch template fields as variables
-                        if prompt.template_ref and len(prompt.template_ref) > 0:
-                            template_id = item.get("template_id")
-                            if template_id and template_path:
-                                try:
-                                    # Fetch template using constructed template_path
-                                    template = get_template_by_id(str(template_path), template_id)
-                                    # Extract specified fields and add to variables
-                                    template_vars = {
-                                        k: template[k]
-                                        for k in prompt.template_ref.keys()
-                                        if k in template
-                                    }
-                                    merged_vars.update(template_vars)
-                                    if verbose:
-                                        print(
-                                            f"    [TEMPLATE] Loaded {template_id}: {list(template_vars.keys())}"
-                                        )
-                                except Exception as e:
-                                    if verbose:
-                                        print(
-                                            f"    [WARN] Template lookup failed for {template_id}: {e}"
-                                        )
-                            elif not template_id and verbose:
-                                print(
-                                    "    [WARN] template_ref specified but no template_id found in item"
-                                )
-                            elif not template_path and verbose:
-                                print(
-                                    "    [WARN] template_ref specified but no template_path configured"
-                                )
+                # Flatten item to variables
+                item_vars = flatten_dict(item)
+                # Keep both original and flattened versions for prefill compatibility
+                merged_vars = {**step_vars, **item, **item_vars}
+
+                # Legacy + rerun slug injection: ensure {slug} is available for prefill.
+                # For legacy items (pre-slug spec_splitter): compute from header.
+                # For reruns with base version: override with old slug to preserve section ids.
+                if "header" in merged_vars and "slug" not in merged_vars:
+                    merged_vars["slug"] = _derive_section_slug(str(merged_vars["header"]))
+                if base_step_dir is not None and "major" in merged_vars and "minor" in merged_vars:
+                    _old_slug = _lookup_base_section_slug(
+                        base_step_dir, step_name, merged_vars["major"], merged_vars["minor"]
+                    )
+                    if _old_slug:
+                        merged_vars["slug"] = _old_slug
 
-                        # Validation schema (used for all validations)
-                        VALIDATION_SCHEMA = {  # noqa: F841
-                            "valid": bool,  # True if no errors found
-                            "errors": list,  # List of error strings
-                            "warnings": list,  # List of warning strings (optional)
-                        }
-
-                        # Self-validation loop with retry logic
-                        # max_retries = 3  # Commented out - no retries for now, just initial validation
-                        max_retries = 0
-                        retry_attempt = 0
-                        is_retry = False
-                        item_result = None
-                        validation_passed = False
-                        validation_history = []
-                        conversation_messages = None  # Track conversation for multi-turn retry
-
-                        # Create ClaudeClient for validation and retries
-                        from claude_client import ClaudeClient
-
-                        claude_client = ClaudeClient()
-
-                        # Resolve context_files for this step
-                        extra_context = _resolve_context_files(
-                            step, output_dir_path, module_number, verbose
-                        )
+                if (verbose or 0) >= DEBUG:
+                    # Show some key variables
+                    var_preview = {k: v for k, v in list(item_vars.items())[:3]}
+                    print(f"    Variables: {var_preview}...")
 
-                        while retry_attempt <= max_retries and not validation_passed:
-                            if is_retry and verbose:
-                                print(
-                                    f"    [RETRY] Regeneration attempt {retry_attempt}/{max_retries} with error feedback..."
-                                )
+                # Execute step for this item
+                if step.is_ai_step():
+                    # AI step - call Claude
+                    prompt_save_path = step_paths["prompts_dir"] / f"{item_id}.md"
 
-                            # Generate output
-                            if not is_retry or conversation_messages is None:
-                                # First attempt: use normal builder.run()
-                                item_output = builder.run(
-                                    prompt_name=step.prompt_name,
-                                    variables=merged_vars,
-                                    input_content=item_input,
-                                    model=step.model,
-                                    save_prompt_to=str(prompt_save_path) if not is_retry else None,
-                                    extra_context=extra_context,
-                                )
+                    # Load prompt to check for template_ref
+                    prompt = builder._load_prompt(step.prompt_name)
+
+                    # Always pass entire item as input JSON
+                    item_input = json.dumps(item, indent=2, ensure_ascii=False)
+
+                    # Add full input JSON as variable for prefill support
+                    merged_vars["__input__"] = item_input
+
+                    # Template lookup: If template_ref exists, fetch template fields as variables
+                    if prompt.template_ref and len(prompt.template_ref) > 0:
+                        template_id = item.get("template_id")
+                        if template_id and template_path:
+                            try:
+                                # Fetch template using constructed template_path
+                                template = get_template_by_id(str(template_path), template_id)
+                                # Extract specified fields and add to variables
+                                template_vars = {
+                                    k: template[k]
+                                    for k in prompt.template_ref.keys()
+                                    if k in template
+                                }
+                                merged_vars.update(template_vars)
+                                if verbose:
+                                    print(
+                                        f"    [TEMPLATE] Loaded {template_id}: {list(template_vars.keys())}"
+                                    )
+                            except Exception as e:
+                                if verbose:
+                                    print(
+                                        f"    [WARN] Template lookup failed for {template_id}: {e}"
+                                    )
+                        elif not template_id and verbose:
+                            print(
+                                "    [WARN] template_ref specified but no template_id found in item"
+                            )
+                        elif not template_path and verbose:
+                            print(
+                                "    [WARN] template_ref specified but no template_path configured"
+                            )
+
+                    # Variables that differ from the step's own: prompt text using these
+                    # is laid out after the cache breakpoints shared by every item
+                    item_variables = {
+                        k
+                        for k in merged_vars
+                        if k not in step_vars or merged_vars[k] != step_vars[k]
+                    }
 
-                                # Build prompt for conversation tracking
+                    # Validation schema (used for all validations)
+                    VALIDATION_SCHEMA = {  # noqa: F841
+                        "valid": bool,  # True if no errors found
+                        "errors": list,  # List of error strings
+                        "warnings": list,  # List of warning strings (optional)
+                    }
+
+                    # Self-validation loop with retry logic
+                    # max_retries = 3  # Commented out - no retries for now, just initial validation
+                    max_retries = 0
+                    retry_attempt = 0
+                    is_retry = False
+                    item_result = None
+                    validation_passed = False
+                    validation_history = []
+                    conversation_messages = None  # Track conversation for multi-turn retry
+
+                    # Create ClaudeClient for validation and retries (validation runs at
+                    # temperature 0, so identical content is answered from the cache)
+                    from claude_client import ClaudeClient
+
+                    claude_client = ClaudeClient(cache=True)
+
+                    # Resolve context_files for this step
+                    extra_context = _resolve_context_files(
+                        step, output_dir_path, module_number, verbose, sibling_dirs
+                    )
+
+                    while retry_attempt <= max_retries and not validation_passed:
+                        if is_retry and verbose:
+                            print(
+                                f"    [RETRY] Regeneration attempt {retry_attempt}/{max_retries} with error feedback..."
+                            )
+
+                        # Generate output
+                        if not is_retry or conversation_messages is None:
+                            # First attempt: build the prompt once, then execute it; the
+                            # same built prompt seeds the conversation for retries
+                            with telemetry.phase("prompt_build"):
                                 built_prompt = builder.build(
                                     step.prompt_name,
                                     merged_vars,
                                     input_content=item_input,
+                                    save_prompt_to=str(prompt_save_path) if not is_retry else None,
                                     extra_context=extra_context,
+                                    item_variables=item_variables,
                                 )
+                            execute = (
+                                batch_collector.execute if batch_collector else builder.execute
+                            )
+                            item_output = execute(
+                                built_prompt, model=step.model, cache=step.cache_responses
+                            )
 
-                                # Extract text from system blocks (list of content blocks)
-                                system_text = "\n\n".join(
-                                    block.get("text", "") for block in built_prompt["system"]
-                                )
-
-                                conversation_messages = [
-                                    {
-                                        "role": "user",
-                                        "content": system_text
-                                        + "\n\n"
-                                        + built_prompt["user_message"],
-                                    },
-                                    {
-                                        "role": "assistant",
-                                        "content": built_prompt.get("prefill", "") + item_output,
-                                    },
-                                ]
-                            else:
-                                # Retry: continue conversation with error feedback
-                                # Handle both string and dict error formats
-                                error_lines = []
-                                for err in content_errors:  # noqa: F821
-                                    if isinstance(err, str):
-                                        error_lines.append("- " + err)
-                                    elif isinstance(err, dict):
-                                        error_lines.append("- " + err.get("message", str(err)))
-                                    else:
-                                        error_lines.append("- " + str(err))
+                            # Extract text from system blocks (list of content blocks)
+                            system_text = "\n\n".join(
+                                block.get("text", "") for block in built_prompt["system"]
+                            )
 
-                                retry_message = f"""Your previous output had validation errors. Regenerate the complete JSON by addressing these issues:
+                            conversation_messages = [
+                                {
+                                    "role": "user",
+                                    "content": system_text + "\n\n" + built_prompt["user_message"],
+                                },
+                                {
+                                    "role": "assistant",
+                                    "content": (built_prompt.get("prefill") or "") + item_output,
+                                },
+                            ]
+                        else:
+                            # Retry: continue conversation with error feedback
+                            # Handle both string and dict error formats
+                            error_lines = []
+                            for err in content_errors:  # noqa: F821
+                                if isinstance(err, str):
+                                    error_lines.append("- " + err)
+                                elif isinstance(err, dict):
+                                    error_lines.append("- " + err.get("message", str(err)))
+                                else:
+                                    error_lines.append("- " + str(err))
+
+                            retry_message = f"""Your previous output had validation errors. Regenerate the complete JSON by addressing these issues:
 
 {chr(10).join(error_lines)}
 
 Review your original instructions and schemas to ensure the regenerated output follows all rules correctly."""
 
-                                conversation_messages.append(
-                                    {"role": "user", "content": retry_message}
-                                )
+                            conversation_messages.append({"role": "user", "content": retry_message})
 
-                                # Call Claude directly with conversation history using Anthropic API
-                                response = claude_client.client.messages.create(
-                                    messages=conversation_messages,
-                                    model=step.model,
-                                    temperature=built_prompt["api_params"].get("temperature", 1.0),
-                                    max_tokens=built_prompt["api_params"].get("max_tokens", 16000),
-                                )
-                                item_output = response.content[0].text
+                            # Call Claude with the conversation history (rate-limited, retried)
+                            item_output = claude_client.generate_conversation(
+                                conversation_messages,
+                                model=step.model,
+                                temperature=built_prompt["api_params"].get("temperature", 1.0),
+                                max_tokens=built_prompt["api_params"].get("max_tokens", 16000),
+                            )
 
-                                # Add assistant response to conversation
-                                conversation_messages.append(
-                                    {"role": "assistant", "content": item_output}
-                                )
+                            # Add assistant response to conversation
+                            conversation_messages.append(
+                                {"role": "assistant", "content": item_output}
+                            )
 
-                            # Parse JSON from AI output.
-                            # claude_client already prepends the prefill to item_output,
-                            # so item_output is always the full response (prefill + continuation).
-                            try:
-                                _raw = item_output
+                        # Parse JSON from AI output.
+                        # claude_client already prepends the prefill to item_output,
+                        # so item_output is always the full response (prefill + continuation).
+                        try:
+                            _raw = item_output
+                            with telemetry.phase("json_parse"):
                                 json_str = extract_json(_raw)
                                 item_result = parse_json(json_str)
-                            except Exception as e:
-                                if verbose:
-                                    print(f"    [WARN] JSON parsing failed: {e}")
-                                item_result = {"raw_output": item_output}
-                                break  # Can't proceed with validation
+                        except Exception as e:
+                            if verbose:
+                                print(f"    [WARN] JSON parsing failed: {e}")
+                            item_result = {"raw_output": item_output}
+                            break  # Can't proceed with validation
 
-                            # Schema validation
-                            expected_id_field = step.batch_output_id_field or step.batch_id_field
+                        # Schema validation
+                        expected_id_field = step.batch_output_id_field or step.batch_id_field
+                        with telemetry.phase("validation"):
                             schema_error = validate_ai_output_structure(
                                 item_result,
                                 item,
@@ -1204,90 +1518,87 @@ Review your original instructions and schemas to ensure the regenerated output f
                                 output_structure=prompt.output_structure,
                             )
 
-                            if schema_error:
-                                if verbose:
-                                    print(f"    [FAIL] Schema validation: {schema_error}")
-                                validation_history.append(
-                                    {
-                                        "generation": "initial"
-                                        if not is_retry
-                                        else f"retry_{retry_attempt}",
-                                        "type": "schema",
-                                        "error": schema_error,
-                                    }
-                                )
+                        if schema_error:
+                            if verbose:
+                                print(f"    [FAIL] Schema validation: {schema_error}")
+                            validation_history.append(
+                                {
+                                    "generation": "initial"
+                                    if not is_retry
+                                    else f"retry_{retry_attempt}",
+                                    "type": "schema",
+                                    "error": schema_error,
+                                }
+                            )
 
-                                # Can't auto-fix schema errors, break out
-                                if not hasattr(batch_proc, "_validation_errors"):
-                                    batch_proc._validation_errors = []
-                                batch_proc._validation_errors.append(
-                                    {
-                                        "item_id": item_id,
-                                        "item_index": item_idx,
-                                        "error": schema_error,
-                                        "type": "schema",
-                                        "generation": "initial"
-                                        if not is_retry
-                                        else f"retry_{retry_attempt}",
-                                        "total_retries": retry_attempt,
-                                    }
+                            # Can't auto-fix schema errors, break out
+                            batch_proc._validation_errors.append(
+                                {
+                                    "item_id": item_id,
+                                    "item_index": item_idx,
+                                    "error": schema_error,
+                                    "type": "schema",
+                                    "generation": "initial"
+                                    if not is_retry
+                                    else f"retry_{retry_attempt}",
+                                    "total_retries": retry_attempt,
+                                }
+                            )
+                            break
+
+                        # AI Content Validation (if validation_prompt exists)
+                        content_errors = []
+                        if prompt.validation_prompt:
+                            if verbose and not is_retry:
+                                print("    [VALIDATE] Running content validation...")
+
+                            try:
+                                validation_input = json.dumps(
+                                    item_result, indent=2, ensure_ascii=False
                                 )
-                                break
 
-                            # AI Content Validation (if validation_prompt exists)
-                            content_errors = []
-                            if prompt.validation_prompt:
-                                if verbose and not is_retry:
-                                    print("    [VALIDATE] Running content validation...")
+                                # Build validation messages with caching
+                                # System message contains the validation prompt (cached if cache_docs enabled)
+                                validation_system = [
+                                    {"type": "text", "text": prompt.validation_prompt}
+                                ]
 
-                                try:
-                                    validation_input = json.dumps(
-                                        item_result, indent=2, ensure_ascii=False
-                                    )
+                                # Add cache control if caching is enabled
+                                if prompt.cache_docs:
+                                    cache_control = {"type": "ephemeral"}
+                                    if prompt.cache_ttl == "1h":
+                                        cache_control["ttl"] = "1h"
+                                    validation_system[-1]["cache_control"] = cache_control
 
-                                    # Build validation messages with caching
-                                    # System message contains the validation prompt (cached if cache_docs enabled)
-                                    validation_system = [
-                                        {"type": "text", "text": prompt.validation_prompt}
-                                    ]
-
-                                    # Add cache control if caching is enabled
-                                    if prompt.cache_docs:
-                                        cache_control = {"type": "ephemeral"}
-                                        if prompt.cache_ttl == "1h":
-                                            cache_control["ttl"] = "1h"
-                                        validation_system[-1]["cache_control"] = cache_control
-
-                                    # User message contains only the content to validate (changes each time)
-                                    validation_user_message = validation_input
-
-                                    # Save validation prompt (only on initial generation)
-                                    if not is_retry:
-                                        validation_prompt_file = (
-                                            step_paths["prompts_dir"] / f"{item_id}_validation.md"
-                                        )
-                                        with open(
-                                            validation_prompt_file, "w", encoding="utf-8"
-                                        ) as f:
-                                            f.write(f"# Validation Prompt for {item_id}\n\n")
-                                            f.write(
-                                                f"## System Message (Cached: {prompt.cache_docs})\n\n"
-                                            )
-                                            f.write(prompt.validation_prompt)
-                                            f.write("\n\n## Expected Response Schema\n\n")
-                                            f.write("```json\n")
-                                            f.write("{\n")
-                                            f.write('  "valid": true,  // or false\n')
-                                            f.write(
-                                                '  "errors": ["error1", "error2"],  // empty if valid\n'
-                                            )
-                                            f.write('  "warnings": []  // optional\n')
-                                            f.write("}\n")
-                                            f.write("```\n\n")
-                                            f.write("## User Input (Content to Validate)\n\n")
-                                            f.write(validation_input)
+                                # User message contains only the content to validate (changes each time)
+                                validation_user_message = validation_input
 
-                                    # Call Claude for validation (use Haiku for speed)
+                                # Save validation prompt (only on initial generation)
+                                if not is_retry:
+                                    validation_prompt_file = (
+                                        step_paths["prompts_dir"] / f"{item_id}_validation.md"
+                                    )
+                                    with open(validation_prompt_file, "w", encoding="utf-8") as f:
+                                        f.write(f"# Validation Prompt for {item_id}\n\n")
+                                        f.write(
+                                            f"## System Message (Cached: {prompt.cache_docs})\n\n"
+                                        )
+                                        f.write(prompt.validation_prompt)
+                                        f.write("\n\n## Expected Response Schema\n\n")
+                                        f.write("```json\n")
+                                        f.write("{\n")
+                                        f.write('  "valid": true,  // or false\n')
+                                        f.write(
+                                            '  "errors": ["error1", "error2"],  // empty if valid\n'
+                                        )
+                                        f.write('  "warnings": []  // optional\n')
+                                        f.write("}\n")
+                                        f.write("```\n\n")
+                                        f.write("## User Input (Content to Validate)\n\n")
+                                        f.write(validation_input)
+
+                                # Call Claude for validation (use Haiku for speed)
+                                with telemetry.phase("validation"):
                                     validation_response = claude_client.generate(
                                         system=validation_system,
                                         user_message=validation_user_message,
@@ -1300,187 +1611,333 @@ Review your original instructions and schemas to ensure the regenerated output f
                                     validation_json_str = extract_json(validation_response)
                                     validation_result = parse_json(validation_json_str)
 
-                                    if not validation_result.get("valid", True):
-                                        content_errors = validation_result.get(
-                                            "errors", ["Unknown validation error"]
-                                        )
-                                        if verbose:
-                                            print("    [FAIL] Content validation failed!")
-                                            for i, error in enumerate(content_errors, 1):
-                                                error_msg = (
-                                                    error
-                                                    if isinstance(error, str)
-                                                    else error.get("message", str(error))
-                                                    if isinstance(error, dict)
-                                                    else str(error)
-                                                )
-                                                # Safe Unicode handling for Windows console
-                                                try:
-                                                    print(f"      Error {i}: {error_msg}")
-                                                except UnicodeEncodeError:
-                                                    # Fallback: encode with ASCII and replace problematic chars
-                                                    safe_msg = error_msg.encode(
-                                                        "ascii", "replace"
-                                                    ).decode("ascii")
-                                                    print(f"      Error {i}: {safe_msg}")
-
-                                        validation_history.append(
+                                if not validation_result.get("valid", True):
+                                    content_errors = validation_result.get(
+                                        "errors", ["Unknown validation error"]
+                                    )
+                                    if verbose:
+                                        print("    [FAIL] Content validation failed!")
+                                        for i, error in enumerate(content_errors, 1):
+                                            error_msg = (
+                                                error
+                                                if isinstance(error, str)
+                                                else error.get("message", str(error))
+                                                if isinstance(error, dict)
+                                                else str(error)
+                                            )
+                                            # Safe Unicode handling for Windows console
+                                            try:
+                                                print(f"      Error {i}: {error_msg}")
+                                            except UnicodeEncodeError:
+                                                # Fallback: encode with ASCII and replace problematic chars
+                                                safe_msg = error_msg.encode(
+                                                    "ascii", "replace"
+                                                ).decode("ascii")
+                                                print(f"      Error {i}: {safe_msg}")
+
+                                    validation_history.append(
+                                        {
+                                            "generation": "initial"
+                                            if not is_retry
+                                            else f"retry_{retry_attempt}",
+                                            "type": "content",
+                                            "errors": content_errors,
+                                            "warnings": validation_result.get("warnings", []),
+                                        }
+                                    )
+
+                                    # If not max retries, retry with multi-turn conversation
+                                    if retry_attempt < max_retries:
+                                        # content_errors will be used in next loop iteration
+                                        # via the multi-turn conversation logic above
+                                        retry_attempt += 1
+                                        is_retry = True
+                                        continue
+                                    else:
+                                        # Final retry failed
+                                        batch_proc._content_validation_errors.append(
                                             {
-                                                "generation": "initial"
-                                                if not is_retry
-                                                else f"retry_{retry_attempt}",
+                                                "item_id": item_id,
+                                                "item_index": item_idx,
+                                                "initial_generation": validation_history[0]
+                                                if validation_history
+                                                else None,
+                                                "final_errors": content_errors,
+                                                "final_warnings": validation_result.get(
+                                                    "warnings", []
+                                                ),
                                                 "type": "content",
-                                                "errors": content_errors,
-                                                "warnings": validation_result.get("warnings", []),
+                                                "total_retries": retry_attempt,
+                                                "history": validation_history,
                                             }
                                         )
-
-                                        # If not max retries, retry with multi-turn conversation
-                                        if retry_attempt < max_retries:
-                                            # content_errors will be used in next loop iteration
-                                            # via the multi-turn conversation logic above
-                                            retry_attempt += 1
-                                            is_retry = True
-                                            continue
-                                        else:
-                                            # Final retry failed
-                                            if not hasattr(
-                                                batch_proc, "_content_validation_errors"
-                                            ):
-                                                batch_proc._content_validation_errors = []
-                                            batch_proc._content_validation_errors.append(
-                                                {
-                                                    "item_id": item_id,
-                                                    "item_index": item_idx,
-                                                    "initial_generation": validation_history[0]
-                                                    if validation_history
-                                                    else None,
-                                                    "final_errors": content_errors,
-                                                    "final_warnings": validation_result.get(
-                                                        "warnings", []
-                                                    ),
-                                                    "type": "content",
-                                                    "total_retries": retry_attempt,
-                                                    "history": validation_history,
-                                                }
-                                            )
-                                    else:
-                                        # Validation passed!
-                                        validation_passed = True
-                                        if verbose:
-                                            success_msg = "[OK] Content validation passed"
-                                            if is_retry:
-                                                success_msg += f" (after {retry_attempt} retries)"
-                                            print(f"    {success_msg}")
-
-                                            warnings = validation_result.get("warnings", [])
-                                            if warnings:
-                                                print("    [WARN] Validation warnings:")
-                                                for i, warning in enumerate(warnings, 1):
-                                                    print(f"      Warning {i}: {warning}")
-
-                                    # Save validation result
-                                    validation_output_file = (
-                                        step_paths["items_dir"] / f"{item_id}_validation.json"
-                                    )
-                                    validation_save = {
-                                        "status": "passed" if validation_passed else "failed",
-                                        "final_result": validation_result,
-                                        "total_retries": retry_attempt,
-                                        "history": validation_history,
-                                    }
-                                    with open(validation_output_file, "w", encoding="utf-8") as f:
-                                        json.dump(validation_save, f, indent=2, ensure_ascii=False)
-
-                                except Exception as e:
+                                else:
+                                    # Validation passed!
+                                    validation_passed = True
                                     if verbose:
-                                        print(f"    [WARN] AI validation exception: {e}")
-                                        import traceback
+                                        success_msg = "[OK] Content validation passed"
+                                        if is_retry:
+                                            success_msg += f" (after {retry_attempt} retries)"
+                                        print(f"    {success_msg}")
+
+                                        warnings = validation_result.get("warnings", [])
+                                        if warnings:
+                                            print("    [WARN] Validation warnings:")
+                                            for i, warning in enumerate(warnings, 1):
+                                                print(f"      Warning {i}: {warning}")
+
+                                # Save validation result
+                                validation_output_file = (
+                                    step_paths["items_dir"] / f"{item_id}_validation.json"
+                                )
+                                validation_save = {
+                                    "status": "passed" if validation_passed else "failed",
+                                    "final_result": validation_result,
+                                    "total_retries": retry_attempt,
+                                    "history": validation_history,
+                                }
+                                with open(validation_output_file, "w", encoding="utf-8") as f:
+                                    json.dump(validation_save, f, indent=2, ensure_ascii=False)
 
-                                        print(f"    [DEBUG] {traceback.format_exc()}")
-                                    validation_passed = True  # Continue if validation fails
-                                    break
-                            else:
-                                # No validation prompt, consider it passed
-                                if verbose and not is_retry:
-                                    print("    [SKIP] No validation prompt defined")
-                                validation_passed = True
+                            except Exception as e:
+                                if verbose:
+                                    print(f"    [WARN] AI validation exception: {e}")
+                                if (verbose or 0) >= DEBUG:
+                                    import traceback
 
-                            # If we got here and validation passed, break out of loop
-                            if validation_passed:
+                                    print(f"    [DEBUG] {traceback.format_exc()}")
+                                validation_passed = True  # Continue if validation fails
                                 break
+                        else:
+                            # No validation prompt, consider it passed
+                            if verbose and not is_retry:
+                                print("    [SKIP] No validation prompt defined")
+                            validation_passed = True
+
+                        # If we got here and validation passed, break out of loop
+                        if validation_passed:
+                            break
 
-                            # Increment retry counter for next iteration
-                            retry_attempt += 1
-                            is_retry = True
+                        # Increment retry counter for next iteration
+                        retry_attempt += 1
+                        is_retry = True
 
+                else:
+                    # Formatting step - call Python function
+                    item_result = run_formatting_step(
+                        step,
+                        item,
+                        None,
+                        module_number,
+                        path_letter,
+                        project_root,
+                        False,
+                        unit_number=unit_number,
+                        output_file_path=step_paths["main_output"],
+                        rerun_items=rerun_items,
+                    )
+
+                # batch_continuous: summarize this section and append to the context document
+                _summarize_section(item_idx, item_result)
+
+                if dispatch_all:
+                    # Save as soon as the item completes so finished work survives a crash.
+                    # Rewritten after collation once the sequential ID has been assigned.
+                    _save_item_result(step_paths["items_dir"], item_id, item_result)
+
+                return item_result
+
+            def _process_logged_item(item_idx, item, item_id):
+                """_process_item, logged as an item_start/item_end span and timed as an item"""
+                with run_log.span("item", step=i, item=item_id), telemetry.span(str(item_id)):
+                    return _process_item(item_idx, item, item_id)
+
+            executor = None
+            futures = {}
+            skip_reasons = {}
+            item_queue = None
+            if streamed_input:
+                # Items are dispatched as they arrive: a feeder thread takes them off the
+                # input stream, decides skips and queues them for collation below
+                if concurrency > 1:
+                    executor = ThreadPoolExecutor(
+                        max_workers=concurrency, thread_name_prefix=f"batch-{step_name}"
+                    )
+                    if verbose:
+                        print(f"  [BATCH] Dispatching items as they arrive ({concurrency} workers)")
+                item_queue = queue.Queue()
+
+                def _feed_items():
+                    try:
+                        for chunk, only_ids in step_input.chunks():
+                            if only_ids is not None:
+                                # Filter output: pass the other items through unchanged
+                                batch_config_overrides.setdefault("batch_only_items", [])
+                                batch_config_overrides["batch_only_items"].extend(only_ids)
+                            for item in chunk:
+                                items.append(item)
+                                item_idx = len(items)
+                                _fingerprint_item(item_idx, item)
+                                reason = batch_proc.get_skip_reason(item, item_idx)
+                                if (
+                                    not reason
+                                    and only_ids is not None
+                                    and not step.batch_only_items
+                                ):
+                                    base_id, item_id = batch_proc._get_item_ids(item, item_idx)
+                                    if item_id not in only_ids and base_id not in only_ids:
+                                        reason = "not in only_items"
+                                skip_reasons[item_idx] = reason
+                                if not reason and executor is not None:
+                                    futures[item_idx] = executor.submit(
+                                        contextvars.copy_context().run,
+                                        _process_logged_item,
+                                        item_idx,
+                                        item,
+                                        _batch_item_id(step, item, item_idx),
+                                    )
+                                item_queue.put((item_idx, item))
+                    except BaseException as e:
+                        item_queue.put(e)
                     else:
-                        # Formatting step - call Python function
-                        item_result = run_formatting_step(
-                            step,
-                            item,
-                            None,
-                            module_number,
-                            path_letter,
-                            project_root,
-                            False,
-                            unit_number=unit_number,
-                            output_file_path=step_paths["main_output"],
-                            rerun_items=rerun_items,
+                        item_queue.put(None)
+
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(_feed_items,),
+                    name=f"feed-{step_name}",
+                    daemon=True,
+                ).start()
+            elif dispatch_all:
+                # Decide skips up front (no side effects) so only real work is dispatched;
+                # skip side effects are applied below, in input order, like the serial path.
+                for item_idx, item in enumerate(items, 1):
+                    skip_reasons[item_idx] = batch_proc.get_skip_reason(item, item_idx)
+                pending = [
+                    idx
+                    for idx, reason in skip_reasons.items()
+                    if not reason and idx not in reused_results
+                ]
+                if pending:
+                    workers = min(concurrency, len(pending))
+                    executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix=f"batch-{step_name}"
+                    )
+                    if verbose:
+                        print(f"  [BATCH] Dispatching {len(pending)} items ({workers} workers)")
+                    jobs = {}
+                    for item_idx in pending:
+                        item = items[item_idx - 1]
+                        jobs[item_idx] = (item_idx, item, _batch_item_id(step, item, item_idx))
+                    if use_batch_api:
+                        from message_batch import MessageBatchCollector
+
+                        batch_collector = MessageBatchCollector(verbose=verbose)
+                        futures = batch_collector.run_items(
+                            jobs, _process_item, _process_logged_item, executor
                         )
-
-                    # batch_continuous: summarize this section and append to the context document
-                    if (
-                        step.batch_continuous
-                        and _batch_summary_client
-                        and isinstance(item_result, dict)
-                    ):
-                        try:
-                            section_summary = _batch_summary_client.generate(
-                                system=step.batch_continuous_summary_prompt,
-                                user_message=json.dumps(item_result, indent=2, ensure_ascii=False),
-                                model="claude-haiku-4-5-20251001",
-                                temperature=0.0,
-                                max_tokens=500,
-                            )
-                            section_id = item_result.get("id", f"section_{item_idx}")
-                            _batch_context_doc.append(f"## {section_id}\n{section_summary.strip()}")
-                            context_path = step_paths["items_dir"].parent / "section_context.md"
-                            context_path.write_text(
-                                "\n\n".join(_batch_context_doc), encoding="utf-8"
+                    else:
+                        for item_idx, args in jobs.items():
+                            # Workers run in this run's context, so their output reaches its
+                            # console.txt
+                            futures[item_idx] = executor.submit(
+                                contextvars.copy_context().run, _process_logged_item, *args
                             )
-                            if verbose:
-                                print(
-                                    f"    [CONTEXT] section_context.md updated ({len(_batch_context_doc)} sections)"
-                                )
-                        except Exception as _ce:
-                            if verbose:
-                                print(f"    [WARN] batch_continuous summary failed: {_ce}")
 
-                    # Add result to batch processor (handles collation and ID assignment).
-                    # Must happen BEFORE saving the file so the batch-assigned sequential
-                    # ID (e.g. problem_id) is written to disk rather than whatever the AI
-                    # model returned. merge_and_collate_items reads IDs from these files to
-                    # build loaded_ids, so they must match the final collated values.
-                    batch_proc.add_result(item_result)
+            output_stream = streams.get(i)
+
+            def _collation_order():
+                """(item_idx, item) in input order; results collated for an item are handed
+                on to the next step (streaming) before the next item is collated"""
+                published = 0
+                entries = iter(item_queue.get, None) if streamed_input else enumerate(items, 1)
+                for entry in entries:
+                    if isinstance(entry, BaseException):
+                        raise entry
+                    yield entry
+                    if output_stream is not None and len(batch_proc.collated_results) > published:
+                        output_stream.put(batch_proc.collated_results[published:])
+                        published = len(batch_proc.collated_results)
 
-                    # Save individual result (after ID assignment so file is consistent)
-                    item_output_file = step_paths["items_dir"] / f"{item_id}.json"
-                    with open(item_output_file, "w", encoding="utf-8") as f:
-                        json.dump(item_result, f, indent=2, ensure_ascii=False)
+            try:
+                # Collate in input order so collated_results and sequential IDs are deterministic
+                # regardless of the order in which concurrent items finish.
+                for item_idx, item in _collation_order():
+                    item_id = _batch_item_id(step, item, item_idx)
+
+                    # Check if should skip
+                    if executor is not None or streamed_input:
+                        skip_reason = skip_reasons[item_idx]
+                        if skip_reason:
+                            skip_reason = batch_proc.apply_skip(item, item_idx, skip_reason)
+                        should_skip = bool(skip_reason)
+                    else:
+                        should_skip, skip_reason = batch_proc.should_skip_item(item, item_idx)
+                    if should_skip:
+                        run_log.event("item_skipped", step=i, item=item_id, reason=skip_reason)
+                        if verbose:
+                            print(f"  [SKIP {item_idx}/{total_items}] {item_id} ({skip_reason})")
+                        if (
+                            "batch_only_items" in batch_config_overrides
+                            and skip_reason == "not in only_items"
+                        ):
+                            # Pass through unchanged — item has no work to do in this step
+                            batch_proc.add_result(item, preserve_id=True)
+                        else:
+                            batch_proc.increment_skipped()
+                        continue
+
+                    if item_idx in reused_results:
+                        # Incremental: unchanged since the base version, keep its result and IDs
+                        item_result = reused_results[item_idx]
+                        batch_proc.add_result(item_result, preserve_id=True)
+                        _save_item_result(step_paths["items_dir"], item_id, item_result)
+                        _summarize_section(item_idx, item_result)
+                        run_log.event("item_reused", step=i, item=item_id)
+                        if verbose:
+                            print(f"  [REUSE {item_idx}/{total_items}] {item_id} (unchanged)")
+                        continue
 
-                    if verbose:
-                        print("    [OK] Completed")
+                    try:
+                        if executor is not None:
+                            item_result = futures[item_idx].result()
+                        else:
+                            item_result = _process_logged_item(item_idx, item, item_id)
 
-                except Exception as e:
-                    batch_proc.add_error(item_id, item_idx, e, i)
+                        # Add result to batch processor (handles collation and ID assignment).
+                        # Must happen BEFORE saving the file so the batch-assigned sequential
+                        # ID (e.g. problem_id) is written to disk rather than whatever the AI
+                        # model returned. merge_and_collate_items reads IDs from these files to
+                        # build loaded_ids, so they must match the final collated values.
+                        batch_proc.add_result(item_result)
 
-                    if verbose:
-                        print(f"    [ERROR] {e}")
+                        # Save individual result (after ID assignment so file is consistent)
+                        _save_item_result(step_paths["items_dir"], item_id, item_result)
+
+                        if verbose:
+                            if executor is not None:
+                                print(f"  [OK {item_idx}/{total_items}] {item_id} collated")
+                            else:
+                                print("    [OK] Completed")
+
+                    except Exception as e:
+                        batch_proc.add_error(item_id, item_idx, e, i)
+
+                        if verbose:
+                            print(f"    [ERROR] {item_id}: {e}")
+
+                        if step.batch_stop_on_error:
+                            print(
+                                "  [STOP] Stopping pipeline due to error (batch_stop_on_error=True)"
+                            )
+                            raise
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
 
-                    if step.batch_stop_on_error:
-                        print("  [STOP] Stopping pipeline due to error (batch_stop_on_error=True)")
-                        raise
+            # Concurrent workers record validation failures in completion order
+            batch_proc._validation_errors.sort(key=lambda e: e["item_index"])
+            batch_proc._content_validation_errors.sort(key=lambda e: e["item_index"])
 
             # Print batch summary
             summary = batch_proc.get_summary()
@@ -1491,7 +1948,7 @@ Review your original instructions and schemas to ensure the regenerated output f
                 print(f"    Errors: {summary['errors']}")
 
             # Get validation errors from batch processor
-            validation_errors = getattr(batch_proc, "_validation_errors", [])
+            validation_errors = batch_proc._validation_errors
 
             if validation_errors and verbose:
                 print("\n  [VALIDATION WARNINGS]")
@@ -1512,7 +1969,7 @@ Review your original instructions and schemas to ensure the regenerated output f
                     )
 
             # Save content validation errors to separate file
-            content_validation_errors = getattr(batch_proc, "_content_validation_errors", [])
+            content_validation_errors = batch_proc._content_validation_errors
             if content_validation_errors:
                 content_validation_errors_file = step_dir / "content_validation_errors.json"
                 with open(content_validation_errors_file, "w", encoding="utf-8") as f:
@@ -1545,7 +2002,6 @@ Review your original instructions and schemas to ensure the regenerated output f
 
             # Set output to collated array
             collated_results = batch_proc.get_collated_results()
-            last_output = json.dumps(collated_results, indent=2, ensure_ascii=False)
 
         else:
             # NON-BATCH MODE: Single execution
@@ -1556,7 +2012,7 @@ Review your original instructions and schemas to ensure the regenerated output f
 
                 # Resolve context_files for this step
                 extra_context = _resolve_context_files(
-                    step, output_dir_path, module_number, verbose
+                    step, output_dir_path, module_number, verbose, sibling_dirs
                 )
 
                 output = builder.run(
@@ -1566,8 +2022,46 @@ Review your original instructions and schemas to ensure the regenerated output f
                     model=step.model,
                     save_prompt_to=str(prompt_save_path),
                     extra_context=extra_context,
+                    cache=step.cache_responses,
                 )
                 last_output = output
+            elif streamed_input:
+                # Streamable formatting step: run the function on each item's results as
+                # they arrive, and hand its results on the same way
+                output_stream = streams.get(i)
+                output_items, output_only = [], None
+                for chunk, only_ids in step_input.chunks():
+                    result = run_formatting_step(
+                        step,
+                        chunk
+                        if only_ids is None
+                        else {"batch_only_items": only_ids, "data": chunk},
+                        None,
+                        module_number,
+                        path_letter,
+                        project_root,
+                        False,
+                        unit_number=unit_number,
+                        output_file_path=step_paths["main_output"],
+                        rerun_items=rerun_items,
+                    )
+                    result, result_only = _split_streamed_result(step_name, result)
+                    output_items.extend(result)
+                    if result_only is not None:
+                        output_only = (output_only or []) + result_only
+                    if output_stream is not None:
+                        output_stream.put(result, result_only)
+                output = (
+                    output_items
+                    if output_only is None
+                    else {"batch_only_items": output_only, "data": output_items}
+                )
+                last_output = output
+                if verbose:
+                    print(f"  [STREAM] Processed {len(output_items)} items as they arrived")
+                fingerprints[step_dir.name]["step"] = item_fingerprint(
+                    step_config_fp, StepOutput(step_input.path, value=step_input.value()).text
+                )
             else:
                 # Formatting step - call Python function
                 output = run_formatting_step(
@@ -1584,27 +2078,19 @@ Review your original instructions and schemas to ensure the regenerated output f
                 )
                 last_output = output
 
-        # Save main output file (always save to step directory)
+        # Save main output file (always save to step directory). The file is written once,
+        # in the background; the next step gets the value from the handoff.
         output_path = step_paths["main_output"]
 
         if step.batch_mode:
             # BATCH MODE: Save collated array
-            try:
-                collated_data = json.loads(last_output)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(collated_data, f, indent=2, ensure_ascii=False)
-
-                if verbose:
-                    print(
-                        f"  [SAVE] Saved {len(collated_data)} items to: {output_path.relative_to(output_dir_path)}"
-                    )
-
-            except Exception:
-                # Fallback to raw save
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(last_output)
-                if verbose:
-                    print(f"  [SAVE] Saved output to: {output_path.relative_to(output_dir_path)}")
+            output = StepOutput(output_path, value=collated_results)
+            writer.write(output)
+            last_output = output.text
+            if verbose:
+                print(
+                    f"  [SAVE] Saved {len(collated_results)} items to: {output_path.relative_to(output_dir_path)}"
+                )
 
         else:
             # NON-BATCH MODE: Save single output
@@ -1614,15 +2100,16 @@ Review your original instructions and schemas to ensure the regenerated output f
                     if verbose:
                         print("  [JSON] Extracting JSON from output...")
 
-                    # Extract JSON from the output
-                    json_str = extract_json(last_output)
+                    with telemetry.phase("json_parse"):
+                        # Extract JSON from the output
+                        json_str = extract_json(last_output)
 
-                    # Parse to validate and format
-                    parsed = parse_json(json_str)
+                        # Parse to validate and format
+                        parsed = parse_json(json_str)
 
                     # Save as formatted JSON
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        json.dump(parsed, f, indent=2, ensure_ascii=False)
+                    output = StepOutput(output_path, value=parsed)
+                    writer.write(output)
 
                     if verbose:
                         if isinstance(parsed, list):
@@ -1639,7 +2126,7 @@ Review your original instructions and schemas to ensure the regenerated output f
                             )
 
                     # Update last_output to be the JSON string for chaining
-                    last_output = json.dumps(parsed, indent=2, ensure_ascii=False)
+                    last_output = output.text
 
                 except Exception as e:
                     if verbose:
@@ -1647,28 +2134,135 @@ Review your original instructions and schemas to ensure the regenerated output f
                         print("  [WARN] Saving raw output instead")
 
                     # Fall back to raw output
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(last_output)
+                    output = StepOutput(output_path, text=last_output)
+                    writer.write(output)
             else:
-                # Save output (for formatting steps or when parse_json_output=False)
-                if isinstance(last_output, (dict, list)):
-                    # Save as JSON
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        json.dump(last_output, f, indent=2, ensure_ascii=False)
-                    if verbose:
+                # Save output (for formatting steps or when parse_json_output=False):
+                # dicts and lists as JSON, anything else as text
+                output = StepOutput.from_value(output_path, last_output)
+                writer.write(output)
+                if verbose:
+                    if isinstance(last_output, (dict, list)):
                         print(f"  [SAVE] Saved JSON to: {output_path.relative_to(output_dir_path)}")
-                else:
-                    # Save as text
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(str(last_output))
-                    if verbose:
+                    else:
                         print(
-                            f"  [SAVE] Saved {len(str(last_output))} chars to: {output_path.relative_to(output_dir_path)}"
+                            f"  [SAVE] Saved {len(output.text)} chars to: {output_path.relative_to(output_dir_path)}"
                         )
 
+        handoff = output
+
+        # Report reference doc reuse for AI steps, from this step's own telemetry span
+        # (process-wide counters also count pipelines and streamed steps running alongside)
+        if verbose and step.is_ai_step() and telemetry.current() is not None:
+            step_counts = dict(telemetry.current().counts)
+            doc_hits = step_counts.get("doc_cache_hits", 0)
+            doc_misses = step_counts.get("doc_cache_misses", 0)
+            if doc_hits or doc_misses:
+                print(f"  [DOC CACHE] {doc_hits} hits, {doc_misses} misses (disk reads)")
+            _print_prompt_cache_usage(step_counts)
+
         # Track last output file for reference
         last_output_file = str(output_path.relative_to(output_dir_path))
 
+        # Other pipelines may read this step's files as soon as it is reported finished
+        if step_gate:
+            writer.flush()
+            step_gate.step_finished(i, step_dir)
+        return None
+
+    def _run_stream_segment(first, last):
+        """Run steps first..last concurrently, each consuming its predecessor's stream"""
+        for n in range(first, last):
+            prev = steps[n - 1]
+            prev_name = prev.prompt_name if prev.is_ai_step() else str(prev.function).split(".")[-1]
+            prev_dir = get_step_directory(output_dir_path, n, prev_name)
+            streams[n] = StreamedOutput(
+                get_step_output_paths(prev_dir, prev_name, prev.batch_mode)["main_output"]
+            )
+        done = {n: threading.Event() for n in range(first, last + 1)}
+        errors = {}
+
+        def _run(n):
+            try:
+                # context_files that read a step of this segment need its complete output
+                for dep in segment_waits.get(n, []):
+                    if verbose:
+                        print(f"  [STREAM] Step {n} waits for step {dep} (context_files)")
+                    done[dep].wait()
+                    if dep in errors:
+                        raise RuntimeError(f"step {n} reads step {dep}, which failed")
+                _run_logged_step(n, steps[n - 1])
+            except BaseException as e:
+                errors[n] = e
+                if n in streams:
+                    streams[n].fail(e)
+            else:
+                if n in streams:
+                    streams[n].close()
+            finally:
+                done[n].set()
+
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_run, n),
+                name=f"stream-step-{n}",
+                daemon=True,
+            )
+            for n in range(first, last + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[min(errors)]
+
+    def _run_logged_step(i, step):
+        """_run_step, logged as a step_start/step_end span with the step's token usage"""
+        if i < start_idx or i > end_idx:
+            return _run_step(i, step)
+        step_name = step.prompt_name if step.is_ai_step() else str(step.function).split(".")[-1]
+        step_dir_name = get_step_directory(output_dir_path, i, step_name).name
+        with run_log.span("step", step=i, name=step_name) as end:
+            with telemetry.span(step_dir_name) as step_span:
+                stopped = _run_step(i, step)
+            end.update({key: step_span.counts.get(key, 0) for key in telemetry.USAGE_KEYS})
+        return stopped
+
+    try:
+        with telemetry.span() as run_span:
+            i = 1
+            while i <= len(steps):
+                if i in segments:
+                    _run_stream_segment(i, segments[i])
+                    i = segments[i] + 1
+                    continue
+                stopped = _run_logged_step(i, steps[i - 1])
+                if stopped is not None:
+                    return stopped
+                i += 1
+    except BaseException as e:
+        # Keep what the failed run logged and finish writing what its steps produced;
+        # a write error is reported here rather than lost with the writer thread
+        write_error = None
+        try:
+            writer.close()
+        except Exception as close_error:
+            write_error = f"{type(close_error).__name__}: {close_error}"
+            print(f"  [ERROR] Writing step outputs failed: {write_error}")
+        run_log.event(
+            "run_end",
+            status="failed",
+            error=f"{type(e).__name__}: {e}",
+            **({"write_error": write_error} if write_error else {}),
+        )
+        _end_console()
+        raise
+
+    # Finish writing step outputs before the run is reported complete
+    writer.close()
+
     # Save metadata and update symlink
     if pipeline_name:
         # Complete metadata
@@ -1676,6 +2270,9 @@ Review your original instructions and schemas to ensure the regenerated output f
         metadata["duration_seconds"] = (end_time - start_time).total_seconds()
         metadata["status"] = "completed"
         metadata["output_dir"] = str(output_dir_path)
+        run_telemetry = run_span.to_dict()
+        run_telemetry["steps"] = run_telemetry.pop("items", {})
+        metadata["telemetry"] = run_telemetry
 
         # Save metadata
         save_metadata(output_dir_path, metadata)
@@ -1702,10 +2299,8 @@ Review your original instructions and schemas to ensure the regenerated output f
             print("PIPELINE COMPLETE")
             print(f"{'=' * 70}")
 
-    # Restore original stdout/stderr and close the log file
-    sys.stdout = _orig_stdout
-    sys.stderr = _orig_stderr
-    _console_log_file.close()
+    run_log.event("run_end", status="completed", seconds=metadata.get("duration_seconds"))
+    _end_console()
 
     return {
         "final_output": last_output,
@@ -1784,6 +2379,11 @@ def add_common_pipeline_args(parser):
     parser.add_argument("-y", "--yes", action="store_true", help="Skip all confirmation prompts")
     parser.add_argument("--note", default="", help="Note about this run")
     parser.add_argument("--status", type=str, help="Pipeline status label (alpha/beta/rc/final)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Claude; ignore cached responses for byte-identical prompts",
+    )
 
 
 def resolve_pipeline_name(pipeline_arg, pipelines):
@@ -1855,6 +2455,14 @@ def apply_yes_flag(args):
         _os.environ["NOTION_YES"] = "1"
 
 
+def apply_no_cache_flag(args):
+    """Set CLAUDE_NO_CACHE env var if --no-cache was passed (inherited by subprocesses)."""
+    import os as _os
+
+    if getattr(args, "no_cache", False):
+        _os.environ["CLAUDE_NO_CACHE"] = "1"
+
+
 def parse_batch_filter_arg(value):
     """Parse a comma-separated ID string into a list of strings, or return None if falsy."""
     if not value:
@@ -1869,6 +2477,99 @@ def parse_step_ref_arg(val):
     return int(val) if str(val).isdigit() else val
 
 
+def _find_base_fingerprints(base_fingerprints: Dict, step_dir_name: str, step_name: str):
+    """Return (base step dir name, fingerprints) recorded by the base version for a step.
+
+    Matches the step directory name first, then any step with the same name (the base
+    version may number its steps differently). Returns (None, {}) when there is none.
+    """
+    if step_dir_name in base_fingerprints:
+        return step_dir_name, base_fingerprints[step_dir_name]
+    for dir_name, entry in base_fingerprints.items():
+        if dir_name.endswith(f"_{step_name}"):
+            return dir_name, entry
+    return None, {}
+
+
+def _streams_input(step: Step) -> bool:
+    """Whether a step can take its (auto-chained) input item by item while it is produced"""
+    if step.input_file:
+        return False
+    if step.batch_mode:
+        return not step.batch_api
+    return step.is_formatting_step() and step.streamable
+
+
+def _stream_segments(steps: List[Step], start_idx: int, end_idx: int):
+    """Find the runs of steps that stream items to each other (run_pipeline(stream=True))
+
+    A segment starts at a batch step and takes in every following step that handles its
+    input item by item. Within a segment, a step whose context_files read an earlier step
+    of the segment waits for that step to finish.
+
+    Returns:
+        ({first step: last step}, {step: [segment steps it waits for]})
+    """
+    names = [s.prompt_name if s.is_ai_step() else str(s.function).split(".")[-1] for s in steps]
+    segments, waits = {}, {}
+    first = start_idx
+    while first <= end_idx:
+        last = first
+        if steps[first - 1].batch_mode:
+            while last < end_idx and _streams_input(steps[last]):
+                last += 1
+        if last > first:
+            segments[first] = last
+            for n in range(first + 1, last + 1):
+                for ref in steps[n - 1].context_files.values():
+                    ref_name = ref.split("/", 1)[0]
+                    if "::" in ref or ref_name not in names[: n - 1]:
+                        continue
+                    dep = names.index(ref_name) + 1
+                    if dep >= first and dep not in waits.setdefault(n, []):
+                        waits[n].append(dep)
+        first = last + 1
+    return segments, waits
+
+
+def _split_streamed_result(step_name: str, result):
+    """Return (items, only_ids) of a streamable formatting step's result for one chunk"""
+    if isinstance(result, list):
+        return result, None
+    if (
+        isinstance(result, dict)
+        and "data" in result
+        and set(result) <= {"batch_only_items", "data"}
+    ):
+        only_ids = result.get("batch_only_items")
+        return list(result["data"]), None if only_ids is None else list(only_ids)
+    raise ValueError(
+        f"Streamable step {step_name} must return a list "
+        f'(or {{"batch_only_items": [...], "data": [...]}}), got {type(result).__name__}'
+    )
+
+
+def _batch_item_id(step: Step, item, item_idx: int) -> str:
+    """Return the file-name ID for a batch item (composite key for multi-step items)."""
+    if step.batch_id_field and isinstance(item, dict):
+        base_id = str(item.get(step.batch_id_field, item_idx))
+        # For multi-step items, append step_id to create unique file names
+        if "step_id" in item:
+            return f"{base_id}_{item['step_id']}"
+        return base_id
+    return str(item_idx)
+
+
+def _save_item_result(items_dir: Path, item_id: str, item_result) -> None:
+    """Write a single batch item's result to items/{item_id}.json."""
+    item_output_file = items_dir / f"{item_id}.json"
+    with telemetry.phase("write"):
+        text = json.dumps(item_result, indent=2, ensure_ascii=False)
+        with open(item_output_file, "w", encoding="utf-8") as f:
+            f.write(text)
+    telemetry.record(bytes_written=len(text.encode("utf-8")))
+
+
 def _derive_section_slug(header: str) -> str:
     """Compute a deterministic snake_case slug from a section header (fallback for legacy items)."""
     import re as _re
@@ -43,6 +43,7 @@ def step_from_config(step_data: dict) -> Step:
         "stop_on_validation_failure",
         "batch_continuous",
         "batch_continuous_summary_prompt",
+        "batch_concurrency",
     ):
         if key in step_data:
             batch_kwargs[key] = step_data[key]
@@ -55,6 +56,8 @@ def step_from_config(step_data: dict) -> Step:
             output_file=output_file,
             model=step_data.get("model"),
             context_files=step_data.get("context_files", {}),
+            cache_responses=step_data.get("cache_responses", False),
+            batch_api=step_data.get("batch_api", False),
             **batch_kwargs,
         )
     else:  # formatting step
@@ -63,6 +66,7 @@ def step_from_config(step_data: dict) -> Step:
             function_args=step_data.get("function_args", {}),
             input_file=input_file,
             output_file=output_file,
+            streamable=step_data.get("streamable", False),
             **batch_kwargs,
         )
 
@@ -12,10 +12,125 @@ Key improvements:
 
 import importlib
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+# Sibling core modules are imported flat (also when loaded as core.prompt_builder)
+core_dir = Path(__file__).parent
+if str(core_dir) not in sys.path:
+    sys.path.insert(0, str(core_dir))
+
+from telemetry import phase, record  # noqa: E402
+
+# System block layout tiers, in prompt order (see PromptBuilderV2._layout_system_blocks)
+LAYOUT_TIER_STATIC = 0  # no variables: role, reference docs, fixed instructions/examples
+LAYOUT_TIER_STEP = 1  # uses step-level variables (module data, step vars)
+LAYOUT_TIER_CONTEXT = 2  # pipeline-injected context shared by the whole step
+LAYOUT_TIER_ITEM = 3  # uses per-item variables; placed after every cache breakpoint
+
+# Anthropic allows at most 4 cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+
+class DocCache:
+    """Process-wide cache of reference docs and their pre-rendered system blocks
+
+    Entries are keyed on (resolved path, mtime, size), so an edited doc is re-read on
+    its next use while unchanged docs are read from disk once per process, however
+    many items, steps or builders use them. Hits and misses are also recorded in the
+    telemetry spans of the caller (doc_cache_hits, doc_cache_misses).
+    """
+
+    def __init__(self):
+        self._texts = {}  # (path, mtime_ns, size) -> text
+        self._blocks = {}  # (path, mtime_ns, size, doc_ref) -> block
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read_text(self, path: Path) -> Optional[str]:
+        """Return the doc text at path (None if it no longer exists)"""
+        key = self._file_key(path)
+        if key is None:
+            return None
+        with self._lock:
+            text = self._texts.get(key)
+            if text is not None:
+                self.hits += 1
+        if text is not None:
+            record(doc_cache_hits=1)
+            return text
+        text = path.read_text(encoding="utf-8")
+        with self._lock:
+            self._drop_stale(self._texts, key)
+            self._texts[key] = text
+            self.misses += 1
+        record(doc_cache_misses=1)
+        return text
+
+    def get_block(self, path: Path, doc_ref: str, render) -> Optional[Dict]:
+        """Return the system block for a doc, rendering it with render(text) on a miss
+
+        Returns a copy, since build() adds cache_control to its last block, or None if
+        the doc is missing or empty.
+        """
+        file_key = self._file_key(path)
+        if file_key is None:
+            return None
+        key = file_key + (doc_ref,)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self.hits += 1
+        if block is not None:
+            record(doc_cache_hits=1)
+        else:
+            text = self.read_text(path)
+            if not text:
+                return None
+            block = render(text)
+            with self._lock:
+                self._drop_stale(self._blocks, key)
+                self._blocks[key] = block
+        return {**block, "metadata": dict(block["metadata"])}
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the hit/miss counters"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._texts.clear()
+            self._blocks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _file_key(path: Path):
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _drop_stale(entries: Dict, key: tuple) -> None:
+        """Remove older versions of the same file (and doc_ref) before storing key"""
+        stale = [k for k in entries if k[0] == key[0] and k[3:] == key[3:] and k != key]
+        for k in stale:
+            del entries[k]
+
+
+_doc_cache = DocCache()
+
+
+def get_doc_cache() -> DocCache:
+    """Return the process-wide DocCache shared by all PromptBuilderV2 instances"""
+    return _doc_cache
+
 
 class Prompt:
     """Represents a prompt with its components"""
@@ -168,6 +283,12 @@ class PromptBuilderV2:
         if str(self.prompts_dir) not in sys.path:
             sys.path.insert(0, str(self.prompts_dir))
 
+        # Prompt definitions loaded so far, by prompt name (see _load_prompt)
+        self._loaded_prompts = {}
+
+        # Resolved doc paths by doc_ref; module/path/unit are fixed for this builder
+        self._doc_paths = {}
+
     def build(
         self,
         prompt_name: str,
@@ -175,6 +296,7 @@ class PromptBuilderV2:
         input_content: str = None,
         save_prompt_to: str = None,
         extra_context: str = "",
+        item_variables=None,
     ) -> Dict:
         """Build complete prompt with caching support
 
@@ -183,6 +305,10 @@ class PromptBuilderV2:
             variables: Optional dict of variables to substitute in instructions
             input_content: Content to use as <input> in system prompt (from pipeline input_file)
             save_prompt_to: Optional path to save the prompt to (for debugging/review)
+            extra_context: Step-level context appended as its own cached system block
+            item_variables: Names of variables that change per batch item. Blocks that use
+                            them are placed after every cache breakpoint. None treats all
+                            variables as step-level.
 
         Returns:
             Dict with {system, user_message, prefill, api_params}
@@ -220,77 +346,92 @@ class PromptBuilderV2:
         #     elif self.verbose:
         #         print(f"  [WARN] template_ref specified but goal_id not found in variables")
 
-        # Build system blocks (for caching)
-        # Order: Role -> Reference Docs -> Task Instructions -> Examples -> Output Structure (all static)
-        system_blocks = []
+        # Build system blocks (for caching), each tagged with its layout tier:
+        # static text -> text using step-level variables -> pipeline context -> text
+        # using per-item variables. Blocks are emitted in tier order (stable within a tier)
+        # so per-item text never lands ahead of a cache breakpoint.
+        # Default order within a tier: Role -> Reference Docs -> Instructions -> Examples ->
+        # Output Structure
+        tiered_blocks = []
 
-        # 1. Role & Context (static)
+        # 1. Role & Context
         if prompt.role:
             role_text = self._substitute_variables(prompt.role, variables)
-            system_blocks.append(
-                self._create_block(
-                    text=role_text,
-                    block_type="role",
-                    purpose="Establishes AI role and task context",
+            tiered_blocks.append(
+                (
+                    self._layout_tier(prompt.role, variables, item_variables),
+                    self._create_block(
+                        text=role_text,
+                        block_type="role",
+                        purpose="Establishes AI role and task context",
+                    ),
                 )
             )
 
         # 2. Reference Documentation (static, cacheable)
         if prompt.doc_refs:
             doc_blocks = self._load_docs_as_blocks(prompt.doc_refs)
-            system_blocks.extend(doc_blocks)
+            tiered_blocks.extend((LAYOUT_TIER_STATIC, block) for block in doc_blocks)
 
-        # 3. Task Instructions (static, cacheable)
+        # 3. Task Instructions
         if prompt.instructions:
             instructions_text = self._substitute_variables(prompt.instructions, variables)
-            system_blocks.append(
-                self._create_block(
-                    text=instructions_text,
-                    block_type="instructions",
-                    purpose="Step-by-step task instructions",
+            tiered_blocks.append(
+                (
+                    self._layout_tier(prompt.instructions, variables, item_variables),
+                    self._create_block(
+                        text=instructions_text,
+                        block_type="instructions",
+                        purpose="Step-by-step task instructions",
+                    ),
                 )
             )
 
-        # 4. Examples (static, cacheable)
+        # 4. Examples
         if prompt.examples:
             examples_text = self._format_examples(prompt.examples, variables)
-            system_blocks.append(
-                self._create_block(
-                    text=f"<examples>\n{examples_text}\n</examples>",
-                    block_type="examples",
-                    purpose="Demonstration of expected output format",
+            raw_examples = self._format_examples(prompt.examples, {})
+            tiered_blocks.append(
+                (
+                    self._layout_tier(raw_examples, variables, item_variables),
+                    self._create_block(
+                        text=f"<examples>\n{examples_text}\n</examples>",
+                        block_type="examples",
+                        purpose="Demonstration of expected output format",
+                    ),
                 )
             )
 
-        # 5. Output Structure (static, cacheable)
+        # 5. Output Structure
         if prompt.output_structure:
             structure_text = self._substitute_variables(prompt.output_structure, variables)
-            system_blocks.append(
-                self._create_block(
-                    text=f"<output_structure>\n{structure_text}\n</output_structure>",
-                    block_type="output_schema",
-                    purpose="Defines expected output structure",
+            tiered_blocks.append(
+                (
+                    self._layout_tier(prompt.output_structure, variables, item_variables),
+                    self._create_block(
+                        text=f"<output_structure>\n{structure_text}\n</output_structure>",
+                        block_type="output_schema",
+                        purpose="Defines expected output structure",
+                    ),
                 )
             )
 
-        # 6. Add cache_control to last block (if caching enabled)
-        # All system blocks are now static and cacheable
-        if prompt.cache_docs and system_blocks:
-            cache_control = {"type": "ephemeral"}
-            if prompt.cache_ttl == "1h":
-                cache_control["ttl"] = "1h"
-            system_blocks[-1]["cache_control"] = cache_control
-
-        # 6b. Extra context (e.g. lesson_sections from context_files) — cached system block
-        # Injected after the prompt's own cache boundary so it gets its own cache entry.
+        # 6. Extra context (e.g. lesson_sections from context_files) — shared by every item
+        # of the step, so it sits after the prompt's own blocks with its own cache entry
         if extra_context:
-            extra_block = self._create_block(
-                text=extra_context.strip(),
-                block_type="context",
-                purpose="Pipeline-injected context (e.g. lesson sections)",
+            tiered_blocks.append(
+                (
+                    LAYOUT_TIER_CONTEXT,
+                    self._create_block(
+                        text=extra_context.strip(),
+                        block_type="context",
+                        purpose="Pipeline-injected context (e.g. lesson sections)",
+                    ),
+                )
             )
-            extra_block["cache_control"] = {"type": "ephemeral"}
-            system_blocks.append(extra_block)
+
+        # 6b. Order by tier and place cache breakpoints at the end of each stable tier
+        system_blocks = self._layout_system_blocks(tiered_blocks, prompt)
 
         # 7. Build user message (dynamic - just the input data)
         # User message contains ONLY the input content that changes per request
@@ -353,12 +494,64 @@ class PromptBuilderV2:
 
         return "\n\n---\n\n".join(formatted)
 
+    def _layout_tier(self, raw_text: str, variables: Dict, item_variables) -> int:
+        """Layout tier of a block from the variables its unsubstituted text references"""
+        used = [key for key in variables if "{" + key + "}" in raw_text]
+        if not used:
+            return LAYOUT_TIER_STATIC
+        if item_variables and any(key in item_variables for key in used):
+            return LAYOUT_TIER_ITEM
+        return LAYOUT_TIER_STEP
+
+    def _layout_system_blocks(self, tiered_blocks: List[tuple], prompt: Prompt) -> List[Dict]:
+        """Order (tier, block) pairs into a stable prefix and add cache_control breakpoints
+
+        Each non-empty stable tier (static, step, context) ends in a breakpoint, so a change
+        in one tier still lets the tiers before it hit the cache. Static and step tiers are
+        only cached when prompt.cache_docs is set; the context tier is always cached.
+        Per-item blocks are never cached.
+        """
+        ordered = sorted(tiered_blocks, key=lambda entry: entry[0])  # stable within a tier
+
+        breakpoints = []
+        for i, (tier, block) in enumerate(ordered):
+            if tier == LAYOUT_TIER_ITEM:
+                block["metadata"]["cacheable"] = False
+                continue
+            is_tier_end = i + 1 == len(ordered) or ordered[i + 1][0] != tier
+            if is_tier_end and (tier == LAYOUT_TIER_CONTEXT or prompt.cache_docs):
+                breakpoints.append((tier, block))
+
+        # The API accepts a limited number of breakpoints; keep the longest prefixes
+        for tier, block in breakpoints[-MAX_CACHE_BREAKPOINTS:]:
+            cache_control = {"type": "ephemeral"}
+            if tier != LAYOUT_TIER_CONTEXT and prompt.cache_ttl == "1h":
+                cache_control["ttl"] = "1h"
+            block["cache_control"] = cache_control
+
+        if self.verbose:
+            moved = [
+                block["metadata"]["block_type"]
+                for tier, block in ordered
+                if tier == LAYOUT_TIER_ITEM
+            ]
+            if moved:
+                print(f"  [LAYOUT] Per-item blocks after cache breakpoints: {', '.join(moved)}")
+
+        return [block for _, block in ordered]
+
     def _load_prompt(self, prompt_name: str) -> Prompt:
         """Load prompt definition from prompts folder
 
         Looks for a constant named {PROMPT_NAME}_PROMPT in {prompt_name}.py
         Example: godot_formatter.py should contain GODOT_FORMATTER_PROMPT
         """
+        # Prompt definitions are static for the life of the builder; batch steps build
+        # the same prompt once per item, so resolve each name only once
+        cached = self._loaded_prompts.get(prompt_name)
+        if cached is not None:
+            return cached
+
         if self.verbose:
             print(f"  Loading prompt definition: {prompt_name}")
 
@@ -374,6 +567,7 @@ class PromptBuilderV2:
                 prompt = getattr(module, constant_name)
                 if self.verbose:
                     print(f"  [OK] Loaded {constant_name}")
+                self._loaded_prompts[prompt_name] = prompt
                 return prompt
             else:
                 raise AttributeError(
@@ -395,18 +589,26 @@ class PromptBuilderV2:
         blocks = []
 
         for doc_ref in doc_refs:
-            content = self._load_single_doc(doc_ref)
-            if content:
-                tag = Path(doc_ref).stem
-                blocks.append(
-                    self._create_block(
+            tag = Path(doc_ref).stem
+            resolved_path = self._resolve_doc(doc_ref)
+            block = None
+            if resolved_path:
+                block = _doc_cache.get_block(
+                    resolved_path,
+                    doc_ref,
+                    render=lambda content, doc_ref=doc_ref, tag=tag: self._create_block(
                         text=f"<{tag}>\n{content}\n</{tag}>",
                         block_type="reference_doc",
                         block_name=doc_ref,
                         purpose="Reference documentation",
-                    )
+                    ),
                 )
-            elif self.verbose:
+            if block:
+                blocks.append(block)
+                continue
+            if resolved_path and not resolved_path.exists():
+                self._forget_doc(doc_ref)
+            if self.verbose:
                 print(f"  [WARN] Doc not found: {doc_ref}")
 
         return blocks
@@ -500,6 +702,25 @@ class PromptBuilderV2:
 
     def _load_single_doc(self, doc_ref: str) -> Optional[str]:
         """Load a single doc with fallback chain"""
+        resolved_path = self._resolve_doc(doc_ref)
+        if resolved_path:
+            content = _doc_cache.read_text(resolved_path)
+            if content is not None:
+                return content
+            self._forget_doc(doc_ref)
+
+        if self.verbose:
+            print(f"    [WARN] Not found: {doc_ref}")
+        return None
+
+    def _resolve_doc(self, doc_ref: str) -> Optional[Path]:
+        """Resolve a doc_ref through the fallback chain, once per builder"""
+        # The doc cache stats the file on every use, so a memoized path needs no re-check
+        # here; callers drop it via _forget_doc() if the file has gone
+        resolved_path = self._doc_paths.get(doc_ref)
+        if resolved_path is not None:
+            return resolved_path
+
         from path_manager import resolve_doc_path
 
         if self.verbose:
@@ -514,16 +735,15 @@ class PromptBuilderV2:
         )
 
         if resolved_path and resolved_path.exists():
-            with open(resolved_path, "r", encoding="utf-8") as f:
-                content = f.read()
             if self.verbose:
                 print(f"    [OK] Loaded from: {resolved_path}")
-            return content
-
-        if self.verbose:
-            print(f"    [WARN] Not found: {doc_ref}")
+            self._doc_paths[doc_ref] = resolved_path
+            return resolved_path
         return None
 
+    def _forget_doc(self, doc_ref: str) -> None:
+        self._doc_paths.pop(doc_ref, None)
+
     def _fetch_module_data(self, module_ref_mapping: Dict[str, str], variables: Dict) -> Dict:
         """Fetch module data fields using module_utils
 
@@ -622,6 +842,7 @@ class PromptBuilderV2:
         model: str = None,
         save_prompt_to: str = None,
         extra_context: str = "",
+        cache: bool = False,
     ) -> str:
         """Build and execute a prompt in one call
 
@@ -630,32 +851,75 @@ class PromptBuilderV2:
             variables: Variables for substitution
             input_content: Content to use as <input> in system prompt
             model: Claude model to use (e.g., "claude-opus-4-5-20251101"). If None, uses default
+            cache: Reuse the stored response when an identical prompt was run before
 
         Returns:
             Claude's response text
         """
-        # Import here to avoid circular dependency
-        import sys
-        from pathlib import Path
+        # Build the prompt using existing build() method
+        with phase("prompt_build"):
+            built_prompt = self.build(
+                prompt_name,
+                variables,
+                input_content=input_content,
+                save_prompt_to=save_prompt_to,
+                extra_context=extra_context,
+            )
+        return self.execute(built_prompt, model=model, cache=cache)
 
-        # Add core directory to path if needed
-        core_dir = Path(__file__).parent
-        if str(core_dir) not in sys.path:
-            sys.path.insert(0, str(core_dir))
+    async def arun(
+        self,
+        prompt_name: str,
+        variables: Dict = None,
+        input_content: str = None,
+        model: str = None,
+        save_prompt_to: str = None,
+        extra_context: str = "",
+        cache: bool = False,
+    ) -> str:
+        """Async version of run(): build the prompt, then await the API call
 
-        from claude_client import ClaudeClient
+        Prompt building is local file work and stays synchronous; only the request
+        is awaited, so many arun() calls can share one event loop via asyncio.gather.
 
-        # Build the prompt using existing build() method
-        built_prompt = self.build(
-            prompt_name,
-            variables,
-            input_content=input_content,
-            save_prompt_to=save_prompt_to,
-            extra_context=extra_context,
-        )
+        Args:
+            prompt_name: Name of the prompt to run
+            variables: Variables for substitution
+            input_content: Content to use as <input> in system prompt
+            model: Claude model to use. If None, uses default
+            cache: Reuse the stored response when an identical prompt was run before
+
+        Returns:
+            Claude's response text
+        """
+        with phase("prompt_build"):
+            built_prompt = self.build(
+                prompt_name,
+                variables,
+                input_content=input_content,
+                save_prompt_to=save_prompt_to,
+                extra_context=extra_context,
+            )
+        return await self.aexecute(built_prompt, model=model, cache=cache)
+
+    def execute(self, built_prompt: Dict, model: str = None, cache: bool = False) -> str:
+        """Send a prompt returned by build() to Claude
+
+        Lets callers that also need the assembled prompt (e.g. to continue the
+        conversation on a validation retry) build it once and reuse it.
+
+        Args:
+            built_prompt: Dict from build() ({system, user_message, prefill, api_params})
+            model: Claude model to use. If None, uses default
+            cache: Reuse the stored response when an identical prompt was run before
+
+        Returns:
+            Claude's response text
+        """
+        ClaudeClient = self._claude_client_class()
 
         # Create client and execute
-        client = ClaudeClient()
+        client = ClaudeClient(cache=cache)
 
         response = client.generate(
             system=built_prompt["system"],
@@ -665,6 +929,42 @@ class PromptBuilderV2:
             **built_prompt["api_params"],
         )
 
+        self._print_stats(client)
+        return response
+
+    async def aexecute(self, built_prompt: Dict, model: str = None, cache: bool = False) -> str:
+        """Async version of execute()"""
+        ClaudeClient = self._claude_client_class()
+
+        client = ClaudeClient(cache=cache)
+
+        response = await client.agenerate(
+            system=built_prompt["system"],
+            user_message=built_prompt["user_message"],
+            prefill=built_prompt.get("prefill"),
+            model=model,
+            **built_prompt["api_params"],
+        )
+
+        self._print_stats(client)
+        return response
+
+    def _claude_client_class(self):
+        """Import ClaudeClient lazily (avoids a circular import at module load)"""
+        import sys
+        from pathlib import Path
+
+        # Add core directory to path if needed
+        core_dir = Path(__file__).parent
+        if str(core_dir) not in sys.path:
+            sys.path.insert(0, str(core_dir))
+
+        from claude_client import ClaudeClient
+
+        return ClaudeClient
+
+    def _print_stats(self, client) -> None:
+        """Print the client's usage stats when verbose"""
         if self.verbose:
             stats = client.get_stats()
             print(f"\n{'=' * 70}")
@@ -673,8 +973,6 @@ class PromptBuilderV2:
             for key, value in stats.items():
                 print(f"  {key}: {value}")
 
-        return response
-
     def _substitute_variables(self, text: str, variables: Dict) -> str:
         """Safely substitute variables in text
 
@@ -0,0 +1,309 @@
+"""Adaptive rate limiting and retry scheduling for Anthropic API calls
+
+Every ClaudeClient request passes through a per-model RateLimiter holding three token
+buckets: requests, input tokens and output tokens per minute. Bucket state lives in a
+small JSON file under logs/.rate_limits/ guarded by an OS file lock, so the limit is
+shared by every ClaudeClient in a process (including the pipelines cli/run_module.py
+runs side by side) *and* by separate run_pipeline.py processes running at the same time.
+
+Limits are learned from the anthropic-ratelimit-* response headers (the server's view of
+the org limit and what remains), or pinned with environment variables:
+
+    CLAUDE_RATE_LIMIT_RPM            requests per minute
+    CLAUDE_RATE_LIMIT_INPUT_TPM      input tokens per minute
+    CLAUDE_RATE_LIMIT_OUTPUT_TPM     output tokens per minute
+
+Until a limit is known the bucket does not throttle. Retryable failures (429, 5xx, 529
+overloaded, connection errors) are retried with jittered exponential backoff that
+honours retry-after headers; 429/529 also pause the shared bucket so every caller backs
+off together instead of stampeding.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import anthropic
+
+# Bucket dimensions, named after the anthropic-ratelimit-{dim}-* response headers
+DIMENSIONS = ("requests", "input-tokens", "output-tokens")
+
+_LIMIT_ENV_VARS = {
+    "requests": "CLAUDE_RATE_LIMIT_RPM",
+    "input-tokens": "CLAUDE_RATE_LIMIT_INPUT_TPM",
+    "output-tokens": "CLAUDE_RATE_LIMIT_OUTPUT_TPM",
+}
+
+# Retry policy
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Longest single sleep while waiting on a bucket, so waiters re-check shared state often
+_MAX_WAIT_SLICE = 5.0
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str, state_dir=None) -> "RateLimiter":
+    """Return the process-wide RateLimiter for a model (created on first use)
+
+    Args:
+        model: Model name the bucket is keyed on
+        state_dir: Directory for the shared state files (default: logs/.rate_limits)
+    """
+    if state_dir is None:
+        from path_manager import get_project_paths
+
+        state_dir = get_project_paths()["logs"] / ".rate_limits"
+    key = (model, str(state_dir))
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(model, state_dir)
+            _limiters[key] = limiter
+        return limiter
+
+
+def estimate_input_tokens(api_params: dict) -> int:
+    """Rough input token count for a request (~4 characters per token)"""
+    text = json.dumps(api_params.get("system") or "", ensure_ascii=False)
+    text += json.dumps(api_params.get("messages") or [], ensure_ascii=False, default=str)
+    if api_params.get("tools"):
+        text += json.dumps(api_params["tools"], ensure_ascii=False)
+    return max(1, len(text) // 4)
+
+
+def retry_delay(error: Exception, attempt: int):
+    """Seconds to wait before retrying a failed request, or None if it should not be retried
+
+    Args:
+        error: Exception raised by the API call
+        attempt: Zero-based number of the attempt that failed
+
+    Returns:
+        Delay in seconds (retry-after header when present, otherwise full-jitter
+        exponential backoff), or None for non-retryable errors / exhausted attempts
+    """
+    if attempt + 1 >= MAX_ATTEMPTS:
+        return None
+    if isinstance(error, anthropic.APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        retry_after = _parse_retry_after(error.response.headers)
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX_SECONDS) + random.uniform(0, 1)
+    elif not isinstance(error, anthropic.APIConnectionError):
+        return None
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for errors that mean the org is over its limit (429) or the API is overloaded (529)"""
+    return isinstance(error, anthropic.APIStatusError) and error.status_code in (429, 529)
+
+
+def _parse_retry_after(headers):
+    """Parse retry-after-ms / retry-after (seconds or HTTP date) into seconds"""
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token-bucket limiter for one model, shared across processes through a state file"""
+
+    def __init__(self, model: str, state_dir):
+        """
+        Args:
+            model: Model name the buckets apply to
+            state_dir: Directory holding {model}.json state and {model}.lock
+        """
+        self.model = model
+        self.state_dir = Path(state_dir)
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in model)
+        self.state_file = self.state_dir / f"{safe_name}.json"
+        self.lock_file = self.state_dir / f"{safe_name}.lock"
+        self._thread_lock = threading.Lock()
+        self._pinned_limits = {}
+        for dim, env_var in _LIMIT_ENV_VARS.items():
+            if os.environ.get(env_var):
+                self._pinned_limits[dim] = float(os.environ[env_var])
+
+    def acquire(self, input_tokens: int) -> None:
+        """Block until a request with ~input_tokens input tokens fits, then reserve it"""
+        while True:
+            wait = self._reserve(input_tokens)
+            if wait <= 0:
+                return
+            time.sleep(min(wait, _MAX_WAIT_SLICE) + random.uniform(0, 0.05))
+
+    async def aacquire(self, input_tokens: int) -> None:
+        """Async version of acquire()"""
+        import asyncio
+
+        while True:
+            wait = self._reserve(input_tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, _MAX_WAIT_SLICE) + random.uniform(0, 0.05))
+
+    def record(self, usage, estimated_input_tokens: int, headers=None) -> None:
+        """Reconcile a finished request against its reservation and learn limits from headers
+
+        Args:
+            usage: Response usage (input_tokens, output_tokens, cache_creation_input_tokens),
+                or None when the request failed
+            estimated_input_tokens: Input tokens reserved by acquire()
+            headers: Response headers (anthropic-ratelimit-* values), if available
+        """
+        with self._state() as state:
+            tokens, limits = state["tokens"], state["limits"]
+            if usage is None:
+                # Request failed before being billed; hand its input reservation back
+                if limits["input-tokens"]:
+                    tokens["input-tokens"] += estimated_input_tokens
+            else:
+                actual_input = (getattr(usage, "input_tokens", 0) or 0) + (
+                    getattr(usage, "cache_creation_input_tokens", 0) or 0
+                )
+                if limits["input-tokens"]:
+                    tokens["input-tokens"] -= actual_input - estimated_input_tokens
+                if limits["output-tokens"]:
+                    tokens["output-tokens"] -= getattr(usage, "output_tokens", 0) or 0
+            if headers is not None:
+                self._learn_from_headers(state, headers)
+
+    def backoff(self, seconds: float) -> None:
+        """Pause every caller sharing this bucket for the given number of seconds"""
+        with self._state() as state:
+            state["blocked_until"] = max(state["blocked_until"], time.time() + seconds)
+
+    def _reserve(self, input_tokens: int) -> float:
+        """Reserve capacity for one request; return 0 on success or seconds to wait"""
+        with self._state() as state:
+            now = time.time()
+            wait = state["blocked_until"] - now
+            if wait > 0:
+                return wait
+
+            needs = {"requests": 1, "input-tokens": input_tokens, "output-tokens": 0}
+            for dim, need in needs.items():
+                limit = state["limits"][dim]
+                if not limit:
+                    continue
+                # A request larger than the whole bucket may go once the bucket is full;
+                # output tokens are only known afterwards, so just require no debt
+                need = max(min(need, limit), 1)
+                deficit = need - state["tokens"][dim]
+                if deficit > 0:
+                    wait = max(wait, deficit / (limit / 60.0))
+            if wait > 0:
+                return wait
+
+            # Dimensions whose limit is still unknown are not counted: nothing refills them
+            for dim, need in (("requests", 1), ("input-tokens", input_tokens)):
+                if state["limits"][dim]:
+                    state["tokens"][dim] -= need
+            return 0.0
+
+    def _learn_from_headers(self, state: dict, headers) -> None:
+        for dim in DIMENSIONS:
+            if dim in self._pinned_limits:
+                continue
+            limit = headers.get(f"anthropic-ratelimit-{dim}-limit")
+            remaining = headers.get(f"anthropic-ratelimit-{dim}-remaining")
+            try:
+                if limit:
+                    if not state["limits"][dim]:
+                        state["tokens"][dim] = float(limit)
+                    state["limits"][dim] = float(limit)
+                if remaining:
+                    # The server's count wins when it is lower than ours
+                    state["tokens"][dim] = min(state["tokens"][dim], float(remaining))
+            except ValueError:
+                continue
+
+    @contextmanager
+    def _state(self):
+        """Lock, load and refill the shared state; write it back on exit"""
+        with self._thread_lock, _file_lock(self.lock_file):
+            state = self._load()
+            self._refill(state, time.time())
+            yield state
+            self.state_file.write_text(json.dumps(state), encoding="utf-8")
+
+    def _load(self) -> dict:
+        state = None
+        if self.state_file.exists():
+            try:
+                state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                state = None  # torn write from a killed process; start fresh
+        if not isinstance(state, dict):
+            state = {
+                "model": self.model,
+                "limits": {dim: None for dim in DIMENSIONS},
+                "tokens": {dim: 0.0 for dim in DIMENSIONS},
+                "updated": time.time(),
+                "blocked_until": 0.0,
+            }
+        for dim, limit in self._pinned_limits.items():
+            if state["limits"].get(dim) != limit:
+                state["limits"][dim] = limit
+                state["tokens"][dim] = limit
+        return state
+
+    def _refill(self, state: dict, now: float) -> None:
+        elapsed = max(0.0, now - state["updated"])
+        for dim in DIMENSIONS:
+            limit = state["limits"][dim]
+            if limit:
+                state["tokens"][dim] = min(limit, state["tokens"][dim] + elapsed * limit / 60.0)
+        state["updated"] = now
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive inter-process lock on path (fcntl on POSIX, msvcrt on Windows)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,186 @@
+"""Content-addressed on-disk cache for Claude responses
+
+A response is stored under the SHA-256 of the exact request ClaudeClient would send
+(model, system blocks, messages incl. prefill, temperature, max_tokens, stop sequences),
+so a rerun whose built prompt is byte-identical to an earlier one is answered from disk
+instead of paying for the tokens again.
+
+Entries live in logs/.response_cache/{key[:2]}/{key}.json. Entries older than the TTL are
+ignored and removed; when the cache grows past its size budget the least recently used
+entries (by file mtime, refreshed on every hit) are evicted first.
+
+Caching is opt-in: steps enable it with "cache_responses": true, and the temperature-0
+helper calls (content validator, batch_continuous summarizer) always use it. Setting
+CLAUDE_NO_CACHE=1 (the --no-cache CLI flag) turns every cache off, including in any
+subprocesses a run spawns.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+NO_CACHE_ENV_VAR = "CLAUDE_NO_CACHE"
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def response_cache_enabled() -> bool:
+    """False when caching was disabled for this run (--no-cache / CLAUDE_NO_CACHE=1)"""
+    return os.environ.get(NO_CACHE_ENV_VAR, "").strip().lower() not in ("1", "true", "yes")
+
+
+def get_response_cache() -> Optional["ResponseCache"]:
+    """Return the process-wide ResponseCache, or None when caching is disabled"""
+    global _default_cache
+    if not response_cache_enabled():
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            from path_manager import get_project_paths
+
+            _default_cache = ResponseCache(get_project_paths()["logs"] / ".response_cache")
+        return _default_cache
+
+
+class ResponseCache:
+    """Size- and age-bounded response store keyed on a hash of the API request"""
+
+    def __init__(
+        self,
+        cache_dir,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Total size budget; LRU entries are evicted beyond it
+            ttl_seconds: Entries older than this are treated as misses
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._approx_size = None  # computed lazily on first put
+
+    @staticmethod
+    def make_key(api_params: dict) -> str:
+        """Hash the request parameters that determine the response"""
+        keyed = {
+            name: api_params.get(name)
+            for name in (
+                "model",
+                "system",
+                "messages",
+                "temperature",
+                "max_tokens",
+                "stop_sequences",
+            )
+        }
+        canonical = json.dumps(keyed, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            stat = path.stat()
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self._remove(path, stat.st_size)
+            self._count(hit=False)
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry.get("text")
+
+    def put(self, key: str, text: str, model: str = None) -> None:
+        """Store a response and evict old entries if the cache is over budget"""
+        path = self._entry_path(key)
+        payload = json.dumps(
+            {"key": key, "model": model, "created": time.time(), "text": text},
+            ensure_ascii=False,
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._approx_size is None:
+                self._approx_size = self._scan_size()
+            else:
+                self._approx_size += len(payload.encode("utf-8"))
+            over_budget = self._approx_size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        entries = []
+        now = time.time()
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        # Oldest mtime first: TTL-expired entries go regardless, the rest until under budget
+        for mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            expired = now - mtime > self.ttl_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            self._remove(path, 0)
+            total -= size
+
+        with self._lock:
+            self._approx_size = total
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _remove(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        if size:
+            with self._lock:
+                if self._approx_size is not None:
+                    self._approx_size -= size
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
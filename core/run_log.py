@@ -0,0 +1,168 @@
+"""
+Run Log - console.txt and a structured event log for a pipeline run, written in the background
+
+run_pipeline used to copy every console write into console.txt on the thread that
+printed it and flush the file each time, so verbose per-item logging cost a disk flush
+per print in the middle of the run.
+
+A RunLog takes the run's console text and structured events on a bounded queue. One
+background thread appends them: console text to console.txt, events as JSON lines to
+run_log.jsonl. Files are flushed each time the queue is drained, not per write; when
+the queue is full, writers wait for it (bounded memory). Logs still open at interpreter
+exit are drained and closed by an atexit hook, and run_pipeline closes its log when a
+run fails, so the output of a crashed run is on disk.
+
+    {"t": 0.004, "event": "run_start", "pipeline": "lesson_generator_dialogue_pass", ...}
+    {"t": 12.8, "event": "step_start", "step": 5, "name": "section_structurer"}
+    {"t": 24.1, "event": "item_end", "step": 5, "item": "s1_2", "seconds": 11.3, "status": "ok"}
+    {"t": 97.1, "event": "step_end", "step": 5, "name": "section_structurer", "seconds": 84.2,
+     "status": "ok", "requests": 14, "input_tokens": 98512, ...}
+
+t is seconds since the run started. Read it back with read_events().
+
+Verbosity levels for run_pipeline(verbose=...): QUIET (False), INFO (True) and DEBUG,
+which adds per-item diagnostics (variable previews, tracebacks) that are otherwise not
+built at all.
+"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+QUIET, INFO, DEBUG = 0, 1, 2
+
+# Entries waiting to be written before writers block
+MAX_PENDING = 10_000
+
+_open_logs = set()
+_open_logs_lock = threading.Lock()
+
+
+class RunLog:
+    """console.txt + run_log.jsonl of one run, appended by a background thread"""
+
+    def __init__(self, directory: Path, append: bool = False, max_pending: int = MAX_PENDING):
+        """
+        Args:
+            directory: Version directory the files are written to
+            append: Append to existing files (a rerun reusing its version directory)
+            max_pending: Entries buffered before write() and event() wait for the writer
+        """
+        directory = Path(directory)
+        self.console_path = directory / "console.txt"
+        self.events_path = directory / "run_log.jsonl"
+        mode = "a" if append else "w"
+        self._console = open(self.console_path, mode, encoding="utf-8")
+        self._events = open(self.events_path, mode, encoding="utf-8")
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._start = time.monotonic()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain, name="run-log", daemon=True)
+        self._thread.start()
+        with _open_logs_lock:
+            _open_logs.add(self)
+
+    def write(self, text: str) -> None:
+        """Append console text (what the run printed) to console.txt"""
+        if text and not self._closed:
+            self._queue.put(("console", text))
+
+    def event(self, kind: str, **fields) -> None:
+        """Append a structured event to run_log.jsonl"""
+        if not self._closed:
+            record = {"t": round(time.monotonic() - self._start, 3), "event": kind, **fields}
+            self._queue.put(("event", record))
+
+    @contextmanager
+    def span(self, kind: str, **fields) -> Iterator[Dict]:
+        """Log {kind}_start and {kind}_end (seconds, status) around a block
+
+        The block can add fields to the end event through the yielded dict.
+        """
+        self.event(f"{kind}_start", **fields)
+        start = time.monotonic()
+        end = {}
+        try:
+            yield end
+        except BaseException as e:
+            self.event(
+                f"{kind}_end",
+                **fields,
+                **end,
+                seconds=round(time.monotonic() - start, 3),
+                status="error",
+                error=f"{type(e).__name__}: {e}",
+            )
+            raise
+        self.event(
+            f"{kind}_end", **fields, **end, seconds=round(time.monotonic() - start, 3), status="ok"
+        )
+
+    def flush(self) -> None:
+        """Wait until everything logged so far is written"""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write what is pending and close the files (later writes are dropped)"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._console.close()
+        self._events.close()
+        with _open_logs_lock:
+            _open_logs.discard(self)
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for entry in batch:
+                    if entry is None:
+                        continue
+                    kind, payload = entry
+                    if kind == "console":
+                        self._console.write(payload)
+                    else:
+                        self._events.write(
+                            json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+                        )
+                self._console.flush()
+                self._events.flush()
+            except Exception:
+                pass  # Logging never fails the run
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+
+def read_events(path: Path) -> List[Dict]:
+    """Events of a run_log.jsonl (a version directory or the file itself)"""
+    path = Path(path)
+    if path.is_dir():
+        path = path / "run_log.jsonl"
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@atexit.register
+def _close_open_logs() -> None:
+    with _open_logs_lock:
+        logs = list(_open_logs)
+    for log in logs:
+        log.close()
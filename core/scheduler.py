@@ -0,0 +1,295 @@
+"""
+Scheduler - Runs several pipelines side by side in one process
+
+cli/run_module.py used to start one run_pipeline.py subprocess per pipeline. Each
+subprocess re-imported everything, re-read the shared reference docs and kept its own
+prompt cache, and a "pipeline::step/file" context_files ref (exitcheck reading lesson's
+section_structurer output) read whatever version of the other pipeline was on disk at
+the time, finished or not.
+
+run_pipelines() runs the pipelines as threads of one process instead, so they share the
+doc cache, the response cache and the per-model Claude rate limiter. Each step's inputs
+are taken from its config:
+
+- auto-chained steps (no input_file) read the previous step's output
+- context_files "step/file" read an earlier step of the same pipeline
+- context_files "pipeline::step/file" read a step of another pipeline; when that pipeline
+  is part of the run, the step waits for that step and reads the version being written
+
+Steps within a pipeline run in order, since each one consumes its predecessor's output.
+Pipelines run concurrently, and a step that reads another pipeline waits only for the
+step it reads. The graph is checked before anything runs (unknown refs, cycles), and a
+failed pipeline fails only the steps that depend on it.
+
+Each pipeline's full log goes to its console.txt; the terminal shows one combined
+progress display:
+
+    [lesson   ]  5/13 section_structurer done in 84.2s
+    [exitcheck] 11/13 remediation_generator waiting for lesson: section_structurer
+
+    runs = [PipelineRun(label, name, PIPELINES[name]) for label, name in ...]
+    results = run_pipelines(runs, module_number=4, unit_number=1)
+"""
+
+import contextvars
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .pipeline import Step, run_pipeline
+
+# A step in the run: (pipeline_name, 1-indexed step number)
+StepKey = Tuple[str, int]
+
+
+class DependencyError(ValueError):
+    """The steps' declared inputs cannot be satisfied (unknown step, cycle)"""
+
+
+class DependencyFailed(RuntimeError):
+    """A step another pipeline depends on did not finish"""
+
+
+class PipelineRun:
+    """One pipeline to run under the scheduler"""
+
+    def __init__(self, label: str, pipeline_name: str, steps: List[Step], **options):
+        """
+        Args:
+            label: Short name shown in the progress display (e.g. "lesson")
+            pipeline_name: Pipeline name, as used in outputs and "pipeline::" refs
+            steps: The pipeline's steps
+            **options: Extra run_pipeline arguments for this pipeline only
+        """
+        self.label = label
+        self.pipeline_name = pipeline_name
+        self.steps = steps
+        self.options = options
+
+
+class RunResult:
+    """Outcome of one pipeline run"""
+
+    def __init__(self, label: str, pipeline_name: str):
+        self.label = label
+        self.pipeline_name = pipeline_name
+        self.error: Optional[str] = None
+        self.seconds = 0.0
+        self.steps_done = 0
+        self.output_dir: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def step_name(step: Step) -> str:
+    """Name a step's output directory ends in (and context_files refs use)"""
+    return step.prompt_name if step.is_ai_step() else str(step.function).split(".")[-1]
+
+
+def build_step_graph(runs: List[PipelineRun]) -> Dict[StepKey, Set[StepKey]]:
+    """Map every step of the run to the steps whose outputs it reads
+
+    Raises:
+        DependencyError: A ref names a step that does not exist (or, within a pipeline,
+                         does not run before the step reading it), or steps of different
+                         pipelines wait on each other in a cycle
+    """
+    names = {run.pipeline_name: [step_name(step) for step in run.steps] for run in runs}
+    if len(names) != len(runs):
+        raise DependencyError("Each pipeline can only be scheduled once per run")
+
+    graph: Dict[StepKey, Set[StepKey]] = {}
+    for run in runs:
+        for i, step in enumerate(run.steps, 1):
+            deps = graph.setdefault((run.pipeline_name, i), set())
+            if i > 1:
+                # Sequential within a pipeline; auto-chained steps also read this output
+                deps.add((run.pipeline_name, i - 1))
+            for ref in step.context_files.values():
+                if "::" in ref:
+                    other, step_ref = ref.split("::", 1)
+                    if other not in names:
+                        continue  # Not in this run: read from its latest version on disk
+                else:
+                    other, step_ref = run.pipeline_name, ref
+                ref_name = step_ref.split("/", 1)[0]
+                candidates = names[other] if other != run.pipeline_name else names[other][: i - 1]
+                if ref_name not in candidates:
+                    raise DependencyError(
+                        f"{run.pipeline_name} step {i} ({step_name(step)}) reads '{ref}', "
+                        f"but {other} has no {'earlier ' if other == run.pipeline_name else ''}"
+                        f"step named {ref_name}"
+                    )
+                deps.add((other, candidates.index(ref_name) + 1))
+
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: Dict[StepKey, Set[StepKey]]) -> None:
+    remaining = {key: set(deps) for key, deps in graph.items()}
+    while remaining:
+        ready = [key for key, deps in remaining.items() if not deps]
+        if not ready:
+            cycle = ", ".join(f"{name} step {i}" for name, i in sorted(remaining))
+            raise DependencyError(f"Steps wait on each other in a cycle: {cycle}")
+        for key in ready:
+            del remaining[key]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+class _Progress:
+    """Combined progress display: one line per event, prefixed with the pipeline label"""
+
+    def __init__(self, runs: List[PipelineRun]):
+        self._width = max(len(run.label) for run in runs)
+        self._totals = {run.pipeline_name: len(run.steps) for run in runs}
+        self._lock = threading.Lock()
+
+    def line(self, run: PipelineRun, message: str, step_num: int = None) -> None:
+        if step_num is not None:
+            total = self._totals[run.pipeline_name]
+            message = f"{step_num:>{len(str(total))}}/{total} {message}"
+        text = f"[{run.label:<{self._width}}] {message}"
+        with self._lock:
+            # Print outside any run's console context: to the terminal, not a console.txt
+            contextvars.Context().run(print, text, flush=True)
+
+
+class _Scheduler:
+    """Shared state of one run_pipelines() call"""
+
+    def __init__(self, runs: List[PipelineRun], graph: Dict[StepKey, Set[StepKey]]):
+        self.runs = {run.pipeline_name: run for run in runs}
+        self.graph = graph
+        self.progress = _Progress(runs)
+        # Version directory each pipeline is writing, once its first step is done
+        self.version_dirs: Dict[str, Path] = {}
+        self._events = {key: threading.Event() for key in graph}
+        self._finished: Set[StepKey] = set()
+
+    def finish(self, key: StepKey, step_dir: Path) -> None:
+        self.version_dirs.setdefault(key[0], Path(step_dir).parent)
+        self._finished.add(key)
+        self._events[key].set()
+
+    def abandon(self, pipeline_name: str) -> None:
+        """Release every step of a pipeline that stopped; unfinished ones count as failed"""
+        for key, event in self._events.items():
+            if key[0] == pipeline_name:
+                event.set()
+
+    def wait(self, key: StepKey, waiter: StepKey) -> None:
+        event = self._events[key]
+        if event.is_set():
+            self._check(key, waiter)
+            return
+        run, other = self.runs[waiter[0]], self.runs[key[0]]
+        self.progress.line(
+            run,
+            f"{step_name(run.steps[waiter[1] - 1])} waiting for "
+            f"{other.label}: {step_name(other.steps[key[1] - 1])}",
+            waiter[1],
+        )
+        event.wait()
+        self._check(key, waiter)
+
+    def _check(self, key: StepKey, waiter: StepKey) -> None:
+        if key not in self._finished:
+            other = self.runs[key[0]]
+            raise DependencyFailed(
+                f"step {waiter[1]} reads {other.label} step {key[1]} "
+                f"({step_name(other.steps[key[1] - 1])}), which did not finish"
+            )
+
+
+class _StepGate:
+    """run_pipeline's step_gate for one pipeline under the scheduler"""
+
+    def __init__(self, scheduler: _Scheduler, run: PipelineRun, result: RunResult):
+        self._scheduler = scheduler
+        self._run = run
+        self._result = result
+        self._started: Dict[int, float] = {}
+
+    @property
+    def sibling_dirs(self) -> Dict[str, Path]:
+        return self._scheduler.version_dirs
+
+    def wait_for_inputs(self, step_num: int) -> None:
+        key = (self._run.pipeline_name, step_num)
+        for dep in sorted(self._scheduler.graph[key]):
+            if dep[0] != key[0]:
+                self._scheduler.wait(dep, key)
+        self._started[step_num] = time.monotonic()
+
+    def step_finished(self, step_num: int, step_dir: Path) -> None:
+        self._scheduler.finish((self._run.pipeline_name, step_num), step_dir)
+        self._result.steps_done += 1
+        if step_num in self._started:
+            seconds = time.monotonic() - self._started.pop(step_num)
+            self._scheduler.progress.line(
+                self._run,
+                f"{step_name(self._run.steps[step_num - 1])} done in {seconds:.1f}s",
+                step_num,
+            )
+
+
+def run_pipelines(runs: List[PipelineRun], **kwargs) -> List[RunResult]:
+    """Run pipelines concurrently in this process, each step after the steps it reads
+
+    Args:
+        runs: Pipelines to run
+        **kwargs: run_pipeline arguments shared by every pipeline (module_number,
+                  unit_number, ...)
+
+    Returns:
+        RunResult per pipeline, in the order of runs
+
+    Raises:
+        DependencyError: The steps' inputs cannot be satisfied (nothing is run)
+    """
+    scheduler = _Scheduler(runs, build_step_graph(runs))
+    results = [RunResult(run.label, run.pipeline_name) for run in runs]
+
+    def _run(run: PipelineRun, result: RunResult) -> None:
+        start = time.monotonic()
+        gate = _StepGate(scheduler, run, result)
+        try:
+            outcome = run_pipeline(
+                run.steps,
+                pipeline_name=run.pipeline_name,
+                console_echo=False,
+                step_gate=gate,
+                **{**kwargs, **run.options},
+            )
+            result.output_dir = outcome.get("output_dir")
+            if outcome.get("status") == "stopped":
+                result.error = f"stopped at step {outcome.get('stopped_at_step')}"
+        except (Exception, SystemExit) as e:
+            result.error = str(e) if not isinstance(e, SystemExit) else f"exited ({e.code})"
+        finally:
+            scheduler.abandon(run.pipeline_name)
+            result.seconds = time.monotonic() - start
+            if result.output_dir is None and run.pipeline_name in scheduler.version_dirs:
+                result.output_dir = str(scheduler.version_dirs[run.pipeline_name])
+            scheduler.progress.line(
+                run,
+                f"DONE in {result.seconds:.1f}s"
+                if result.ok
+                else f"FAILED after {result.seconds:.1f}s: {result.error}",
+            )
+
+    threads = [
+        threading.Thread(target=_run, args=(run, result), name=f"pipeline-{run.label}", daemon=True)
+        for run, result in zip(runs, results)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
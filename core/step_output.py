@@ -0,0 +1,231 @@
+"""Step output handoff between consecutive pipeline steps
+
+run_pipeline used to pass each step's result to the next one through disk only: the
+output was dumped to a JSON string, written to the step directory, read back by the
+next step and parsed again (for formatting-step input, for batch config overrides and
+for batch items). A StepOutput carries the step's main output in memory instead:
+
+- value: the parsed Python value (collated batch results, parsed AI JSON, the dict/list
+  a formatting step returned), handed to the next step as-is
+- text: the file contents, serialized once and shared by the file write and by the next
+  AI step's input_content
+
+Only a cold start reads the file back (start_from_step, an explicit input_file that is
+not the previous step's output); StepOutput.load() then parses it at most once.
+
+OutputWriter writes main outputs on a background thread so a multi-megabyte write
+overlaps the next step's API calls. run_pipeline flushes it before anything that may
+read the version directory (formatting steps, context_files, inputs loaded from disk)
+and before the run finishes.
+
+    output = StepOutput.from_value(path, collated_results)
+    writer.write(output)
+    items = output.data()  # next batch step: no json.loads
+
+With run_pipeline(stream=True) a step inside a streaming segment hands its output on
+item by item instead: a StreamedOutput receives the results of each input item as the
+step collates them, and the next step consumes them while the producer is still
+running. Each put() also rewrites the producer's main output file with everything
+collated so far, so formatting functions that look up earlier steps' files (the
+mergers) find the items that already passed through.
+
+    stream = StreamedOutput(path)
+    stream.put([section])                      # producer, in input order
+    for items, only_ids in stream.chunks():    # consumer, blocks until the next chunk
+        ...
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Sibling core modules are imported flat (also when loaded as core.step_output)
+core_dir = Path(__file__).parent
+if str(core_dir) not in sys.path:
+    sys.path.insert(0, str(core_dir))
+
+from telemetry import phase, record  # noqa: E402
+
+_UNPARSED = object()
+_NOT_JSON = object()
+
+
+class StepOutput:
+    """A step's main output: its file path, parsed value and serialized text"""
+
+    def __init__(self, path: Path, value: Any = _UNPARSED, text: Optional[str] = None):
+        """
+        Args:
+            path: Main output file the text is (or will be) written to
+            value: Parsed value, if known
+            text: File contents, if known (serialized from value on first use otherwise)
+        """
+        self.path = Path(path)
+        self._value = value
+        self._text = text
+
+    @classmethod
+    def from_value(cls, path: Path, value: Any) -> "StepOutput":
+        """Output of a formatting step: dicts and lists are JSON, anything else is text"""
+        if isinstance(value, (dict, list)):
+            return cls(path, value=value)
+        return cls(path, text=str(value))
+
+    @classmethod
+    def load(cls, path: Path) -> "StepOutput":
+        """Read an output written by an earlier run (parsed lazily, at most once)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(path, text=f.read())
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self._value, indent=2, ensure_ascii=False)
+        return self._text
+
+    def data(self) -> Any:
+        """The parsed value
+
+        Raises:
+            ValueError: If the text is not JSON
+        """
+        if self._value is _UNPARSED:
+            try:
+                self._value = json.loads(self._text)
+            except ValueError:
+                self._value = _NOT_JSON
+        if self._value is _NOT_JSON:
+            raise ValueError(f"{self.path.name} is not JSON")
+        return self._value
+
+    def is_output_of(self, path: Path) -> bool:
+        return self.path.resolve() == Path(path).resolve()
+
+
+def _write_text(path: Path, text: str) -> None:
+    # Replaced atomically: a streaming step may read the file while it is rewritten
+    tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    with phase("write"):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    record(bytes_written=len(text.encode("utf-8")))
+
+
+class OutputWriter:
+    """Writes step outputs, on a single background thread when background=True"""
+
+    def __init__(self, background: bool = True):
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+            if background
+            else None
+        )
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def write(self, output: StepOutput) -> None:
+        """Write output.text to output.path (serialized here, written in the background)"""
+        # The background write is counted in the telemetry spans of the caller
+        context = contextvars.copy_context()
+        with phase("write"):
+            text = output.text
+        if self._executor is None:
+            context.run(_write_text, output.path, text)
+        else:
+            with self._lock:
+                self._pending.append(
+                    self._executor.submit(context.run, _write_text, output.path, text)
+                )
+
+    def flush(self) -> None:
+        """Wait for pending writes; re-raises the first write error"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Wait for pending writes and stop the writer thread; re-raises a write error"""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+
+class StreamedOutput:
+    """A step's output handed to the next step one input item at a time
+
+    The producing step put()s the results of each of its input items (a list, possibly
+    empty) in input order and the run closes the stream when the step is done. The
+    consuming step iterates chunks() as they arrive.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: The producing step's main output file
+        """
+        self.path = Path(path)
+        self._chunks: List[Tuple[list, Optional[list]]] = []
+        self._items: list = []
+        self._only_ids: Optional[list] = None
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    def put(self, items: list, only_ids: Optional[list] = None) -> None:
+        """Hand on the results of one input item
+
+        Args:
+            items: The item's results
+            only_ids: IDs among items the next batch step should process, when the
+                      producer is a filter that returns {"batch_only_items", "data"}
+        """
+        with self._cond:
+            self._items.extend(items)
+            if only_ids is not None:
+                self._only_ids = (self._only_ids or []) + list(only_ids)
+            snapshot = StepOutput(self.path, value=self.value())
+        _write_text(self.path, snapshot.text)
+        with self._cond:
+            self._chunks.append((list(items), None if only_ids is None else list(only_ids)))
+            self._cond.notify_all()
+
+    def value(self) -> Any:
+        """Everything put so far, shaped like the step's collated output"""
+        if self._only_ids is None:
+            return list(self._items)
+        return {"batch_only_items": list(self._only_ids), "data": list(self._items)}
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        """End the stream with the producer's error (re-raised in the consumer)"""
+        with self._cond:
+            self._error = error
+            self._cond.notify_all()
+
+    def chunks(self) -> Iterator[Tuple[list, Optional[list]]]:
+        """Yield (items, only_ids) per producer input item, waiting for each to arrive"""
+        n = 0
+        while True:
+            with self._cond:
+                while n >= len(self._chunks) and not self._closed and self._error is None:
+                    self._cond.wait()
+                if self._error is not None:
+                    raise self._error
+                if n >= len(self._chunks):
+                    return
+                chunk = self._chunks[n]
+            n += 1
+            yield chunk
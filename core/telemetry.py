@@ -0,0 +1,154 @@
+"""
+Telemetry - Where a pipeline run spends its time and tokens
+
+metadata.json used to record only a total duration_seconds, and token usage was only
+available as process-wide totals (claude_client.get_usage_totals()), which mix up
+pipelines running side by side (core/scheduler.py) and concurrent batch items.
+
+run_pipeline opens a span for the run, each step and each batch item. Spans live in a
+context variable, so worker threads started with contextvars.copy_context() record
+into the spans of the step and item they work for. Whatever runs inside a span records
+into it and every enclosing span:
+
+- counters, via record(): Claude requests and input/output/cache tokens, retries and
+  response cache hits (core/claude_client.py), bytes written (core/step_output.py)
+- phase times, via phase(): prompt_build, api, rate_limit_wait, retry_wait,
+  json_parse, validation, write. Phases do not nest: time inside an open phase counts
+  for it only, so a content validation's request and its rate limit waits are
+  validation time, not api time
+
+Phase times are summed over the threads that ran in the span, so with batch_concurrency
+a step's phases can add up to more than its wall time (seconds).
+
+    metadata["telemetry"] = {
+        "seconds": 2411.2, "requests": 96, "input_tokens": 1240311, ...,
+        "phases": {"api": 2011.5, "prompt_build": 14.2, ...},
+        "steps": {
+            "step_05_section_structurer": {
+                "seconds": 512.3, "requests": 28, ..., "phases": {...},
+                "items": {"s1_2": {"seconds": 31.0, "requests": 2, ...}, ...}
+            }
+        }
+    }
+
+python cli/report.py renders it per step and compares two versions.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Claude usage counters, as in claude_client.get_usage_totals()
+USAGE_KEYS = (
+    "requests",
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_tokens",
+    "cache_read_tokens",
+)
+
+# Spans the current context records into, outermost first
+_spans = contextvars.ContextVar("telemetry_spans", default=())
+# Name of the phase open in the current context
+_phase = contextvars.ContextVar("telemetry_phase", default=None)
+
+
+class Span:
+    """Wall time, counters and phase times of one run, step or batch item"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.seconds: Optional[float] = None
+        self.counts: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+        self.items: Dict[str, "Span"] = {}
+        self._lock = threading.Lock()
+
+    def add(self, **counts) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self.counts[key] = self.counts.get(key, 0) + value
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary (items included, keyed by item ID)"""
+        with self._lock:
+            seconds = self.seconds if self.seconds is not None else time.monotonic() - self.started
+            data = {
+                "seconds": round(seconds, 3),
+                **self.counts,
+                "phases": {name: round(value, 3) for name, value in sorted(self.phases.items())},
+            }
+            items = dict(self.items)
+        if items:
+            data["items"] = {item_id: item.to_dict() for item_id, item in items.items()}
+        return data
+
+
+@contextmanager
+def span(item_id: str = None) -> Iterator[Span]:
+    """Open a span inside the current ones
+
+    Args:
+        item_id: Keep the span as an item of the enclosing span under this ID
+    """
+    new_span = Span()
+    parents = _spans.get()
+    if item_id is not None and parents:
+        with parents[-1]._lock:
+            parents[-1].items[item_id] = new_span
+    token = _spans.set(parents + (new_span,))
+    try:
+        yield new_span
+    finally:
+        new_span.seconds = time.monotonic() - new_span.started
+        _spans.reset(token)
+
+
+def current() -> Optional[Span]:
+    """Innermost open span of this context (None outside a pipeline run)"""
+    spans = _spans.get()
+    return spans[-1] if spans else None
+
+
+def record(**counts) -> None:
+    """Add counters to every open span of this context"""
+    for open_span in _spans.get():
+        open_span.add(**counts)
+
+
+def record_usage(usage) -> None:
+    """Record one Claude response's usage (an anthropic Usage object)"""
+    record(
+        requests=1,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_creation_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+    )
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block as phase name in every open span of this context
+
+    Inside another phase the block is part of that phase and is not timed again.
+    """
+    spans = _spans.get()
+    if not spans or _phase.get() is not None:
+        yield
+        return
+    token = _phase.set(name)
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        elapsed = time.monotonic() - start
+        _phase.reset(token)
+        for open_span in spans:
+            open_span.add_phase(name, elapsed)
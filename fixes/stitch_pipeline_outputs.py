@@ -177,7 +177,7 @@ def _stitch(pipeline_dir: Path, versions: list[str], dest: Path, replace: bool =
                 dest_step = dest / step_dir.name
                 dest_step.mkdir(exist_ok=True)
                 _merge_step(dest_step, step_dir)
-            for fname in ("metadata.json", "console.txt"):
+            for fname in ("metadata.json", "console.txt", "run_log.jsonl"):
                 f = src / fname
                 if f.exists():
                     shutil.copy2(f, dest / fname)
@@ -458,7 +458,7 @@ def run_legacy_mode(args) -> None:
                 )
                 print(f"  [NEW]     {new_step_dir.name}")
 
-    for fname in ("metadata.json", "console.txt"):
+    for fname in ("metadata.json", "console.txt", "run_log.jsonl"):
         src = new_pipeline / fname
         if src.exists():
             shutil.copy2(src, dest / fname)
@@ -158,26 +158,10 @@ def _lookup_page_in_database(
 
 
 def _fetch_all_blocks(client, block_id: str) -> list:
-    """Fetch all child blocks (paginated), then recursively fetch their children."""
-    results: list = []
-    cursor = None
-    while True:
-        kwargs: dict = {"block_id": block_id}
-        if cursor:
-            kwargs["start_cursor"] = cursor
-        response = client.blocks.children.list(**kwargs)
-        results.extend(response["results"])
-        if not response["has_more"]:
-            break
-        cursor = response["next_cursor"]
-
-    for block in results:
-        if block.get("has_children"):
-            btype = block.get("type", "")
-            block.setdefault(btype, {})
-            block[btype]["children"] = _fetch_all_blocks(client, block["id"])
+    """Fetch all child blocks (paginated) and their children, level by level, concurrently."""
+    from utils.notion_api import fetch_block_tree
 
-    return results
+    return fetch_block_tree(client, block_id)
 
 
 # ---------------------------------------------------------------------------
@@ -69,6 +69,7 @@ Pipeline config example:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 from pathlib import Path
@@ -88,6 +89,9 @@ _MODULE_TEMPLATES: dict[int, str] = {
     12: "array_template",
 }
 
+# Max Claude sting_id fallback requests in flight at once
+_AI_FALLBACK_CONCURRENCY = 8
+
 
 # ---------------------------------------------------------------------------
 # Naming helpers
@@ -187,7 +191,7 @@ def _extract_incorrect_count(condition: dict) -> int | None:
     return None
 
 
-def _ai_slug_from_selected(selected: str) -> str:
+async def _ai_slug_from_selected(selected: str) -> str:
     """Use Claude to produce a concise snake_case slug from a selected answer string."""
     try:
         import sys
@@ -203,7 +207,8 @@ def _ai_slug_from_selected(selected: str) -> str:
             "Reply with only the identifier, nothing else."
         )
         client = ClaudeClient()
-        result = client.generate(user_message=prompt, max_tokens=20, temperature=0).strip().lower()
+        response = await client.agenerate(user_message=prompt, max_tokens=20, temperature=0)
+        result = response.strip().lower()
         slug = re.sub(r"[^a-z0-9]+", "_", result).strip("_")
         return slug or re.sub(r"[^a-z0-9]+", "_", selected.lower()).strip("_")
     except Exception as e:
@@ -235,7 +240,7 @@ def _sting_id_from_validator(validator: dict) -> str | None:
     return None
 
 
-def _ai_infer_sting_id(validator: dict) -> str:
+async def _ai_infer_sting_id(validator: dict) -> str:
     """Use Claude to classify a validator as light / medium / heavy when
     condition-based logic cannot determine the sting_id."""
     try:
@@ -262,7 +267,7 @@ def _ai_infer_sting_id(validator: dict) -> str:
         )
 
         client = ClaudeClient()
-        response = client.generate(user_message=prompt, max_tokens=20, temperature=0)
+        response = await client.agenerate(user_message=prompt, max_tokens=20, temperature=0)
         result = response.strip().lower()
         if result in {"light", "medium", "heavy"}:
             return result
@@ -297,6 +302,54 @@ def _iter_step_groups(section: dict):
             yield current, None  # no current_scene terminator
 
 
+def _prefetch_ai_sting_ids(data: list[dict], vocab_open: str, vocab_close: str) -> dict[int, str]:
+    """Resolve every sting_id that needs the AI fallback, concurrently.
+
+    Walks data exactly as _process does and returns {id(validator): sting_id} for the
+    validators _sting_id_from_validator cannot resolve. Identical selected answers
+    share one slug request.
+    """
+    slug_jobs: dict[str, list[dict]] = {}
+    infer_jobs: list[dict] = []
+    for section in data:
+        for active_beats, _cs_beat in _iter_step_groups(section):
+            if not _beats_to_fields(active_beats, vocab_open, vocab_close):
+                continue
+            for validator in _extract_validators(active_beats):
+                if validator.get("is_correct") or _sting_id_from_validator(validator) is not None:
+                    continue
+                selected = (validator.get("condition") or {}).get("selected")
+                if selected is not None:
+                    slug_jobs.setdefault(str(selected), []).append(validator)
+                else:
+                    infer_jobs.append(validator)
+
+    if not slug_jobs and not infer_jobs:
+        return {}
+
+    async def _resolve_all() -> list[str]:
+        limit = asyncio.Semaphore(_AI_FALLBACK_CONCURRENCY)
+
+        async def _bounded(coro):
+            async with limit:
+                return await coro
+
+        return await asyncio.gather(
+            *(_bounded(_ai_slug_from_selected(selected)) for selected in slug_jobs),
+            *(_bounded(_ai_infer_sting_id(validator)) for validator in infer_jobs),
+        )
+
+    results = iter(asyncio.run(_resolve_all()))
+    sting_ids: dict[int, str] = {}
+    for validators in slug_jobs.values():
+        slug = next(results)
+        for validator in validators:
+            sting_ids[id(validator)] = slug
+    for validator in infer_jobs:
+        sting_ids[id(validator)] = next(results)
+    return sting_ids
+
+
 # ---------------------------------------------------------------------------
 # TOML serialisation
 # ---------------------------------------------------------------------------
@@ -351,6 +404,9 @@ def _process(
     section_display = 1
     first_step_in_script = True
 
+    # Claude fallbacks are independent per validator; resolve them all up front
+    ai_sting_ids = _prefetch_ai_sting_ids(data, vocab_open, vocab_close) if use_ai_fallback else {}
+
     for section in data:
         raw_id = section.get("id", f"section_{section_counter}")
         slug = _slugify_id(raw_id)
@@ -423,12 +479,12 @@ def _process(
                         selected = (validator.get("condition") or {}).get("selected")
                         if selected is not None:
                             sting_id = (
-                                _ai_slug_from_selected(str(selected))
+                                ai_sting_ids[id(validator)]
                                 if use_ai_fallback
                                 else re.sub(r"[^a-z0-9]+", "_", str(selected).lower()).strip("_")
                             )
                         else:
-                            sting_id = _ai_infer_sting_id(validator) if use_ai_fallback else "light"
+                            sting_id = ai_sting_ids[id(validator)] if use_ai_fallback else "light"
                     validator["_sting_id"] = sting_id
                     if dialogue:
                         sub_key = f"{step_key_bare}.step_{sub_counter}"
@@ -0,0 +1,220 @@
+"""Benchmark the Notion push/pull paths against the local fake Notion server.
+
+Replays the pulled lessons in tracked_scripts/ through the real code paths, with the
+real notion_client pointed at tests/fake_notion_server.py, and reports the number of
+requests and the wall time of each operation:
+
+    push         push_lesson onto a new page
+    push (same)  re-push with nothing changed
+    push (edit)  re-push with one dialogue beat edited
+    pull         pull_lesson
+    tag          tag_notion_ids
+    comments     fetch_lesson_comments over the whole page (full sweep)
+    comments (incr)  the same sweep again with a state file (incremental)
+
+Nothing touches the real Notion workspace or config/: the registry and page mirrors
+are redirected to a temporary directory.
+
+Usage:
+    python tests/bench_notion.py
+    python tests/bench_notion.py --limit 3 --latency 0.3 --rps 3
+    python tests/bench_notion.py --match m11 --throttle-every 20 --verbose
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_notion_server import FakeNotionServer  # noqa: E402
+
+import utils.notion as notion  # noqa: E402
+import utils.notion_api as notion_api  # noqa: E402
+import utils.notion_mirror as notion_mirror  # noqa: E402
+from utils.notion_api import NotionRateLimiter  # noqa: E402
+
+TRACKED_DIR = project_root / "tracked_scripts"
+
+# Comment one in this many tagged beats with an @claude thread before the sweeps
+_COMMENT_EVERY = 10
+
+
+def _find_lessons(match: str | None, limit: int | None) -> list[Path]:
+    """Latest pull.json of every tracked script, optionally filtered by a path substring"""
+    lessons = []
+    for script_dir in sorted(p.parent for p in TRACKED_DIR.glob("*/*/*/step_*_pull")):
+        if match and match not in str(script_dir.relative_to(TRACKED_DIR)):
+            continue
+        pulls = sorted(script_dir.glob("step_*_pull/pull.json"))
+        if pulls:
+            lessons.append(pulls[-1])
+    return lessons[:limit] if limit else lessons
+
+
+def _edit_one_beat(sections: list) -> list:
+    """Copy of the lesson with the first dialogue beat's text changed"""
+    sections = copy.deepcopy(sections)
+    for section in sections:
+        for beat in section.get("beats", []):
+            if beat.get("type") == "dialogue" and beat.get("text"):
+                beat["text"] += " (edited)"
+                return sections
+    return sections
+
+
+class _Bench:
+    """Runs operations against the fake server and records one row per operation"""
+
+    def __init__(self, server: FakeNotionServer, verbose: bool):
+        self.server = server
+        self.verbose = verbose
+        self.rows: list[dict] = []
+
+    def measure(self, lesson: str, operation: str, fn):
+        self.server.reset_counts()
+        output = io.StringIO()
+        start = time.monotonic()
+        with contextlib.redirect_stdout(sys.stdout if self.verbose else output):
+            result = fn()
+        self.rows.append(
+            {
+                "lesson": lesson,
+                "operation": operation,
+                "requests": self.server.total_requests,
+                "throttled": self.server.throttled,
+                "seconds": time.monotonic() - start,
+                "by_endpoint": dict(self.server.requests),
+            }
+        )
+        return result
+
+
+def _bench_lesson(bench: _Bench, pull_path: Path, work_dir: Path) -> None:
+    label = str(pull_path.parent.parent.relative_to(TRACKED_DIR))
+    sections = json.loads(pull_path.read_text(encoding="utf-8"))
+    # Push from a copy so the push log lands in the temp dir, not tracked_scripts/
+    file_path = work_dir / label.replace("/", "_") / "pull.json"
+    file_path.parent.mkdir(parents=True)
+    file_path.write_text(json.dumps(sections), encoding="utf-8")
+    title = f"[bench] {label}"
+
+    page_id = bench.measure(label, "push", lambda: notion.push_lesson(sections, title, file_path))
+    bench.measure(label, "push (same)", lambda: notion.push_lesson(sections, title, file_path))
+    edited = _edit_one_beat(sections)
+    bench.measure(label, "push (edit)", lambda: notion.push_lesson(edited, title, file_path))
+
+    _, _, blocks = bench.measure(label, "pull", lambda: notion.pull_lesson(page_id, edited))
+    client = notion.get_notion_client()
+    tagged = bench.measure(label, "tag", lambda: notion.tag_notion_ids(client, page_id, edited))
+
+    beat_ids = [
+        beat["_notion_block_id"]
+        for section in tagged
+        for beat in section.get("beats", [])
+        if beat.get("_notion_block_id")
+    ]
+    for block_id in beat_ids[::_COMMENT_EVERY]:
+        bench.server.add_comment(block_id, "@claude please tighten this line")
+
+    def _sweep(state_path=None):
+        return notion.fetch_lesson_comments(page_id, tagged, blocks=blocks, state_path=state_path)
+
+    state_path = file_path.parent / "notion_comment_state.json"
+    bench.measure(label, "comments", _sweep)
+    _sweep(state_path)  # prime the state file
+    bench.measure(label, "comments (incr)", lambda: _sweep(state_path))
+
+
+def _print_report(rows: list[dict], elapsed: float) -> None:
+    width = max([len(r["lesson"]) for r in rows] + [6])
+    print(f"\n{'lesson':<{width}}  {'operation':<16} {'requests':>8} {'429s':>5} {'seconds':>8}")
+    for row in rows:
+        print(
+            f"{row['lesson']:<{width}}  {row['operation']:<16} {row['requests']:>8} "
+            f"{row['throttled']:>5} {row['seconds']:>8.2f}"
+        )
+
+    print(f"\n{'operation':<16} {'requests':>8} {'429s':>5} {'seconds':>8}  (totals)")
+    operations = list(dict.fromkeys(r["operation"] for r in rows))
+    for operation in operations:
+        selected = [r for r in rows if r["operation"] == operation]
+        print(
+            f"{operation:<16} {sum(r['requests'] for r in selected):>8} "
+            f"{sum(r['throttled'] for r in selected):>5} "
+            f"{sum(r['seconds'] for r in selected):>8.2f}"
+        )
+    print(f"\n{len({r['lesson'] for r in rows})} lesson(s) in {elapsed:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Notion sync against a fake server")
+    parser.add_argument("--match", help="Only lessons whose path contains this (e.g. m11/lesson)")
+    parser.add_argument("--limit", type=int, help="Benchmark at most this many lessons")
+    parser.add_argument(
+        "--latency", type=float, default=0.15, help="Seconds per request (default: 0.15)"
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=notion_api.DEFAULT_REQUESTS_PER_SECOND,
+        help=f"Client rate limit (default: {notion_api.DEFAULT_REQUESTS_PER_SECOND})",
+    )
+    parser.add_argument(
+        "--throttle-every", type=int, default=0, help="Answer every Nth request with 429"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s"
+    )
+    parser.add_argument("--json", type=Path, help="Also write the rows to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show push/pull output")
+    args = parser.parse_args()
+
+    lessons = _find_lessons(args.match, args.limit)
+    if not lessons:
+        print(f"[ERROR] No pulled lessons found in {TRACKED_DIR}")
+        sys.exit(1)
+    if not args.verbose:
+        logging.getLogger("notion_client").setLevel(logging.ERROR)
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        FakeNotionServer(args.latency, args.throttle_every, args.retry_after) as server,
+    ):
+        work_dir = Path(tmp)
+        os.environ.update(
+            NOTION_API_KEY="secret_bench",
+            NOTION_PARENT_PAGE_ID="bench-parent",
+            NOTION_BASE_URL=server.url,
+            NOTION_YES="1",
+        )
+        notion._REGISTRY_PATH = work_dir / "notion_pages.json"
+        notion_mirror._MIRROR_DIR = work_dir / "notion_mirrors"
+        notion_api._limiter = NotionRateLimiter(args.rps)
+
+        bench = _Bench(server, args.verbose)
+        start = time.monotonic()
+        for pull_path in lessons:
+            print(f"Benchmarking {pull_path.relative_to(project_root)}")
+            _bench_lesson(bench, pull_path, work_dir)
+        elapsed = time.monotonic() - start
+
+    _print_report(bench.rows, elapsed)
+    if args.json:
+        args.json.write_text(json.dumps(bench.rows, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
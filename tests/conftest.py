@@ -1,8 +1,18 @@
 import os
+import sys
+from pathlib import Path
 
 import pytest
 from dotenv import load_dotenv
 
+# The code under test imports core modules flat (import rate_limiter)
+_core_dir = Path(__file__).parent.parent / "core"
+if str(_core_dir) not in sys.path:
+    sys.path.append(str(_core_dir))
+
+import path_manager  # noqa: E402
+import response_cache  # noqa: E402
+
 load_dotenv()
 
 
@@ -21,6 +31,17 @@ def pytest_addoption(parser):
     )
 
 
+@pytest.fixture(autouse=True)
+def local_logs(tmp_path, monkeypatch):
+    """Keep what tests write under logs/ (rate limiter state, cached responses, usage
+    logs) in tmp_path instead of the repository's logs/ directory"""
+    real_paths = path_manager.get_project_paths
+    monkeypatch.setattr(
+        path_manager, "get_project_paths", lambda: {**real_paths(), "logs": tmp_path / "logs"}
+    )
+    monkeypatch.setattr(response_cache, "_default_cache", None)
+
+
 @pytest.fixture
 def sandbox_page(request):
     """Create a blank child page under NOTION_PARENT_PAGE_ID, yield its ID, archive on teardown
@@ -41,3 +62,26 @@ def sandbox_page(request):
         print(f"  [kept]   {get_page_url(page_id)}")
     else:
         client.pages.update(page_id, archived=True)
+
+
+@pytest.fixture
+def outputs(tmp_path, monkeypatch):
+    """Redirect pipeline outputs (and the artifact store) to a temp directory"""
+    import core.pipeline as pipeline
+
+    outputs_dir = tmp_path / "outputs"
+    real_paths = pipeline.get_project_paths()
+    monkeypatch.setattr(
+        pipeline, "get_project_paths", lambda: {**real_paths, "outputs": outputs_dir}
+    )
+    real_create = pipeline.create_version_directory
+    monkeypatch.setattr(
+        pipeline,
+        "create_version_directory",
+        lambda *args, **kwargs: real_create(*args, outputs_dir=outputs_dir, **kwargs),
+    )
+    store_module = sys.modules["artifact_store"]
+    monkeypatch.setattr(
+        store_module, "_default_store", store_module.ArtifactStore(outputs_dir / ".objects")
+    )
+    return outputs_dir
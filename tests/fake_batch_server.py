@@ -0,0 +1,160 @@
+"""
+Local fake of the Anthropic Message Batches API, for tests.
+
+Serves the three endpoints MessageBatchCollector uses (create, retrieve, results) on
+127.0.0.1 so the real anthropic SDK can be pointed at it with base_url. Each request is
+answered by a responder function (params -> response text); a responder can raise to
+produce an "errored" result, or return FakeBatchServer.EXPIRED to produce "expired".
+
+    with FakeBatchServer(lambda params: '{"id": 1}') as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.url)
+"""
+
+import itertools
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeBatchServer:
+    """In-process HTTP server implementing /v1/messages/batches"""
+
+    EXPIRED = object()
+
+    def __init__(self, responder, polls_until_ended: int = 1):
+        """
+        Args:
+            responder: Called with each request's params; returns the response text
+            polls_until_ended: Number of retrieve calls that report "in_progress"
+        """
+        self.responder = responder
+        self.polls_until_ended = polls_until_ended
+        self.batches = {}  # batch id -> {"requests": [...], "polls": int, "results": [...]}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _answer(self, params: dict) -> dict:
+        """Build one batch result entry for a request's params"""
+        try:
+            text = self.responder(params)
+        except Exception as e:
+            return {
+                "type": "errored",
+                "error": {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": str(e)},
+                },
+            }
+        if text is self.EXPIRED:
+            return {"type": "expired"}
+        return {"type": "succeeded", "message": _message(params, text)}
+
+    def _batch_object(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        ended = batch["polls"] >= self.polls_until_ended
+        count = len(batch["requests"])
+        now = datetime.now(timezone.utc)
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(days=1)).isoformat(),
+            "ended_at": now.isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type="application/json"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0]
+                if path == "/v1/messages/batches":
+                    with server._lock:
+                        batch_id = f"msgbatch_{next(server._ids):04d}"
+                        server.batches[batch_id] = {
+                            "requests": body["requests"],
+                            "polls": 0,
+                            "results": [
+                                {"custom_id": r["custom_id"], "result": server._answer(r["params"])}
+                                for r in body["requests"]
+                            ],
+                        }
+                        payload = server._batch_object(batch_id)
+                    self._send(200, json.dumps(payload))
+                else:
+                    self._send(404, json.dumps({"type": "error", "error": {"type": "not_found"}}))
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                # v1 / messages / batches / {id} [/ results]
+                batch_id = parts[3] if len(parts) >= 4 else None
+                with server._lock:
+                    if batch_id not in server.batches:
+                        self._send(404, json.dumps({"type": "error"}))
+                        return
+                    if len(parts) == 5 and parts[4] == "results":
+                        lines = [json.dumps(r) for r in server.batches[batch_id]["results"]]
+                        self._send(200, "\n".join(lines) + "\n", "application/binary")
+                        return
+                    server.batches[batch_id]["polls"] += 1
+                    payload = server._batch_object(batch_id)
+                self._send(200, json.dumps(payload))
+
+        return Handler
+
+
+def _message(params: dict, text: str) -> dict:
+    return {
+        "id": "msg_fake",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "claude-fake"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": 100,
+            "output_tokens": 20,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        },
+    }
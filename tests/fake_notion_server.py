@@ -0,0 +1,421 @@
+"""
+Local fake of the Notion API subset the Notion integration uses, for tests and benchmarks.
+
+Serves blocks children list/append, block update, page create/retrieve/update and
+comments list on 127.0.0.1, so the real notion_client can be pointed at it with
+base_url (or NOTION_BASE_URL, see utils/notion.get_notion_client). Blocks are stored
+and returned the way Notion returns them: IDs, has_children, plain_text, default
+colours, archived flags and last_edited_time stamps that move on every write.
+
+Each request can be delayed by `latency` seconds, and every `throttle_every`-th
+request is answered with 429 + Retry-After, to exercise the rate limiter and retries.
+Requests are counted per endpoint in `requests`.
+
+    with FakeNotionServer(latency=0.2, throttle_every=25) as server:
+        client = notion_client.Client(auth="test", base_url=server.url)
+"""
+
+import copy
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Block types whose type object carries a color ("default" when omitted)
+_COLORED_TYPES = {
+    "paragraph",
+    "heading_1",
+    "heading_2",
+    "heading_3",
+    "bulleted_list_item",
+    "numbered_list_item",
+    "toggle",
+    "callout",
+    "quote",
+    "to_do",
+}
+
+_MAX_PAGE_SIZE = 100
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _NotionError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _not_found(object_id: str) -> _NotionError:
+    return _NotionError(404, "object_not_found", f"Could not find block with ID: {object_id}.")
+
+
+class FakeNotionServer:
+    """In-process HTTP server implementing the Notion endpoints utils/notion*.py call"""
+
+    def __init__(self, latency: float = 0.0, throttle_every: int = 0, retry_after: float = 0.0):
+        """
+        Args:
+            latency: Seconds to wait before answering each request
+            throttle_every: Answer every Nth request with 429 (0 = never)
+            retry_after: Retry-After seconds sent with each 429
+        """
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = Counter()  # "GET blocks.children" -> count
+        self.throttled = 0
+        self.pages = {}  # page id -> page object
+        self.blocks = {}  # block id -> stored block (without children)
+        self.children = {}  # page or block id -> [child block id, ...]
+        self.comments = {}  # page or block id -> [comment object, ...]
+        self._clock = itertools.count(1)
+        self._seen = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.throttled = 0
+
+    def add_comment(self, block_id: str, text: str, discussion_id: str | None = None) -> dict:
+        """Add a comment to a page or block, starting a new thread unless discussion_id is given"""
+        with self._lock:
+            comment = {
+                "object": "comment",
+                "id": str(uuid.uuid4()),
+                "discussion_id": discussion_id or str(uuid.uuid4()),
+                "parent": {"type": "block_id", "block_id": block_id},
+                "created_time": self._now(),
+                "last_edited_time": self._now(),
+                "created_by": {"object": "user", "id": "fake-reviewer"},
+                "rich_text": _rich_text([{"text": {"content": text}}]),
+            }
+            self.comments.setdefault(block_id, []).append(comment)
+            return copy.deepcopy(comment)
+
+    def live_tree(self, parent_id: str) -> list[dict]:
+        """Unarchived blocks under parent_id, with children embedded like fetch_block_tree"""
+        tree = []
+        for block_id in self.children.get(parent_id, []):
+            block = self.blocks[block_id]
+            if block["archived"]:
+                continue
+            block = self._block_object(block_id)
+            if block["has_children"]:
+                block[block["type"]]["children"] = self.live_tree(block_id)
+            tree.append(block)
+        return tree
+
+    # -- storage ------------------------------------------------------------
+
+    def _now(self) -> str:
+        stamp = _EPOCH + timedelta(seconds=next(self._clock))
+        return stamp.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    def _touch(self, block_id: str) -> None:
+        """Move last_edited_time on a block and on the page that contains it"""
+        now = self._now()
+        while block_id in self.blocks:
+            self.blocks[block_id]["last_edited_time"] = now
+            block_id = self.blocks[block_id]["_parent"]
+        if block_id in self.pages:
+            self.pages[block_id]["last_edited_time"] = now
+
+    def _exists(self, object_id: str) -> bool:
+        if object_id in self.pages:
+            return not self.pages[object_id]["archived"]
+        return object_id in self.blocks and not self.blocks[object_id]["archived"]
+
+    def _store(self, parent_id: str, block: dict) -> str:
+        block = copy.deepcopy(block)
+        btype = block["type"]
+        data = block.get(btype) or {}
+        children = data.pop("children", [])
+        _normalize(btype, data)
+        block_id = str(uuid.uuid4())
+        now = self._now()
+        self.blocks[block_id] = {
+            "id": block_id,
+            "type": btype,
+            btype: data,
+            "_parent": parent_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+        }
+        self.children[block_id] = [self._store(block_id, child) for child in children]
+        return block_id
+
+    def _block_object(self, block_id: str) -> dict:
+        stored = self.blocks[block_id]
+        btype = stored["type"]
+        parent_id = stored["_parent"]
+        parent_type = "page_id" if parent_id in self.pages else "block_id"
+        return {
+            "object": "block",
+            "id": block_id,
+            "parent": {"type": parent_type, parent_type: parent_id},
+            "created_time": stored["created_time"],
+            "last_edited_time": stored["last_edited_time"],
+            "has_children": any(
+                not self.blocks[c]["archived"] for c in self.children.get(block_id, [])
+            ),
+            "archived": stored["archived"],
+            "in_trash": stored["archived"],
+            "type": btype,
+            btype: copy.deepcopy(stored[btype]),
+        }
+
+    def _paginate(self, items: list, query: dict) -> dict:
+        page_size = min(int(query.get("page_size", _MAX_PAGE_SIZE)), _MAX_PAGE_SIZE)
+        start = int(query["start_cursor"]) if query.get("start_cursor") else 0
+        chunk = items[start : start + page_size]
+        has_more = start + page_size < len(items)
+        return {
+            "object": "list",
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None,
+        }
+
+    # -- endpoints ----------------------------------------------------------
+
+    def _list_children(self, block_id: str, query: dict) -> dict:
+        if not self._exists(block_id):
+            raise _not_found(block_id)
+        visible = [c for c in self.children.get(block_id, []) if not self.blocks[c]["archived"]]
+        return self._paginate([self._block_object(c) for c in visible], query)
+
+    def _append_children(self, block_id: str, body: dict) -> dict:
+        if not self._exists(block_id):
+            raise _not_found(block_id)
+        new_blocks = body.get("children") or []
+        if len(new_blocks) > _MAX_PAGE_SIZE:
+            raise _NotionError(400, "validation_error", "body.children.length should be ≤ `100`.")
+        siblings = self.children.setdefault(block_id, [])
+        after = body.get("after")
+        if after is not None:
+            if after not in siblings:
+                raise _NotionError(400, "validation_error", f"Block {after} is not a child.")
+            if self.blocks[after]["archived"]:
+                raise _NotionError(400, "validation_error", "Can't edit block that is archived.")
+            index = siblings.index(after) + 1
+        elif (body.get("position") or {}).get("type") == "start":
+            index = 0
+        else:
+            index = len(siblings)
+        ids = [self._store(block_id, block) for block in new_blocks]
+        siblings[index:index] = ids
+        self._touch(block_id)
+        return {
+            "object": "list",
+            "results": [self._block_object(i) for i in ids],
+            "has_more": False,
+            "next_cursor": None,
+        }
+
+    def _update_block(self, block_id: str, body: dict) -> dict:
+        if block_id not in self.blocks:
+            raise _not_found(block_id)
+        stored = self.blocks[block_id]
+        archive = body.get("archived", body.get("in_trash"))
+        if stored["archived"] and not archive:
+            raise _NotionError(400, "validation_error", "Can't edit block that is archived.")
+        if archive is not None:
+            stored["archived"] = bool(archive)
+        btype = stored["type"]
+        if btype in body:
+            data = copy.deepcopy(body[btype])
+            _normalize(btype, data)
+            stored[btype].update(data)
+        self._touch(block_id)
+        return self._block_object(block_id)
+
+    def _create_page(self, body: dict) -> dict:
+        parent_id = (body.get("parent") or {}).get("page_id")
+        page_id = str(uuid.uuid4())
+        now = self._now()
+        self.pages[page_id] = {
+            "object": "page",
+            "id": page_id,
+            "parent": {"type": "page_id", "page_id": parent_id},
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "in_trash": False,
+            "properties": copy.deepcopy(body.get("properties") or {}),
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        self.children[page_id] = [self._store(page_id, b) for b in body.get("children") or []]
+        return copy.deepcopy(self.pages[page_id])
+
+    def _retrieve_page(self, page_id: str) -> dict:
+        if page_id not in self.pages:
+            raise _not_found(page_id)
+        return copy.deepcopy(self.pages[page_id])
+
+    def _update_page(self, page_id: str, body: dict) -> dict:
+        if page_id not in self.pages:
+            raise _not_found(page_id)
+        page = self.pages[page_id]
+        page["properties"].update(copy.deepcopy(body.get("properties") or {}))
+        archive = body.get("archived", body.get("in_trash"))
+        if archive is not None:
+            page["archived"] = page["in_trash"] = bool(archive)
+        page["last_edited_time"] = self._now()
+        return copy.deepcopy(page)
+
+    def _list_comments(self, query: dict) -> dict:
+        block_id = query.get("block_id", "")
+        if block_id not in self.pages and block_id not in self.blocks:
+            raise _not_found(block_id)
+        return self._paginate(copy.deepcopy(self.comments.get(block_id, [])), query)
+
+    def _route(self, method: str, parts: list[str], query: dict, body: dict) -> tuple[str, dict]:
+        """Dispatch a request; returns (endpoint name for the counters, response body)"""
+        match method, parts:
+            case "GET", ["blocks", block_id, "children"]:
+                return "GET blocks.children", self._list_children(block_id, query)
+            case "PATCH", ["blocks", block_id, "children"]:
+                return "PATCH blocks.children", self._append_children(block_id, body)
+            case "PATCH", ["blocks", block_id]:
+                return "PATCH blocks", self._update_block(block_id, body)
+            case "GET", ["blocks", block_id]:
+                if block_id not in self.blocks:
+                    raise _not_found(block_id)
+                return "GET blocks", self._block_object(block_id)
+            case "POST", ["pages"]:
+                return "POST pages", self._create_page(body)
+            case "GET", ["pages", page_id]:
+                return "GET pages", self._retrieve_page(page_id)
+            case "PATCH", ["pages", page_id]:
+                return "PATCH pages", self._update_page(page_id, body)
+            case "GET", ["comments"]:
+                return "GET comments", self._list_comments(query)
+        raise _NotionError(400, "invalid_request_url", f"Invalid request URL: {method} {parts}")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: dict, headers: dict | None = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")[1:]  # drop "v1"
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    seen = next(server._seen)
+                    if server.throttle_every and seen % server.throttle_every == 0:
+                        server.throttled += 1
+                        throttled = True
+                    else:
+                        throttled = False
+                        try:
+                            endpoint, payload = server._route(self.command, parts, query, body)
+                            server.requests[endpoint] += 1
+                            status = 200
+                        except _NotionError as e:
+                            payload = {
+                                "object": "error",
+                                "status": e.status,
+                                "code": e.code,
+                                "message": str(e),
+                            }
+                            status = e.status
+                if throttled:
+                    self._send(
+                        429,
+                        {
+                            "object": "error",
+                            "status": 429,
+                            "code": "rate_limited",
+                            "message": "You have been rate limited. Please try again in a few minutes.",
+                        },
+                        {"Retry-After": str(server.retry_after)},
+                    )
+                    return
+                self._send(status, payload)
+
+            do_GET = do_POST = do_PATCH = _handle
+
+        return Handler
+
+
+def _rich_text(spans: list[dict]) -> list[dict]:
+    """Fill in the read-only fields Notion adds to rich text spans"""
+    for span in spans:
+        span.setdefault("type", "text")
+        if span["type"] == "text":
+            span["text"].setdefault("link", None)
+            content = span["text"].get("content", "")
+        else:
+            content = span.get("plain_text", "")
+        span.setdefault(
+            "annotations",
+            {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+        )
+        span["plain_text"] = content
+        span.setdefault("href", None)
+    return spans
+
+
+def _normalize(btype: str, data: dict) -> None:
+    """Shape a block's type object the way Notion returns it"""
+    if "rich_text" in data:
+        _rich_text(data["rich_text"])
+    if btype in _COLORED_TYPES:
+        data.setdefault("color", "default")
+    if btype.startswith("heading_"):
+        data.setdefault("is_toggleable", False)
+    if btype == "code":
+        data.setdefault("caption", [])
@@ -0,0 +1,17 @@
+"""
+Step functions shared by the pipeline tests (incremental, streaming, run log, telemetry).
+
+A lesson file is split into one section per line, and each section is structured by
+uppercasing its text. The functions keep the underscore names the tests' step names and
+output files are derived from (step_01__split, _structure.json).
+
+    Step(function="tests.pipeline_helpers._split", input_file=str(lesson))
+"""
+
+
+def _split(text):
+    return [{"id": f"s{n}", "text": line} for n, line in enumerate(text.splitlines(), 1)]
+
+
+def _structure(section):
+    return {"id": section["id"], "text": section["text"].upper()}
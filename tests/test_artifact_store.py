@@ -0,0 +1,109 @@
+"""
+Tests for the content-addressed artifact store (core/artifact_store.py).
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from core.artifact_store import MANIFEST_FILENAME, ArtifactStore, unshare_tree
+
+
+def _make_step(version_dir: Path, files: dict) -> Path:
+    step_dir = version_dir / "step_01_problem_generator"
+    for rel, text in files.items():
+        (step_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+        (step_dir / rel).write_text(text, encoding="utf-8")
+    return step_dir
+
+
+def test_linked_steps_share_one_object_per_content(tmp_path):
+    store = ArtifactStore(tmp_path / "outputs/.objects", reflinks=True)
+    pipeline_dir = tmp_path / "outputs/problem_generator_module_1"
+    files = {"problem_generator.json": "[1, 2]", "items/a.json": "{}", "items/b.json": "{}"}
+    base_step = _make_step(pipeline_dir / "v0", files)
+
+    v1_step = pipeline_dir / "v1/step_01_problem_generator"
+    linked = store.link_tree(base_step, v1_step)
+
+    assert sorted(linked) == sorted(files)
+    for rel, text in files.items():
+        assert (v1_step / rel).read_text(encoding="utf-8") == text
+        assert not os.path.samefile(v1_step / rel, base_step / rel)
+    # Identical item files are stored once
+    assert linked["items/a.json"] == linked["items/b.json"]
+    assert len(list(store.objects_dir.glob("*/*"))) == 2
+
+    manifest = json.loads((pipeline_dir / "v1" / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert manifest == {"step_01_problem_generator": linked}
+
+    # Linking again from the linked copy trusts the manifest (no change, same objects)
+    v2_step = pipeline_dir / "v2/step_01_problem_generator"
+    assert store.link_tree(v1_step, v2_step) == linked
+    assert len(list(store.objects_dir.glob("*/*"))) == 2
+
+
+def test_in_place_write_to_a_linked_file_stays_in_its_version(tmp_path):
+    store = ArtifactStore(tmp_path / "outputs/.objects", reflinks=True)
+    base_step = _make_step(tmp_path / "outputs/p/v0", {"out.json": "old"})
+    v1_step = tmp_path / "outputs/p/v1/step_01_problem_generator"
+    v2_step = tmp_path / "outputs/p/v2/step_01_problem_generator"
+    linked = store.link_tree(base_step, v1_step)
+    store.link_tree(base_step, v2_step)
+
+    # A plain "w" open, as notion pulls, rerun.save_json and fixes/ scripts do
+    (v2_step / "out.json").write_text("new", encoding="utf-8")
+
+    assert (base_step / "out.json").read_text(encoding="utf-8") == "old"
+    assert (v1_step / "out.json").read_text(encoding="utf-8") == "old"
+    assert store.object_path(linked["out.json"]).read_text(encoding="utf-8") == "old"
+    # The rewritten file is hashed again on the next link instead of trusted
+    v3_step = tmp_path / "outputs/p/v3/step_01_problem_generator"
+    assert store.link_tree(v2_step, v3_step)["out.json"] != linked["out.json"]
+
+
+def test_unshare_drops_the_manifest_entry_and_legacy_hardlinks(tmp_path):
+    store = ArtifactStore(tmp_path / "outputs/.objects", reflinks=True)
+    base_step = _make_step(tmp_path / "outputs/p/v0", {"out.json": "old"})
+    new_step = tmp_path / "outputs/p/v1/step_01_problem_generator"
+    store.link_tree(base_step, new_step)
+    # Versions linked by the hardlink-based store shared one inode
+    os.unlink(new_step / "out.json")
+    os.link(base_step / "out.json", new_step / "out.json")
+
+    assert unshare_tree(new_step) == 1
+    (new_step / "out.json").write_text("new", encoding="utf-8")
+
+    assert (base_step / "out.json").read_text(encoding="utf-8") == "old"
+    manifest = json.loads((tmp_path / "outputs/p/v1" / MANIFEST_FILENAME).read_text("utf-8"))
+    assert "step_01_problem_generator" not in manifest
+    assert unshare_tree(new_step) == 0
+
+
+def test_gc_removes_objects_no_version_refers_to(tmp_path):
+    store = ArtifactStore(tmp_path / "outputs/.objects", reflinks=True)
+    base_step = _make_step(tmp_path / "outputs/p/v0", {"out.json": "data"})
+    store.link_tree(base_step, tmp_path / "outputs/p/v1/step_01_problem_generator")
+
+    shutil.rmtree(tmp_path / "outputs/p/v1")
+    assert store.gc() == 0
+    shutil.rmtree(tmp_path / "outputs/p/v0")
+    assert store.gc() == 1
+    assert list(store.objects_dir.glob("*/*")) == []
+
+
+def test_without_reflinks_steps_are_plain_copies(tmp_path):
+    store = ArtifactStore(tmp_path / "outputs/.objects", reflinks=False)
+    base_step = _make_step(tmp_path / "outputs/p/v0", {"out.json": "data", "items/a.json": "{}"})
+    v1_step = tmp_path / "outputs/p/v1/step_01_problem_generator"
+
+    assert store.link_tree(base_step, v1_step) == {}
+    assert (v1_step / "items/a.json").read_text(encoding="utf-8") == "{}"
+    assert not store.objects_dir.exists()
+    assert not (tmp_path / "outputs/p/v1" / MANIFEST_FILENAME).exists()
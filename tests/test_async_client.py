@@ -0,0 +1,149 @@
+"""
+Tests for the asyncio API (ClaudeClient.agenerate, sting_id prefetch in toml_sequence_writer).
+
+Runs offline: the shared AsyncAnthropic client and the AI helpers are replaced with
+fakes that record concurrency, so no API key or network is needed.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import core.claude_client as claude_client_module
+from core.claude_client import ClaudeClient
+from core.rate_limiter import RateLimiter
+from steps.formatting import toml_sequence_writer
+
+
+class _FakeMessages:
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, **params):
+        self.calls.append(params)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        usage = SimpleNamespace(
+            input_tokens=10,
+            output_tokens=2,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=0,
+        )
+        text = params["messages"][0]["content"].upper()
+        message = SimpleNamespace(
+            content=[SimpleNamespace(text=text)], usage=usage, stop_reason="end"
+        )
+        return SimpleNamespace(parse=lambda: message, headers={})
+
+
+def test_agenerate_runs_concurrently(tmp_path, monkeypatch):
+    messages = _FakeMessages()
+    fake = SimpleNamespace(messages=SimpleNamespace(with_raw_response=messages))
+    monkeypatch.setattr(claude_client_module, "_get_shared_async_client", lambda api_key: fake)
+    monkeypatch.setattr(
+        claude_client_module,
+        "get_rate_limiter",
+        lambda model: RateLimiter(model, tmp_path / "limits"),
+    )
+
+    client = ClaudeClient(api_key="test-key", log_file=tmp_path / "usage.jsonl")
+    system = [{"type": "text", "text": "role", "metadata": {"block_type": "role"}}]
+
+    async def _run_all():
+        return await asyncio.gather(
+            *(client.agenerate(system=system, user_message=f"q{i}", prefill="> ") for i in range(5))
+        )
+
+    results = asyncio.run(_run_all())
+
+    assert results == [f"> Q{i}" for i in range(5)]
+    assert messages.peak > 1
+    # Metadata stripped and prefill sent as an assistant turn, same as generate()
+    assert messages.calls[0]["system"] == [{"type": "text", "text": "role"}]
+    assert messages.calls[0]["messages"][-1] == {"role": "assistant", "content": "> "}
+    assert client.request_count == 5
+    assert len((tmp_path / "usage.jsonl").read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_sting_id_prefetch_dedupes_and_keeps_order(monkeypatch):
+    slug_calls = []
+
+    async def _fake_slug(selected):
+        slug_calls.append(selected)
+        await asyncio.sleep(0)
+        return f"slug_{selected}"
+
+    async def _fake_infer(validator):
+        await asyncio.sleep(0)
+        return "heavy"
+
+    monkeypatch.setattr(toml_sequence_writer, "_ai_slug_from_selected", _fake_slug)
+    monkeypatch.setattr(toml_sequence_writer, "_ai_infer_sting_id", _fake_infer)
+
+    def _validator(condition):
+        return {"condition": condition, "beats": [{"type": "dialogue", "text": "Try again."}]}
+
+    validators = [
+        _validator({"selected": "a"}),
+        _validator({"selected": "b"}),
+        _validator({"selected": "a"}),
+        _validator({"incorrect_count": 2}),
+        _validator({}),
+    ]
+    data = [
+        {
+            "id": "s1",
+            "beats": [
+                {"type": "dialogue", "text": "Pick one."},
+                {"type": "prompt", "text": "Which?", "validator": validators},
+            ],
+        }
+    ]
+
+    toml_sequence_writer._process(data, "demo", "[vocab]", "[/vocab]")
+
+    assert sorted(slug_calls) == ["a", "b"]
+    assert [v["_sting_id"] for v in validators] == [
+        "slug_a",
+        "slug_b",
+        "slug_a",
+        "medium",
+        "heavy",
+    ]
+
+
+def test_each_event_loop_keeps_its_own_shared_client():
+    seen = {}
+    both_running = threading.Barrier(2)
+
+    async def calls(name):
+        clients = {id(claude_client_module._get_shared_async_client("test-key"))}
+        await asyncio.to_thread(both_running.wait, 30)
+        clients.add(id(claude_client_module._get_shared_async_client("test-key")))
+        seen[name] = clients
+
+    threads = [threading.Thread(target=asyncio.run, args=(calls(n),)) for n in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One client per loop, reused across its calls while the other loop was running
+    assert len(seen["a"]) == len(seen["b"]) == 1
+    assert seen["a"] != seen["b"]
+
+    async def another_run():
+        return claude_client_module._get_shared_async_client("test-key")
+
+    asyncio.run(another_run())
+    assert not any(loop.is_closed() for loop in claude_client_module._shared_async_clients)
@@ -0,0 +1,91 @@
+"""
+Tests for concurrent batch execution (Step.batch_concurrency).
+
+Uses a deterministic formatting function with staggered sleeps so items finish
+out of order, then checks that collation order, sequential IDs and the per-item
+files are identical to a serial run.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from core.pipeline import Step, run_pipeline
+
+_active = {"now": 0, "peak": 0}
+_lock = threading.Lock()
+
+
+def _slow_echo(item):
+    """Echo the item back, sleeping longer for earlier items so they finish last."""
+    with _lock:
+        _active["now"] += 1
+        _active["peak"] = max(_active["peak"], _active["now"])
+    try:
+        time.sleep(0.02 * (10 - int(item["id"])))
+        if item["id"] == "7":
+            raise RuntimeError("boom")
+        return {"source_id": item["id"], "value": item["value"] * 2}
+    finally:
+        with _lock:
+            _active["now"] -= 1
+
+
+def _run(tmp_path: Path, name: str, concurrency: int) -> dict:
+    items = [{"id": str(n), "value": n} for n in range(1, 10)]
+    input_file = tmp_path / f"{name}_input.json"
+    input_file.write_text(json.dumps(items), encoding="utf-8")
+
+    step = Step(
+        function="tests.test_batch_concurrency._slow_echo",
+        input_file=str(input_file),
+        batch_mode=True,
+        batch_id_field="id",
+        batch_output_id_field="result_id",
+        batch_id_start=100,
+        batch_skip_items=["3"],
+        batch_concurrency=concurrency,
+    )
+    out_dir = tmp_path / name
+    result = run_pipeline([step], output_dir=str(out_dir), verbose=False)
+    return {"result": result, "step_dir": out_dir / "step_01__slow_echo"}
+
+
+def _strip_timestamps(rows):
+    return [{k: v for k, v in row.items() if k != "_generated_at"} for row in rows]
+
+
+def test_concurrent_batch_matches_serial(tmp_path):
+    serial = _run(tmp_path, "serial", concurrency=1)
+    _active["peak"] = 0
+    concurrent = _run(tmp_path, "concurrent", concurrency=4)
+
+    assert _active["peak"] > 1
+
+    serial_rows = json.loads((serial["step_dir"] / "_slow_echo.json").read_text(encoding="utf-8"))
+    concurrent_rows = json.loads(
+        (concurrent["step_dir"] / "_slow_echo.json").read_text(encoding="utf-8")
+    )
+
+    # Input order preserved, skipped item absent, errored item reserves its ID
+    assert [r["source_id"] for r in concurrent_rows] == ["1", "2", "4", "5", "6", "8", "9"]
+    assert [r["result_id"] for r in concurrent_rows] == [100, 101, 102, 103, 104, 106, 107]
+    assert _strip_timestamps(concurrent_rows) == _strip_timestamps(serial_rows)
+
+    errors = json.loads((concurrent["step_dir"] / "errors.json").read_text(encoding="utf-8"))
+    assert [e["item_id"] for e in errors] == ["7"]
+
+
+def test_item_files_carry_collated_ids(tmp_path):
+    run = _run(tmp_path, "items", concurrency=3)
+    items_dir = run["step_dir"] / "items"
+
+    assert sorted(p.stem for p in items_dir.glob("*.json")) == ["1", "2", "4", "5", "6", "8", "9"]
+    item_9 = json.loads((items_dir / "9.json").read_text(encoding="utf-8"))
+    assert item_9["result_id"] == 107
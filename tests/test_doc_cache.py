@@ -0,0 +1,66 @@
+"""
+Tests for the process-wide reference doc cache (core/prompt_builder.DocCache).
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from core.prompt_builder import DocCache
+
+
+def _render(text):
+    return {"type": "text", "text": f"<doc>\n{text}\n</doc>", "metadata": {"block_type": "doc"}}
+
+
+def test_doc_read_once_until_changed(tmp_path):
+    cache = DocCache()
+    doc = tmp_path / "visuals.md"
+    doc.write_text("v1", encoding="utf-8")
+
+    assert cache.read_text(doc) == "v1"
+    assert cache.read_text(doc) == "v1"
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    doc.write_text("version 2", encoding="utf-8")  # size (and mtime) change
+    assert cache.read_text(doc) == "version 2"
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_blocks_are_rendered_once_and_copied(tmp_path):
+    cache = DocCache()
+    doc = tmp_path / "glossary.md"
+    doc.write_text("terms", encoding="utf-8")
+    renders = []
+
+    def render(text):
+        renders.append(text)
+        return _render(text)
+
+    first = cache.get_block(doc, "glossary.md", render)
+    first["cache_control"] = {"type": "ephemeral"}
+    first["metadata"]["extra"] = True
+    second = cache.get_block(doc, "glossary.md", render)
+
+    assert renders == ["terms"]
+    assert "cache_control" not in second
+    assert "extra" not in second["metadata"]
+    assert cache.get_block(tmp_path / "missing.md", "missing.md", render) is None
+
+
+def test_hits_and_misses_count_for_the_span_they_happen_in(tmp_path):
+    telemetry = sys.modules["telemetry"]
+    cache = DocCache()
+    doc = tmp_path / "visuals.md"
+    doc.write_text("v1", encoding="utf-8")
+    cache.read_text(doc)  # outside any span (another pipeline): not counted
+
+    with telemetry.span() as step_span:
+        cache.read_text(doc)
+        cache.get_block(doc, "visuals", _render)
+
+    assert step_span.counts == {"doc_cache_hits": 2}
+    assert cache.stats() == {"hits": 2, "misses": 1}
@@ -0,0 +1,85 @@
+"""
+Tests for incremental pipeline runs (run_pipeline(incremental=True), core/fingerprint.py).
+
+A lesson file is split into sections, and each section runs through two batch steps.
+After editing one section, an incremental run should rerun only that section's chain.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import core.pipeline as pipeline
+from core.pipeline import Step, run_pipeline
+from tests import pipeline_helpers
+
+_calls = Counter()
+
+
+def _split(text):
+    _calls["split"] += 1
+    return pipeline_helpers._split(text)
+
+
+def _structure(section):
+    _calls["structure"] += 1
+    return pipeline_helpers._structure(section)
+
+
+def _rewrite(section):
+    _calls["rewrite"] += 1
+    return {"id": section["id"], "text": f"<{section['text']}>"}
+
+
+def _run(lesson: Path, incremental: bool) -> dict:
+    _calls.clear()
+    steps = [
+        Step(function="tests.test_incremental._split", input_file=str(lesson)),
+        Step(function="tests.test_incremental._structure", batch_mode=True, batch_id_field="id"),
+        Step(function="tests.test_incremental._rewrite", batch_mode=True, batch_id_field="id"),
+    ]
+    result = run_pipeline(
+        steps, pipeline_name="lesson_test", verbose=False, incremental=incremental
+    )
+    return result["metadata"]
+
+
+def test_edit_reruns_only_the_changed_section(tmp_path, outputs):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\nwarmup\nexit check\n", encoding="utf-8")
+    first = _run(lesson, incremental=False)
+    assert _calls == {"split": 1, "structure": 3, "rewrite": 3}
+    assert set(first["fingerprints"]["step_02__structure"]["items"]) == {"s1", "s2", "s3"}
+
+    lesson.write_text("intro\nwarmup, revised\nexit check\n", encoding="utf-8")
+    second = _run(lesson, incremental=True)
+    assert _calls == {"split": 1, "structure": 1, "rewrite": 1}
+    assert second["incremental"]["reused_items"] == {
+        "step_02__structure": 2,
+        "step_03__rewrite": 2,
+    }
+
+    rewritten = json.loads(
+        (outputs / "lesson_test/v1/step_03__rewrite/_rewrite.json").read_text(encoding="utf-8")
+    )
+    assert [row["text"] for row in rewritten] == ["<INTRO>", "<WARMUP, REVISED>", "<EXIT CHECK>"]
+
+    # Nothing changed: every step is reused from v1
+    third = _run(lesson, incremental=True)
+    assert _calls == {}
+    assert third["incremental"]["reused_steps"] == [1]
+    assert third["incremental"]["reused_items"] == {
+        "step_02__structure": 3,
+        "step_03__rewrite": 3,
+    }
+    again = json.loads(
+        (outputs / "lesson_test/v2/step_03__rewrite/_rewrite.json").read_text(encoding="utf-8")
+    )
+    assert again == rewritten
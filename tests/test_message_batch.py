@@ -0,0 +1,161 @@
+"""
+Tests for Message Batches API execution (Step.batch_api / core/message_batch.py).
+
+Runs the real anthropic SDK against the local fake batch server in fake_batch_server.py.
+"""
+
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+# Pipeline code imports core modules flat (claude_client, message_batch)
+sys.path.insert(0, str(project_root / "core"))
+
+import claude_client as flat_claude_client
+from message_batch import MessageBatchCollector
+
+import core.pipeline as pipeline_module
+from core.pipeline import Step, run_pipeline
+from core.prompt_builder import Prompt
+from tests.fake_batch_server import FakeBatchServer
+
+
+def _input_item(params):
+    content = params["messages"][0]["content"]
+    return json.loads(re.search(r"<input>\n(.*)\n</input>", content, re.S).group(1))
+
+
+def _built(text):
+    return {
+        "system": [{"type": "text", "text": "role", "metadata": {"block_type": "role"}}],
+        "user_message": text,
+        "prefill": "{",
+        "api_params": {"max_tokens": 200, "temperature": 0},
+    }
+
+
+def test_collector_sends_one_batch_and_routes_results(tmp_path, monkeypatch):
+    def responder(params):
+        text = params["messages"][0]["content"]
+        if text == "bad":
+            raise ValueError("prompt is too long")
+        return f'"echo": "{text}"}}'
+
+    def responder_with_expiry(params):
+        if params["messages"][0]["content"] == "slow":
+            return FakeBatchServer.EXPIRED
+        return responder(params)
+
+    with FakeBatchServer(responder_with_expiry, polls_until_ended=2) as server:
+        client = flat_claude_client.ClaudeClient(
+            api_key="test-key", log_file=tmp_path / "usage.jsonl"
+        )
+        client.client = anthropic.Anthropic(api_key="test-key", base_url=server.url)
+        sent_directly = []
+
+        def create(api_params):
+            sent_directly.append(api_params)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text='"echo": "direct"}')],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+                stop_reason="end_turn",
+            )
+
+        client._create = create
+        collector = MessageBatchCollector(client=client, poll_seconds=0.01)
+
+        def item(text):
+            if text == "skip":
+                raise RuntimeError("failed before generation")
+            output = collector.execute(_built(text))
+            if text == "b":
+                # A follow-up (validation retry) is sent directly, not batched again
+                output += collector.execute(_built("retry"))
+            return output
+
+        texts = ["a", "b", "bad", "skip", "slow"]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = collector.run_items({text: (text,) for text in texts}, item, item, pool)
+            results = {}
+            for text, future in futures.items():
+                try:
+                    results[text] = future.result(timeout=30)
+                except Exception as e:
+                    results[text] = e
+
+    assert len(server.batches) == 1
+    (batch,) = server.batches.values()
+    assert len(batch["requests"]) == 4  # "skip" never reached execute()
+    assert all("metadata" not in block for block in batch["requests"][0]["params"]["system"])
+
+    assert results["a"] == '{"echo": "a"}'
+    assert results["b"] == '{"echo": "b"}{"echo": "direct"}'
+    assert results["slow"] == '{"echo": "direct"}'  # expired in the batch, re-sent directly
+    assert sorted(p["messages"][0]["content"] for p in sent_directly) == ["retry", "slow"]
+    assert isinstance(results["bad"], RuntimeError) and "too long" in str(results["bad"])
+    assert isinstance(results["skip"], RuntimeError)
+    assert client.get_stats()["requests"] == 4
+
+
+@pytest.fixture
+def fake_pipeline_env(tmp_path, monkeypatch):
+    """Point pipeline ClaudeClients at a fake batch server and keep their logs in tmp_path"""
+
+    def responder(params):
+        item = _input_item(params)
+        return json.dumps({"id": item["id"], "text": item["word"].upper()})
+
+    real_init = flat_claude_client.ClaudeClient.__init__
+
+    def init(self, api_key=None, log_file=None, cache=False):
+        real_init(self, api_key, tmp_path / "usage.jsonl", False)
+
+    monkeypatch.setattr(flat_claude_client.ClaudeClient, "__init__", init)
+    monkeypatch.setattr(pipeline_module, "_print_prompt_cache_usage", lambda *a: None)
+
+    with FakeBatchServer(responder) as server:
+        # A per-server key gets its own shared SDK client, created with this base URL
+        monkeypatch.setenv("ANTHROPIC_API_KEY", f"fake-{server.url}")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+        monkeypatch.setattr(
+            pipeline_module.PromptBuilderV2,
+            "_load_prompt",
+            lambda self, name: Prompt(
+                instructions="Uppercase the word.",
+                output_structure='{"id": "w1", "text": "WORD"}',
+                cache_docs=False,
+            ),
+        )
+        monkeypatch.setattr("message_batch.DEFAULT_POLL_SECONDS", 0.01)
+        yield server
+
+
+def test_batch_api_step_collates_like_sync(tmp_path, fake_pipeline_env):
+    items = [{"id": f"w{n}", "word": word} for n, word in enumerate(["one", "two", "six"], 1)]
+    input_file = tmp_path / "words.json"
+    input_file.write_text(json.dumps(items), encoding="utf-8")
+
+    step = Step(
+        prompt_name="uppercase",
+        input_file=str(input_file),
+        batch_mode=True,
+        batch_id_field="id",
+        batch_skip_items=["w2"],
+        batch_api=True,
+    )
+    run_pipeline([step], output_dir=str(tmp_path / "out"), verbose=False)
+
+    assert len(fake_pipeline_env.batches) == 1
+    rows = json.loads(
+        (tmp_path / "out" / "step_01_uppercase" / "uppercase.json").read_text(encoding="utf-8")
+    )
+    assert [(r["id"], r["text"]) for r in rows] == [("w1", "ONE"), ("w3", "SIX")]
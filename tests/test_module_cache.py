@@ -0,0 +1,77 @@
+"""
+Tests for the cached starter-pack lookups in utils/module_utils.py.
+"""
+
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils import module_utils
+from utils.module_utils import get_module_field
+
+
+def _write_pack(units_dir: Path, data: dict, mtime: int) -> Path:
+    pack = units_dir / "unitX" / "_starter_packs" / "module_1.json"
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    pack.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(pack, (mtime, mtime))
+    return pack
+
+
+def test_pack_parsed_once_until_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(module_utils, "_UNITS_DIR", tmp_path)
+    module_utils.clear_module_cache()
+    parses = []
+    real_loads = module_utils._json.loads
+    monkeypatch.setattr(
+        module_utils._json, "loads", lambda text: parses.append(1) or real_loads(text)
+    )
+
+    _write_pack(tmp_path, {"phases": [{"name": "warm_up"}, {"name": "lesson"}]}, 1_000_000)
+    assert get_module_field(1, "phases.*.name", unit="unitX") == ["warm_up", "lesson"]
+    assert get_module_field(1, "phases.1.name", unit="unitX") == "lesson"
+    assert len(parses) == 1
+
+    _write_pack(tmp_path, {"phases": [{"name": "synthesis"}]}, 2_000_000)
+    assert get_module_field(1, "phases.0.name", unit="unitX") == "synthesis"
+    assert len(parses) == 2
+
+
+def test_returned_containers_are_read_only_views(tmp_path, monkeypatch):
+    monkeypatch.setattr(module_utils, "_UNITS_DIR", tmp_path)
+    module_utils.clear_module_cache()
+    _write_pack(tmp_path, {"vocabulary": ["equal", "parts"]}, 1_000_000)
+
+    vocab = get_module_field(1, "vocabulary", unit="unitX")
+    with pytest.raises(TypeError):
+        vocab.append("mutated")
+    editable = copy.deepcopy(vocab)
+    editable.append("mutated")
+
+    assert get_module_field(1, "vocabulary", unit="unitX") == ["equal", "parts"]
+    assert json.dumps(vocab) == '["equal", "parts"]'
+    assert get_module_field(1, "missing", required=False, default="d", unit="unitX") == "d"
+
+
+def test_modules_built_once_per_pack_signature(tmp_path, monkeypatch):
+    monkeypatch.setattr(module_utils, "_UNITS_DIR", tmp_path)
+    monkeypatch.setattr(module_utils, "_DEFAULT_UNIT", "unitX")
+    monkeypatch.setattr(module_utils, "_STARTER_PACKS_DIR", tmp_path / "unitX/_starter_packs")
+    module_utils.clear_module_cache()
+    _write_pack(tmp_path, {"vocabulary": ["equal"]}, 1_000_000)
+
+    modules = module_utils.MODULES
+    assert module_utils.MODULES is modules
+    with pytest.raises(TypeError):
+        modules[1]["vocabulary"] = []
+
+    _write_pack(tmp_path, {"vocabulary": ["parts"]}, 2_000_000)
+    assert module_utils.MODULES[1]["vocabulary"] == ["parts"]
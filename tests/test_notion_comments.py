@@ -0,0 +1,153 @@
+"""
+Tests for the concurrent, incremental comment sweep (utils/notion.fetch_lesson_comments).
+
+Uses an in-memory fake of client.comments.list; no Notion credentials needed.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import utils.notion as notion
+import utils.notion_api as notion_api
+from utils.notion_api import NotionRateLimiter
+
+
+def _rt(text):
+    return [{"type": "text", "text": {"content": text}}]
+
+
+def _comment(cid, discussion, text):
+    return {
+        "id": cid,
+        "discussion_id": discussion,
+        "rich_text": _rt(text),
+        "created_by": {"id": "user-1"},
+        "created_time": "2026-01-01T00:00:00.000Z",
+    }
+
+
+def _blocks(edited="2026-01-01T00:00:00.000Z"):
+    """One section: H2 heading, a toggle with two callouts, then a divider"""
+    callouts = [
+        {"id": f"callout-{n}", "type": "callout", "callout": {}, "last_edited_time": edited}
+        for n in range(2)
+    ]
+    return [
+        {
+            "id": "h2",
+            "type": "heading_2",
+            "heading_2": {"rich_text": _rt("Intro [s1_intro]")},
+            "last_edited_time": "2026-01-01T00:00:00.000Z",
+        },
+        {
+            "id": "toggle",
+            "type": "toggle",
+            "toggle": {"children": callouts + [callouts[0]]},
+            "last_edited_time": "2026-01-01T00:00:00.000Z",
+        },
+        {"id": "divider", "type": "divider", "divider": {}, "last_edited_time": "x"},
+    ]
+
+
+class _FakeComments:
+    def __init__(self, comments):
+        self.comments = comments
+        self.queried = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.comments_api = SimpleNamespace(list=self._list)
+
+    @property
+    def client(self):
+        return SimpleNamespace(comments=self.comments_api)
+
+    def _list(self, block_id, start_cursor=None):
+        with self._lock:
+            self.queried.append(block_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01)
+            return {"results": self.comments.get(block_id, []), "has_more": False}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _sweep(monkeypatch, fake, blocks, **kwargs):
+    monkeypatch.setattr(notion, "get_notion_client", lambda: fake.client)
+    monkeypatch.setattr(notion_api, "_limiter", NotionRateLimiter(1000))
+    return notion.fetch_lesson_comments("page", [], blocks=blocks, **kwargs)
+
+
+def test_block_ids_deduped_in_page_order():
+    assert notion._all_block_ids_from_tree(_blocks()) == [
+        "h2",
+        "toggle",
+        "callout-0",
+        "callout-1",
+        "divider",
+    ]
+
+
+def test_sweep_is_concurrent_and_filters_claude_threads(monkeypatch):
+    fake = _FakeComments(
+        {
+            "callout-1": [
+                _comment("c1", "d1", "@Claude this beat is wrong"),
+                _comment("c2", "d1", "agreed"),
+                _comment("c3", "d2", "typo only"),
+            ],
+        }
+    )
+
+    results = _sweep(monkeypatch, fake, _blocks())
+
+    assert sorted(fake.queried) == sorted(
+        ["page", "h2", "toggle", "callout-0", "callout-1", "divider"]
+    )
+    assert fake.peak > 1
+    assert [r["discussion_id"] for r in results] == ["d1"]
+    assert results[0]["section_id"] == "s1_intro"
+    assert [m["comment_text"] for m in results[0]["thread"]] == [
+        "@Claude this beat is wrong",
+        "agreed",
+    ]
+
+    fake.queried.clear()
+    everything = _sweep(monkeypatch, fake, _blocks(), all_comments=True)
+    assert [r["discussion_id"] for r in everything] == ["d1", "d2"]
+
+
+def test_incremental_sweep_only_requeries_edited_blocks(monkeypatch, tmp_path):
+    state_path = tmp_path / "notion_comment_state.json"
+    fake = _FakeComments({"callout-0": [_comment("c1", "d1", "@claude fix")]})
+
+    first = _sweep(monkeypatch, fake, _blocks(), state_path=state_path)
+    assert len(fake.queried) == 6
+    assert state_path.exists()
+
+    # Nothing edited: the page and the block with comments (for replies) are re-queried
+    fake.queried.clear()
+    fake.comments["callout-0"].append(_comment("c3", "d1", "a reply"))
+    second = _sweep(monkeypatch, fake, _blocks(), state_path=state_path)
+    assert sorted(fake.queried) == ["callout-0", "page"]
+    assert [m["comment_id"] for m in second[0]["thread"]] == ["c1", "c3"]
+    assert second[0]["block_id"] == first[0]["block_id"]
+
+    # The callouts were edited (and one gained a thread): just those are re-queried
+    fake.queried.clear()
+    fake.comments["callout-1"] = [_comment("c2", "d2", "@claude and this")]
+    third = _sweep(
+        monkeypatch, fake, _blocks(edited="2026-02-01T00:00:00.000Z"), state_path=state_path
+    )
+    assert sorted(fake.queried) == ["callout-0", "callout-1", "page"]
+    assert [r["discussion_id"] for r in third] == ["d1", "d2"]
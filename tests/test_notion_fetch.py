@@ -0,0 +1,139 @@
+"""
+Tests for the breadth-first, rate-limited Notion block fetcher (utils/notion_api.py).
+
+Uses an in-memory fake of client.blocks.children.list; no Notion credentials needed.
+"""
+
+import copy
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from notion_client import APIResponseError
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.notion_api import NotionRateLimiter, fetch_block_tree, notion_call
+
+
+def _page_tree():
+    """{block_id: [child blocks]}: 6 toggles, each with 3 children, one nested deeper"""
+    tree = {"page": []}
+    for t in range(6):
+        toggle_id = f"toggle-{t}"
+        tree["page"].append({"id": toggle_id, "type": "toggle", "toggle": {}, "has_children": True})
+        tree["page"].append({"id": f"para-{t}", "type": "paragraph", "paragraph": {}})
+        tree[toggle_id] = []
+        for c in range(3):
+            child_id = f"{toggle_id}-c{c}"
+            nested = c == 0
+            tree[toggle_id].append(
+                {"id": child_id, "type": "callout", "callout": {}, "has_children": nested}
+            )
+            if nested:
+                tree[child_id] = [{"id": f"{child_id}-leaf", "type": "paragraph", "paragraph": {}}]
+    return tree
+
+
+class _FakeNotion:
+    def __init__(self, tree, page_size=4, fail_first_with_429=False):
+        self.tree = tree
+        self.page_size = page_size
+        self.fail_next = fail_first_with_429
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.blocks = SimpleNamespace(children=SimpleNamespace(list=self._list))
+
+    def _list(self, block_id, start_cursor=None):
+        with self._lock:
+            self.calls += 1
+            if self.fail_next:
+                self.fail_next = False
+                raise APIResponseError(
+                    "rate_limited", 429, "slow down", httpx.Headers({"retry-after": "0"}), ""
+                )
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01)
+            start = int(start_cursor or 0)
+            children = copy.deepcopy(self.tree.get(block_id, []))
+            page = children[start : start + self.page_size]
+            more = start + self.page_size < len(children)
+            return {
+                "results": page,
+                "has_more": more,
+                "next_cursor": str(start + self.page_size) if more else None,
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _depth_first(client, block_id):
+    """Reference: the old recursive _all_blocks walk"""
+    results, cursor = [], None
+    while True:
+        kwargs = {"block_id": block_id}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = client.blocks.children.list(**kwargs)
+        results.extend(response["results"])
+        if not response["has_more"]:
+            break
+        cursor = response["next_cursor"]
+    for block in results:
+        if block.get("has_children"):
+            block[block["type"]]["children"] = _depth_first(client, block["id"])
+    return results
+
+
+def test_breadth_first_matches_depth_first_structure():
+    tree = _page_tree()
+    expected = _depth_first(_FakeNotion(tree), "page")
+
+    client = _FakeNotion(tree)
+    blocks = fetch_block_tree(client, "page", max_workers=6, limiter=NotionRateLimiter(1000))
+
+    assert blocks == expected
+    assert client.peak > 1  # sibling listings overlapped
+
+
+def test_rate_limit_and_429_backoff():
+    limiter = NotionRateLimiter(rate=50, burst=1)
+    client = _FakeNotion({"page": []}, fail_first_with_429=True)
+
+    start = time.monotonic()
+    for _ in range(5):
+        notion_call(client.blocks.children.list, block_id="page", limiter=limiter)
+    elapsed = time.monotonic() - start
+
+    assert client.calls == 6  # the 429 was retried
+    assert elapsed >= 5 / 50  # requests were spaced by the bucket
+
+
+def test_appends_are_only_retried_when_not_applied():
+    limiter = NotionRateLimiter(1000)
+    errors = [
+        APIResponseError("rate_limited", 429, "slow down", httpx.Headers({"retry-after": "0"}), ""),
+        APIResponseError("bad_gateway", 502, "bad gateway", httpx.Headers(), ""),
+    ]
+    calls = []
+
+    def append(block_id, children):
+        calls.append(block_id)
+        raise errors.pop(0)
+
+    # The 429 is retried; the 502 may have created the blocks, so it is raised
+    with pytest.raises(APIResponseError) as excinfo:
+        notion_call(append, "page", children=[{}], limiter=limiter, idempotent=False)
+    assert excinfo.value.status == 502
+    assert len(calls) == 2
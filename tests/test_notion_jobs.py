@@ -0,0 +1,57 @@
+"""
+Tests for the concurrent multi-page job runner (utils/notion_jobs.py).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.notion_jobs import print_job_summary, run_page_jobs
+
+
+def test_jobs_run_concurrently_with_prefixed_output(capsys):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def page(n):
+        def run():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            print(f"pulling page {n}", end="")
+            time.sleep(0.02)
+            print(" ... done")
+            with lock:
+                active -= 1
+            if n == 2:
+                raise RuntimeError("page not found")
+            if n == 3:
+                sys.exit(1)
+            return f"OK {n}"
+
+        return f"p{n}", run
+
+    results = run_page_jobs([page(n) for n in range(5)], max_workers=5)
+    print_job_summary(results, 0.1)
+    out = capsys.readouterr().out.splitlines()
+
+    assert peak > 1
+    assert sys.stdout is not None and not hasattr(sys.stdout, "set_label")
+    assert [r.label for r in results] == ["p0", "p1", "p2", "p3", "p4"]
+    assert [r.ok for r in results] == [True, True, False, False, True]
+    assert results[0].status == "OK 0"
+    assert results[2].error == "page not found"
+
+    # Lines are whole and carry their page's label
+    assert "[p1] pulling page 1 ... done" in out
+    assert "[p4] OK 4" in out
+    assert "[p2] [FAILED] page not found" in out
+    assert "3 page(s) OK, 2 failed in 0.1s" in out
+    assert "  p2: page not found" in out
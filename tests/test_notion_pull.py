@@ -454,3 +454,45 @@ def test_section_isolation():
     sec_b = _find_section(patched, "s1_2_b")
     assert _find_beat(sec_a, "dialogue")["text"] == "Section A edited."
     assert _find_beat(sec_b, "dialogue")["text"] == "Section B."
+
+
+# ---------------------------------------------------------------------------
+# 11. Untagged beats — unedited blocks match by text, only edits are scored
+# ---------------------------------------------------------------------------
+
+
+def test_untagged_beats_match_by_text(monkeypatch):
+    from utils.notion_codecs import DialogueCodec
+
+    lesson = _make_lesson(
+        [
+            _make_section(
+                "s1_1_lines",
+                [{"type": "dialogue", "id": f"b{n}", "text": f"Line {n}."} for n in range(30)],
+            )
+        ]
+    )
+    scored = []
+    match_score = DialogueCodec.match_score
+
+    def counting_match_score(self, beat, block):
+        scored.append(beat["id"])
+        return match_score(self, beat, block)
+
+    monkeypatch.setattr(DialogueCodec, "match_score", counting_match_score)
+
+    def mutate(blocks):
+        callouts = _callout_blocks(blocks, "s1_1_lines")
+        # Move the last line to the top (far outside the fuzzy-match window) and edit one
+        blocks.remove(callouts[-1])
+        blocks.insert(blocks.index(callouts[0]), callouts[-1])
+        _set_callout_text(callouts[10], '"Line 10, edited."')
+
+    patched, flags = _push_pull(lesson, mutate)
+    beats = _find_section(patched, "s1_1_lines")["beats"]
+
+    assert [b["id"] for b in beats] == ["b29"] + [f"b{n}" for n in range(29)]
+    assert beats[11]["text"] == "Line 10, edited."
+    # Only the edited block was scored, and only against the beats right after it
+    assert scored and set(scored) <= {f"b{n}" for n in range(10, 15)}
+    assert flags == []
@@ -0,0 +1,98 @@
+"""
+Tests for the Notion page registry store (utils/notion_registry.py).
+"""
+
+import json
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import utils.notion_registry as notion_registry
+from utils.notion_registry import RegistryStore
+
+
+def _entry(page_id: str) -> dict:
+    return {"page_id": page_id, "title": page_id, "pushed_at": "2026-01-01T00:00:00+00:00"}
+
+
+def _push_many(path: str, worker: int, count: int) -> None:
+    store = RegistryStore(Path(path))
+    for n in range(count):
+        store.set(f"outputs/w{worker}/p{n}/notion_page.json", _entry(f"{worker:04d}-{n:04d}"))
+
+
+def test_reads_existing_snapshot_and_indexes_page_ids(tmp_path):
+    path = tmp_path / "notion_pages.json"
+    path.write_text(json.dumps({"lesson.json": _entry("31764eb2-2a3f-8116")}), encoding="utf-8")
+    store = RegistryStore(path)
+
+    store.set("outputs/a/notion_page.json", _entry("aaaa-bbbb"))
+
+    assert store.get("lesson.json")["page_id"] == "31764eb2-2a3f-8116"
+    assert store.key_for_page("31764eb22a3f8116") == "lesson.json"
+    assert store.key_for_page("aaaabbbb") == "outputs/a/notion_page.json"
+    # The snapshot is not rewritten for a single entry; a new reader sees both
+    assert list(json.loads(path.read_text(encoding="utf-8"))) == ["lesson.json"]
+    assert set(RegistryStore(path).entries()) == {"lesson.json", "outputs/a/notion_page.json"}
+
+
+def test_parallel_processes_keep_every_entry(tmp_path):
+    path = tmp_path / "notion_pages.json"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        for future in [pool.submit(_push_many, str(path), w, 30) for w in range(4)]:
+            future.result()
+
+    entries = RegistryStore(path).entries()
+    assert len(entries) == 120
+    assert entries["outputs/w3/p29/notion_page.json"]["page_id"] == "0003-0029"
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(notion_registry, "COMPACT_AFTER", 5)
+    path = tmp_path / "notion_pages.json"
+    store = RegistryStore(path)
+
+    for n in range(5):
+        store.set(f"k{n}", _entry(f"p{n}"))
+
+    assert not store.journal_path.exists()
+    assert set(json.loads(path.read_text(encoding="utf-8"))) == {f"k{n}" for n in range(5)}
+    assert store.key_for_page("p4") == "k4"
+
+
+def test_batch_writes_once_and_reads_its_own_writes(tmp_path):
+    store = RegistryStore(tmp_path / "notion_pages.json")
+
+    with store.batch():
+        store.set("k1", _entry("p1"))
+        store.set("k2", _entry("p2"))
+        assert store.get("k1")["page_id"] == "p1"
+        assert store.key_for_page("p2") == "k2"
+        assert not store.journal_path.exists()
+
+    assert len(store.journal_path.read_text(encoding="utf-8").splitlines()) == 2
+    assert set(RegistryStore(store.path).entries()) == {"k1", "k2"}
+
+
+def test_batches_are_per_thread(tmp_path):
+    store = RegistryStore(tmp_path / "notion_pages.json")
+
+    def first_job():
+        with store.batch():
+            store.set("k1", _entry("p1"))
+
+    with store.batch():
+        store.set("k2", _entry("p2"))
+        # Another job's batch ends while this one is still open: its entry is saved
+        thread = threading.Thread(target=first_job)
+        thread.start()
+        thread.join()
+        assert set(RegistryStore(store.path).entries()) == {"k1"}
+        assert store.get("k2")["page_id"] == "p2"
+
+    assert set(RegistryStore(store.path).entries()) == {"k1", "k2"}
@@ -0,0 +1,91 @@
+"""
+Push/pull round trip through the real notion_client against the fake Notion server
+(tests/fake_notion_server.py). No Notion credentials needed.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+from fake_notion_server import FakeNotionServer
+from notion_client import Client
+
+import utils.notion as notion
+import utils.notion_api as notion_api
+import utils.notion_mirror as notion_mirror
+from utils.notion_api import NotionRateLimiter, list_children
+
+LESSON = project_root / "tracked_scripts/u1/m4/exitcheck/step_14_pull/pull.json"
+
+
+def _without_ids(obj):
+    if isinstance(obj, dict):
+        return {k: _without_ids(v) for k, v in obj.items() if k != "_notion_block_id"}
+    if isinstance(obj, list):
+        return [_without_ids(v) for v in obj]
+    return obj
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    with FakeNotionServer() as server:
+        monkeypatch.setenv("NOTION_API_KEY", "secret_test")
+        monkeypatch.setenv("NOTION_PARENT_PAGE_ID", "parent")
+        monkeypatch.setenv("NOTION_BASE_URL", server.url)
+        monkeypatch.setenv("NOTION_YES", "1")
+        monkeypatch.setattr(notion, "_REGISTRY_PATH", tmp_path / "notion_pages.json")
+        monkeypatch.setattr(notion_mirror, "_MIRROR_DIR", tmp_path / "mirrors")
+        monkeypatch.setattr(notion_api, "_limiter", NotionRateLimiter(1000))
+        yield server
+
+
+def test_push_pull_tag_and_comments(server, tmp_path):
+    sections = json.loads(LESSON.read_text(encoding="utf-8"))
+    file_path = tmp_path / "pull.json"
+    file_path.write_text(json.dumps(sections), encoding="utf-8")
+
+    page_id = notion.push_lesson(sections, "Exit check", file_path)
+
+    patched, flags, blocks = notion.pull_lesson(page_id, sections)
+    assert _without_ids(patched) == _without_ids(sections)
+    assert flags == []
+
+    # Nothing changed since the pull: decided from the local mirror in one request
+    server.reset_counts()
+    assert notion.push_lesson(sections, "Exit check", file_path) == page_id
+    assert dict(server.requests) == {"GET pages": 1}
+
+    tagged = notion.tag_notion_ids(notion.get_notion_client(), page_id, sections)
+    beat_id = next(b["_notion_block_id"] for b in tagged[0]["beats"] if "_notion_block_id" in b)
+    server.add_comment(beat_id, "@claude shorter please")
+    server.add_comment(page_id, "Looks good")
+
+    comments = notion.fetch_lesson_comments(page_id, tagged, blocks=blocks)
+    assert [c["block_id"] for c in comments] == [beat_id]
+    assert comments[0]["section_id"] == tagged[0]["id"]
+    assert comments[0]["thread"][0]["comment_text"] == "@claude shorter please"
+
+
+def test_rate_limited_requests_are_retried(server):
+    server.throttle_every = 2
+    client = Client(auth="secret_test", base_url=server.url, retry=False)
+    page = client.pages.create(parent={"page_id": "parent"}, properties={})
+    children = [
+        {"type": "paragraph", "paragraph": {"rich_text": [{"text": {"content": f"{n}"}}]}}
+        for n in range(150)
+    ]
+    notion_api.notion_call(client.blocks.children.append, page["id"], children=children[:100])
+    notion_api.notion_call(client.blocks.children.append, page["id"], children=children[100:])
+
+    listed = list_children(client, page["id"])
+
+    assert [b["paragraph"]["rich_text"][0]["plain_text"] for b in listed] == [
+        f"{n}" for n in range(150)
+    ]
+    assert server.throttled > 0
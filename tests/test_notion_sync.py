@@ -0,0 +1,262 @@
+"""
+Tests for the minimal-mutation Notion sync planner (utils/notion_sync.py).
+
+Pushes rendered lessons onto an in-memory fake of the Notion blocks API and counts
+the write requests; no Notion credentials needed. Also covers the local page mirror
+(utils/notion_mirror.py) that lets a push skip re-downloading the page.
+"""
+
+import copy
+import itertools
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import utils.notion_api as notion_api
+import utils.notion_mirror as notion_mirror
+from utils.notion import _sync_blocks, lesson_to_blocks
+from utils.notion_api import NotionRateLimiter
+from utils.notion_mirror import load_mirror, tree_hash
+from utils.notion_sync import block_skeleton, content_hash, plan_sync
+
+
+class _FakeBlocksApi:
+    """Children lists keyed by parent ID, answering like the Notion blocks endpoints"""
+
+    def __init__(self):
+        self.children = {"page": []}
+        self.writes = []
+        self.reads = 0
+        self.edits = itertools.count(1)
+        self.last_edited_time = "t0"
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.blocks = SimpleNamespace(
+            update=self._update,
+            children=SimpleNamespace(list=self._list, append=self._append),
+        )
+        self.pages = SimpleNamespace(retrieve=self._retrieve)
+
+    def _retrieve(self, page_id):
+        return {"id": page_id, "last_edited_time": self.last_edited_time}
+
+    def _write(self, kind, block_id):
+        self.writes.append((kind, block_id))
+        self.last_edited_time = f"t{next(self.edits)}"
+
+    def _stored(self, block):
+        """Store a rendered block the way Notion returns it"""
+        block = copy.deepcopy(block)
+        block_id = f"b{next(self._ids)}"
+        btype = block["type"]
+        data = block.setdefault(btype, {})
+        children = data.pop("children", [])
+        for span in data.get("rich_text", []):
+            span.setdefault("type", "text")
+            span["plain_text"] = span["text"]["content"]
+        if btype not in ("divider", "column_list", "column", "code"):
+            data.setdefault("color", "default")
+        if btype == "code":
+            data.setdefault("caption", [])
+        block.update(id=block_id, has_children=bool(children), archived=False)
+        self.children[block_id] = [self._stored(child) for child in children]
+        return block
+
+    def _find(self, block_id):
+        for siblings in self.children.values():
+            for block in siblings:
+                if block["id"] == block_id:
+                    return block, siblings
+        raise KeyError(block_id)
+
+    def _list(self, block_id, start_cursor=None):
+        with self._lock:
+            self.reads += 1
+            visible = [b for b in self.children.get(block_id, []) if not b["archived"]]
+            for block in visible:
+                block["has_children"] = any(not c["archived"] for c in self.children[block["id"]])
+            return {"results": copy.deepcopy(visible), "has_more": False, "next_cursor": None}
+
+    def _update(self, block_id, archived=None, **fields):
+        with self._lock:
+            self._write("archive" if archived else "update", block_id)
+            block, _ = self._find(block_id)
+            if archived:
+                block["archived"] = True
+            for btype, data in fields.items():
+                block[btype].update(copy.deepcopy(data))
+                for span in block[btype].get("rich_text", []):
+                    span["plain_text"] = span["text"]["content"]
+            return block
+
+    def _append(self, block_id, children, after=None, position=None):
+        with self._lock:
+            self._write("append", block_id)
+            siblings = self.children.setdefault(block_id, [])
+            stored = [self._stored(child) for child in children]
+            if after is not None:
+                index = next(i for i, b in enumerate(siblings) if b["id"] == after) + 1
+                if siblings[index - 1]["archived"]:
+                    raise ValueError("Can't edit block that is archived.")
+            elif position == {"type": "start"}:
+                index = 0
+            else:
+                index = len(siblings)
+            siblings[index:index] = stored
+            return {"results": copy.deepcopy(stored)}
+
+    def tree(self, parent="page"):
+        """Visible tree as (skeleton, content hash, children) tuples"""
+        return [
+            (block_skeleton(b), content_hash(b), self.tree(b["id"]))
+            for b in self.children.get(parent, [])
+            if not b["archived"]
+        ]
+
+    def ids(self, parent="page"):
+        return [b["id"] for b in self.children.get(parent, []) if not b["archived"]]
+
+
+def _rendered_tree(blocks):
+    return [
+        (
+            block_skeleton(b),
+            content_hash(b),
+            _rendered_tree(b[b["type"]].get("children", [])),
+        )
+        for b in blocks
+    ]
+
+
+def _lesson(intro_text="Hello world.", extra_beat=False):
+    beats = [
+        {"type": "dialogue", "text": intro_text},
+        {"type": "scene", "method": "show", "tangible_id": "pg_fruits"},
+        {"type": "dialogue", "text": "Let's count."},
+    ]
+    if extra_beat:
+        beats.insert(0, {"type": "dialogue", "text": "A new first line."})
+    return [
+        {"id": "s1_1_intro", "beats": beats},
+        {
+            "id": "s1_2_count",
+            "beats": [{"type": "dialogue", "text": f"Line {n}."} for n in range(40)],
+        },
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(notion_api, "_limiter", NotionRateLimiter(1000))
+    monkeypatch.setattr(notion_mirror, "_MIRROR_DIR", tmp_path / "mirrors")
+
+
+def _sync(fake, blocks, monkeypatch):
+    fake.writes.clear()
+    fake.reads = 0
+    _sync_blocks(fake, "page", blocks)
+    return list(fake.writes)
+
+
+def test_first_push_appends_everything_in_one_run(monkeypatch):
+    fake = _FakeBlocksApi()
+    blocks = lesson_to_blocks(_lesson())
+
+    writes = _sync(fake, blocks, monkeypatch)
+
+    assert fake.tree() == _rendered_tree(blocks)
+    assert writes == [("append", "page")] * -(-len(blocks) // 100)
+
+
+def test_one_changed_beat_is_one_update_and_keeps_ids(monkeypatch):
+    fake = _FakeBlocksApi()
+    _sync(fake, lesson_to_blocks(_lesson()), monkeypatch)
+    ids_before = fake.ids()
+
+    blocks = lesson_to_blocks(_lesson(intro_text="Hello, world!"))
+    writes = _sync(fake, blocks, monkeypatch)
+
+    assert fake.tree() == _rendered_tree(blocks)
+    assert [kind for kind, _ in writes] == ["update"]
+    assert fake.ids() == ids_before
+
+
+def test_unchanged_push_sends_no_writes(monkeypatch):
+    fake = _FakeBlocksApi()
+    blocks = lesson_to_blocks(_lesson())
+    _sync(fake, blocks, monkeypatch)
+
+    assert _sync(fake, lesson_to_blocks(_lesson()), monkeypatch) == []
+
+
+def test_inserted_and_removed_beats_are_positioned(monkeypatch):
+    fake = _FakeBlocksApi()
+    _sync(fake, lesson_to_blocks(_lesson()), monkeypatch)
+
+    blocks = lesson_to_blocks(_lesson(extra_beat=True))
+    writes = _sync(fake, blocks, monkeypatch)
+    assert fake.tree() == _rendered_tree(blocks)
+    assert [kind for kind, _ in writes] == ["append"]
+
+    blocks = lesson_to_blocks(_lesson())
+    writes = _sync(fake, blocks, monkeypatch)
+    assert fake.tree() == _rendered_tree(blocks)
+    assert [kind for kind, _ in writes] == ["archive"]
+
+
+def test_leading_insert_goes_to_start():
+    existing = [{"id": "k", "type": "divider", "divider": {}}]
+    new = [{"type": "paragraph", "paragraph": {"rich_text": []}}, existing[0]]
+
+    plan = plan_sync("page", existing, new)
+
+    assert plan.kept == 1
+    assert [(parent, after, at_start) for parent, after, at_start, _ in plan.inserts] == [
+        ("page", None, True)
+    ]
+
+
+def test_mirror_replaces_page_download(monkeypatch):
+    fake = _FakeBlocksApi()
+    _sync(fake, lesson_to_blocks(_lesson()), monkeypatch)
+
+    mirror = load_mirror("page")
+    assert mirror["tree_hash"] == tree_hash(lesson_to_blocks(_lesson()))
+    assert mirror["last_edited_time"] == fake.last_edited_time
+
+    # Nobody touched the page: the diff is planned locally, with no block listings
+    blocks = lesson_to_blocks(_lesson(intro_text="Hello, world!", extra_beat=True))
+    writes = _sync(fake, blocks, monkeypatch)
+    assert fake.reads == 0
+    assert sorted(kind for kind, _ in writes) == ["append", "update"]
+    assert fake.tree() == _rendered_tree(blocks)
+    assert load_mirror("page")["tree_hash"] == tree_hash(blocks)
+
+    # A reviewer edit moves last_edited_time: the live page is fetched again
+    fake.last_edited_time = "reviewer"
+    _sync(fake, lesson_to_blocks(_lesson()), monkeypatch)
+    assert fake.reads > 0
+    assert fake.tree() == _rendered_tree(lesson_to_blocks(_lesson()))
+
+
+def test_stale_mirror_falls_back_to_live_page(monkeypatch):
+    fake = _FakeBlocksApi()
+    _sync(fake, lesson_to_blocks(_lesson()), monkeypatch)
+
+    # An edit the mirror cannot see (same minute): the section heading the new first
+    # beat would be inserted after has been deleted
+    heading_id = fake.ids()[2]
+    fake._find(heading_id)[0]["archived"] = True
+
+    blocks = lesson_to_blocks(_lesson(extra_beat=True))
+    _sync(fake, blocks, monkeypatch)
+
+    assert fake.tree() == _rendered_tree(blocks)
+    assert fake.reads > 0
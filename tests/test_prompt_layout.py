@@ -0,0 +1,95 @@
+"""
+Tests for the prefix-cache-aware system block layout in PromptBuilderV2.build().
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import core.claude_client as claude_client_module
+from core.claude_client import ClaudeClient, get_usage_totals
+from core.prompt_builder import Prompt, PromptBuilderV2
+
+
+def _builder(prompt):
+    builder = PromptBuilderV2()
+    builder._loaded_prompts["layout_test"] = prompt
+    return builder
+
+
+def _layout(built):
+    return [
+        (b["metadata"]["block_type"], "cache_control" in b, b["metadata"]["cacheable"])
+        for b in built["system"]
+    ]
+
+
+def test_item_specific_blocks_follow_cache_breakpoints():
+    prompt = Prompt(
+        role="You write lesson scripts.",
+        instructions="Write section {slug} of group {group}.",
+        output_structure="Use the {unit_name} schema.",
+        examples=[{"description": "Plain example", "output": "{}"}],
+        cache_docs=True,
+    )
+    builder = _builder(prompt)
+    variables = {"unit_name": "fractions", "slug": "s1", "group": 2}
+
+    built = builder.build(
+        "layout_test",
+        variables,
+        extra_context="lesson sections",
+        item_variables={"slug", "group"},
+    )
+
+    assert _layout(built) == [
+        ("role", False, True),
+        ("examples", True, True),  # end of static tier
+        ("output_schema", True, True),  # end of step tier
+        ("context", True, True),
+        ("instructions", False, False),  # per item, after every breakpoint
+    ]
+    assert "section s1 of group 2" in built["system"][-1]["text"]
+
+    # The cached prefix is byte-identical for the next item
+    other = builder.build(
+        "layout_test",
+        {**variables, "slug": "s2", "group": 3},
+        extra_context="lesson sections",
+        item_variables={"slug", "group"},
+    )
+    assert built["system"][:4] == other["system"][:4]
+
+
+def test_without_item_variables_layout_is_unchanged():
+    prompt = Prompt(role="Role", instructions="Do the task.", output_structure="JSON")
+    built = _builder(prompt).build("layout_test", {"unused": 1})
+
+    assert _layout(built) == [
+        ("role", False, True),
+        ("instructions", False, True),
+        ("output_schema", True, True),
+    ]
+
+
+def test_usage_totals_accumulate_across_clients(tmp_path):
+    usage = SimpleNamespace(
+        input_tokens=10,
+        output_tokens=5,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=900,
+    )
+    before = get_usage_totals()
+
+    for _ in range(2):
+        client = ClaudeClient(api_key="test-key", log_file=tmp_path / "usage.jsonl")
+        client._track_usage(usage)
+
+    after = claude_client_module.get_usage_totals()
+    assert after["requests"] - before["requests"] == 2
+    assert after["cache_read_tokens"] - before["cache_read_tokens"] == 1800
+    assert after["input_tokens"] - before["input_tokens"] == 20
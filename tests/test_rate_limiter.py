@@ -0,0 +1,132 @@
+"""
+Tests for the shared rate limiter and retry scheduling (core/rate_limiter.py).
+
+Separate RateLimiter instances on one state directory stand in for the parallel
+run_pipeline.py subprocesses; a fake Anthropic client drives the retry path offline.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import core.claude_client as claude_client_module
+from core.claude_client import ClaudeClient
+from core.rate_limiter import RateLimiter, retry_delay
+
+MODEL = "claude-test"
+
+
+def _status_error(cls, status: int, headers: dict = None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+def test_bucket_is_shared_between_limiter_instances(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_RATE_LIMIT_RPM", "2")
+    first = RateLimiter(MODEL, tmp_path)
+    second = RateLimiter(MODEL, tmp_path)
+
+    assert first._reserve(10) == 0
+    assert second._reserve(10) == 0
+    # Both requests drew from the same bucket, so a third must wait ~30s for a refill
+    assert 25 < first._reserve(10) <= 30
+
+
+def test_limits_learned_from_headers(tmp_path):
+    limiter = RateLimiter(MODEL, tmp_path)
+    assert limiter._reserve(5000) == 0  # unknown limits do not throttle
+
+    usage = SimpleNamespace(input_tokens=5000, output_tokens=50, cache_creation_input_tokens=0)
+    limiter.record(
+        usage,
+        5000,
+        {
+            "anthropic-ratelimit-input-tokens-limit": "6000",
+            "anthropic-ratelimit-input-tokens-remaining": "1000",
+        },
+    )
+
+    assert limiter._reserve(500) == 0
+    assert limiter._reserve(3000) > 0
+
+
+def test_unknown_limits_are_not_counted(tmp_path):
+    limiter = RateLimiter(MODEL, tmp_path)
+    for _ in range(3):
+        assert limiter._reserve(100) == 0
+    limiter.record(None, 100)
+    limiter.record(SimpleNamespace(input_tokens=100, output_tokens=50), 100)
+
+    with limiter._state() as state:
+        assert state["tokens"] == {dim: 0.0 for dim in state["tokens"]}
+
+
+def test_retry_delay_policy():
+    assert retry_delay(_status_error(anthropic.BadRequestError, 400), 0) is None
+    assert retry_delay(_status_error(anthropic.RateLimitError, 429), 5) is None
+    delay = retry_delay(_status_error(anthropic.RateLimitError, 429, {"retry-after": "3"}), 0)
+    assert 3 <= delay <= 4
+    assert 0 <= retry_delay(_status_error(anthropic.InternalServerError, 529), 2) <= 8
+
+
+def _fake_client(outcomes: list):
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        message = SimpleNamespace(
+            content=[SimpleNamespace(text=outcome)],
+            usage=SimpleNamespace(
+                input_tokens=10,
+                output_tokens=2,
+                cache_creation_input_tokens=0,
+                cache_read_input_tokens=0,
+            ),
+            stop_reason="end_turn",
+        )
+        return SimpleNamespace(parse=lambda: message, headers={})
+
+    raw = SimpleNamespace(create=create)
+    return SimpleNamespace(messages=SimpleNamespace(with_raw_response=raw)), calls
+
+
+def _client(tmp_path, monkeypatch, outcomes: list):
+    monkeypatch.setattr(
+        claude_client_module,
+        "get_rate_limiter",
+        lambda model: RateLimiter(model, tmp_path / "limits"),
+    )
+    client = ClaudeClient(api_key="test-key", log_file=tmp_path / "usage.jsonl")
+    client.client, calls = _fake_client(outcomes)
+    return client, calls
+
+
+def test_generate_retries_rate_limited_requests(tmp_path, monkeypatch):
+    rate_limited = _status_error(anthropic.RateLimitError, 429, {"retry-after": "0"})
+    client, calls = _client(tmp_path, monkeypatch, [rate_limited, "ok"])
+
+    assert client.generate(user_message="hi", model=MODEL) == "ok"
+    assert len(calls) == 2
+    assert client.request_count == 1
+
+
+def test_generate_does_not_retry_bad_requests(tmp_path, monkeypatch):
+    client, calls = _client(
+        tmp_path, monkeypatch, [_status_error(anthropic.BadRequestError, 400), "unused"]
+    )
+
+    with pytest.raises(anthropic.BadRequestError):
+        client.generate(user_message="hi", model=MODEL)
+    assert len(calls) == 1
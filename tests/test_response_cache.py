@@ -0,0 +1,103 @@
+"""
+Tests for the content-addressed response cache (core/response_cache.py).
+
+Uses a fake Anthropic client so cache hits/misses can be counted without network access.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import core.claude_client as claude_client_module
+from core.claude_client import ClaudeClient
+from core.rate_limiter import RateLimiter
+from core.response_cache import ResponseCache
+
+
+def _client(tmp_path, monkeypatch, cache):
+    monkeypatch.setattr(
+        claude_client_module,
+        "get_rate_limiter",
+        lambda model: RateLimiter(model, tmp_path / "limits"),
+    )
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        message = SimpleNamespace(
+            content=[SimpleNamespace(text=f"answer {len(calls)}")],
+            usage=SimpleNamespace(
+                input_tokens=10,
+                output_tokens=2,
+                cache_creation_input_tokens=0,
+                cache_read_input_tokens=0,
+            ),
+            stop_reason="end_turn",
+        )
+        return SimpleNamespace(parse=lambda: message, headers={})
+
+    client = ClaudeClient(api_key="test-key", log_file=tmp_path / "usage.jsonl", cache=cache)
+    client.client = SimpleNamespace(
+        messages=SimpleNamespace(with_raw_response=SimpleNamespace(create=create))
+    )
+    return client, calls
+
+
+def test_identical_requests_hit_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / "cache")
+    client, calls = _client(tmp_path, monkeypatch, cache)
+    system = [{"type": "text", "text": "role", "metadata": {"block_type": "role"}}]
+
+    first = client.generate(system=system, user_message="q", prefill="[", temperature=0)
+    second = client.generate(system=system, user_message="q", prefill="[", temperature=0)
+    changed = client.generate(system=system, user_message="q", prefill="[", temperature=0.5)
+
+    assert first == second == "[answer 1"
+    assert changed == "[answer 2"
+    assert len(calls) == 2
+    assert client.get_stats()["response_cache_hits"] == 1
+
+    # A fresh client (e.g. a rerun) reads the same on-disk entry
+    rerun_client, rerun_calls = _client(tmp_path, monkeypatch, ResponseCache(tmp_path / "cache"))
+    assert rerun_client.generate(system=system, user_message="q", prefill="[", temperature=0) == (
+        "[answer 1"
+    )
+    assert rerun_calls == []
+
+
+def test_no_cache_env_disables_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_NO_CACHE", "1")
+    client, calls = _client(tmp_path, monkeypatch, ResponseCache(tmp_path / "cache"))
+
+    client.generate(user_message="q", temperature=0)
+    client.generate(user_message="q", temperature=0)
+
+    assert client.cache is None
+    assert len(calls) == 2
+
+
+def test_eviction_by_size_and_ttl(tmp_path):
+    cache = ResponseCache(tmp_path / "cache", max_bytes=10_000, ttl_seconds=3600)
+    for i in range(3):
+        cache.put(f"{i:064x}", "x" * 3000)
+    path_0 = cache._entry_path(f"{0:064x}")
+    old = time.time() - 60
+    os.utime(path_0, (old, old))
+    assert cache.get(f"{0:064x}") is not None  # hit refreshes recency
+
+    os.utime(cache._entry_path(f"{1:064x}"), (old, old))
+    cache.put(f"{3:064x}", "x" * 3000)  # over budget: least recently used (1) goes
+
+    assert cache.get(f"{1:064x}") is None
+    assert cache.get(f"{0:064x}") is not None
+    assert cache.get(f"{3:064x}") is not None
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get(f"{3:064x}") is None
@@ -0,0 +1,122 @@
+"""
+Tests for the run log (core/run_log.py): console.txt and run_log.jsonl written in the
+background, and kept when a run fails.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import core.pipeline as pipeline
+from core.pipeline import Step, run_pipeline
+from core.run_log import DEBUG, RunLog, read_events
+from tests import pipeline_helpers
+
+
+def _structure(section):
+    if section["text"] == "broken":
+        raise ValueError("cannot structure")
+    return pipeline_helpers._structure(section)
+
+
+def _steps(lesson: Path, **batch_options):
+    return [
+        Step(function="tests.pipeline_helpers._split", input_file=str(lesson)),
+        Step(
+            function="tests.test_run_log._structure",
+            batch_mode=True,
+            batch_id_field="id",
+            **batch_options,
+        ),
+    ]
+
+
+def test_run_log_writes_console_and_events_in_order(tmp_path):
+    log = RunLog(tmp_path, max_pending=4)
+    for n in range(50):
+        log.write(f"line {n}\n")
+    with log.span("step", step=1, name="split") as end:
+        end["items"] = 3
+    log.flush()
+    assert (tmp_path / "console.txt").read_text(encoding="utf-8").count("\n") == 50
+    log.close()
+    log.write("after close\n")
+
+    assert "after close" not in (tmp_path / "console.txt").read_text(encoding="utf-8")
+    start, end = read_events(tmp_path)
+    assert (start["event"], end["event"]) == ("step_start", "step_end")
+    assert end["status"] == "ok" and end["items"] == 3 and end["seconds"] >= 0
+
+
+def test_pipeline_logs_steps_and_items(tmp_path, outputs):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\nwarmup\n", encoding="utf-8")
+    run_pipeline(_steps(lesson), pipeline_name="lesson_test", verbose=True)
+
+    version_dir = outputs / "lesson_test/v0"
+    events = read_events(version_dir)
+    assert events[0]["event"] == "run_start" and events[-1]["event"] == "run_end"
+    assert events[-1]["status"] == "completed"
+    step_ends = [e for e in events if e["event"] == "step_end"]
+    assert [(e["step"], e["name"], e["status"]) for e in step_ends] == [
+        (1, "_split", "ok"),
+        (2, "_structure", "ok"),
+    ]
+    assert [e["item"] for e in events if e["event"] == "item_end"] == ["s1", "s2"]
+
+    console = (version_dir / "console.txt").read_text(encoding="utf-8")
+    assert "[STEP 2/2] [FORMATTING] _structure" in console
+    # Variable previews are only built at DEBUG verbosity
+    assert "Variables:" not in console
+
+
+def test_failed_run_keeps_its_log(tmp_path, outputs):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\nbroken\n", encoding="utf-8")
+    stdout = sys.stdout
+    with pytest.raises(ValueError, match="cannot structure"):
+        run_pipeline(
+            _steps(lesson, batch_stop_on_error=True),
+            pipeline_name="lesson_test",
+            verbose=DEBUG,
+        )
+    assert sys.stdout is stdout
+
+    version_dir = outputs / "lesson_test/v0"
+    console = (version_dir / "console.txt").read_text(encoding="utf-8")
+    assert "Variables: {'id': 's1'" in console
+    assert "[STOP] Stopping pipeline" in console
+    events = read_events(version_dir)
+    failed_item = [e for e in events if e["event"] == "item_end" and e["status"] == "error"]
+    assert failed_item[0]["item"] == "s2"
+    assert failed_item[0]["error"] == "ValueError: cannot structure"
+    assert events[-1]["event"] == "run_end" and events[-1]["status"] == "failed"
+
+
+def test_failed_run_reports_its_write_errors(tmp_path, outputs, monkeypatch):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\n", encoding="utf-8")
+
+    def write_text(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(sys.modules["step_output"], "_write_text", write_text)
+    # The AI step fails (no such prompt) while the split's output is still being written
+    steps = [_steps(lesson)[0], Step(prompt_name="no_such_prompt")]
+    with pytest.raises(Exception) as failure:
+        run_pipeline(steps, pipeline_name="lesson_test", verbose=True)
+    assert "disk full" not in str(failure.value)
+
+    version_dir = outputs / "lesson_test/v0"
+    assert "Writing step outputs failed: OSError: disk full" in (
+        version_dir / "console.txt"
+    ).read_text(encoding="utf-8")
+    run_end = read_events(version_dir)[-1]
+    assert run_end["status"] == "failed" and run_end["write_error"] == "OSError: disk full"
+    assert not any(t.name.startswith("output-writer") for t in threading.enumerate())
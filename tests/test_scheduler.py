@@ -0,0 +1,149 @@
+"""
+Tests for running pipelines side by side (core/scheduler.py).
+
+Two small pipelines run concurrently; the second one's last step reads the first one's
+structure step through a "pipeline::step/file" context_files ref and must wait for it.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import core.pipeline as pipeline
+from core.pipeline import Step
+from core.scheduler import DependencyError, PipelineRun, build_step_graph, run_pipelines
+
+_events = []
+_other_started = threading.Event()
+
+
+def _structure():
+    # Only returns once the other pipeline is running: the two run concurrently
+    assert _other_started.wait(timeout=10)
+    _events.append("lesson structured")
+    return [{"id": "s1"}]
+
+
+def _lesson_push(sections):
+    _events.append("lesson pushed")
+    return sections
+
+
+def _split():
+    _other_started.set()
+    _events.append("exit split")
+    return [{"id": "e1"}]
+
+
+def _remediate(sections):
+    _events.append("exit remediated")
+    return sections
+
+
+def _broken():
+    raise RuntimeError("no spec")
+
+
+def _exit_run(**options):
+    return PipelineRun(
+        "exit",
+        "exit_test",
+        [
+            Step(function="tests.test_scheduler._split"),
+            Step(
+                function="tests.test_scheduler._remediate",
+                context_files={"lesson_sections": "lesson_test::_structure/_structure.json"},
+            ),
+        ],
+        **options,
+    )
+
+
+@pytest.fixture
+def outputs(outputs):
+    """The shared outputs fixture, with this module's state reset"""
+    _events.clear()
+    _other_started.clear()
+    return outputs
+
+
+def test_cross_pipeline_step_waits_for_the_step_it_reads(outputs, capsys):
+    lesson = PipelineRun(
+        "lesson",
+        "lesson_test",
+        [
+            Step(function="tests.test_scheduler._structure"),
+            Step(function="tests.test_scheduler._lesson_push"),
+        ],
+    )
+    results = run_pipelines([lesson, _exit_run()])
+
+    assert [result.ok for result in results] == [True, True]
+    assert _events.index("exit split") < _events.index("lesson structured")
+    assert _events.index("lesson structured") < _events.index("exit remediated")
+
+    # The terminal shows combined progress; each console.txt only its own pipeline
+    progress = capsys.readouterr().out
+    assert "[exit  ] 2/2 _remediate done in" in progress
+    assert "RUNNING PIPELINE" not in progress
+    exit_console = (outputs / "exit_test/v0/console.txt").read_text(encoding="utf-8")
+    lesson_console = (outputs / "lesson_test/v0/console.txt").read_text(encoding="utf-8")
+    assert "_remediate" in exit_console and "_remediate" not in lesson_console
+    assert "_structure" in lesson_console
+
+
+def test_failed_pipeline_fails_only_its_dependents(outputs):
+    lesson = PipelineRun("lesson", "lesson_test", [Step(function="tests.test_scheduler._broken")])
+    # _broken is named "_broken", so point the exit pipeline's ref at it
+    exit_run = _exit_run()
+    exit_run.steps[1].context_files = {"lesson_sections": "lesson_test::_broken/_broken.json"}
+    _other_started.set()
+
+    lesson_result, exit_result = run_pipelines([lesson, exit_run])
+
+    assert "no spec" in lesson_result.error
+    assert "did not finish" in exit_result.error
+    assert exit_result.steps_done == 1
+    assert "exit remediated" not in _events
+
+
+def test_graph_rejects_unknown_refs_and_cycles():
+    with pytest.raises(DependencyError, match="no step named _missing"):
+        build_step_graph(
+            [
+                PipelineRun("lesson", "lesson_test", [Step(function="m._structure")]),
+                PipelineRun(
+                    "exit",
+                    "exit_test",
+                    [Step(function="m._split", context_files={"x": "lesson_test::_missing/a"})],
+                ),
+            ]
+        )
+
+    with pytest.raises(DependencyError, match="cycle"):
+        build_step_graph(
+            [
+                PipelineRun(
+                    "a",
+                    "a_test",
+                    [
+                        Step(function="m._one", context_files={"x": "b_test::_four/out"}),
+                        Step(function="m._two"),
+                    ],
+                ),
+                PipelineRun(
+                    "b",
+                    "b_test",
+                    [
+                        Step(function="m._three", context_files={"x": "a_test::_two/out"}),
+                        Step(function="m._four"),
+                    ],
+                ),
+            ]
+        )
@@ -0,0 +1,108 @@
+"""
+Tests for the in-memory step-to-step handoff in run_pipeline (core/step_output.py).
+
+Chains formatting steps and checks that each step receives the previous step's value
+itself (not a re-parsed copy) while every step output still lands on disk.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from core.pipeline import Step, run_pipeline
+from core.step_output import StepOutput
+
+_seen = {}
+
+
+def _make_items():
+    data = [{"id": "a", "v": 1}, {"id": "b", "v": 2}, {"id": "c", "v": 3}]
+    _seen["made"] = data
+    return {"batch_only_items": ["a", "c"], "data": data}
+
+
+def _double(item):
+    _seen.setdefault("items", []).append(item)
+    return {"source_id": item["id"], "v": item["v"] * 2}
+
+
+def _total(rows):
+    _seen["rows"] = rows
+    return {"total": sum(row["v"] for row in rows)}
+
+
+def _run(tmp_path, background_writes=True):
+    _seen.clear()
+    steps = [
+        Step(function="tests.test_step_handoff._make_items"),
+        Step(
+            function="tests.test_step_handoff._double",
+            batch_mode=True,
+            batch_id_field="id",
+            batch_output_id_field="row_id",
+        ),
+        Step(function="tests.test_step_handoff._total"),
+    ]
+    out_dir = tmp_path / ("bg" if background_writes else "sync")
+    result = run_pipeline(
+        steps, output_dir=str(out_dir), verbose=False, background_writes=background_writes
+    )
+    return result, out_dir
+
+
+def test_steps_receive_previous_value_in_memory(tmp_path):
+    result, out_dir = _run(tmp_path)
+
+    # Batch items are the objects step 1 returned (b passes through untouched);
+    # step 3 gets step 2's collated list
+    made = _seen["made"]
+    assert [id(item) for item in _seen["items"]] == [id(made[0]), id(made[2])]
+    assert _seen["rows"][1] is made[1]
+    assert [row.get("source_id") for row in _seen["rows"]] == ["a", None, "c"]
+    assert result["final_output"] == {"total": 10}
+
+    saved = json.loads((out_dir / "step_01__make_items/_make_items.json").read_text("utf-8"))
+    rows = json.loads((out_dir / "step_02__double/_double.json").read_text("utf-8"))
+    total = json.loads((out_dir / "step_03__total/_total.json").read_text("utf-8"))
+    assert saved["batch_only_items"] == ["a", "c"]
+    assert [row["row_id"] for row in rows] == [1, 2, 3]
+    assert rows == _seen["rows"]
+    assert total == {"total": 10}
+
+
+def test_background_and_sync_writes_match(tmp_path):
+    _, bg_dir = _run(tmp_path, background_writes=True)
+    _, sync_dir = _run(tmp_path, background_writes=False)
+
+    def outputs(out_dir):
+        return {
+            str(p.relative_to(out_dir)): p.read_text("utf-8")
+            for p in sorted(out_dir.glob("step_*/*.json"))
+        }
+
+    bg, sync = outputs(bg_dir), outputs(sync_dir)
+    assert list(bg) == list(sync)
+    for name in bg:
+        if "_double" not in name:  # collated rows carry a _generated_at timestamp
+            assert bg[name] == sync[name]
+
+
+def test_loaded_output_parses_once_and_keeps_text(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text('[{"id": 1}]', encoding="utf-8")
+    output = StepOutput.load(path)
+    assert output.data() is output.data()
+    assert output.text == '[{"id": 1}]'
+
+    path.write_text("plain notes", encoding="utf-8")
+    text_output = StepOutput.load(path)
+    try:
+        text_output.data()
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    assert text_output.text == "plain notes"
@@ -0,0 +1,134 @@
+"""
+Tests for streaming items between steps (run_pipeline(stream=True)).
+
+Sections are split, structured one by one, stamped, filtered, rewritten and merged.
+Streamed, a section is rewritten while later sections are still being structured, and
+the outputs match those of a step-by-step run.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import core.pipeline as pipeline
+from core.pipeline import Step, _stream_segments, run_pipeline
+from tests import pipeline_helpers
+
+_rewritten = threading.Event()
+_overlap = {"expected": False}
+
+
+def _structure(section):
+    if section["id"] == "s3" and _overlap["expected"]:
+        # Only returns once s2 made it through the steps after this one
+        assert _rewritten.wait(timeout=10)
+    return pipeline_helpers._structure(section)
+
+
+def _stamp(sections):
+    return [{**section, "stamp": f"#{section['id']}"} for section in sections]
+
+
+def _filter(sections):
+    return {
+        "batch_only_items": [s["id"] for s in sections if "?" in s["text"]],
+        "data": sections,
+    }
+
+
+def _rewrite(section):
+    _rewritten.set()
+    return {**section, "text": f"<{section['text']}>"}
+
+
+def _merge(sections):
+    return [{**section, "merged": True} for section in sections]
+
+
+@pytest.fixture
+def outputs(outputs):
+    """The shared outputs fixture, with this module's state reset"""
+    _rewritten.clear()
+    return outputs
+
+
+def _steps(lesson: Path):
+    return [
+        Step(function="tests.pipeline_helpers._split", input_file=str(lesson)),
+        Step(function="tests.test_streaming._structure", batch_mode=True, batch_id_field="id"),
+        Step(function="tests.test_streaming._stamp", streamable=True),
+        Step(function="tests.test_streaming._filter", streamable=True),
+        Step(
+            function="tests.test_streaming._rewrite",
+            batch_mode=True,
+            batch_id_field="id",
+            batch_concurrency=2,
+        ),
+        Step(function="tests.test_streaming._merge", streamable=True),
+    ]
+
+
+def _read_outputs(version_dir: Path) -> dict:
+    outputs = {}
+    for output_file in sorted(version_dir.glob("step_*/*.json")):
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+        rows = data["data"] if isinstance(data, dict) else data
+        for row in rows:
+            row.pop("_generated_at", None)
+        outputs[output_file.parent.name] = data
+    return outputs
+
+
+def test_streamed_run_overlaps_steps_and_matches_unstreamed(tmp_path, outputs):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\nwhat is a graph?\nexit check?\n", encoding="utf-8")
+
+    _overlap["expected"] = False
+    first = run_pipeline(_steps(lesson), pipeline_name="lesson_test", verbose=False)
+    _overlap["expected"] = True
+    try:
+        second = run_pipeline(
+            _steps(lesson), pipeline_name="lesson_test", verbose=False, stream=True
+        )
+    finally:
+        _overlap["expected"] = False
+
+    unstreamed = _read_outputs(outputs / "lesson_test/v0")
+    streamed = _read_outputs(outputs / "lesson_test/v1")
+    assert streamed == unstreamed
+    assert [row["text"] for row in streamed["step_06__merge"]] == [
+        "INTRO",
+        "<WHAT IS A GRAPH?>",
+        "<EXIT CHECK?>",
+    ]
+    # Same item fingerprints, so a later --incremental run can reuse a streamed run
+    item_fps = [
+        {name: fp.get("items") for name, fp in result["metadata"]["fingerprints"].items()}
+        for result in (first, second)
+    ]
+    assert item_fps[0] == item_fps[1]
+
+
+def test_segments_end_at_steps_that_need_the_whole_output():
+    steps = [
+        Step(function="m._split", input_file="lesson.md"),
+        Step(prompt_name="section_structurer", batch_mode=True),
+        Step(function="m._stamp", streamable=True),
+        Step(
+            prompt_name="remediation_generator",
+            batch_mode=True,
+            context_files={"lesson_sections": "section_structurer/section_structurer.json"},
+        ),
+        Step(function="m._merge", streamable=True),
+        Step(function="m._push"),
+    ]
+    assert _stream_segments(steps, 1, len(steps)) == ({2: 5}, {4: [2]})
+    # A step range cuts segments short
+    assert _stream_segments(steps, 1, 3) == ({2: 3}, {})
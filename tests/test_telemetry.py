@@ -0,0 +1,97 @@
+"""
+Tests for run telemetry (core/telemetry.py): spans, phases and the per-step/per-item
+telemetry run_pipeline saves in metadata.json, as read by cli/report.py.
+"""
+
+import contextvars
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+import core.pipeline as pipeline
+from cli.report import regressions, slowest_items
+from core.pipeline import Step, run_pipeline
+from core.run_log import read_events
+from tests import pipeline_helpers
+
+# The module pipeline code records into (imported flat, like claude_client does)
+telemetry = sys.modules["telemetry"]
+
+
+def _structure(section):
+    # Stands in for a Claude call: usage recorded from the item's worker thread
+    telemetry.record_usage(SimpleNamespace(input_tokens=100, output_tokens=len(section["text"])))
+    return pipeline_helpers._structure(section)
+
+
+def test_spans_count_for_enclosing_spans_and_phases_do_not_nest():
+    with telemetry.span() as run_span:
+        with telemetry.span("a") as item_span:
+            with telemetry.phase("validation"):
+                # The validation's own request is validation time, not api time
+                with telemetry.phase("api"):
+                    time.sleep(0.02)
+                telemetry.record(requests=1)
+            with telemetry.phase("api"):
+                time.sleep(0.01)
+
+        # Work in another thread counts for the span it was started in
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run, args=(telemetry.record,), kwargs={"retries": 2}
+        )
+        thread.start()
+        thread.join()
+    telemetry.record(requests=5)  # outside any span: dropped
+
+    assert item_span.counts == {"requests": 1}
+    assert run_span.counts == {"requests": 1, "retries": 2}
+    assert item_span.phases["validation"] >= 0.02
+    assert 0.01 <= item_span.phases["api"] < 0.02
+    assert run_span.to_dict()["items"]["a"]["requests"] == 1
+
+
+def test_pipeline_saves_step_and_item_telemetry(tmp_path, outputs):
+    lesson = tmp_path / "lesson.md"
+    lesson.write_text("intro\nwarmup\n", encoding="utf-8")
+    steps = [
+        Step(function="tests.pipeline_helpers._split", input_file=str(lesson)),
+        Step(
+            function="tests.test_telemetry._structure",
+            batch_mode=True,
+            batch_id_field="id",
+            batch_concurrency=2,
+        ),
+    ]
+    run_pipeline(steps, pipeline_name="lesson_test", verbose=False)
+
+    version_dir = outputs / "lesson_test/v0"
+    metadata = json.loads((version_dir / "metadata.json").read_text(encoding="utf-8"))
+    run = metadata["telemetry"]
+    assert list(run["steps"]) == ["step_01__split", "step_02__structure"]
+    structure = run["steps"]["step_02__structure"]
+    assert (structure["requests"], structure["input_tokens"], structure["output_tokens"]) == (
+        2,
+        200,
+        11,
+    )
+    assert structure["items"]["s2"]["output_tokens"] == len("warmup")
+    assert structure["phases"]["write"] > 0 and structure["bytes_written"] > 0
+    assert run["requests"] == 2 and run["seconds"] >= structure["seconds"]
+    assert sorted(item[2] for item in slowest_items(run, 5)) == ["s1", "s2"]
+    # The run log's step_end carries the same, per-run usage
+    step_end = [e for e in read_events(version_dir) if e["event"] == "step_end"][-1]
+    assert step_end["requests"] == 2 and step_end["input_tokens"] == 200
+
+    # Twice the tokens: flagged against the previous version
+    slower = {**structure, "input_tokens": 400}
+    assert [header for header, _, _ in regressions(structure, slower)] == ["in tok"]
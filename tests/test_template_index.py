@@ -0,0 +1,86 @@
+"""
+Tests for the indexed template lookups in utils/template_utils.py and
+utils/problem_template_utils.py.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import problem_template_utils, template_utils
+
+
+def _count_parses(monkeypatch, module):
+    parses = []
+    real_load = module.json.load
+    monkeypatch.setattr(module.json, "load", lambda f: parses.append(1) or real_load(f))
+    return parses
+
+
+def _write(path: Path, data, mtime: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_template_by_id_indexed_until_changed(tmp_path, monkeypatch):
+    template_utils.clear_template_cache()
+    parses = _count_parses(monkeypatch, template_utils)
+    path = tmp_path / "problem_templates.json"
+    templates = [{"template_id": str(4000 + i), "problem_type": f"type {i}"} for i in range(300)]
+    _write(path, templates, 1_000_000)
+
+    for i in range(300):
+        template = template_utils.get_template_by_id(str(path), str(4000 + i))
+        assert template["problem_type"] == f"type {i}"
+    with pytest.raises(TypeError):
+        template["problem_type"] = "mutated"
+    assert len(parses) == 1
+    assert template_utils.get_template_by_id(str(path), "4000")["problem_type"] == "type 0"
+    assert template_utils.get_template_by_id(str(path), "9999", required=False) is None
+    with pytest.raises(ValueError, match="Available template IDs"):
+        template_utils.get_template_by_id(str(path), "9999")
+
+    _write(path, [{"template_id": "4000", "problem_type": "edited"}], 2_000_000)
+    assert template_utils.get_template_by_id(str(path), "4000")["problem_type"] == "edited"
+    assert len(parses) == 2
+
+
+def test_fields_by_reference_reads_file_once(tmp_path, monkeypatch):
+    problem_template_utils.clear_template_cache()
+    parses = _count_parses(monkeypatch, problem_template_utils)
+    monkeypatch.chdir(tmp_path)
+    goals = {
+        "goals": [
+            {"id": 1, "tools_available": ["cut"], "variables": [{"fractions": ["1/2"]}]},
+            {"id": 2, "tools_available": ["shade"], "cognitive_type": ["create"]},
+        ]
+    }
+    _write(tmp_path / "modules" / "module1" / "problem_templates.json", goals, 1_000_000)
+
+    fields = problem_template_utils.get_fields_by_reference(
+        1, 1, ["tools_available", "variables.0.fractions", "cognitive_type"], required=False
+    )
+    assert fields == {
+        "tools_available": ["cut"],
+        "variables.0.fractions": ["1/2"],
+        "cognitive_type": None,
+    }
+    with pytest.raises(TypeError):
+        fields["tools_available"].append("mutated")
+    assert json.dumps(problem_template_utils.get_all_goal_templates(1)[0]["tools_available"]) == (
+        '["cut"]'
+    )
+
+    assert problem_template_utils.get_tools(1, 1) == ["cut"]
+    assert problem_template_utils.get_cognitive_type(1, 2) == ["create"]
+    assert len(parses) == 1
+    with pytest.raises(ValueError, match="Available goal IDs"):
+        problem_template_utils.get_problem_template_field(1, 3, "tools_available")
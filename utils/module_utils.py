@@ -1,21 +1,108 @@
 """
 Utility functions for fetching data from modules.
 Supports nested field access with dot notation.
+
+Starter packs are parsed lazily on first use and kept in a process-wide cache that is
+re-validated against each file's mtime and size, and field paths are compiled once into
+accessor functions, so repeated lookups (one per module_ref variable per batch item)
+cost a stat and a few dictionary lookups instead of a JSON parse.
+
+Parsed packs are shared, so they are frozen: get_module_field() and MODULES hand out
+read-only views of them (dict and list subclasses that raise TypeError when modified)
+instead of deep-copying every lookup. Callers that need to edit a value take a copy
+first; copy.deepcopy() of a view returns plain, mutable dicts and lists.
+
+    vocabulary = list(get_module_field(1, "vocabulary"))
 """
 
+import copy as _copy
+import functools as _functools
 import json as _json
+import threading as _threading
 from pathlib import Path as _Path
 
 _UNITS_DIR = _Path(__file__).parent.parent / "units"
 _DEFAULT_UNIT = "unit5"
 
-# Backwards-compatible MODULES dict using the default unit
+# Backwards-compatible MODULES dict uses the default unit (built lazily, see __getattr__)
 _STARTER_PACKS_DIR = _UNITS_DIR / _DEFAULT_UNIT / "_starter_packs"
-MODULES: dict[int, dict] = {}
-for _n in range(1, 13):
-    _p = _STARTER_PACKS_DIR / f"module_{_n}.json"
-    if _p.exists():
-        MODULES[_n] = _json.loads(_p.read_text(encoding="utf-8"))
+
+# Parsed starter packs: path -> (mtime_ns, size, data)
+_pack_cache: dict = {}
+_pack_cache_lock = _threading.Lock()
+
+# MODULES as last built: (signature of the packs it was built from, MODULES)
+_modules_cache = (None, None)
+
+
+class _ReadOnlyDict(dict):
+    """A dict of a cached starter pack; copy it before modifying"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("starter pack data is read-only; copy it before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: _copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (_ReadOnlyDict, (dict(self),))
+
+
+class _ReadOnlyList(list):
+    """A list of a cached starter pack; copy it before modifying"""
+
+    _readonly = _ReadOnlyDict._readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [_copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (_ReadOnlyList, (list(self),))
+
+
+def _freeze(value):
+    """Parsed JSON as nested read-only dicts and lists"""
+    if isinstance(value, dict):
+        return _ReadOnlyDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _ReadOnlyList(_freeze(item) for item in value)
+    return value
+
+
+def __getattr__(name):
+    if name == "MODULES":
+        return _modules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _modules():
+    """MODULES of the default unit, rebuilt only when one of its packs has changed"""
+    global _modules_cache
+    signature = []
+    for n in range(1, 13):
+        try:
+            stat = (_STARTER_PACKS_DIR / f"module_{n}.json").stat()
+        except OSError:
+            continue
+        signature.append((n, stat.st_mtime_ns, stat.st_size))
+    signature = tuple(signature)
+
+    built_for, modules = _modules_cache
+    if built_for != signature:
+        modules = _ReadOnlyDict((n, _load_module_data(n, _DEFAULT_UNIT)) for n, _, _ in signature)
+        _modules_cache = (signature, modules)
+    return modules
 
 
 def get_module_field(module_number, field_path, required=True, default=None, unit=_DEFAULT_UNIT):
@@ -32,6 +119,8 @@ def get_module_field(module_number, field_path, required=True, default=None, uni
 
     Returns:
         The requested field value, or default if not found and not required.
+        Lists and dicts are read-only views of the cached pack (see the module
+        docstring); copy them before modifying.
 
     Examples:
         get_module_field(1, "vocabulary")  # Top-level field
@@ -43,77 +132,133 @@ def get_module_field(module_number, field_path, required=True, default=None, uni
     Raises:
         ValueError: If module not found or required field is missing.
     """
+    module_data = _load_module_data(module_number, unit)
+
+    try:
+        value = _compile_field_path(field_path)(module_data)
+    except KeyError as e:
+        if required:
+            available_fields = _get_available_fields(module_data)
+            raise ValueError(
+                f"Required field '{field_path}' not found in Module {module_number} ({unit}). "
+                f"Error: {e}. Available top-level fields: {available_fields}"
+            )
+        return default
+
+    return value
+
+
+def clear_module_cache():
+    """Drop all cached starter packs (they are also re-read automatically when changed)"""
+    global _modules_cache
+    with _pack_cache_lock:
+        _pack_cache.clear()
+    _modules_cache = (None, None)
+
+
+def _load_module_data(module_number, unit=_DEFAULT_UNIT):
+    """Return the parsed starter pack, re-reading it only when the file has changed"""
     pack_dir = _UNITS_DIR / unit / "_starter_packs"
     module_path = pack_dir / f"module_{module_number}.json"
 
-    if not module_path.exists():
+    try:
+        stat = module_path.stat()
+    except OSError:
         available = [p.stem.replace("module_", "") for p in pack_dir.glob("module_*.json")]
         raise ValueError(
             f"Module {module_number} not found in {unit}. Available: {', '.join(sorted(available))}"
         )
 
-    module_data = _json.loads(module_path.read_text(encoding="utf-8"))
+    with _pack_cache_lock:
+        cached = _pack_cache.get(module_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    # Shared by every caller, so frozen rather than copied on each lookup
+    module_data = _freeze(_json.loads(module_path.read_text(encoding="utf-8")))
+    with _pack_cache_lock:
+        _pack_cache[module_path] = (stat.st_mtime_ns, stat.st_size, module_data)
+    return module_data
+
 
-    # Split the path by dots for nested access
+@_functools.lru_cache(maxsize=None)
+def _compile_field_path(field_path):
+    """Parse a dot path once into an accessor: data -> value
+
+    The accessor raises KeyError for missing fields / bad indexes and ValueError for a
+    wildcard on a non-list, exactly like walking the path part by part.
+    """
     path_parts = field_path.split(".")
-    current = module_data
+    steps = []
+    for i, part in enumerate(path_parts):
+        location = ".".join(path_parts[: i + 1])
+        if part == "*":
+            parent = ".".join(path_parts[:i])
+            remaining = ".".join(path_parts[i + 1 :])
+            steps.append(("*", parent, _compile_lenient_path(remaining) if remaining else None))
+            break
+        try:
+            index = int(part)
+        except ValueError:
+            index = None
+        steps.append((part, index, location))
 
-    try:
-        for i, part in enumerate(path_parts):
+    def access(data):
+        current = data
+        for step in steps:
             # Handle wildcard for arrays (e.g., "goals.*.id")
-            if part == "*":
+            if step[0] == "*":
+                _, parent, remaining = step
                 if not isinstance(current, list):
-                    raise ValueError(
-                        f"Wildcard used on non-list field at '{'.'.join(path_parts[:i])}'"
-                    )
-                remaining_path = ".".join(path_parts[i + 1 :])
-                if remaining_path:
-                    return [_get_nested_value(item, remaining_path) for item in current]
-                else:
+                    raise ValueError(f"Wildcard used on non-list field at '{parent}'")
+                if remaining is None:
                     return current
+                return [remaining(item) for item in current]
 
+            part, index, location = step
             # Handle array index (e.g., "goals.0")
             if isinstance(current, list):
+                if index is None:
+                    raise KeyError(f"Invalid array index '{part}' at '{location}'")
                 try:
-                    index = int(part)
                     current = current[index]
-                except (ValueError, IndexError):
-                    raise KeyError(
-                        f"Invalid array index '{part}' at '{'.'.join(path_parts[: i + 1])}'"
-                    )
+                except IndexError:
+                    raise KeyError(f"Invalid array index '{part}' at '{location}'")
             elif isinstance(current, dict):
                 if part not in current:
-                    raise KeyError(f"Field '{part}' not found at '{'.'.join(path_parts[: i + 1])}'")
+                    raise KeyError(f"Field '{part}' not found at '{location}'")
                 current = current[part]
             else:
                 raise KeyError(f"Cannot access '{part}' on non-dict/non-list value")
+        return current
+
+    return access
+
+
+@_functools.lru_cache(maxsize=None)
+def _compile_lenient_path(path):
+    """Compile the path after a wildcard: missing dict keys yield None instead of raising"""
+    parts = path.split(".")
 
+    def access(obj):
+        current = obj
+        for part in parts:
+            if isinstance(current, dict):
+                current = current.get(part)
+            elif isinstance(current, list):
+                current = current[int(part)]
+            else:
+                return None
+            if current is None:
+                return None
         return current
 
-    except KeyError as e:
-        if required:
-            available_fields = _get_available_fields(module_data)
-            raise ValueError(
-                f"Required field '{field_path}' not found in Module {module_number} ({unit}). "
-                f"Error: {e}. Available top-level fields: {available_fields}"
-            )
-        return default
+    return access
 
 
 def _get_nested_value(obj, path):
     """Helper to get nested value from object using dot notation"""
-    parts = path.split(".")
-    current = obj
-    for part in parts:
-        if isinstance(current, dict):
-            current = current.get(part)
-        elif isinstance(current, list):
-            current = current[int(part)]
-        else:
-            return None
-        if current is None:
-            return None
-    return current
+    return _compile_lenient_path(path)(obj)
 
 
 def _get_available_fields(data):
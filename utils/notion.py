@@ -32,23 +32,45 @@ from __future__ import annotations
 
 import copy
 import difflib
+import itertools
 import json
 import os
 import re
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from notion_client import Client
 
+from utils.notion_api import (  # noqa: E402
+    fetch_block_tree,
+    fetch_comments,
+    list_children,
+    notion_call,
+)
 from utils.notion_codecs import BEAT_CODECS, BeatCodec  # noqa: E402
+from utils.notion_mirror import (  # noqa: E402
+    build_mirror,
+    drop_mirror,
+    fresh_mirror,
+    mirror_tree,
+    page_last_edited_time,
+    save_mirror,
+    tree_hash,
+)
+from utils.notion_registry import RegistryStore  # noqa: E402
+from utils.notion_sync import SyncPlan, execute_sync, plan_sync  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 
 # Registry of { relative_file_path: { page_id, title, pushed_at } }
+# (snapshot + journal, see utils/notion_registry.py)
 _REGISTRY_PATH = Path(__file__).parent.parent / "config" / "notion_pages.json"
+_registry_stores: dict[Path, RegistryStore] = {}
+_registry_stores_lock = threading.Lock()
 
 # Notion's hard limit for a single rich_text span is 2000 chars.
 # We use 1900 to stay safely under it.
@@ -69,6 +91,10 @@ def get_notion_client() -> Client:
     api_key = os.getenv("NOTION_API_KEY")
     if not api_key:
         raise ValueError("NOTION_API_KEY is not set in your .env file.")
+    base_url = os.getenv("NOTION_BASE_URL")
+    if base_url:
+        # e.g. the fake server in tests/fake_notion_server.py
+        return Client(auth=api_key, base_url=base_url.rstrip("/"))
     return Client(auth=api_key)
 
 
@@ -102,31 +128,35 @@ def _registry_key(file_path: Path) -> str:
         return str(file_path)
 
 
+def _registry_store() -> RegistryStore:
+    with _registry_stores_lock:
+        if _REGISTRY_PATH not in _registry_stores:
+            _registry_stores[_REGISTRY_PATH] = RegistryStore(_REGISTRY_PATH)
+        return _registry_stores[_REGISTRY_PATH]
+
+
 def load_registry() -> dict:
-    if _REGISTRY_PATH.exists():
-        return json.loads(_REGISTRY_PATH.read_text(encoding="utf-8"))
-    return {}
+    return _registry_store().entries()
 
 
 def save_registry(registry: dict) -> None:
-    _REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    _REGISTRY_PATH.write_text(
-        json.dumps(registry, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-    )
+    """Replace the whole registry (single entries: use set_registry_entry)."""
+    _registry_store().replace_all(registry)
+
+
+def registry_batch():
+    """Context manager: this thread's registry writes inside it are saved in one locked write."""
+    return _registry_store().batch()
 
 
 def get_registry_entry(file_path: Path) -> dict | None:
-    return load_registry().get(_registry_key(file_path))
+    return _registry_store().get(_registry_key(file_path))
 
 
 def get_file_path_for_page(page_id: str) -> Path | None:
     """Reverse lookup: return the source file Path for a given page_id, or None."""
-    root = Path(__file__).parent.parent
-    normalised = page_id.replace("-", "")
-    for key, entry in load_registry().items():
-        if entry.get("page_id", "").replace("-", "") == normalised:
-            return root / key
-    return None
+    key = _registry_store().key_for_page(page_id)
+    return Path(__file__).parent.parent / key if key is not None else None
 
 
 def _extract_version(file_path: Path) -> str | None:
@@ -143,7 +173,7 @@ def _extract_version(file_path: Path) -> str | None:
 
 
 def set_registry_entry(file_path: Path, page_id: str, title: str) -> None:
-    registry = load_registry()
+    """Record file_path's page; safe to call from concurrent threads and processes."""
     entry = {
         "page_id": page_id,
         "title": title,
@@ -152,8 +182,7 @@ def set_registry_entry(file_path: Path, page_id: str, title: str) -> None:
     version = _extract_version(file_path)
     if version is not None:
         entry["last_version"] = version
-    registry[_registry_key(file_path)] = entry
-    save_registry(registry)
+    _registry_store().set(_registry_key(file_path), entry)
 
 
 # ---------------------------------------------------------------------------
@@ -346,26 +375,12 @@ def _all_blocks(client: Client, block_id: str, recursive: bool = False) -> list[
 
     When recursive=True, also fetches and embeds children for any block that
     has_children (e.g. toggle headings, toggle blocks). Children are stored
-    under block[block_type]["children"].
+    under block[block_type]["children"]. Each level of the tree is listed
+    concurrently under the shared Notion rate limit (see utils/notion_api.py).
     """
-    results: list[dict] = []
-    cursor: str | None = None
-    while True:
-        kwargs: dict = {"block_id": block_id}
-        if cursor:
-            kwargs["start_cursor"] = cursor
-        response = client.blocks.children.list(**kwargs)
-        results.extend(response["results"])
-        if not response["has_more"]:
-            break
-        cursor = response["next_cursor"]
     if recursive:
-        for block in results:
-            if block.get("has_children"):
-                btype = block.get("type", "")
-                block_data = block.get(btype, {})
-                block_data["children"] = _all_blocks(client, block["id"], recursive=True)
-    return results
+        return fetch_block_tree(client, block_id)
+    return list_children(client, block_id)
 
 
 # ---------------------------------------------------------------------------
@@ -373,97 +388,6 @@ def _all_blocks(client: Client, block_id: str, recursive: bool = False) -> list[
 # ---------------------------------------------------------------------------
 
 
-def _block_content_equal(existing: dict, new_block: dict) -> bool:
-    """Return True if two blocks have identical type and text content."""
-    if existing.get("type") != new_block.get("type"):
-        return False
-    btype = existing["type"]
-    ex_data = existing.get(btype, {})
-    new_data = new_block.get(btype, {})
-    if _extract_rt(ex_data.get("rich_text", [])) != _extract_rt(new_data.get("rich_text", [])):
-        return False
-    if btype == "callout":
-        if ex_data.get("icon", {}).get("emoji") != new_data.get("icon", {}).get("emoji"):
-            return False
-    return True
-
-
-_HEADING_TYPES = {"heading_1", "heading_2", "heading_3"}
-
-
-def _refresh_children(client: Client, block_id: str, new_children: list[dict]) -> None:
-    """Archive all existing children of block_id and append new_children."""
-    for child in _all_blocks(client, block_id):
-        client.blocks.update(child["id"], archived=True)
-    for i in range(0, len(new_children), 100):
-        client.blocks.children.append(block_id, children=new_children[i : i + 100])
-
-
-def _block_skeleton(block: dict) -> str:
-    """Return a structural fingerprint for a block (type + emoji for callouts)."""
-    btype = block.get("type", "")
-    if btype == "callout":
-        emoji = block.get("callout", {}).get("icon", {}).get("emoji", "")
-        return f"callout:{emoji}"
-    return btype
-
-
-def _update_block_content(client: Client, block_id: str, new_block: dict) -> None:
-    """Update an existing Notion block's displayable content in-place.
-
-    Children are intentionally excluded — manage those separately via
-    _refresh_children so block IDs (and any comments) are preserved.
-    """
-    btype = new_block.get("type", "")
-    bdata = dict(new_block.get(btype, {}))
-    bdata.pop("children", None)
-    bdata.pop("is_toggleable", None)
-    if bdata:
-        client.blocks.update(block_id, **{btype: bdata})
-
-
-def _smart_sync_children(client: Client, parent_id: str, new_children: list[dict]) -> None:
-    """Sync children of a section heading block.
-
-    Compares the structural skeleton — the ordered sequence of block types and
-    callout emojis — of new_children against existing children.
-
-    - Skeleton matches: positional update-in-place.  Each beat's Notion block ID
-      (and any reviewer comments on it) is preserved; only changed text is
-      patched via blocks.update.  Toggle children (validator states, current_scene
-      snapshots) recurse into _smart_sync_children so comments inside them also
-      survive re-push when their structure is unchanged.
-    - Skeleton differs: fall back to _refresh_children (archive all, re-append).
-      This handles structural edits (added/removed beats, reordered steps) and
-      also recovers from previously scrambled Notion pages where prior syncs left
-      beats in the wrong order.
-    """
-    existing = _all_blocks(client, parent_id)
-
-    new_skel = [_block_skeleton(b) for b in new_children]
-    ex_skel = [_block_skeleton(b) for b in existing]
-
-    if new_skel != ex_skel:
-        _refresh_children(client, parent_id, new_children)
-        return
-
-    for nb, eb in zip(new_children, existing):
-        btype = nb["type"]
-        nb_children = nb.get(btype, {}).get("children")
-
-        if not _block_content_equal(nb, eb):
-            _update_block_content(client, eb["id"], nb)
-
-        if nb_children is not None:
-            if btype == "toggle":
-                _smart_sync_children(client, eb["id"], nb_children)
-            else:
-                _refresh_children(client, eb["id"], nb_children)
-        elif eb.get("has_children"):
-            for child in _all_blocks(client, eb["id"]):
-                client.blocks.update(child["id"], archived=True)
-
-
 def _section_sort_key(section_id: str) -> tuple:
     """Return a sort key for a section ID so headings are ordered s1_1, s1_2, …, s1_a, s1_b, …"""
     m = re.match(r"^s(\d+)_(\d+)([a-z]?)(?:_.*)?$", section_id)
@@ -476,118 +400,70 @@ def _section_sort_key(section_id: str) -> tuple:
 
 
 def _sync_blocks(client: Client, parent_id: str, new_blocks: list[dict]) -> None:
-    """Sync new_blocks into parent_id using forward content-matching.
-
-    For each new block, scans forward in existing blocks to find a content match:
-    - Match found: keep block in place (preserves ID and comments); archive any
-      existing blocks skipped over.
-    - No match: insert after the last matched/inserted block via Notion's
-      ``after=`` parameter.  For heading_2 blocks (lesson sections), the insertion
-      point is determined by sorted section ID order so new sections land in the
-      correct position among existing ones.
-
-    Heading blocks (section toggle headings) recurse into _smart_sync_children,
-    which does positional in-place updates when the beat structure is unchanged
-    and falls back to a full refresh when structure has changed.
-    Toggle blocks (validator states, current_scene) are refreshed wholesale.
-    """
-    existing = _all_blocks(client, parent_id)
-    ex_ptr = 0
-    last_id: str | None = None
-    anchor_id: str | None = None  # ID of the 💡 reviewer guide callout (stable first block)
-
-    existing_h2s: list[tuple[dict, tuple]] = []
-    pre_existing_h2_ids: set[str] = set()
-    for block in existing:
-        if block.get("type") == "heading_2":
-            rt = _extract_rt(block.get("heading_2", {}).get("rich_text", []))
-            m = re.search(r"\[([^\]]+)\]\s*$", rt)
-            if m:
-                existing_h2s.append((block, _section_sort_key(m.group(1))))
-                pre_existing_h2_ids.add(block["id"])
-
-    for new_block in new_blocks:
-        btype = new_block["type"]
-        bdata = new_block.get(btype, {})
-        new_children = bdata.get("children")
-
-        match_idx = None
-        for k in range(ex_ptr, len(existing)):
-            if _block_content_equal(existing[k], new_block):
-                match_idx = k
-                break
+    """Sync new_blocks into page parent_id with the fewest requests.
 
-        if match_idx is not None:
-            for skipped in existing[ex_ptr:match_idx]:
-                client.blocks.update(skipped["id"], archived=True)
+    Plans a minimal edit (keep, update in place, insert after=, archive — see
+    utils/notion_sync.py) and sends it concurrently under the shared Notion rate
+    limit. Unchanged blocks keep their IDs and reviewer comments, and so do changed
+    blocks whose structure is the same.
+
+    The plan is made against the local page mirror when nobody has edited the page
+    since it was recorded (utils/notion_mirror.py), otherwise against the live block
+    tree. The mirror is re-recorded afterwards.
+    """
+    mirror = fresh_mirror(client, parent_id)
+    if mirror is not None:
+        existing = mirror_tree(mirror)
+    else:
+        existing = _all_blocks(client, parent_id, recursive=True)
+    plan = plan_sync(parent_id, existing, new_blocks)
+    source = "local mirror" if mirror is not None else "live page"
+    print(f"  [SYNC] {plan.summary()} (planned from {source})")
+    try:
+        execute_sync(client, plan)
+    except Exception:
+        if mirror is None:
+            raise
+        # The mirror missed an edit (e.g. one made in the same minute as the last
+        # push): re-plan what is left against the live page
+        print("  [SYNC] Local mirror was out of date; re-planning from the live page")
+        drop_mirror(parent_id)
+        _sync_blocks(client, parent_id, new_blocks)
+        return
+    _record_mirror_after_sync(client, parent_id, new_blocks, plan)
 
-            ex = existing[match_idx]
-            block_id = ex["id"]
-            last_id = block_id
-            ex_ptr = match_idx + 1
 
-            if anchor_id is None and btype == "callout":
-                if bdata.get("icon", {}).get("emoji") == "💡":
-                    anchor_id = block_id
+def _record_mirror_after_sync(
+    client: Client, page_id: str, new_blocks: list[dict], plan: SyncPlan
+) -> None:
+    """Record the page mirror from the pushed blocks and the IDs the sync produced.
 
-            if new_children is not None:
-                if btype in _HEADING_TYPES:
-                    _smart_sync_children(client, block_id, new_children)
+    Only the subtrees of newly inserted blocks are fetched, since Notion returns
+    IDs for the top-level blocks of an append but not for their children.
+    """
+    inserted = {id(block) for *_, blocks in plan.inserts for block in blocks}
+
+    def _with_ids(blocks: list[dict]) -> list[dict]:
+        tree = []
+        for block in blocks:
+            node = {**block, "id": plan.block_ids[id(block)]}
+            btype = block["type"]
+            children = block.get(btype, {}).get("children")
+            if children:
+                if id(block) in inserted:
+                    node_children = _all_blocks(client, node["id"], recursive=True)
                 else:
-                    _refresh_children(client, block_id, new_children)
-            elif ex.get("has_children"):
-                for child in _all_blocks(client, block_id):
-                    client.blocks.update(child["id"], archived=True)
-        else:
-            after_id = last_id
-            if btype == "heading_2":
-                rt = _extract_rt(bdata.get("rich_text", []))
-                m = re.search(r"\[([^\]]+)\]\s*$", rt)
-                if m:
-                    new_key = _section_sort_key(m.group(1))
-                    after_h2: dict | None = None
-                    for h2_block, h2_key in existing_h2s:
-                        if h2_key < new_key:
-                            after_h2 = h2_block
-                    if after_h2 is not None and after_h2["id"] in pre_existing_h2_ids:
-                        after_id = after_h2["id"]
-                    elif existing_h2s:
-                        # New section sorts before all existing h2s — insert before
-                        # the first existing h2 by finding the block preceding it.
-                        first_h2_id = existing_h2s[0][0]["id"]
-                        first_h2_pos = next(
-                            (i for i, b in enumerate(existing) if b["id"] == first_h2_id), None
-                        )
-                        if first_h2_pos is not None and first_h2_pos > 0:
-                            after_id = existing[first_h2_pos - 1]["id"]
-                        else:
-                            after_id = anchor_id or last_id
-                    else:
-                        after_id = anchor_id or last_id
-
-            kwargs: dict = {"children": [new_block]}
-            if after_id is not None:
-                kwargs["after"] = after_id
-            resp = client.blocks.children.append(parent_id, **kwargs)
-            inserted_id = resp["results"][0]["id"]
-            last_id = inserted_id
-
-            if btype == "heading_2":
-                rt = _extract_rt(bdata.get("rich_text", []))
-                m = re.search(r"\[([^\]]+)\]\s*$", rt)
-                if m:
-                    new_key = _section_sort_key(m.group(1))
-                    insert_at = len(existing_h2s)
-                    for i, (_, k) in enumerate(existing_h2s):
-                        if k > new_key:
-                            insert_at = i
-                            break
-                    existing_h2s.insert(
-                        insert_at, ({"id": inserted_id, "type": "heading_2"}, new_key)
-                    )
+                    node_children = _with_ids(children)
+                node[btype] = {**block[btype], "children": node_children}
+            tree.append(node)
+        return tree
 
-    for leftover in existing[ex_ptr:]:
-        client.blocks.update(leftover["id"], archived=True)
+    try:
+        tree = _with_ids(new_blocks)
+    except KeyError:
+        drop_mirror(page_id)  # an append response without IDs; re-fetch next time
+        return
+    save_mirror(build_mirror(page_id, tree, page_last_edited_time(client, page_id)))
 
 
 # ---------------------------------------------------------------------------
@@ -1050,7 +926,7 @@ def push_to_notion(
     Push JSON data to Notion.  Returns the Notion page ID.
 
     - If existing_page_id is given (or found in the registry), the page is
-      updated in-place (old blocks archived, new blocks appended).
+      updated in-place (diffed by _sync_blocks; only changed blocks are written).
     - Otherwise a new child page is created under NOTION_PARENT_PAGE_ID.
     - The page ID is saved to the registry if file_path is provided.
     - blocks_fn: optional callable(data) -> list[dict]; defaults to lesson_to_blocks.
@@ -1165,78 +1041,32 @@ def _extract_comment_text(rich_text: list[dict]) -> str:
     return "".join(parts)
 
 
-def _collect_notion_block_ids(obj: object, acc: list | None = None) -> list[str]:
+def _collect_notion_block_ids(obj: object, acc: dict | None = None) -> list[str]:
     """Recursively collect unique _notion_block_id values from a sections structure."""
     if acc is None:
-        acc = []
+        acc = {}
     if isinstance(obj, dict):
         bid = obj.get("_notion_block_id")
-        if bid and bid not in acc:
-            acc.append(bid)
+        if bid:
+            acc.setdefault(bid)
         for v in obj.values():
             _collect_notion_block_ids(v, acc)
     elif isinstance(obj, list):
         for item in obj:
             _collect_notion_block_ids(item, acc)
-    return acc
+    return list(acc)
 
 
 def _build_block_to_beat_map(sections: list) -> dict[str, dict]:
     """Return {notion_block_id: {section_id, beat_description, beat}} for all tagged beats."""
-    result: dict[str, dict] = {}
-
-    def _reg(bid: str, section_id: str, description: str, beat: dict | None) -> None:
-        if bid:
-            result[bid] = {"section_id": section_id, "beat_description": description, "beat": beat}
-
-    for section in sections:
-        if not isinstance(section, dict):
-            continue
-        sid = section.get("id", "")
-        _reg(section.get("_notion_block_id", ""), sid, "section heading", None)
-
-        for bi, beat in enumerate(section.get("beats", [])):
-            if not isinstance(beat, dict):
-                continue
-            btype = beat.get("type", "")
-            _reg(beat.get("_notion_block_id", ""), sid, f"beats[{bi}] ({btype})", beat)
-
-            for vi, validator in enumerate(beat.get("validator", [])):
-                if not isinstance(validator, dict):
-                    continue
-                is_correct = validator.get("is_correct", False)
-                label = "correct" if is_correct else f"incorrect[{vi}]"
-                for di, vbeat in enumerate(validator.get("beats", [])):
-                    if not isinstance(vbeat, dict):
-                        continue
-                    vbtype = vbeat.get("type", "")
-                    _reg(
-                        vbeat.get("_notion_block_id", ""),
-                        sid,
-                        f"beats[{bi}].validator[{vi}] ({label}).beats[{di}] ({vbtype})",
-                        vbeat,
-                    )
-
-    return result
-
-
-def _fetch_all_block_comments(client: Client, block_id: str) -> list[dict]:
-    """Fetch all comments for a block, following pagination cursors."""
-    comments: list[dict] = []
-    cursor: str | None = None
-    while True:
-        kwargs: dict = {"block_id": block_id}
-        if cursor:
-            kwargs["start_cursor"] = cursor
-        try:
-            resp = client.comments.list(**kwargs)
-        except Exception:
-            break
-        comments.extend(resp.get("results", []))
-        if not resp.get("has_more"):
-            break
-        cursor = resp.get("next_cursor")
-    return comments
+    return {
+        block_id: {
+            "section_id": ref.section_id,
+            "beat_description": ref.path,
+            "beat": ref.beat,
+        }
+        for block_id, ref in _BeatIndex(sections).by_block_id.items()
+    }
 
 
 def _build_block_to_section_map(blocks: list[dict]) -> dict[str, str]:
@@ -1284,20 +1114,38 @@ def _build_block_to_section_map(blocks: list[dict]) -> dict[str, str]:
     return result
 
 
-def _all_block_ids_from_tree(blocks: list[dict], acc: list | None = None) -> list[str]:
-    """Recursively collect every block ID from a blocks tree."""
-    if acc is None:
-        acc = []
+def _iter_tree_blocks(blocks: list[dict]):
+    """Yield every block in a blocks tree, parents before their children."""
     for block in blocks:
-        bid = block.get("id")
-        if bid and bid not in acc:
-            acc.append(bid)
+        yield block
         btype = block.get("type")
-        children = (
-            block.get(btype, {}).get("children", []) if isinstance(block.get(btype), dict) else []
-        )
-        _all_block_ids_from_tree(children, acc)
-    return acc
+        if isinstance(block.get(btype), dict):
+            yield from _iter_tree_blocks(block[btype].get("children", []))
+
+
+def _all_block_ids_from_tree(blocks: list[dict]) -> list[str]:
+    """Collect every unique block ID from a blocks tree, in page order."""
+    return list(dict.fromkeys(b["id"] for b in _iter_tree_blocks(blocks) if b.get("id")))
+
+
+def _load_comment_state(state_path: Path | None) -> dict[str, dict]:
+    """Read the previous sweep's {block_id: {last_edited_time, comments}}, or {}."""
+    if state_path is None or not state_path.exists():
+        return {}
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return state.get("blocks", {}) if isinstance(state, dict) else {}
+
+
+def _save_comment_state(state_path: Path, page_id: str, blocks: dict[str, dict]) -> None:
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"page_id": page_id, "blocks": blocks}, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, state_path)
 
 
 def fetch_lesson_comments(
@@ -1305,6 +1153,7 @@ def fetch_lesson_comments(
     sections: list,
     blocks: list[dict] | None = None,
     all_comments: bool = False,
+    state_path: Path | None = None,
 ) -> list[dict]:
     """Fetch Notion comment threads. By default only threads that mention @claude.
 
@@ -1317,6 +1166,14 @@ def fetch_lesson_comments(
 
     When *blocks* is omitted, falls back to checking only tagged blocks.
 
+    Comments are listed concurrently under the shared Notion rate limit. When
+    *state_path* is given the sweep is incremental: each block's last_edited_time
+    and comments are saved there, and the next sweep only re-queries the page, the
+    blocks whose last_edited_time changed and the blocks that had comments (for new
+    replies). Adding a comment does not change a block's last_edited_time, so a new
+    thread on an unedited, uncommented block is only seen by a sweep without
+    *state_path*.
+
     Each returned dict:
       discussion_id, block_id, section_id, beat_description, beat,
       thread: [{comment_id, comment_text, author_id, created_time}, ...]
@@ -1327,20 +1184,57 @@ def fetch_lesson_comments(
     if blocks is not None:
         all_block_ids = [page_id] + _all_block_ids_from_tree(blocks)
         block_to_section = _build_block_to_section_map(blocks)
+        edited = {
+            b["id"]: b.get("last_edited_time") for b in _iter_tree_blocks(blocks) if b.get("id")
+        }
     else:
         all_block_ids = [page_id] + _collect_notion_block_ids(sections)
         block_to_section = {}
+        edited = {}
+
+    all_block_ids = list(dict.fromkeys(all_block_ids))
+    previous = _load_comment_state(state_path)
+    stale = [
+        bid
+        for bid in all_block_ids
+        if bid == page_id
+        or not edited.get(bid)
+        or previous.get(bid, {}).get("last_edited_time") != edited[bid]
+        or previous[bid].get("comments")
+    ]
+    fetched = fetch_comments(client, stale)
+
+    comments_by_block: dict[str, list[dict]] = {}
+    state: dict[str, dict] = {}
+    for bid in all_block_ids:
+        if bid in fetched:
+            block_comments = fetched[bid]
+            if block_comments is None:
+                # Listing failed: re-query next time instead of caching the gap
+                continue
+        else:
+            block_comments = previous[bid]["comments"]
+        comments_by_block[bid] = block_comments
+        if edited.get(bid):
+            state[bid] = {"last_edited_time": edited[bid], "comments": block_comments}
+
+    if state_path is not None:
+        _save_comment_state(state_path, page_id, state)
+        print(
+            f"  [NOTION] Comment sweep: queried {len(stale)} of {len(all_block_ids)} blocks "
+            f"({len(all_block_ids) - len(stale)} unchanged since the last sweep)"
+        )
 
     seen_discussions: set[str] = set()
     results: list[dict] = []
 
     for bid in all_block_ids:
-        all_comments = _fetch_all_block_comments(client, bid)
-        if not all_comments:
+        block_comments = comments_by_block.get(bid)
+        if not block_comments:
             continue
 
         threads: dict[str, list[dict]] = {}
-        for comment in all_comments:
+        for comment in block_comments:
             did = comment.get("discussion_id") or comment.get("id", "")
             threads.setdefault(did, []).append(comment)
 
@@ -1705,6 +1599,114 @@ def _codec_pool_match(codec: BeatCodec, pool: list[dict], block: dict) -> int |
     return best[1] if best is not None else None
 
 
+class _BeatPool:
+    """Beats of one type with no usable block ID, in lesson order, awaiting a block.
+
+    A block that was pushed from one of these beats and not edited since is found by
+    its rendered text (codec.encoded_text) in one lookup; codec.match_score only runs
+    over the next few beats for blocks a reviewer edited or added.
+    """
+
+    def __init__(self, codec: BeatCodec, beats: list[dict]):
+        self.codec = codec
+        self._beats: dict[int, dict] = {id(b): b for b in beats}
+        self._by_text: dict[str, list[dict]] = {}
+        for beat in beats:
+            self._by_text.setdefault(codec.encoded_text(beat), []).append(beat)
+
+    def __bool__(self) -> bool:
+        return bool(self._beats)
+
+    def beats(self) -> list[dict]:
+        return list(self._beats.values())
+
+    def discard(self, beat: dict) -> None:
+        self._beats.pop(id(beat), None)
+
+    def take_first(self) -> dict:
+        beat = next(iter(self._beats.values()))
+        self.discard(beat)
+        return beat
+
+    def take_match(self, block: dict) -> dict | None:
+        """Remove and return the beat block was rendered from, or None (a new beat)"""
+        text = _extract_rt(block.get("callout", {}).get("rich_text", []))
+        for beat in self._by_text.get(text, ()):
+            if id(beat) in self._beats:
+                self.discard(beat)
+                return beat
+        window = list(itertools.islice(self._beats.values(), _LEGACY_MATCH_WINDOW + 1))
+        idx = _codec_pool_match(self.codec, window, block)
+        if idx is None:
+            return None
+        self.discard(window[idx])
+        return window[idx]
+
+
+class _BeatRef:
+    """A stamped beat's place in the lesson"""
+
+    def __init__(self, section_id: str, path: str, beat: dict | None):
+        self.section_id = section_id
+        self.path = path  # e.g. "beats[3] (dialogue)"
+        self.beat = beat  # None for the section heading
+
+
+class _BeatIndex:
+    """One-time index of a lesson's beats for mapping Notion blocks back to them.
+
+    Built once per pull or comment sweep instead of per section and per block:
+    by_block_id maps every _notion_block_id (section headings, beats, validator-state
+    beats) to its _BeatRef, so a stamped block is a single dict lookup.
+    section_beats() holds each section's beats flattened from any legacy format and
+    stamped_beats() the section's own {block ID: beat}, which the pull decoder uses.
+    """
+
+    def __init__(self, sections: list):
+        from steps.formatting.id_stamper import _flatten_validator_beats, flatten_beats
+
+        self.by_block_id: dict[str, _BeatRef] = {}
+        self._section_beats: dict[int, list[dict]] = {}
+        self._stamped: dict[int, dict[str, dict]] = {}
+        for section in sections:
+            if not isinstance(section, dict):
+                continue
+            sid = section.get("id", "")
+            beats = flatten_beats(section)
+            self._section_beats[id(section)] = beats
+            stamped = self._stamped[id(section)] = {}
+            self._add(section, sid, "section heading", None)
+            for bi, beat in enumerate(beats):
+                if not isinstance(beat, dict):
+                    continue
+                self._add(beat, sid, f"beats[{bi}] ({beat.get('type', '')})", beat)
+                if beat.get("_notion_block_id"):
+                    stamped[beat["_notion_block_id"]] = beat
+                for vi, state in enumerate(beat.get("validator") or []):
+                    if not isinstance(state, dict):
+                        continue
+                    label = "correct" if state.get("is_correct", False) else f"incorrect[{vi}]"
+                    for di, vbeat in enumerate(_flatten_validator_beats(state)):
+                        if not isinstance(vbeat, dict):
+                            continue
+                        path = (
+                            f"beats[{bi}].validator[{vi}] ({label}).beats[{di}] "
+                            f"({vbeat.get('type', '')})"
+                        )
+                        self._add(vbeat, sid, path, vbeat)
+
+    def _add(self, obj: dict, section_id: str, path: str, beat: dict | None) -> None:
+        block_id = obj.get("_notion_block_id")
+        if block_id:
+            self.by_block_id[block_id] = _BeatRef(section_id, path, beat)
+
+    def section_beats(self, section: dict) -> list[dict]:
+        return self._section_beats[id(section)]
+
+    def stamped_beats(self, section: dict) -> dict[str, dict]:
+        return self._stamped[id(section)]
+
+
 def _is_step_break(block: dict) -> bool:
     """Return True if this block represents a step boundary.
 
@@ -1818,11 +1820,16 @@ def _patch_validator_state(state: dict, toggle_block: dict) -> None:
         for sb in state_beats
         if "_notion_block_id" in sb and sb.get("type") in BEAT_CODECS.beat_types
     }
-    positional_pools: dict[str, list] = {
-        beat_type: [
-            b for b in state_beats if b.get("type") == beat_type and "_notion_block_id" not in b
-        ]
-        for beat_type in BEAT_CODECS.beat_types
+    positional_pools: dict[str, _BeatPool] = {
+        codec.beat_type: _BeatPool(
+            codec,
+            [
+                b
+                for b in state_beats
+                if b.get("type") == codec.beat_type and "_notion_block_id" not in b
+            ],
+        )
+        for codec in BEAT_CODECS.all_codecs
     }
 
     new_beats: list[dict] = []
@@ -1839,12 +1846,11 @@ def _patch_validator_state(state: dict, toggle_block: dict) -> None:
             codec.apply_edit(beat, child)
             new_beats.append(beat)
         else:
-            pool = positional_pools.get(codec.beat_type, [])
-            idx = _codec_pool_match(codec, pool, child)
-            if idx is None and pool:
-                idx = 0  # positional fallback: pool is scoped to this state
-            if idx is not None:
-                beat = pool.pop(idx)
+            pool = positional_pools[codec.beat_type]
+            beat = pool.take_match(child)
+            if beat is None and pool:
+                beat = pool.take_first()  # positional fallback: pool is scoped to this state
+            if beat is not None:
                 codec.apply_edit(beat, child)
                 beat["_notion_block_id"] = child_id  # back-fill
                 new_beats.append(beat)
@@ -1857,16 +1863,21 @@ def _patch_validator_state(state: dict, toggle_block: dict) -> None:
     state.pop("steps", None)
 
 
-def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
+def _patch_section_beats(
+    section: dict, section_blocks: list[dict], index: _BeatIndex | None = None
+) -> None:
     """
     Merge Notion block edits into the beats of *section* (mutates in place).
 
     Two-layer matching at every level:
 
-    Layer 1 — ID match (via _notion_block_id set during push).
+    Layer 1 — ID match (via _notion_block_id set during push): one lookup in the
+               lesson's _BeatIndex (built once per pull by blocks_to_lesson).
     Layer 2 — positional fallback for beats/step-breaks that were never ID-tagged
-               (LEGACY: files pushed before ID-tagging). Strip once all files have
-               been re-pushed with IDs.
+               (LEGACY: files pushed before ID-tagging), or whose ID is stale. An
+               unedited block is matched on its rendered text in one lookup; only
+               edited or new blocks are scored with codec.match_score. Strip once all
+               files have been re-pushed with IDs.
 
     - Editable callout: Layer 1 → Layer 2 → new beat (reviewer-added).
     - Step-break: Layer 1 → Layer 2 → synthetic current_scene.
@@ -1875,46 +1886,36 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
 
     Beats are emitted in Notion page order — reordering and deletions are reflected.
     """
-    from steps.formatting.id_stamper import flatten_beats
+    index = index if index is not None else _BeatIndex([section])
+    json_beats = index.section_beats(section)
+    stamped_beats = index.stamped_beats(section)
+    beat_types = BEAT_CODECS.beat_types
 
-    json_beats = flatten_beats(section)
+    # IDs that actually exist in the current Notion section (branch columns included)
+    # — used to detect stale IDs.
+    notion_section_ids: set[str] = {blk.get("id", "") for blk in _iter_tree_blocks(section_blocks)}
 
-    # IDs that actually exist in the current Notion section — used to detect stale IDs.
-    notion_section_ids: set[str] = {blk.get("id", "") for blk in section_blocks}
+    def _stamped(block_id: str, types: set[str]) -> dict | None:
+        """This section's beat that block_id was pushed from, if any"""
+        beat = stamped_beats.get(block_id)
+        return beat if beat is not None and beat.get("type") in types else None
+
+    def _unstamped(beat: dict) -> bool:
+        return "_notion_block_id" not in beat or beat["_notion_block_id"] not in notion_section_ids
 
-    id_to_beat: dict[str, dict] = {
-        b["_notion_block_id"]: b
-        for b in json_beats
-        if "_notion_block_id" in b
-        and b.get("type") in BEAT_CODECS.beat_types
-        and b["_notion_block_id"] in notion_section_ids
-    }
-    id_to_current_scene: dict[str, dict] = {
-        b["_notion_block_id"]: b
-        for b in json_beats
-        if "_notion_block_id" in b
-        and b.get("type") == "current_scene"
-        and b["_notion_block_id"] in notion_section_ids
-    }
     # LEGACY: positional pools for beats without an ID, or whose ID is stale
     # (not present in the current Notion section). Stale IDs arise when the page
     # is re-pushed and all block IDs change; treating those beats as untagged lets
     # positional matching recover them (and back-fills the new IDs).
-    positional_pools: dict[str, list] = {
-        beat_type: [
-            b
-            for b in json_beats
-            if b.get("type") == beat_type
-            and ("_notion_block_id" not in b or b["_notion_block_id"] not in notion_section_ids)
-        ]
-        for beat_type in BEAT_CODECS.beat_types
+    positional_pools: dict[str, _BeatPool] = {
+        codec.beat_type: _BeatPool(
+            codec, [b for b in json_beats if b.get("type") == codec.beat_type and _unstamped(b)]
+        )
+        for codec in BEAT_CODECS.all_codecs
     }
 
     cs_positional_pool = [
-        b
-        for b in json_beats
-        if b.get("type") == "current_scene"
-        and ("_notion_block_id" not in b or b["_notion_block_id"] not in notion_section_ids)
+        b for b in json_beats if b.get("type") == "current_scene" and _unstamped(b)
     ]
     cs_positional_ptr = 0
 
@@ -1927,13 +1928,12 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
         block_id = block.get("id", "")
 
         if _is_step_break(block):
-            if block_id in id_to_current_scene:
-                cs = id_to_current_scene[block_id]
-            elif cs_positional_ptr < len(cs_positional_pool):  # LEGACY
+            cs = _stamped(block_id, {"current_scene"})
+            if cs is None and cs_positional_ptr < len(cs_positional_pool):  # LEGACY
                 cs = cs_positional_pool[cs_positional_ptr]
                 cs["_notion_block_id"] = block_id  # back-fill so future pulls use ID match
                 cs_positional_ptr += 1
-            else:
+            elif cs is None:
                 cs = {"type": "current_scene", "elements": []}
             result.append(cs)
             last_prompt_beat = None
@@ -1969,17 +1969,13 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
                 )
                 continue
 
-            if block_id in id_to_beat:
-                beat = id_to_beat[block_id]
-            else:  # LEGACY: content-match scan (for files pushed before ID-tagging)
-                pool = positional_pools.get(codec.beat_type, [])
-                idx = _codec_pool_match(codec, pool, block)
-                if idx is not None:
-                    beat = pool.pop(idx)
-                    beat["_notion_block_id"] = block_id  # back-fill so future pulls use ID match
-                else:
+            beat = _stamped(block_id, beat_types)
+            if beat is None:  # LEGACY: content match (for files pushed before ID-tagging)
+                beat = positional_pools[codec.beat_type].take_match(block)
+                if beat is None:
                     beat = codec.decode_new(block)
-                    beat["_notion_block_id"] = block_id
+                # back-fill so future pulls use ID match
+                beat["_notion_block_id"] = block_id
 
             is_prompt = codec.apply_edit(beat, block)
             if is_prompt:
@@ -2027,13 +2023,12 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
 
                 # Positional pool scoped to this branch so fallback doesn't
                 # cross into the other branch's beats.
-                branch_pools: dict[str, list] = {
-                    bt: [
-                        b
-                        for b in positional_pools.get(bt, [])
-                        if b.get("branch_name") == branch_name
-                    ]
-                    for bt in BEAT_CODECS.beat_types
+                branch_pools: dict[str, _BeatPool] = {
+                    bt: _BeatPool(
+                        pool.codec,
+                        [b for b in pool.beats() if b.get("branch_name") == branch_name],
+                    )
+                    for bt, pool in positional_pools.items()
                 }
 
                 for child in col_children[content_start:]:
@@ -2041,9 +2036,8 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
                     child_id = child.get("id", "")
 
                     if _is_step_break(child):
-                        if child_id in id_to_current_scene:
-                            cs = id_to_current_scene[child_id]
-                        else:
+                        cs = _stamped(child_id, {"current_scene"})
+                        if cs is None:
                             cs = {"type": "current_scene", "elements": []}
                         if branch_name:
                             cs["branch_name"] = branch_name
@@ -2056,20 +2050,17 @@ def _patch_section_beats(section: dict, section_blocks: list[dict]) -> None:
                     if codec is None:
                         continue
 
-                    if child_id in id_to_beat:
-                        beat = id_to_beat[child_id]
+                    beat = _stamped(child_id, beat_types)
+                    if beat is not None:
                         codec.apply_edit(beat, child)
                     else:
-                        pool = branch_pools.get(codec.beat_type, [])
-                        idx = _codec_pool_match(codec, pool, child)
-                        if idx is None and pool:
-                            idx = 0  # positional fallback scoped to this branch
-                        if idx is not None:
-                            beat = pool.pop(idx)
+                        pool = branch_pools[codec.beat_type]
+                        beat = pool.take_match(child)
+                        if beat is None and pool:
+                            beat = pool.take_first()  # positional fallback scoped to this branch
+                        if beat is not None:
                             # Remove from the shared positional pool too
-                            main_pool = positional_pools.get(codec.beat_type, [])
-                            if beat in main_pool:
-                                main_pool.remove(beat)
+                            positional_pools[codec.beat_type].discard(beat)
                             beat["_notion_block_id"] = child_id
                             codec.apply_edit(beat, child)
                         else:
@@ -2182,13 +2173,14 @@ def blocks_to_lesson(blocks: list[dict], original: dict | list) -> tuple[dict |
     section_map = _section_blocks_map(blocks)
 
     sections = patched if isinstance(patched, list) else patched.get("sections", [])
+    index = _BeatIndex(sections)
 
     kept: list[dict] = []
     extra_flags: list[dict] = []
     for section in sections:
         sid = section["id"]
         if sid in section_map:
-            _patch_section_beats(section, section_map[sid])
+            _patch_section_beats(section, section_map[sid], index)
             kept.append(section)
         else:
             extra_flags.append(
@@ -2321,7 +2313,8 @@ def _confirm_page_update(
             pass  # non-interactive (pipeline) — proceed
     try:
         if update_title:
-            client.pages.update(
+            notion_call(
+                client.pages.update,
                 existing_page_id,
                 properties={"title": {"title": [{"text": {"content": title}}]}},
             )
@@ -2348,7 +2341,9 @@ def push_lesson(
     Each section is pushed via push_section (flat heading style). Sync is
     determined by comparing against the actual Notion page state — sections
     absent from the page or with missing/changed beats are pushed; the rest
-    are skipped.
+    are skipped. A full push diffs the whole page (_sync_blocks); when the page
+    is unchanged since its local mirror was recorded, that is decided without
+    downloading it, and a push with nothing new returns after one request.
 
     sections: optional allowlist of section IDs to push. Default: all sections
     that are absent from or out of sync with the Notion page.
@@ -2365,10 +2360,12 @@ def push_lesson(
 
     # Detect existing page first so we can check actual page state below
     existing_page_id: str | None = page_id or None
+    registered_title: str | None = None
     if file_path is not None:
         entry = get_registry_entry(file_path)
         if entry:
             existing_page_id = entry["page_id"]
+            registered_title = entry.get("title")
 
     # Determine which sections need pushing
     page_blocks: list[dict] = []
@@ -2377,43 +2374,57 @@ def push_lesson(
         target_ids = set(sections)
         target_sections = [s for s in all_sections if s.get("id") in target_ids]
     elif existing_page_id:
-        # Full push — wipe and re-render everything; no need to inspect page state
+        # Full push — re-render everything; _sync_blocks diffs it against the page
         target_sections = list(all_sections)
     else:
         # No existing page yet: all sections are new
         target_sections = list(all_sections)
 
+    fresh_blocks: list[dict] = []
+    if sections is None:
+        fresh_blocks = [_reviewer_guide_callout(reviewer_user_id)]
+        for section in target_sections:
+            fresh_blocks.extend(_render_main_section(section))
+
     if existing_page_id:
         if not target_sections:
             print("Nothing to push — all sections are in sync.")
             return existing_page_id
+        if sections is None and registered_title == title:
+            # Decided locally: one pages.retrieve instead of downloading the page
+            mirror = fresh_mirror(client, existing_page_id)
+            if mirror is not None and mirror["tree_hash"] == tree_hash(fresh_blocks):
+                print("Nothing to push — the page matches its local mirror.")
+                return existing_page_id
         page_id = _confirm_page_update(
             client,
             existing_page_id,
             title,
-            update_title=(sections is None),
+            # A rename moves last_edited_time and would invalidate the local mirror
+            update_title=(sections is None and registered_title != title),
             n_sections=len(target_sections),
         )
         if page_id is None:
             existing_page_id = None  # page was deleted; fall through to create
 
     if sections is None:
-        # Full push (new or existing page): clear existing content, then re-render everything.
+        # Full push (new or existing page): render everything, then create or diff-sync.
         if not existing_page_id:
-            page = client.pages.create(
+            page = notion_call(
+                client.pages.create,
+                idempotent=False,
                 parent={"page_id": parent_page_id},
                 properties={"title": {"title": [{"text": {"content": title}}]}},
             )
             page_id = page["id"]
+        if existing_page_id:
+            # Diff against the page instead of wiping it: unchanged beats keep their
+            # block IDs and reviewer comments, and only the changes cost requests
+            _sync_blocks(client, page_id, fresh_blocks)
         else:
-            page_blocks = page_blocks or _all_blocks(client, page_id)
-            for block in page_blocks:
-                client.blocks.update(block["id"], archived=True)
-        fresh_blocks: list[dict] = [_reviewer_guide_callout(reviewer_user_id)]
-        for section in target_sections:
-            fresh_blocks.extend(_render_main_section(section))
-        for i in range(0, len(fresh_blocks), 100):
-            client.blocks.children.append(page_id, children=fresh_blocks[i : i + 100])
+            plan = plan_sync(page_id, [], fresh_blocks)
+            execute_sync(client, plan)
+            _record_mirror_after_sync(client, page_id, fresh_blocks, plan)
         if file_path is not None:
             _write_push_log(file_path, page_id, all_sections, target_sections)
             set_registry_entry(file_path, page_id, title)
@@ -2500,10 +2511,13 @@ def pull_lesson(
     """Pull lesson edits from Notion. Returns (patched, flags, raw_blocks).
 
     raw_blocks is the full fetched block tree, returned so callers can save
-    it as a debug artifact if needed.
+    it as a debug artifact if needed. The page's local mirror is refreshed from it.
     """
     client = get_notion_client()
+    # Read the edit time first: an edit made during the fetch then shows up as a change
+    last_edited_time = page_last_edited_time(client, page_id)
     blocks = _all_blocks(client, page_id, recursive=True)
+    save_mirror(build_mirror(page_id, blocks, last_edited_time))
     patched, flags = blocks_to_lesson(blocks, original)
     return patched, flags, blocks
 
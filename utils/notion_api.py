@@ -0,0 +1,252 @@
+"""utils/notion_api.py
+
+Rate-limited access to the Notion API, shared by push, pull and the comment sweeps.
+
+Notion allows an average of about 3 requests per second per integration and answers
+bursts with HTTP 429 + Retry-After. Every request made through notion_call() takes a
+token from a process-wide bucket (NOTION_RATE_LIMIT_RPS, default 3) and retries rate
+limits and transient server errors with backoff. A 429 pauses the whole bucket, so
+concurrent workers back off together instead of stampeding. Requests that are not safe
+to repeat (appending blocks, creating pages) are passed with idempotent=False and only
+retried when Notion provably did not apply them: a 429, or a connection that never
+opened. A timeout or 5xx after the request was sent may have created the blocks
+already, so it is raised instead of duplicating them on the page.
+
+fetch_block_tree() walks a page breadth-first: the children of every block on one level
+are listed concurrently, then the next level, and the result is the same nested
+block[type]["children"] structure the old depth-first walk produced.
+
+fetch_comments() lists the comments of many blocks concurrently under the same bucket,
+for the reviewer comment sweeps.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from notion_client import APIResponseError
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+# Notion's documented average rate limit per integration
+DEFAULT_REQUESTS_PER_SECOND = 3.0
+RATE_LIMIT_ENV_VAR = "NOTION_RATE_LIMIT_RPS"
+
+# Child listings in flight at once; the bucket, not the pool, sets the request rate
+DEFAULT_FETCH_WORKERS = 8
+
+# Retry policy
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+_RETRYABLE_STATUS_CODES = {409, 429, 500, 502, 503, 504}
+# Failures before the request reached Notion: safe to retry any request
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class NotionRateLimiter:
+    """Thread-safe token bucket: `rate` requests per second, bursts of up to `burst`"""
+
+    def __init__(self, rate: float = DEFAULT_REQUESTS_PER_SECOND, burst: float = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def backoff(self, seconds: float) -> None:
+        """Pause every caller for `seconds` (after a 429)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+def get_rate_limiter() -> NotionRateLimiter:
+    """Return the process-wide Notion rate limiter (created on first use)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            rate = float(os.getenv(RATE_LIMIT_ENV_VAR) or DEFAULT_REQUESTS_PER_SECOND)
+            _limiter = NotionRateLimiter(rate)
+        return _limiter
+
+
+def notion_call(fn, *args, limiter: NotionRateLimiter = None, idempotent: bool = True, **kwargs):
+    """Call a notion_client endpoint under the rate limit, retrying transient failures
+
+    Args:
+        fn: Bound endpoint, e.g. client.blocks.children.list
+        *args, **kwargs: Passed to fn
+        limiter: Rate limiter to use (default: the process-wide one)
+        idempotent: False for requests that must not be applied twice
+                    (blocks.children.append, pages.create): only retried on errors
+                    that show the request was not applied
+
+    Returns:
+        Whatever fn returns
+    """
+    limiter = limiter or get_rate_limiter()
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except (HTTPResponseError, RequestTimeoutError, httpx.TransportError) as e:
+            delay = _retry_delay(e, attempt, idempotent)
+            if delay is None:
+                raise
+            if getattr(e, "status", None) == 429:
+                limiter.backoff(delay)
+            print(f"  [NOTION] {_describe(e)}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def list_children(client, block_id: str, limiter: NotionRateLimiter = None) -> list[dict]:
+    """Fetch all direct children of a block, following pagination cursors"""
+    results: list[dict] = []
+    cursor: str | None = None
+    while True:
+        kwargs: dict = {"block_id": block_id}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = notion_call(client.blocks.children.list, limiter=limiter, **kwargs)
+        results.extend(response["results"])
+        if not response["has_more"]:
+            break
+        cursor = response["next_cursor"]
+    return results
+
+
+def fetch_block_tree(
+    client,
+    block_id: str,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    limiter: NotionRateLimiter = None,
+) -> list[dict]:
+    """Fetch a block's children and all their descendants, one level at a time
+
+    Children of any block that has_children are embedded under
+    block[block_type]["children"], in Notion order.
+
+    Args:
+        client: notion_client.Client
+        block_id: Page or block to fetch
+        max_workers: Child listings issued concurrently
+        limiter: Rate limiter to use (default: the process-wide one)
+
+    Returns:
+        List of top-level blocks with nested children
+    """
+    top_level = list_children(client, block_id, limiter)
+    frontier = [block for block in top_level if block.get("has_children")]
+    if not frontier:
+        return top_level
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-fetch") as pool:
+        while frontier:
+            children_lists = pool.map(
+                lambda block: list_children(client, block["id"], limiter), frontier
+            )
+            next_frontier = []
+            for block, children in zip(frontier, children_lists):
+                block.setdefault(block.get("type", ""), {})["children"] = children
+                next_frontier.extend(child for child in children if child.get("has_children"))
+            frontier = next_frontier
+    return top_level
+
+
+def list_comments(client, block_id: str, limiter: NotionRateLimiter = None) -> list[dict]:
+    """Fetch all comments on a block (or page), following pagination cursors"""
+    results: list[dict] = []
+    cursor: str | None = None
+    while True:
+        kwargs: dict = {"block_id": block_id}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = notion_call(client.comments.list, limiter=limiter, **kwargs)
+        results.extend(response.get("results", []))
+        if not response.get("has_more"):
+            break
+        cursor = response.get("next_cursor")
+    return results
+
+
+def fetch_comments(
+    client,
+    block_ids: list[str],
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    limiter: NotionRateLimiter = None,
+) -> dict[str, list[dict] | None]:
+    """Fetch the comments of many blocks concurrently
+
+    A block whose comments cannot be listed (deleted, no access, retries exhausted)
+    maps to None rather than failing the whole sweep.
+
+    Args:
+        client: notion_client.Client
+        block_ids: Blocks (or pages) to query; duplicates are queried once
+        max_workers: Comment listings issued concurrently
+        limiter: Rate limiter to use (default: the process-wide one)
+
+    Returns:
+        {block_id: [comment, ...] or None}, in the order of block_ids
+    """
+
+    def _list(block_id):
+        try:
+            return list_comments(client, block_id, limiter)
+        except Exception as e:
+            print(f"  [NOTION] Could not list comments on {block_id}: {_describe(e)}")
+            return None
+
+    unique_ids = list(dict.fromkeys(block_ids))
+    if len(unique_ids) <= 1:
+        return {block_id: _list(block_id) for block_id in unique_ids}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-comments") as pool:
+        return dict(zip(unique_ids, pool.map(_list, unique_ids)))
+
+
+def _retry_delay(error: Exception, attempt: int, idempotent: bool = True):
+    """Seconds to wait before retrying, or None if the error is not retryable"""
+    if attempt + 1 >= MAX_ATTEMPTS:
+        return None
+    status = getattr(error, "status", None)
+    if not idempotent and status != 429 and not isinstance(error, _NOT_SENT_ERRORS):
+        return None
+    if isinstance(error, HTTPResponseError) and status not in _RETRYABLE_STATUS_CODES:
+        return None
+    if status == 429:
+        retry_after = (getattr(error, "headers", None) or {}).get("retry-after")
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS) + random.uniform(0, 0.5)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, APIResponseError):
+        return f"{error.status} {error.code}"
+    if isinstance(error, HTTPResponseError):
+        return f"HTTP {error.status}"
+    return type(error).__name__
@@ -0,0 +1,135 @@
+"""utils/notion_jobs.py
+
+Run push/pull work for many Notion pages concurrently.
+
+Syncing every tracked script one page at a time is bounded by request latency, not
+by Notion's rate limit. run_page_jobs() runs one job per page on a thread pool
+instead; all Notion requests made through utils.notion_api share the process-wide
+rate limiter, so the pool size only sets how many pages are in progress while the
+bucket sets the request rate. Each job is isolated: an exception (or sys.exit) fails
+that page only and is reported in the summary.
+
+While jobs run, every line a job prints is prefixed with its label, so interleaved
+output stays readable:
+
+    [u1/m3/lesson] Pulling from: https://notion.so/...
+    [u1/m4/warmup] [SYNC] 212 kept, 1 updated, 0 inserted, 0 archived (1 requests)
+
+    start = time.monotonic()
+    results = run_page_jobs([("u1/m3/lesson", lambda: pull(...)), ...])
+    print_job_summary(results, time.monotonic() - start)
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Pages in progress at once; the shared Notion rate limiter sets the request rate
+DEFAULT_PAGE_WORKERS = 4
+
+
+class PageJobResult:
+    """Outcome of one page's job"""
+
+    def __init__(self, label: str, status: str = "", error: str | None = None, seconds=0.0):
+        self.label = label
+        self.status = status
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _PrefixedStream:
+    """Stream wrapper that prefixes each complete line written by a job thread
+
+    Lines are buffered per thread and written whole, so concurrent jobs never split
+    each other's lines. Threads without a label (the main thread) write through.
+    """
+
+    def __init__(self, original):
+        self._original = original
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def set_label(self, label: str | None) -> None:
+        self._local.label = label
+        self._local.buffer = ""
+
+    def write(self, data):
+        label = getattr(self._local, "label", None)
+        if label is None:
+            return self._original.write(data)
+        *lines, self._local.buffer = (self._local.buffer + data).split("\n")
+        if lines:
+            with self._lock:
+                self._original.write("".join(f"[{label}] {line}\n" for line in lines))
+        return len(data)
+
+    def flush_label(self) -> None:
+        """Write out the current thread's unterminated line, if any"""
+        if getattr(self._local, "buffer", ""):
+            self.write("\n")
+
+    def flush(self):
+        self._original.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self._original, attr)
+
+
+def run_page_jobs(
+    jobs: list[tuple[str, Callable[[], str]]],
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+) -> list[PageJobResult]:
+    """Run one job per page concurrently, prefixing their output with their labels
+
+    Args:
+        jobs: (label, fn) pairs; fn() does the page's work and returns a status line
+        max_workers: Jobs in progress at once
+
+    Returns:
+        PageJobResult per job, in the order of jobs
+    """
+    stream = _PrefixedStream(sys.stdout)
+
+    def _run(label: str, fn: Callable[[], str]) -> PageJobResult:
+        stream.set_label(label)
+        start = time.monotonic()
+        try:
+            status = fn() or ""
+            result = PageJobResult(label, status=status, seconds=time.monotonic() - start)
+        except (Exception, SystemExit) as e:
+            message = str(e) if not isinstance(e, SystemExit) else f"exited ({e.code})"
+            print(f"[FAILED] {message}")
+            result = PageJobResult(label, error=message, seconds=time.monotonic() - start)
+        else:
+            if status:
+                print(status)
+        stream.flush_label()
+        stream.set_label(None)
+        return result
+
+    original_stdout = sys.stdout
+    sys.stdout = stream
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-page") as pool:
+            return list(pool.map(lambda job: _run(*job), jobs))
+    finally:
+        sys.stdout = original_stdout
+
+
+def print_job_summary(results: list[PageJobResult], elapsed: float) -> None:
+    """Print totals and the list of failed pages"""
+    failed = [r for r in results if not r.ok]
+    print(f"\n{len(results) - len(failed)} page(s) OK, {len(failed)} failed in {elapsed:.1f}s")
+    if failed:
+        print("Failed:")
+        for result in failed:
+            print(f"  {result.label}: {result.error}")
@@ -0,0 +1,156 @@
+"""utils/notion_mirror.py
+
+Local mirror of pushed Notion pages, so pushes need not re-download the page.
+
+After every push and pull the page's block tree is recorded in
+config/notion_mirrors/<page_id>.json, next to the page registry:
+
+    {
+      "page_id": ...,
+      "last_edited_time": <page last_edited_time when the mirror was taken>,
+      "root": [block_id, ...],
+      "tree_hash": <hash of the whole tree>,
+      "blocks": {
+        block_id: {
+          "type", "skeleton", "hash",          # utils/notion_sync keys
+          "children": [block_id, ...],
+          "children_hash",                     # hash of the subtree below
+          "last_edited_time"
+        }
+      }
+    }
+
+fresh_mirror() checks the mirror with a single pages.retrieve: while the page's
+last_edited_time is unchanged nobody has edited it since, so the push path plans its
+diff against mirror_tree() instead of fetching every block, and a push whose rendered
+tree_hash() equals the mirror's sends nothing at all. Notion reports last_edited_time
+to the minute, so an edit made in the same minute as a push is only seen by the next
+pull (which always re-downloads and re-records the page).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from utils.notion_api import notion_call
+from utils.notion_sync import block_key
+
+_MIRROR_DIR = Path(__file__).parent.parent / "config" / "notion_mirrors"
+
+
+def _children(block: dict) -> list[dict]:
+    data = block.get(block.get("type", ""))
+    return (data.get("children") or []) if isinstance(data, dict) else []
+
+
+def _hash(value) -> str:
+    raw = json.dumps(value, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def tree_hash(blocks: list[dict]) -> str:
+    """Hash of a block list and everything below it (structure and content, not IDs)"""
+    return _hash([[*block_key(b), tree_hash(_children(b))] for b in blocks])
+
+
+def build_mirror(page_id: str, blocks: list[dict], last_edited_time: str | None) -> dict:
+    """Build a page mirror from a block tree whose blocks (at every level) carry IDs
+
+    Args:
+        page_id: Notion page ID
+        blocks: Page children with nested children under block[type]["children"]
+        last_edited_time: The page's last_edited_time matching this tree
+
+    Returns:
+        Mirror dict (see module docstring)
+    """
+    entries: dict[str, dict] = {}
+
+    def _record(block_list: list[dict]) -> tuple[list[str], str]:
+        ids, keys = [], []
+        for block in block_list:
+            skeleton, content = block_key(block)
+            child_ids, child_hash = _record(_children(block))
+            entries[block["id"]] = {
+                "type": block.get("type"),
+                "skeleton": skeleton,
+                "hash": content,
+                "children": child_ids,
+                "children_hash": child_hash,
+                "last_edited_time": block.get("last_edited_time"),
+            }
+            ids.append(block["id"])
+            keys.append([skeleton, content, child_hash])
+        return ids, _hash(keys)
+
+    root, root_hash = _record(blocks)
+    return {
+        "page_id": page_id,
+        "last_edited_time": last_edited_time,
+        "mirrored_at": datetime.now(timezone.utc).isoformat(),
+        "root": root,
+        "tree_hash": root_hash,
+        "blocks": entries,
+    }
+
+
+def mirror_tree(mirror: dict) -> list[dict]:
+    """Rebuild the mirrored tree as stub blocks that utils.notion_sync.plan_sync accepts"""
+    entries = mirror["blocks"]
+
+    def _stub(block_id: str) -> dict:
+        entry = entries[block_id]
+        btype = entry["type"]
+        return {
+            "id": block_id,
+            "type": btype,
+            "_key": [entry["skeleton"], entry["hash"]],
+            btype: {"children": [_stub(child) for child in entry["children"]]},
+        }
+
+    return [_stub(block_id) for block_id in mirror["root"]]
+
+
+def _mirror_path(page_id: str) -> Path:
+    return _MIRROR_DIR / f"{page_id.replace('-', '')}.json"
+
+
+def load_mirror(page_id: str) -> dict | None:
+    path = _mirror_path(page_id)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_mirror(mirror: dict) -> None:
+    path = _mirror_path(mirror["page_id"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(mirror, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def drop_mirror(page_id: str) -> None:
+    _mirror_path(page_id).unlink(missing_ok=True)
+
+
+def page_last_edited_time(client, page_id: str) -> str | None:
+    """The page's current last_edited_time (one pages.retrieve request)"""
+    return notion_call(client.pages.retrieve, page_id).get("last_edited_time")
+
+
+def fresh_mirror(client, page_id: str) -> dict | None:
+    """The page's mirror if nobody has edited the page since it was taken, else None"""
+    mirror = load_mirror(page_id)
+    if mirror is None or not mirror.get("last_edited_time"):
+        return None
+    if page_last_edited_time(client, page_id) != mirror["last_edited_time"]:
+        return None
+    return mirror
@@ -0,0 +1,224 @@
+"""utils/notion_registry.py
+
+Store for the Notion page registry (which Notion page each pushed file maps to).
+
+The registry used to be read and rewritten in full on every push, with no locking,
+so pushes running in parallel (run_module pipelines, push_to_notion -j)
+could drop each other's entries. RegistryStore keeps the same snapshot file,
+config/notion_pages.json ({key: entry}, still readable and diffable), plus an
+append-only journal of the entries written since it was last compacted,
+config/notion_pages.jsonl:
+
+    {"key": "outputs/unit1/lesson_generator_module_1/notion_page.json", "entry": {...}}
+
+- A write appends one journal line under an inter-process file lock
+  (config/notion_pages.lock) instead of rewriting the snapshot. Once the journal
+  holds COMPACT_AFTER lines the writer folds it into the snapshot (tmp file +
+  os.replace) and empties it, still under the lock.
+- Reads replay snapshot + journal into a dict plus a reverse index by page ID. The
+  result is cached per process and reloaded only when either file changes, so
+  lookups by file key or by page ID are dict lookups.
+- batch() buffers the writes a thread makes inside it and appends them in one locked
+  write when the block ends. Batches are per thread, so concurrent pushes each save
+  their entries as soon as their own block ends.
+
+Both files hold registry data; commit the journal along with the snapshot.
+
+    store = RegistryStore(Path("config/notion_pages.json"))
+    store.set(key, {"page_id": ..., "title": ..., "pushed_at": ...})
+    store.get(key), store.key_for_page(page_id)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Journal lines written before the next writer folds them into the snapshot
+COMPACT_AFTER = 200
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive inter-process lock on path (fcntl on POSIX, msvcrt on Windows)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _normalize_page_id(page_id: str) -> str:
+    return page_id.replace("-", "")
+
+
+class RegistryStore:
+    """Snapshot + journal registry with locked appends and indexed, cached reads"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Snapshot file; the journal and lock file sit next to it
+        """
+        self.path = path
+        self.journal_path = path.with_suffix(".jsonl")
+        self.lock_path = path.with_suffix(".lock")
+        self._thread_lock = threading.RLock()
+        self._signature = None
+        self._entries: dict[str, dict] = {}
+        self._by_page: dict[str, str] = {}
+        self._journal_lines = 0
+        self._local = threading.local()  # .pending: set while the thread is batching
+
+    # -- reads --------------------------------------------------------------
+
+    def entries(self) -> dict[str, dict]:
+        """All entries, {key: entry} (a copy)"""
+        with self._thread_lock:
+            self._refresh()
+            entries = dict(self._entries)
+            entries.update(self._pending() or {})
+            return entries
+
+    def get(self, key: str) -> dict | None:
+        pending = self._pending()
+        if pending and key in pending:
+            return pending[key]
+        with self._thread_lock:
+            self._refresh()
+            return self._entries.get(key)
+
+    def key_for_page(self, page_id: str) -> str | None:
+        """Key of the entry registered for page_id (dashes ignored), or None"""
+        normalized = _normalize_page_id(page_id)
+        for key, entry in (self._pending() or {}).items():
+            if _normalize_page_id(entry.get("page_id", "")) == normalized:
+                return key
+        with self._thread_lock:
+            self._refresh()
+            return self._by_page.get(normalized)
+
+    def _pending(self) -> dict[str, dict] | None:
+        """This thread's buffered writes (None outside batch())"""
+        return getattr(self._local, "pending", None)
+
+    def _stat_signature(self):
+        signature = []
+        for path in (self.path, self.journal_path):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _refresh(self) -> None:
+        """Reload snapshot + journal if either changed since the last read"""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        entries: dict[str, dict] = {}
+        if self.path.exists():
+            entries.update(json.loads(self.path.read_text(encoding="utf-8")))
+        lines = 0
+        if self.journal_path.exists():
+            for line in self.journal_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a killed process
+                entries[record["key"]] = record["entry"]
+                lines += 1
+        self._entries = entries
+        self._by_page = {}
+        for key, entry in entries.items():
+            # First key wins, as when the registry was scanned in order
+            self._by_page.setdefault(_normalize_page_id(entry.get("page_id", "")), key)
+        self._journal_lines = lines
+        self._signature = signature
+
+    # -- writes -------------------------------------------------------------
+
+    def set(self, key: str, entry: dict) -> None:
+        """Record entry under key (buffered while this thread is inside batch())"""
+        pending = self._pending()
+        if pending is not None:
+            pending[key] = entry
+            return
+        self._append({key: entry})
+
+    @contextmanager
+    def batch(self):
+        """Buffer this thread's set() calls inside the block and append them in one
+        locked write (set() calls of other threads are not held back)"""
+        nested = self._pending() is not None
+        if not nested:
+            self._local.pending = {}
+        try:
+            yield self
+        finally:
+            if not nested:
+                pending, self._local.pending = self._local.pending, None
+                if pending:
+                    self._append(pending)
+
+    def replace_all(self, entries: dict[str, dict]) -> None:
+        """Overwrite the whole registry with entries (and empty the journal)"""
+        with self._thread_lock, _file_lock(self.lock_path):
+            self._write_snapshot(entries)
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot"""
+        with self._thread_lock, _file_lock(self.lock_path):
+            self._signature = None
+            self._refresh()
+            self._write_snapshot(self._entries)
+
+    def _append(self, entries: dict[str, dict]) -> None:
+        lines = "".join(
+            json.dumps({"key": key, "entry": entry}, ensure_ascii=False) + "\n"
+            for key, entry in entries.items()
+        )
+        with self._thread_lock, _file_lock(self.lock_path):
+            with open(self.journal_path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._refresh()
+            if self._journal_lines >= COMPACT_AFTER:
+                self._write_snapshot(self._entries)
+
+    def _write_snapshot(self, entries: dict[str, dict]) -> None:
+        """Replace the snapshot and empty the journal (caller holds the file lock)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps(entries, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
+        self.journal_path.unlink(missing_ok=True)
+        self._signature = None
@@ -0,0 +1,245 @@
+"""utils/notion_sync.py
+
+Minimal-mutation sync of rendered blocks onto an existing Notion page.
+
+Re-pushing a lesson used to archive every stale block one request at a time, and any
+structural difference in a section fell back to archiving all of its children and
+appending them again — hundreds of requests, and every reviewer comment lost with
+the archived block IDs. plan_sync() instead diffs the page's current block tree
+against the freshly rendered blocks and produces the smallest edit it can find:
+
+- Blocks whose skeleton (type, callout emoji, toggleable heading) and content both
+  match are kept untouched.
+- Blocks whose skeleton matches but whose text, colour or language changed are
+  updated in place, so their IDs and comment threads survive.
+- Remaining new blocks are inserted with after= positioning, batched into runs;
+  remaining old blocks are archived.
+- Kept and updated blocks recurse into their children the same way.
+
+Each list is first aligned on skeleton + content hash (difflib.SequenceMatcher, so
+unchanged runs anchor the alignment), then the unmatched gaps are aligned on skeleton
+alone to find in-place updates. execute_sync() sends the plan's requests concurrently
+under the shared Notion rate limiter (utils/notion_api.py); inserts are independent
+because each run is anchored on a block that is kept.
+
+    existing = fetch_block_tree(client, page_id)
+    plan = plan_sync(page_id, existing, new_blocks)
+    execute_sync(client, plan)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+
+from utils.notion_api import DEFAULT_FETCH_WORKERS, NotionRateLimiter, notion_call
+
+# Notion accepts at most 100 children per append request
+_APPEND_LIMIT = 100
+
+# Block types whose type object carries a color ("default" when omitted)
+_COLORED_TYPES = {
+    "paragraph",
+    "heading_1",
+    "heading_2",
+    "heading_3",
+    "bulleted_list_item",
+    "numbered_list_item",
+    "toggle",
+    "callout",
+    "quote",
+    "to_do",
+}
+
+
+class SyncPlan:
+    """Requests needed to turn a page's current blocks into the rendered blocks"""
+
+    def __init__(self):
+        self.updates: list[tuple[str, dict]] = []  # (block_id, new block)
+        self.archives: list[str] = []  # block_id
+        # (parent_id, after_id or None, at_start, [new blocks])
+        self.inserts: list[tuple[str, str | None, bool, list[dict]]] = []
+        self.kept = 0
+        # id(new block) -> Notion block ID, for kept/updated blocks (planning)
+        # and inserted top-level blocks (filled in by execute_sync)
+        self.block_ids: dict[int, str] = {}
+
+    @property
+    def requests(self) -> int:
+        """Number of write requests execute_sync() will send"""
+        appends = sum(-(-len(blocks) // _APPEND_LIMIT) for *_, blocks in self.inserts)
+        return len(self.updates) + len(self.archives) + appends
+
+    def summary(self) -> str:
+        inserted = sum(len(blocks) for *_, blocks in self.inserts)
+        return (
+            f"{self.kept} kept, {len(self.updates)} updated, {inserted} inserted, "
+            f"{len(self.archives)} archived ({self.requests} requests)"
+        )
+
+
+def block_skeleton(block: dict) -> str:
+    """Return a structural fingerprint for a block (type + emoji for callouts)."""
+    btype = block.get("type", "")
+    data = block.get(btype) or {}
+    if btype == "callout":
+        return f"callout:{(data.get('icon') or {}).get('emoji', '')}"
+    if data.get("is_toggleable"):
+        return f"{btype}:toggle"
+    return btype
+
+
+def block_key(block: dict) -> tuple[str, str]:
+    """(skeleton, content hash) of a block; mirror stubs carry theirs precomputed"""
+    if "_key" in block:
+        return tuple(block["_key"])
+    return block_skeleton(block), content_hash(block)
+
+
+def content_hash(block: dict) -> str:
+    """Hash of a block's displayable content, excluding children
+
+    Equal for a rendered block and the block Notion returns for it: rich text is
+    compared as plain content, a missing colour counts as "default", and read-only
+    fields Notion adds (caption, width_ratio, ...) are ignored.
+    """
+    btype = block.get("type", "")
+    data = block.get(btype) or {}
+    content = {
+        "text": "".join(
+            span.get("text", {}).get("content", "") or span.get("plain_text", "")
+            for span in data.get("rich_text", [])
+        ),
+        "color": data.get("color", "default") if btype in _COLORED_TYPES else None,
+        "language": data.get("language"),
+    }
+    raw = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _children(block: dict) -> list[dict]:
+    data = block.get(block.get("type", ""))
+    return (data.get("children") or []) if isinstance(data, dict) else []
+
+
+def plan_sync(
+    parent_id: str,
+    existing: list[dict],
+    new_blocks: list[dict],
+    plan: SyncPlan = None,
+) -> SyncPlan:
+    """Plan the requests that turn `existing` children of parent_id into `new_blocks`
+
+    Args:
+        parent_id: Page or block whose children are being synced
+        existing: Current children, with nested children embedded under
+                  block[type]["children"] (as returned by fetch_block_tree)
+        new_blocks: Rendered blocks, e.g. from lesson_to_blocks()
+        plan: Plan to add to (used when recursing into children)
+
+    Returns:
+        The SyncPlan
+    """
+    plan = plan if plan is not None else SyncPlan()
+    old_keys = [block_key(b) for b in existing]
+    new_keys = [block_key(b) for b in new_blocks]
+
+    new_to_old: dict[int, int] = {}
+    matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            new_to_old.update(zip(range(j1, j2), range(i1, i2)))
+        elif tag == "replace":
+            # Same structure, different content: pair blocks up for in-place updates
+            gap = SequenceMatcher(
+                None,
+                [key[0] for key in old_keys[i1:i2]],
+                [key[0] for key in new_keys[j1:j2]],
+                autojunk=False,
+            )
+            for a, b, size in gap.get_matching_blocks():
+                new_to_old.update((j1 + b + k, i1 + a + k) for k in range(size))
+
+    matched_old = set(new_to_old.values())
+    plan.archives.extend(b["id"] for i, b in enumerate(existing) if i not in matched_old)
+
+    after_id: str | None = None
+    run: list[dict] = []
+    for j, new_block in enumerate(new_blocks):
+        if j not in new_to_old:
+            run.append(new_block)
+            continue
+        if run:
+            plan.inserts.append((parent_id, after_id, after_id is None, run))
+            run = []
+        old_block = existing[new_to_old[j]]
+        plan.block_ids[id(new_block)] = old_block["id"]
+        if old_keys[new_to_old[j]] == new_keys[j]:
+            plan.kept += 1
+        else:
+            plan.updates.append((old_block["id"], new_block))
+        old_children, new_children = _children(old_block), _children(new_block)
+        if old_children or new_children:
+            plan_sync(old_block["id"], old_children, new_children, plan)
+        after_id = old_block["id"]
+    if run:
+        # A trailing run (or a list with nothing kept) can simply be appended
+        plan.inserts.append((parent_id, after_id, False, run))
+    return plan
+
+
+def execute_sync(
+    client,
+    plan: SyncPlan,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    limiter: NotionRateLimiter = None,
+) -> None:
+    """Send a SyncPlan's updates, inserts and archives concurrently under the rate limit
+
+    The IDs Notion assigns to inserted top-level blocks are recorded in plan.block_ids.
+    """
+
+    def _update(block_id: str, new_block: dict) -> None:
+        btype = new_block["type"]
+        data = {k: v for k, v in new_block[btype].items() if k not in ("children", "is_toggleable")}
+        if btype in _COLORED_TYPES:
+            data.setdefault("color", "default")
+        notion_call(client.blocks.update, block_id, limiter=limiter, **{btype: data})
+
+    def _archive(block_id: str) -> None:
+        notion_call(client.blocks.update, block_id, archived=True, limiter=limiter)
+
+    def _insert(parent_id: str, after_id: str | None, at_start: bool, blocks: list[dict]) -> None:
+        for start in range(0, len(blocks), _APPEND_LIMIT):
+            kwargs: dict = {"children": blocks[start : start + _APPEND_LIMIT]}
+            if after_id is not None:
+                kwargs["after"] = after_id
+            elif at_start:
+                kwargs["position"] = {"type": "start"}
+            response = notion_call(
+                client.blocks.children.append,
+                parent_id,
+                limiter=limiter,
+                idempotent=False,
+                **kwargs,
+            )
+            results = response.get("results", [])
+            for block, created in zip(blocks[start : start + _APPEND_LIMIT], results):
+                plan.block_ids[id(block)] = created["id"]
+            if results:
+                after_id = results[-1]["id"]
+            at_start = False
+
+    tasks = (
+        [(_update, args) for args in plan.updates]
+        + [(_insert, args) for args in plan.inserts]
+        + [(_archive, (block_id,)) for block_id in plan.archives]
+    )
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-sync") as pool:
+        for future in [pool.submit(fn, *args) for fn, args in tasks]:
+            future.result()
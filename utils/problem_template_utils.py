@@ -1,10 +1,89 @@
 """
 Utility functions for fetching data from problem_templates.json files
 Supports nested field access with dot notation
+
+Each problem_templates.json is parsed once per process and its goals indexed by id; the
+index is re-validated against the file's mtime and size, so fetching several template_ref
+fields for many goals does not re-read the file per field. Like starter packs
+(utils/module_utils.py), parsed files are frozen: fields and goals are returned as
+read-only views of the cached goals rather than copies; copy one before modifying it.
 """
 
 import json
 import os
+import sys
+import threading
+
+# Sibling utils modules are imported flat (also when loaded as utils.X)
+_utils_dir = os.path.dirname(os.path.abspath(__file__))
+if _utils_dir not in sys.path:
+    sys.path.insert(0, _utils_dir)
+
+from module_utils import _freeze  # noqa: E402
+
+# Parsed template files: absolute path -> (mtime_ns, size, goals, {goal_id: goal})
+_goal_index = {}
+_goal_index_lock = threading.Lock()
+
+
+def _template_path(module_number, unit_number=None):
+    """Path to a module's problem_templates.json (relative to the working directory)"""
+    if unit_number is not None:
+        return os.path.join(
+            "units", f"unit{unit_number}", f"module{module_number}", "problem_templates.json"
+        )
+    return os.path.join("modules", f"module{module_number}", "problem_templates.json")
+
+
+def _load_goal_index(template_path):
+    """Return (goals, goals_by_id) for a template file, re-reading it only when it changed
+
+    Raises:
+        FileNotFoundError: If the template file does not exist
+    """
+    key = os.path.abspath(template_path)
+    try:
+        stat = os.stat(key)
+    except OSError:
+        raise FileNotFoundError(f"problem_templates.json not found at {template_path}")
+
+    with _goal_index_lock:
+        cached = _goal_index.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+
+    with open(key, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    goals = _freeze(data.get("goals", []))
+    # First occurrence wins, matching the old linear scan
+    by_id = {}
+    for goal in goals:
+        by_id.setdefault(goal.get("id"), goal)
+
+    with _goal_index_lock:
+        _goal_index[key] = (stat.st_mtime_ns, stat.st_size, goals, by_id)
+    return goals, by_id
+
+
+def _find_goal(module_number, goal_id, unit_number=None):
+    """Look up a goal in the (cached) index; the returned dict is a shared read-only view"""
+    template_path = _template_path(module_number, unit_number)
+    goals, by_id = _load_goal_index(template_path)
+
+    goal = by_id.get(goal_id)
+    if goal is None:
+        available_ids = [g.get("id") for g in goals]
+        raise ValueError(
+            f"Goal {goal_id} not found in {template_path}. Available goal IDs: {available_ids}"
+        )
+    return goal
+
+
+def clear_template_cache():
+    """Drop all indexed template files (they are also re-read automatically when changed)"""
+    with _goal_index_lock:
+        _goal_index.clear()
 
 
 def get_problem_template_field(
@@ -35,36 +114,12 @@ def get_problem_template_field(
         FileNotFoundError: If problem_templates.json not found for module
         ValueError: If goal not found or required field is missing
     """
-    # Construct path to problem_templates.json
-    if unit_number is not None:
-        template_path = os.path.join(
-            "units", f"unit{unit_number}", f"module{module_number}", "problem_templates.json"
-        )
-    else:
-        template_path = os.path.join("modules", f"module{module_number}", "problem_templates.json")
+    goal = _find_goal(module_number, goal_id, unit_number)
+    return _goal_field(goal, field_path, required, default, module_number, goal_id)
 
-    # Check if file exists
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"problem_templates.json not found at {template_path}")
-
-    # Load the JSON file
-    with open(template_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Find the goal by ID
-    goal = None
-    if "goals" in data:
-        for g in data["goals"]:
-            if g.get("id") == goal_id:
-                goal = g
-                break
-
-    if goal is None:
-        available_ids = [g.get("id") for g in data.get("goals", [])]
-        raise ValueError(
-            f"Goal {goal_id} not found in {template_path}. Available goal IDs: {available_ids}"
-        )
 
+def _goal_field(goal, field_path, required, default, module_number, goal_id):
+    """Walk a dot path inside a goal template (see get_problem_template_field)"""
     # Split the path by dots for nested access
     path_parts = field_path.split(".")
     current = goal
@@ -178,30 +233,18 @@ def get_no_of_steps(module_number, goal_id):
 
 
 def get_all_goal_templates(module_number, unit_number=None):
-    """Get all goal templates from a module's problem_templates.json."""
-    if unit_number is not None:
-        template_path = os.path.join(
-            "units", f"unit{unit_number}", f"module{module_number}", "problem_templates.json"
-        )
-    else:
-        template_path = os.path.join("modules", f"module{module_number}", "problem_templates.json")
-
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"problem_templates.json not found at {template_path}")
-
-    with open(template_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    return data.get("goals", [])
+    """Get all goal templates from a module's problem_templates.json (a read-only view)."""
+    goals, _ = _load_goal_index(_template_path(module_number, unit_number))
+    return goals
 
 
 def get_goal_template_by_id(module_number, goal_id, unit_number=None):
     """Get a specific goal template by ID."""
-    goals = get_all_goal_templates(module_number, unit_number=unit_number)
-    for goal in goals:
-        if goal.get("id") == goal_id:
-            return goal
-    raise ValueError(f"Goal {goal_id} not found in Module {module_number} problem templates")
+    try:
+        goal = _find_goal(module_number, goal_id, unit_number)
+    except ValueError:
+        raise ValueError(f"Goal {goal_id} not found in Module {module_number} problem templates")
+    return goal
 
 
 def get_fields_by_reference(
@@ -232,16 +275,13 @@ def get_fields_by_reference(
         CUSTOM_REF = ["tools_available", "variables.0.fractions", "remediations_per_step.0.0.scaffolding_level"]
         fields = get_fields_by_reference(1, 1, CUSTOM_REF)
     """
+    # Resolve the goal once, then read every field from it
+    goal = _find_goal(module_number, goal_id, unit_number)
     result = {}
 
     for field_path in field_reference_list:
-        result[field_path] = get_problem_template_field(
-            module_number,
-            goal_id,
-            field_path,
-            required=required,
-            default=default,
-            unit_number=unit_number,
+        result[field_path] = _goal_field(
+            goal, field_path, required, default, module_number, goal_id
         )
 
     return result
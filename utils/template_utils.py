@@ -2,10 +2,58 @@
 Utility functions for fetching data from module 4 problem template JSON files.
 Supports the template structure with template_id, goal_decomposition, etc.
 Uses __ (double underscore) for nested field access.
+
+Template files are parsed once per process and indexed by template_id; the index is
+re-validated against the file's mtime and size, so per-item lookups in a batch over
+hundreds of templates are a stat plus a dict lookup instead of a JSON parse and scan.
+Like starter packs (utils/module_utils.py), parsed files are frozen: lookups return
+read-only views of the cached templates rather than copies; copy one before modifying it.
 """
 
 import json
 import os
+import sys
+import threading
+
+# Sibling utils modules are imported flat (also when loaded as utils.X)
+_utils_dir = os.path.dirname(os.path.abspath(__file__))
+if _utils_dir not in sys.path:
+    sys.path.insert(0, _utils_dir)
+
+from module_utils import _freeze  # noqa: E402
+
+# Parsed template files: absolute path -> (mtime_ns, size, templates, {template_id: template})
+_template_index = {}
+_template_index_lock = threading.Lock()
+
+
+def _load_template_index(template_file_path):
+    """Return (templates, templates_by_id) for a file, re-reading it only when it changed"""
+    key = os.path.abspath(template_file_path)
+    stat = os.stat(key)
+
+    with _template_index_lock:
+        cached = _template_index.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+
+    with open(key, "r", encoding="utf-8") as f:
+        templates = _freeze(json.load(f))
+
+    # First occurrence wins, matching the old linear scan
+    by_id = {}
+    for template in templates:
+        by_id.setdefault(template.get("template_id"), template)
+
+    with _template_index_lock:
+        _template_index[key] = (stat.st_mtime_ns, stat.st_size, templates, by_id)
+    return templates, by_id
+
+
+def clear_template_cache():
+    """Drop all indexed template files (they are also re-read automatically when changed)"""
+    with _template_index_lock:
+        _template_index.clear()
 
 
 def get_template_by_id(template_file_path, template_id, required=True):
@@ -18,18 +66,16 @@ def get_template_by_id(template_file_path, template_id, required=True):
         required: If True, raises error if template not found
 
     Returns:
-        The template object, or None if not found and not required
+        The template object (a read-only view), or None if not found and not required
     """
     if not os.path.exists(template_file_path):
         raise FileNotFoundError(f"Template file not found at {template_file_path}")
 
-    with open(template_file_path, "r", encoding="utf-8") as f:
-        templates = json.load(f)
+    templates, by_id = _load_template_index(template_file_path)
 
-    # Find template by ID
-    for template in templates:
-        if template.get("template_id") == template_id:
-            return template
+    template = by_id.get(template_id)
+    if template is not None:
+        return template
 
     if required:
         available_ids = [t.get("template_id") for t in templates]
@@ -114,7 +160,7 @@ def get_all_fields(module_number, template_id):
 
 
 def get_all_templates(module_number, template_file, unit_number=None):
-    """Get all templates from a module's template file."""
+    """Get all templates from a module's template file (a read-only view)."""
     if unit_number is not None:
         template_path = os.path.join(
             "units", f"unit{unit_number}", f"module{module_number}", template_file
@@ -125,8 +171,8 @@ def get_all_templates(module_number, template_file, unit_number=None):
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"{template_file} not found at {template_path}")
 
-    with open(template_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    templates, _ = _load_template_index(template_path)
+    return templates
 
 
 # Counting functions